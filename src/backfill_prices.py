@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+장기 일봉 백필 프로그램
+[start, end] 기간을 호출 단위 구간으로 나눠 inquire-daily-itemchartprice를 반복 호출하고
+로컬 일봉 저장소에 기록 (중단 시 완료된 구간은 건너뛰고 이어서 실행)
+
+- 오늘이 포함된 구간과 평일이 있는데 0행이 온 구간은 완료로 남기지 않고 재시도 대상으로 기록
+  → 다음 실행에서 다시 조회 (상장 이전 구간은 바로, 그 밖의 빈 구간은 price_store.MAX_EMPTY_ATTEMPTS회 뒤 완료)
+
+예) 5년 × 2,500종목 ≈ 14구간 × 2,500 = 약 3.5만 호출 → 초당 20건 기준 약 30분
+"""
+
+import sys
+import time
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from kis_api import KoreaInvestmentAPI, ITEMCHART_CHUNK_DAYS
+from price_store import PriceBarStore
+
+# 호출당 100건 제한에 맞춘 구간 길이 (달력 일수)
+DEFAULT_CHUNK_DAYS = ITEMCHART_CHUNK_DAYS
+
+
+def plan_chunks(start_date: str, end_date: str, chunk_days: int = DEFAULT_CHUNK_DAYS) -> List[Tuple[str, str]]:
+    """
+    [start_date, end_date] 기간을 chunk_days 단위 구간으로 분할
+
+    Args:
+        start_date: 시작일 (YYYYMMDD)
+        end_date: 종료일 (YYYYMMDD)
+        chunk_days: 구간 길이 (달력 일수)
+
+    Returns:
+        (구간 시작일, 구간 종료일) 리스트 (YYYYMMDD)
+    """
+    start = datetime.strptime(start_date, "%Y%m%d")
+    end = datetime.strptime(end_date, "%Y%m%d")
+    chunks = []
+
+    while start <= end:
+        chunk_end = min(start + timedelta(days=chunk_days - 1), end)
+        chunks.append((start.strftime("%Y%m%d"), chunk_end.strftime("%Y%m%d")))
+        start = chunk_end + timedelta(days=1)
+
+    return chunks
+
+
+class BackfillJob:
+    """재시작 가능한 일봉 백필 작업"""
+
+    def __init__(self, api: KoreaInvestmentAPI, store: PriceBarStore, workers: int = 4,
+                 max_retries: int = 3, report_every: int = 100):
+        """
+        Args:
+            api: KIS API 클라이언트 (초당 호출 제한은 API의 rate_limiter가 담당)
+            store: 일봉 저장소 (진행 상황도 함께 기록)
+            workers: 동시 요청 스레드 수
+            max_retries: 구간별 재시도 횟수
+            report_every: 진행 상황 출력 간격 (구간 수)
+        """
+        self.api = api
+        self.store = store
+        self.workers = workers
+        self.max_retries = max_retries
+        self.report_every = report_every
+
+    def _fetch_chunk(self, code: str, chunk: Tuple[str, str]):
+        """구간 1개 조회 (실패 시 지수 백오프 재시도)"""
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                return self.api.fetch_daily_prices(code, chunk[0], chunk[1])
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                logging.warning(f"{code} {chunk[0]}~{chunk[1]} 조회 실패 ({attempt}/{self.max_retries}): {e}")
+                time.sleep(0.5 * 2 ** attempt)
+
+    def run(self, stock_codes: List[str], start_date: str, end_date: str,
+            chunk_days: int = DEFAULT_CHUNK_DAYS) -> Dict[str, float]:
+        """
+        백필 실행
+
+        Args:
+            stock_codes: 종목 코드 리스트
+            start_date: 시작일 (YYYYMMDD)
+            end_date: 종료일 (YYYYMMDD)
+            chunk_days: 구간 길이 (달력 일수)
+
+        Returns:
+            처리 통계 (완료 구간 수, 재시도 대상 구간 수, 행 수, 실패 수, 초당 행 수)
+        """
+        chunks = plan_chunks(start_date, end_date, chunk_days)
+        completed = self.store.completed_chunks()
+        pending = [
+            (code, chunk)
+            for code in stock_codes
+            for chunk in chunks
+            if (code, chunk[0], chunk[1]) not in completed
+        ]
+
+        total = len(stock_codes) * len(chunks)
+        print(f"📦 백필 대상: {len(stock_codes)}종목 × {len(chunks)}구간 = {total}구간 "
+              f"(완료 {total - len(pending)}, 남은 구간 {len(pending)})")
+
+        stats = {'chunks': 0, 'retry': 0, 'rows': 0, 'failed': 0, 'rows_per_sec': 0.0}
+        # 워커들이 동시에 토큰을 발급받지 않도록 시작 전에 한 번 발급 (발급 실패는 바로 예외)
+        if pending:
+            self.api._get_access_token()
+        started = time.monotonic()
+
+        # 조회는 스레드 풀, 저장은 메인 스레드에서만 수행 (SQLite 단일 writer)
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            futures = {executor.submit(self._fetch_chunk, code, chunk): (code, chunk) for code, chunk in pending}
+
+            for future in as_completed(futures):
+                code, chunk = futures[future]
+                try:
+                    bars = future.result()
+                    rows, complete = self.store.write_chunk(code, chunk[0], chunk[1], bars)
+                    stats['rows'] += rows
+                    stats['chunks' if complete else 'retry'] += 1
+                except Exception as e:
+                    stats['failed'] += 1
+                    logging.error(f"{code} {chunk[0]}~{chunk[1]} 백필 실패: {e}")
+
+                done = stats['chunks'] + stats['retry'] + stats['failed']
+                if done % self.report_every == 0 or done == len(pending):
+                    elapsed = max(time.monotonic() - started, 1e-9)
+                    stats['rows_per_sec'] = stats['rows'] / elapsed
+                    remaining = (len(pending) - done) * elapsed / done
+                    print(f"⏳ {done}/{len(pending)}구간 | {stats['rows']:,}행 | "
+                          f"{stats['rows_per_sec']:,.1f}행/초 | 남은 시간 약 {remaining / 60:.1f}분")
+        finally:
+            # 중단(Ctrl+C) 시 대기 중인 구간은 취소 → 다음 실행에서 이어서 처리
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        elapsed = max(time.monotonic() - started, 1e-9)
+        stats['rows_per_sec'] = stats['rows'] / elapsed
+        print(f"✅ 백필 완료: {stats['chunks']}구간, {stats['rows']:,}행, 재시도 대상 {stats['retry']}구간, "
+              f"실패 {stats['failed']}구간 ({elapsed:.1f}초, {stats['rows_per_sec']:,.1f}행/초)")
+        if stats['retry'] or stats['failed']:
+            print("⚠️ 재시도 대상(오늘 포함/빈 응답)과 실패한 구간은 같은 명령을 다시 실행하면 이어서 처리됩니다.")
+
+        return stats
+
+
+def load_codes(codes: Optional[List[str]], codes_file: Optional[str]) -> List[str]:
+    """명령행/파일에서 종목 코드 목록 로드 (중복 제거, 순서 유지)"""
+    result = list(codes or [])
+
+    if codes_file:
+        with open(codes_file, 'r', encoding='utf-8') as f:
+            result.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+
+    return list(dict.fromkeys(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='KIS 일봉 장기 백필 (중단 후 재실행 시 이어서 진행)')
+    parser.add_argument('--codes', nargs='*', help='종목 코드 목록 (예: 005930 000660)')
+    parser.add_argument('--codes-file', help='종목 코드 파일 (한 줄에 하나)')
+    parser.add_argument('--start', required=True, help='시작일 (YYYYMMDD)')
+    parser.add_argument('--end', default=datetime.now().strftime('%Y%m%d'), help='종료일 (YYYYMMDD, 기본: 오늘)')
+    parser.add_argument('--chunk-days', type=int, default=DEFAULT_CHUNK_DAYS, help='호출당 조회 구간 (달력 일수)')
+    parser.add_argument('--workers', type=int, default=4, help='동시 요청 스레드 수')
+    parser.add_argument('--db', help='일봉 저장소 경로 (기본: data/price_bars.db)')
+    parser.add_argument('--real', action='store_true', help='실전 계정 사용 (기본: 모의투자)')
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    stock_codes = load_codes(args.codes, args.codes_file)
+    if not stock_codes:
+        print("❌ 백필할 종목 코드가 없습니다. --codes 또는 --codes-file을 지정해주세요.")
+        sys.exit(1)
+
+    api = KoreaInvestmentAPI(is_demo=not args.real)
+    store = PriceBarStore(args.db)
+
+    try:
+        BackfillJob(api, store, workers=args.workers).run(stock_codes, args.start, args.end, args.chunk_days)
+    except KeyboardInterrupt:
+        print("\n⏹️ 중단되었습니다. 다시 실행하면 완료된 구간은 건너뜁니다.")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
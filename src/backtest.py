@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+랭킹 백테스트 엔진
+저장된 일일 TOP 10 랭킹을 일봉 가격 행렬에 대입하여
+적중률, 평균/중앙값 수익률, 순위별·섹터별 수익률, 낙폭을 전체 기간에 대해 한 번에 계산
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List, Optional
+from returns_engine import PriceMatrix, ReturnsEngine
+
+RANKING_COLUMNS = ['date', 'rank', 'stock_name', 'score', 'region', 'market_sentiment', 'global_sentiment']
+
+
+def rankings_frame(results: Dict[str, Dict], key: str = 'top_10_stocks') -> pd.DataFrame:
+    """
+    날짜별 랭킹 결과(JSON)를 long 형식 DataFrame으로 변환
+
+    Args:
+        results: {날짜: 랭킹 결과 딕셔너리}
+        key: 종목 리스트 키
+
+    Returns:
+        date / rank / stock_name / score / region / market_sentiment / global_sentiment 컬럼 DataFrame
+    """
+    rows = [
+        (
+            date, stock.get('rank', i), stock.get('stock_name', ''), stock.get('score', np.nan),
+            stock.get('region', ''), result.get('market_sentiment', ''),
+            str(result.get('global_market_sentiment', '')).upper()
+        )
+        for date, result in results.items()
+        for i, stock in enumerate(result.get(key, []), 1)
+    ]
+    return pd.DataFrame(rows, columns=RANKING_COLUMNS)
+
+
+def build_sector_map(stock_keywords: Dict[str, List[str]]) -> Dict[str, str]:
+    """섹터별 종목 목록 → {종목명: 첫 번째로 등록된 섹터}"""
+    sectors = {}
+    for sector, stocks in stock_keywords.items():
+        for stock in stocks:
+            sectors.setdefault(stock, sector)
+    return sectors
+
+
+class Backtester:
+    """일일 랭킹 백테스트"""
+
+    def __init__(self, prices: PriceMatrix, resolve_code: Callable[[str], str],
+                 sectors: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            prices: 날짜 × 종목코드 가격 행렬 (시가/종가)
+            resolve_code: 종목명 → 종목코드 함수
+            sectors: {종목명: 섹터}
+        """
+        self.engine = ReturnsEngine(prices)
+        self.resolve_code = resolve_code
+        self.sectors = sectors or {}
+
+    def attach_returns(self, rankings: pd.DataFrame, horizon: int = 1) -> pd.DataFrame:
+        """
+        랭킹에 종목코드·섹터·수익률 컬럼 추가
+
+        종목명 → 코드/섹터 변환은 고유 종목명에 대해서만 한 번씩 수행하고
+        수익률은 ReturnsEngine으로 전체 (예측일, 종목) 쌍을 한 번에 계산한다.
+        """
+        frame = rankings.reset_index(drop=True).copy()
+        names = frame['stock_name'].unique()
+        frame['stock_code'] = frame['stock_name'].map({name: self.resolve_code(name) or '' for name in names})
+        frame['sector'] = frame['stock_name'].map(lambda name: self.sectors.get(name, '기타'))
+        frame['prediction_date'] = frame['date']
+        return self.engine.returns_frame(frame, horizon).drop(columns='prediction_date')
+
+    def run(self, rankings: pd.DataFrame, horizon: int = 1, hit_threshold: float = 0.0) -> Dict:
+        """
+        백테스트 실행
+
+        Args:
+            rankings: rankings_frame() 형식 DataFrame
+            horizon: 보유 거래일 수 (1이면 다음 거래일 종가 청산)
+            hit_threshold: 적중으로 볼 최소 수익률 (%)
+
+        Returns:
+            적중률, 수익률 통계, 순위별/섹터별/심리별 성과, 일별 포트폴리오 수익률과 낙폭
+        """
+        frame = self.attach_returns(rankings, horizon)
+        frame['return'] = frame['return_1d'] if horizon == 1 else frame['return_nd']
+        evaluated = frame[frame['return'].notna()].copy()
+        evaluated['hit'] = evaluated['return'] > hit_threshold
+
+        summary = {
+            'total_predictions': len(frame),
+            'evaluated_predictions': len(evaluated),
+            'correct_predictions': int(evaluated['hit'].sum()),
+            'accuracy_rate': float(evaluated['hit'].mean() * 100) if len(evaluated) else 0.0,
+            'mean_return': float(evaluated['return'].mean()) if len(evaluated) else 0.0,
+            'median_return': float(evaluated['return'].median()) if len(evaluated) else 0.0,
+            'mean_open_to_close': float(evaluated['open_to_close'].mean()) if evaluated['open_to_close'].notna().any() else 0.0,
+            'rank_performance': {},
+            'sector_performance': {},
+            'global_sentiment_performance': {},
+            'global_factor_impact': 0.0,
+            'max_drawdown': 0.0,
+            'daily': pd.DataFrame(columns=['date', 'portfolio_return', 'equity', 'drawdown']),
+            'details': evaluated,
+        }
+        if evaluated.empty:
+            return summary
+
+        def _group_stats(column: str) -> Dict:
+            grouped = evaluated.groupby(column).agg(
+                count=('return', 'size'),
+                mean_return=('return', 'mean'),
+                hit_rate=('hit', 'mean'),
+            )
+            grouped['hit_rate'] *= 100
+            return grouped.to_dict('index')
+
+        summary['rank_performance'] = _group_stats('rank')
+        summary['sector_performance'] = _group_stats('sector')
+
+        # 일별 동일가중 포트폴리오 → 누적 자산곡선과 낙폭
+        daily = evaluated.groupby('date').agg(
+            portfolio_return=('return', 'mean'),
+            global_sentiment=('global_sentiment', 'first'),
+        ).sort_index()
+        equity = np.cumprod(1 + daily['portfolio_return'].to_numpy() / 100)
+        drawdown = equity / np.maximum.accumulate(np.maximum(equity, 1.0)) - 1  # 시작 자산 1.0 대비 포함
+        daily['equity'] = equity
+        daily['drawdown'] = drawdown * 100
+        summary['daily'] = daily.reset_index()
+        summary['max_drawdown'] = float(drawdown.min() * 100)
+
+        # 글로벌 심리별 일평균 수익률 차이 = 글로벌 변수 영향력 (%p)
+        by_sentiment = daily[daily['global_sentiment'] != ''].groupby('global_sentiment')['portfolio_return'].agg(['size', 'mean'])
+        summary['global_sentiment_performance'] = {
+            sentiment: {'days': int(row['size']), 'mean_return': float(row['mean'])}
+            for sentiment, row in by_sentiment.iterrows()
+        }
+        if len(by_sentiment) >= 2:
+            summary['global_factor_impact'] = float(by_sentiment['mean'].max() - by_sentiment['mean'].min())
+
+        return summary
+
+
+def print_backtest_report(summary: Dict) -> None:
+    """백테스트 결과 출력"""
+    print(f"\n📊 종합 검증 결과:")
+    print(f"총 예측: {summary['total_predictions']}개 (가격 데이터로 평가 {summary['evaluated_predictions']}개)")
+    print(f"적중 예측: {summary['correct_predictions']}개")
+    print(f"정확도: {summary['accuracy_rate']:.1f}%")
+    print(f"평균 수익률: {summary['mean_return']:+.2f}% | 중앙값: {summary['median_return']:+.2f}% | "
+          f"다음날 시가→종가: {summary['mean_open_to_close']:+.2f}%")
+    print(f"최대 낙폭 (일별 TOP 동일가중): {summary['max_drawdown']:.2f}%")
+
+    if summary['rank_performance']:
+        print("\n🏅 순위별 성과:")
+        for rank, stats in sorted(summary['rank_performance'].items()):
+            print(f"   {rank:2d}위: 평균 {stats['mean_return']:+.2f}% | 적중률 {stats['hit_rate']:.1f}% ({stats['count']}건)")
+
+    if summary['sector_performance']:
+        print("\n🏭 섹터별 성과:")
+        ordered = sorted(summary['sector_performance'].items(), key=lambda item: item[1]['mean_return'], reverse=True)
+        for sector, stats in ordered:
+            print(f"   {sector}: 평균 {stats['mean_return']:+.2f}% | 적중률 {stats['hit_rate']:.1f}% ({stats['count']}건)")
+
+    if summary['global_sentiment_performance']:
+        print("\n🌍 글로벌 심리별 일평균 수익률:")
+        for sentiment, stats in summary['global_sentiment_performance'].items():
+            print(f"   {sentiment}: {stats['mean_return']:+.2f}% ({stats['days']}일)")
+    print(f"글로벌 변수 영향력: {summary['global_factor_impact']:.2f}%p")
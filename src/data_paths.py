@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+로컬 데이터 저장 경로 설정
+작업 디렉토리와 무관하게 src/data (또는 TUJA_DATA_DIR) 아래에 저장
+"""
+
+import os
+
+DATA_DIR = os.getenv("TUJA_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+
+
+def data_path(*parts: str) -> str:
+    """데이터 디렉토리 하위 경로 반환 (디렉토리가 없으면 생성)"""
+    path = os.path.join(DATA_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
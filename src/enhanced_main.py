@@ -11,6 +11,33 @@ import argparse
 from datetime import datetime
 from enhanced_stock_ranking_system import EnhancedStockRankingSystem
 
+def run_performance_mode(ranking_system: EnhancedStockRankingSystem, days_back: int, args) -> None:
+    """weekly / monthly 모드 공통: 요약 → 성과 지표 → 선택적 그래프"""
+    # 먼저 간단한 분석 실행
+    ranking_system.simple_weekly_analysis(days_back=days_back)
+    
+    # 순위 IC / 스피어만 / 적중률 / 상위-하위 스프레드 / 섹터·지역별 성과
+    performance_data = ranking_system.performance_report(days_back=days_back)
+    
+    if not (args.ascii or args.plot):
+        return
+    if not performance_data.get('stock_performance'):
+        print("❌ 그래프를 생성할 데이터가 없습니다.")
+        return
+    
+    # 텍스트 기반 그래프 (선택적)
+    if args.ascii:
+        print("\n📊 텍스트 그래프 생성 중...")
+        ranking_system.generate_ascii_charts(performance_data)
+    
+    # matplotlib 그래프 (선택적)
+    if args.plot:
+        try:
+            print("\n📈 matplotlib 그래프 생성 중...")
+            ranking_system.visualize_weekly_performance(performance_data, save_plot=True)
+        except Exception as e:
+            print(f"⚠️ matplotlib 그래프 생성 중 오류 발생: {e}")
+
 def main():
     parser = argparse.ArgumentParser(description='향상된 다음날 오전 상승 예측 주식 추천 프로그램')
     parser.add_argument('--mode', choices=['single', 'schedule', 'validate', 'weekly', 'monthly'], default='single',
@@ -20,19 +47,44 @@ def main():
     parser.add_argument('--days', type=int, default=30,
                         help='검증용 과거 일수 (validate 모드에서만 사용)')
     parser.add_argument('--plot', action='store_true',
-                        help='주간 성과 그래프 표시 (weekly 모드에서만 사용)')
+                        help='성과 그래프 표시 (weekly/monthly 모드에서만 사용)')
     parser.add_argument('--ascii', action='store_true',
-                        help='주간 성과 텍스트 그래프 표시 (weekly 모드에서만 사용)')
+                        help='성과 텍스트 그래프 표시 (weekly/monthly 모드에서만 사용)')
+    parser.add_argument('--full', action='store_true',
+                        help='같은 날 앞선 실행의 중간 집계를 쓰지 않고 처음부터 분석 (single 모드에서만 사용)')
+    parser.add_argument('--resume', metavar='RUN_ID',
+                        help='실패한 실행을 체크포인트부터 이어서 실행 (single 모드에서만 사용, 실행 ID는 run_checkpoint.py로 확인)')
+    parser.add_argument('--universes', nargs='*', metavar='NAME',
+                        help='뉴스 수집/분석 한 번으로 유니버스별 랭킹도 함께 생성 (이름 없이 쓰면 설정된 전체, single/schedule 모드)')
+    parser.add_argument('--trading-days', action='store_true',
+                        help='KRX 거래일에만 실행 (schedule 모드에서만 사용, 기본: 매일)')
+    parser.add_argument('--universes-file',
+                        help='유니버스 설정 JSON (기본: TUJA_UNIVERSES 환경변수, 없으면 기본 유니버스)')
     
     args = parser.parse_args()
     
+    universes = {}
+    if args.universes is not None:
+        from universes import load_universes, select_universes
+        try:
+            universes = select_universes(load_universes(args.universes_file), args.universes)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(str(e))
+    
     # 시스템 초기화
     ranking_system = EnhancedStockRankingSystem()
+    ranking_system.set_universes(universes)
     
     if args.mode == 'single':
         # 단일 실행 모드
         print("🚀 향상된 다음날 오전 상승 예측 주식 분석 시작...")
-        result = ranking_system.generate_enhanced_daily_ranking()
+        # 스케줄러 실행과 겹치지 않도록 같은 잠금 사용
+        from scheduler import run_lock
+        with run_lock() as acquired:
+            if not acquired:
+                print("🔒 다른 랭킹 실행(스케줄러 등)이 진행 중입니다. 끝난 뒤 다시 실행해주세요.")
+                sys.exit(1)
+            result = ranking_system.generate_enhanced_daily_ranking(full=args.full, resume=args.resume)
         
         if result:
             if args.output == 'print':
@@ -57,77 +109,17 @@ def main():
     elif args.mode == 'weekly':
         # 주간 성과 분석 모드
         print("📊 주간 성과 분석 시작...")
-        
-        # 먼저 간단한 분석 실행
-        ranking_system.simple_weekly_analysis(days_back=7)
-        
-        # 텍스트 기반 그래프 (선택적)
-        if args.ascii:
-            try:
-                performance_data = ranking_system.analyze_weekly_performance(days_back=7)
-                
-                if performance_data.get('stock_performance'):
-                    print("\n📊 텍스트 그래프 생성 중...")
-                    ranking_system.generate_ascii_charts(performance_data)
-                else:
-                    print("❌ 그래프를 생성할 데이터가 없습니다.")
-            except Exception as e:
-                print(f"⚠️ 텍스트 그래프 생성 중 오류 발생: {e}")
-                print("   간단한 텍스트 분석만 완료되었습니다.")
-        
-        # 실제 주가 데이터 기반 분석 (선택적)
-        if args.plot:
-            try:
-                performance_data = ranking_system.analyze_weekly_performance(days_back=7)
-                
-                if performance_data.get('stock_performance'):
-                    print("\n📈 matplotlib 그래프 생성 중...")
-                    ranking_system.visualize_weekly_performance(performance_data, save_plot=True)
-                else:
-                    print("❌ 실제 주가 데이터를 분석할 데이터가 없습니다.")
-            except Exception as e:
-                print(f"⚠️ matplotlib 그래프 생성 중 오류 발생: {e}")
-                print("   간단한 텍스트 분석만 완료되었습니다.")
+        run_performance_mode(ranking_system, 7, args)
     
     elif args.mode == 'monthly':
         # 월간 성과 분석 모드
         print("📊 월간 성과 분석 시작...")
-        
-        # 먼저 간단한 분석 실행 (30일)
-        ranking_system.simple_weekly_analysis(days_back=30)
-        
-        # 텍스트 기반 그래프 (선택적)
-        if args.ascii:
-            try:
-                performance_data = ranking_system.analyze_weekly_performance(days_back=7)
-                
-                if performance_data.get('stock_performance'):
-                    print("\n📊 텍스트 그래프 생성 중...")
-                    ranking_system.generate_ascii_charts(performance_data)
-                else:
-                    print("❌ 그래프를 생성할 데이터가 없습니다.")
-            except Exception as e:
-                print(f"⚠️ 텍스트 그래프 생성 중 오류 발생: {e}")
-                print("   간단한 텍스트 분석만 완료되었습니다.")
-        
-        # 실제 주가 데이터 기반 분석 (선택적)
-        if args.plot:
-            try:
-                performance_data = ranking_system.analyze_weekly_performance(days_back=7)
-                
-                if performance_data.get('stock_performance'):
-                    print("\n📈 matplotlib 그래프 생성 중...")
-                    ranking_system.visualize_weekly_performance(performance_data, save_plot=True)
-                else:
-                    print("❌ 실제 주가 데이터를 분석할 데이터가 없습니다.")
-            except Exception as e:
-                print(f"⚠️ matplotlib 그래프 생성 중 오류 발생: {e}")
-                print("   간단한 텍스트 분석만 완료되었습니다.")
+        run_performance_mode(ranking_system, 30, args)
             
     elif args.mode == 'schedule':
-        # 스케줄링 실행 모드
-        print("📅 스케줄링 기능은 현재 준비 중입니다.")
-        print("단일 모드(--mode single)로 실행해주세요.")
+        # 스케줄링 실행 모드 (같은 시스템 객체를 실행마다 재사용)
+        from scheduler import run_daemon
+        run_daemon(ranking_system, days='trading' if args.trading_days else 'daily')
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,23 +2,54 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 from typing import List, Dict, Tuple, Optional
+import os
 import json
 import logging
-import matplotlib.pyplot as plt
-import matplotlib.font_manager as fm
-import seaborn as sns
+import time
 from news_collector import NewsCollector
 from global_news_collector_fixed import GlobalNewsCollector
 from stock_analyzer import StockAnalyzer
 from kis_api import KoreaInvestmentAPI, StockDataManager
+from returns_engine import PriceMatrix
+from price_store import PriceBarStore
+from news_archive import save_news_archive
+from backtest import Backtester, build_sector_map, print_backtest_report, rankings_frame
+from ranking_store import RankingStore, load_ranking_history
+from ranking_server import notify_refresh
+from portfolio_sim import CostModel, PortfolioSimulator, print_portfolio_report
+from pipeline_dag import StageGraph
+from intraday_state import IntradayState, print_ranking_diff, ranking_diff
+from universes import print_universe_results, universe_analyzer
+from run_checkpoint import RunCheckpoint
+from result_dataset import append_result, resolve_format
+import metrics
+import tracing
+from performance_analytics import (analyze_performance, bootstrap_confidence, performance_frame,
+                                   print_confidence_intervals, print_performance_report)
 # import schedule  # 동적 import로 LSP 오류 회피
 
 class EnhancedStockRankingSystem:
-    def __init__(self):
+    def __init__(self, ranking_store: Optional[RankingStore] = None, results_root: Optional[str] = None):
+        """
+        Args:
+            ranking_store: 랭킹 저장소 (기본: data/rankings.db)
+            results_root: 결과 데이터셋 경로 (기본: data/results 또는 TUJA_RESULTS_DIR)
+        """
         self.news_collector = NewsCollector()
         self.global_news_collector = GlobalNewsCollector()
         self.stock_analyzer = StockAnalyzer()
         self.results_history = []
+        # 같은 날 두 번째 실행부터 새 기사만 분석 (TUJA_INCREMENTAL=0이면 매번 처음부터)
+        self.incremental = os.getenv("TUJA_INCREMENTAL", "1") != "0"
+        self.ranking_store = ranking_store or RankingStore(sectors=build_sector_map(self.stock_analyzer.stock_keywords))
+        # 단계 결과 체크포인트 (TUJA_CHECKPOINTS=0이면 남기지 않음, run_checkpoint.py)
+        self.checkpoints = os.getenv("TUJA_CHECKPOINTS", "1") != "0"
+        # 결과 파일 형식: parquet(pyarrow 설치 시 기본, result_dataset.py) 또는 files(JSON + CSV) — TUJA_RESULT_FORMAT
+        self.result_format = resolve_format()
+        self.results_root = results_root
+        # 같은 수집/집계로 함께 랭킹할 유니버스 (set_universes, enhanced_main.py --universes)
+        self.universes: Dict[str, Dict] = {}
+        self.universe_analyzers: Dict[str, StockAnalyzer] = {}
         
         # 한국투자증권 API 초기화
         try:
@@ -42,120 +73,291 @@ class EnhancedStockRankingSystem:
             ]
         )
 
-    def generate_enhanced_daily_ranking(self) -> Optional[Dict]:
-        """글로벌 데이터까지 포함한 일일 주식 랭킹 생성"""
+    def set_universes(self, universes: Dict[str, Dict]) -> None:
+        """
+        멀티 유니버스 모드 설정 (이후 실행마다 유니버스별 결과를 함께 생성)
+
+        Args:
+            universes: {이름: 유니버스 설정} (universes.load_universes, 빈 딕셔너리면 해제)
+        """
+        self.universes = dict(universes)
+        self.universe_analyzers = {name: universe_analyzer(self.stock_analyzer, spec) for name, spec in self.universes.items()}
+
+    def generate_enhanced_daily_ranking(self, full: bool = False, resume: Optional[str] = None) -> Optional[Dict]:
+        """
+        글로벌 데이터까지 포함한 일일 주식 랭킹 생성 (실행 전체를 하나의 trace로 기록)
+
+        Args:
+            full: True면 같은 날 앞선 실행의 중간 집계를 쓰지 않고 처음부터 분석
+            resume: 실패한 실행 ID — 체크포인트에 남은 단계는 건너뛰고 나머지만 실행
+        """
+        with tracing.trace('daily_ranking') as trace:
+            if trace:
+                logging.info(f"추적 ID: {trace.trace_id}")
+            return self._generate_enhanced_daily_ranking(full, resume)
+
+    def _generate_enhanced_daily_ranking(self, full: bool = False, resume: Optional[str] = None) -> Optional[Dict]:
+        """수집 → 분석 → 저장 (generate_enhanced_daily_ranking에서 호출)"""
+        metrics.start_run()  # JSON 요약은 이번 실행분만 (데몬에서도 실행별 수치)
+        started = time.perf_counter()
+        status = 'error'
+        checkpoint = None
         try:
             logging.info("향상된 일일 주식 랭킹 생성 시작...")
             
-            # 1. 국내 뉴스 데이터 수집
-            domestic_news = self.news_collector.collect_financial_news()
-            logging.info(f"수집된 국내 뉴스: {len(domestic_news)}개")
-            
-            # 2. 글로벌 뉴스 데이터 수집
-            global_news = self.global_news_collector.collect_global_financial_news()
-            logging.info(f"수집된 글로벌 뉴스: {len(global_news)}개")
-            
-            # 3. 뉴스 데이터 통합
-            all_news = domestic_news + global_news
-            logging.info(f"총 뉴스 데이터: {len(all_news)}개")
-            
-            # 4. 주식 언급 분석
-            stock_mentions = self.stock_analyzer.extract_stock_mentions(all_news)
-            logging.info(f"언급된 주식: {len(stock_mentions)}개")
-            
-            # 5. 주식 점수 계산
-            stock_scores = self.stock_analyzer.calculate_stock_scores(all_news, stock_mentions)
-            
-            # 6. 랭킹 생성
-            ranking_results = self.stock_analyzer.rank_stocks(stock_scores)
-            
-            # 7. 시장 동향 분석
-            market_trends = self.stock_analyzer.analyze_market_trends(all_news)
+            # 단계 결과 체크포인트 (실패하면 --resume <실행 ID>로 끝난 단계를 건너뜀)
+            checkpoint = self._open_checkpoint(full, resume)
+            if checkpoint is not None:
+                full = checkpoint.meta.get('full', full)
             
-            # 8. 글로벌 시장 데이터 통합
-            global_market_data = self.global_news_collector.collect_global_market_data()
+            # 같은 날 앞선 실행의 기사 집합 / 중간 집계 (새 기사만 분석해 더함)
+            state = IntradayState.load(datetime.now().strftime('%Y-%m-%d'), self.stock_analyzer)
+            if full or not self.incremental:
+                state.reset()
+            self.news_collector.known_links = state.links()
             
-            # 9. 글로벌 시장 심리 분석
-            global_sentiment_data = self.stock_analyzer._analyze_global_sentiment(global_market_data)
-            global_sentiment = global_sentiment_data.get('sentiment', 'NEUTRAL')
-            
-            # 10. 하락 예측 주식 분석
-            declining_stocks = self.stock_analyzer.predict_declining_stocks(all_news, stock_mentions)
-            
-            # 11. 새로운 기술/영역 이슈 감지
-            emerging_trends = self.stock_analyzer.detect_emerging_trends(all_news)
-            
-            # 12. 영향력 있는 기관/인물 분석
-            influential_impact = self.stock_analyzer.analyze_influential_impact(all_news)
+            # 1~12. 수집/분석 단계를 의존성 그래프로 실행 (독립 단계는 동시에)
+            stages = self._build_ranking_graph(state).run(checkpoint=checkpoint)
+            new_news = stages['new_news']
             
             # 13. 결과 포맷팅
-            result = {
-                'date': datetime.now().strftime('%Y-%m-%d'),
-                'time': datetime.now().strftime('%H:%M:%S'),
-                'market_sentiment': market_trends['market_sentiment'],
-                'hot_sectors': market_trends['hot_sectors'],
-                'domestic_news_count': len(domestic_news),
-                'global_news_count': len(global_news),
-                'total_news_analyzed': len(all_news),
-                'total_stocks_mentioned': len(stock_mentions),
-                'global_market_sentiment': global_sentiment,
-                'top_10_stocks': [],
-                'declining_stocks': [],
-                'emerging_trends': emerging_trends,
-                'influential_impact': influential_impact
-            }
-            
-            for rank, (stock, score, reason) in enumerate(ranking_results[:10], 1):
-                result['top_10_stocks'].append({
-                    'rank': rank,
-                    'stock_name': stock,
-                    'score': round(score, 2),
-                    'reason': reason,
-                    'mention_count': stock_mentions.get(stock, 0),
-                    'region': self.stock_analyzer.classify_stock_region(stock)
-                })
+            result = self._format_result(state, stages)
             
-            # 하락 예측 주식 추가
-            for rank, (stock, risk_score, reason) in enumerate(declining_stocks, 1):
-                result['declining_stocks'].append({
-                    'rank': rank,
-                    'stock_name': stock,
-                    'risk_score': round(risk_score, 2),
-                    'reason': reason,
-                    'mention_count': stock_mentions.get(stock, 0),
-                    'region': self.stock_analyzer.classify_stock_region(stock)
-                })
+            # 직전 실행(같은 날) 대비 TOP 10 변화
+            if state.ranking:
+                result['ranking_diff'] = ranking_diff(state.ranking, result['top_10_stocks'])
+                result['previous_run_time'] = state.runs[-1]['time'] if state.runs else None
             
             # 10. 결과 저장
             self.save_enhanced_results(result)
             self.results_history.append(result)
+            try:
+                state.record(result, len(new_news))
+            except OSError as e:
+                logging.warning(f"당일 재실행 상태 저장 실패: {e}")
+            
+            # 유니버스별 결과 (같은 수집/집계에서 계산, 유니버스마다 파일/저장소에 따로 저장)
+            if self.universes:
+                result['universe_results'] = {}
+                for name, spec in self.universes.items():
+                    universe_result = self._format_result(state, {**stages, **stages[f'universe:{name}']})
+                    universe_result['universe'] = name
+                    universe_result['universe_description'] = spec.get('description', '')
+                    self.save_enhanced_results(universe_result, universe=name)
+                    result['universe_results'][name] = universe_result
             
+            if checkpoint is not None:
+                checkpoint.remove()
             logging.info("향상된 일일 주식 랭킹 생성 완료!")
+            status = 'ok'
             return result
             
         except Exception as e:
             logging.error(f"향상된 일일 주식 랭킹 생성 오류: {e}")
+            if checkpoint is not None:
+                logging.error(f"끝난 단계는 저장되어 있습니다. 이어서 실행: python3 enhanced_main.py --resume {checkpoint.run_id}")
             return None
+        
+        finally:
+            # 실행마다 단계/외부 호출 지표를 textfile collector용 파일과 JSON 요약으로 기록
+            metrics.observe('run_duration_seconds', time.perf_counter() - started)
+            metrics.inc('runs_total', status=status)
+            try:
+                metrics.export()
+            except OSError as e:
+                logging.warning(f"실행 지표 저장 실패: {e}")
                 
-    def save_enhanced_results(self, result: Dict) -> None:
-        """향상된 결과 저장"""
+    def _open_checkpoint(self, full: bool, resume: Optional[str]) -> Optional[RunCheckpoint]:
+        """
+        이어서 실행할 체크포인트를 열거나 새 실행 체크포인트 생성 (TUJA_CHECKPOINTS=0이면 새로 만들지 않음)
+
+        Raises:
+            FileNotFoundError: resume 실행이 없는 경우
+            ValueError: resume 실행이 오늘 실행이 아닌 경우 (당일 기사 집합이 달라 이어서 실행할 수 없음)
+        """
+        today = datetime.now().strftime('%Y-%m-%d')
+        if resume:
+            checkpoint = RunCheckpoint.open(resume)
+            if checkpoint.meta.get('date') != today:
+                raise ValueError(f"{checkpoint.meta.get('date')} 실행은 오늘({today}) 이어서 실행할 수 없습니다")
+            logging.info(f"실행 {resume} 이어서 실행 (완료 단계 {len(checkpoint.completed())}개)")
+            return checkpoint
+        if not self.checkpoints:
+            return None
         try:
-            # JSON 파일로 저장
-            filename = f"enhanced_stock_ranking_{result['date']}.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
+            checkpoint = RunCheckpoint.create({'date': today, 'full': full})
+        except OSError as e:
+            logging.warning(f"실행 체크포인트 생성 실패, 체크포인트 없이 실행합니다: {e}")
+            return None
+        logging.info(f"실행 ID: {checkpoint.run_id}")
+        return checkpoint
+
+    def _format_result(self, state: IntradayState, stages: Dict) -> Dict:
+        """
+        단계 결과를 일일 랭킹 결과 딕셔너리로 구성
+
+        Args:
+            state: 당일 기사 집합
+            stages: 단계 그래프 결과 (유니버스는 유니버스 단계 결과로 덮어쓴 것)
+        """
+        stock_mentions = stages['stock_mentions']
+        market_trends = stages['market_trends']
+        result = {
+            'date': datetime.now().strftime('%Y-%m-%d'),
+            'time': datetime.now().strftime('%H:%M:%S'),
+            'market_sentiment': market_trends['market_sentiment'],
+            'hot_sectors': market_trends['hot_sectors'],
+            'domestic_news_count': len(state.articles['domestic']),
+            'global_news_count': len(state.articles['global']),
+            'total_news_analyzed': len(stages['all_news']),
+            'new_news_count': len(stages['new_news']),
+            'total_stocks_mentioned': len(stock_mentions),
+            'global_market_sentiment': stages['global_sentiment'].get('sentiment', 'NEUTRAL'),
+            'top_10_stocks': [],
+            'declining_stocks': [],
+            'emerging_trends': stages['emerging_trends'],
+            'influential_impact': stages['influential_impact']
+        }
+        
+        for rank, (stock, score, reason) in enumerate(stages['ranking_results'][:10], 1):
+            result['top_10_stocks'].append({
+                'rank': rank,
+                'stock_name': stock,
+                'score': round(score, 2),
+                'reason': reason,
+                'mention_count': stock_mentions.get(stock, 0),
+                'region': self.stock_analyzer.classify_stock_region(stock)
+            })
+        
+        # 하락 예측 주식 추가
+        for rank, (stock, risk_score, reason) in enumerate(stages['declining_stocks'], 1):
+            result['declining_stocks'].append({
+                'rank': rank,
+                'stock_name': stock,
+                'risk_score': round(risk_score, 2),
+                'reason': reason,
+                'mention_count': stock_mentions.get(stock, 0),
+                'region': self.stock_analyzer.classify_stock_region(stock)
+            })
+        
+        return result
+
+    def _build_ranking_graph(self, state: IntradayState) -> StageGraph:
+        """
+        일일 랭킹 단계 그래프
+
+        국내 뉴스 / 글로벌 뉴스 / 글로벌 시장 데이터 수집은 서로 독립이고,
+        뉴스 분석 단계들은 중간 집계에만 의존하므로 시장 데이터 수집을 기다리지 않는다.
+        중간 집계에는 이번 실행에서 처음 본 기사만 더한다 (같은 날 앞선 실행의 집계는 state에 있음).
+        """
+        analyzer = self.stock_analyzer
+
+        def collect_domestic():
+            news = self.news_collector.collect_financial_news()
+            logging.info(f"수집된 국내 뉴스: {len(news)}개")
+            return news
+
+        def collect_global():
+            news = self.global_news_collector.collect_global_financial_news()
+            logging.info(f"수집된 글로벌 뉴스: {len(news)}개")
+            return news
+
+        def select_new(domestic_news, global_news):
+            new_news = state.add_articles(domestic_news, global_news)
+            logging.info(f"새 뉴스: {len(new_news)}개 (당일 누적 {len(state.keys)}개)")
+            return new_news
+
+        def merge_news(new_news):
+            all_news = state.all_news
+            logging.info(f"총 뉴스 데이터: {len(all_news)}개")
+            # 과거 재채점(scoring_sweep.py)용 뉴스 보관
+            try:
+                save_news_archive(state.date, all_news)
+            except OSError as e:
+                logging.warning(f"뉴스 보관 실패: {e}")
+            return all_news
+
+        def aggregate(new_news):
+            return analyzer.aggregate_news(new_news, state.aggregate)
+
+        def mentions(news_aggregate):
+            stock_mentions = news_aggregate.stock_mentions()
+            logging.info(f"언급된 주식: {len(stock_mentions)}개")
+            return stock_mentions
+
+        graph = StageGraph('daily_ranking')
+        graph.add('domestic_news', collect_domestic)
+        graph.add('global_news', collect_global)
+        graph.add('global_market_data', self.global_news_collector.collect_global_market_data)
+        # 당일 상태(state)에 기사/집계를 더하는 단계는 체크포인트 대신 이어서 실행할 때 다시 실행
+        graph.add('new_news', select_new, ['domestic_news', 'global_news'], checkpoint=False)
+        graph.add('all_news', merge_news, ['new_news'], checkpoint=False)
+        graph.add('news_aggregate', aggregate, ['new_news'], checkpoint=False)
+        graph.add('stock_mentions', mentions, ['news_aggregate'])
+        graph.add('stock_scores', lambda news_aggregate: analyzer.scores_from_aggregate(news_aggregate), ['news_aggregate'])
+        graph.add('ranking_results', lambda stock_scores: analyzer.rank_stocks(stock_scores), ['stock_scores'])
+        graph.add('market_trends', lambda news_aggregate: analyzer.market_trends_from_aggregate(news_aggregate),
+                  ['news_aggregate'])
+        graph.add('global_sentiment', lambda global_market_data: analyzer._analyze_global_sentiment(global_market_data),
+                  ['global_market_data'])
+        graph.add('declining_stocks', lambda news_aggregate: analyzer.declining_from_aggregate(news_aggregate),
+                  ['news_aggregate'])
+        graph.add('emerging_trends', lambda news_aggregate: analyzer.emerging_from_aggregate(news_aggregate),
+                  ['news_aggregate'])
+        graph.add('influential_impact', lambda news_aggregate: analyzer.influential_from_aggregate(news_aggregate),
+                  ['news_aggregate'])
+        # 유니버스별 점수/순위는 공유 집계에서 계산 (수집/기사 분석을 다시 하지 않음)
+        for name, scoped in self.universe_analyzers.items():
+            graph.add(f'universe:{name}', lambda news_aggregate, scoped=scoped: self._rank_universe(scoped, news_aggregate),
+                      ['news_aggregate'])
+        return graph
+
+    @staticmethod
+    def _rank_universe(analyzer: StockAnalyzer, news_aggregate) -> Dict:
+        """유니버스 분석기로 공유 집계를 좁혀 점수 / 순위 / 시장 동향 / 하락 예측 계산 (단계 결과와 같은 키)"""
+        aggregate = news_aggregate.restrict(analyzer.stock_keywords)
+        return {
+            'stock_mentions': aggregate.stock_mentions(),
+            'ranking_results': analyzer.rank_stocks(analyzer.scores_from_aggregate(aggregate)),
+            'market_trends': analyzer.market_trends_from_aggregate(aggregate),
+            'declining_stocks': analyzer.declining_from_aggregate(aggregate),
+        }
+
+    def save_enhanced_results(self, result: Dict, universe: Optional[str] = None) -> None:
+        """
+        향상된 결과 저장
+
+        Args:
+            result: 랭킹 결과
+            universe: 유니버스 이름 (파일 이름 뒤에 붙이고 저장소에는 system='enhanced:<이름>'으로 저장)
+        """
+        suffix = f"_{universe}" if universe else ""
+        system = f"enhanced:{universe}" if universe else 'enhanced'
+        try:
+            if self.result_format == 'parquet':
+                # 컬럼형 데이터셋에 실행 정보 / 종목 행 추가 (기존 형식 JSON은 result_dataset.py export)
+                saved = ", ".join(append_result(result, system, self.results_root))
+            else:
+                # JSON 파일로 저장
+                filename = f"enhanced_stock_ranking_{result['date']}{suffix}.json"
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(result, f, ensure_ascii=False, indent=2)
+                
+                # CSV 파일로 저장
+                df = pd.DataFrame(result['top_10_stocks'])
+                df['date'] = result['date']
+                df['market_sentiment'] = result['market_sentiment']
+                df['global_sentiment'] = result['global_market_sentiment']
+                df['domestic_news'] = result['domestic_news_count']
+                df['global_news'] = result['global_news_count']
+                csv_filename = f"enhanced_stock_ranking_{result['date']}{suffix}.csv"
+                df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
+                saved = f"{filename}, {csv_filename}"
             
-            # CSV 파일로 저장
-            df = pd.DataFrame(result['top_10_stocks'])
-            df['date'] = result['date']
-            df['market_sentiment'] = result['market_sentiment']
-            df['global_sentiment'] = result['global_market_sentiment']
-            df['domestic_news'] = result['domestic_news_count']
-            df['global_news'] = result['global_news_count']
-            csv_filename = f"enhanced_stock_ranking_{result['date']}.csv"
-            df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
+            self.ranking_store.save(result, system)
+            notify_refresh()  # 랭킹 조회 서비스가 떠 있으면 즉시 반영 (TUJA_RANKING_SERVER)
             
-            logging.info(f"향상된 결과 저장 완료: {filename}, {csv_filename}")
+            logging.info(f"향상된 결과 저장 완료: {saved}")
             
         except Exception as e:
             logging.error(f"향상된 결과 저장 중 오류 발생: {e}")
@@ -179,6 +381,8 @@ class EnhancedStockRankingSystem:
         print(f"\n🌍 시장 심리: 국내 {result['market_sentiment'].upper()} / 글로벌 {global_sentiment.upper()}")
         print(f"🔥 핫 섹터: {', '.join(result['hot_sectors'])}")
         print(f"📰 분석 뉴스: 국내 {result['domestic_news_count']}개 + 글로벌 {result['global_news_count']}개 = 총 {result['total_news_analyzed']}개")
+        if result.get('ranking_diff'):
+            print(f"🆕 직전 실행 이후 새 뉴스: {result.get('new_news_count', 0)}개")
         print(f"📈 언급 주식: {result['total_stocks_mentioned']}개")
         
         # 새로운 트렌드 표시
@@ -232,13 +436,21 @@ class EnhancedStockRankingSystem:
                 print(f"     위험점수: {stock_info['risk_score']:6.1f} | 언급횟수: {stock_info['mention_count']}")
                 print(f"     위험요인: {stock_info['reason']}")
         
+        if result.get('ranking_diff'):
+            print_ranking_diff(result['ranking_diff'], result.get('previous_run_time'))
+        
+        if result.get('universe_results'):
+            print("\n" + "─"*80)
+            print("🗂️ 유니버스별 TOP 5 (같은 뉴스 집계 기준)")
+            print_universe_results(result['universe_results'])
+        
         print("\n" + "="*80)
         print("⚠️  투자 주의사항: 본 분석은 뉴스 기반 예측으로, 글로벌 변수가 많습니다.")
         print("🇰🇷 한국주식 / 🇺🇸 미국주식 / 🌍 기타")
         print("="*80)
 
     def validate_with_historical_data(self, days_back: int = 30) -> Dict:
-        """과거 데이터로 알고리즘 검증"""
+        """과거 랭킹을 저장된 일봉에 대입하여 알고리즘 검증 (backtest.Backtester)"""
         validation_results = {
             'total_predictions': 0,
             'correct_predictions': 0,
@@ -257,50 +469,54 @@ class EnhancedStockRankingSystem:
         print(f"\n🔍 최근 {days_back}일간 알고리즘 검증 결과:")
         print("="*60)
         
-        total_correct = 0
-        total_predictions = 0
+        rankings = rankings_frame(past_results)
+        stock_manager = self.stock_manager or StockDataManager(self.kis_api)
+        codes = sorted({code for code in map(stock_manager.get_stock_code, rankings['stock_name'].unique()) if code})
+        prices = self._load_backtest_prices(codes, rankings['date'].min(), days_back)
         
-        for date, result in past_results.items():
-            if 'top_10_stocks' in result:
-                total_predictions += len(result['top_10_stocks'])
-                # 실제 주가 데이터와 비교 (실제 구현 시 필요)
-                # 여기서는 시뮬레이션으로 60-70% 정확도 가정
-                correct = int(len(result['top_10_stocks']) * 0.65)
-                total_correct += correct
-                
-                print(f"{date}: 예측 {len(result['top_10_stocks'])}개, 실제 적중 약 {correct}개")
+        if prices.empty:
+            print("❌ 검증에 사용할 일봉 데이터가 없습니다. backfill_prices.py로 먼저 백필해주세요.")
+            validation_results['total_predictions'] = len(rankings)
+            return validation_results
         
-        validation_results['total_predictions'] = total_predictions
-        validation_results['correct_predictions'] = total_correct
-        validation_results['accuracy_rate'] = (total_correct / total_predictions * 100) if total_predictions > 0 else 0
+        backtester = Backtester(prices, stock_manager.get_stock_code,
+                                build_sector_map(self.stock_analyzer.stock_keywords))
+        summary = backtester.run(rankings)
+        print_backtest_report(summary)
         
-        print(f"\n📊 종합 검증 결과:")
-        print(f"총 예측: {total_predictions}개")
-        print(f"적중 예측: {total_correct}개")
-        print(f"정확도: {validation_results['accuracy_rate']:.1f}%")
+        # 점 추정치만으로 판단하지 않도록 부트스트랩 신뢰구간 함께 보고
+        summary['confidence_intervals'] = [
+            bootstrap_confidence(summary['details'], block=block) for block in (None, 'date')
+        ]
+        print_confidence_intervals(summary['confidence_intervals'])
         
-        # 글로벌 변수 영향력 분석
-        validation_results['global_factor_impact'] = 85.2  # 시뮬레이션 값
-        print(f"글로벌 변수 영향력: {validation_results['global_factor_impact']:.1f}%")
+        # 적중률과 별개로 실제 매매 시 거래비용을 반영한 TOP 10 포트폴리오 성과
+        markets = stock_manager.stock_master.markets if stock_manager.stock_master is not None else None
+        portfolio = PortfolioSimulator(prices, stock_manager.get_stock_code, CostModel(markets=markets)).run(rankings)
+        print_portfolio_report(portfolio)
+        summary['portfolio'] = {key: value for key, value in portfolio.items() if key != 'daily'}
         
+        validation_results.update(summary)
         return validation_results
 
+    def _load_backtest_prices(self, stock_codes: List[str], start_date: str, days_back: int) -> PriceMatrix:
+        """백테스트용 가격 행렬 (로컬 일봉 저장소 우선, 비어 있으면 KIS API 조회)"""
+        store = PriceBarStore()
+        try:
+            # 예측일 직전 거래일이 기준가가 될 수 있으므로 앞쪽 여유 기간 포함
+            start = (pd.Timestamp(start_date) - pd.Timedelta(days=10)).strftime('%Y-%m-%d')
+            prices = store.price_matrix(stock_codes, start=start)
+        finally:
+            store.close()
+        
+        if prices.empty and self.use_kis_api:
+            print("⚠️ 로컬 일봉 저장소가 비어 있어 KIS API로 조회합니다.")
+            prices = self.stock_manager.load_price_matrix(stock_codes, days=days_back + 10)
+        return prices
+
     def _load_past_results(self, days_back: int) -> Dict:
-        """과거 결과 로드"""
-        past_results = {}
-        current_date = datetime.now()
-        
-        for i in range(days_back):
-            date = (current_date - timedelta(days=i)).strftime('%Y-%m-%d')
-            filename = f"enhanced_stock_ranking_{date}.json"
-            
-            try:
-                with open(filename, 'r', encoding='utf-8') as f:
-                    past_results[date] = json.load(f)
-            except FileNotFoundError:
-                continue
-                
-        return past_results
+        """과거 결과 로드 (랭킹 저장소에서 최근 days_back일 조회)"""
+        return load_ranking_history(days_back, system='enhanced', store=self.ranking_store)
     
     def _generate_test_return(self, stock_name: str) -> float:
         """테스트용 임시 수익률 생성"""
@@ -367,7 +583,7 @@ class EnhancedStockRankingSystem:
     def simple_weekly_analysis(self, days_back: int = 7):
         """간단한 주간 성과 분석 (텍스트 기반)"""
         print("\n" + "="*80)
-        print("📊 지난 1주일간 주식 예측 성과 분석")
+        print(f"📊 지난 {days_back}일간 주식 예측 성과 분석")
         print("="*80)
         
         # 과거 결과 로드
@@ -409,44 +625,32 @@ class EnhancedStockRankingSystem:
         print(f"   • 고유 주식: {len(all_stocks_mentioned)}개")
         print(f"   • 일평균 예측: {total_predictions/len(past_results):.1f}개")
         
-        # 언급된 주식 목록
+        # 언급된 주식 목록 (일/주/월 롤업에서 기간 합계 조회)
         if all_stocks_mentioned:
-            print(f"\n🏆 1주일간 가장 많이 언급된 주식:")
-            stock_counts = {}
+            print(f"\n🏆 {days_back}일간 가장 많이 언급된 주식:")
+            dates = sorted(past_results)
+            top_stocks = self.ranking_store.rollups.summary(dates[0], dates[-1]).head(10)
             
-            # 주식별 언급 횟수 계산
-            for date, result in past_results.items():
-                if 'top_10_stocks' in result:
-                    for stock_info in result['top_10_stocks']:
-                        stock_name = stock_info['stock_name']
-                        score = stock_info['score']
-                        if stock_name not in stock_counts:
-                            stock_counts[stock_name] = {'count': 0, 'total_score': 0, 'regions': set()}
-                        stock_counts[stock_name]['count'] += 1
-                        stock_counts[stock_name]['total_score'] += score
-                        stock_counts[stock_name]['regions'].add(stock_info.get('region', '기타'))
-            
-            # 상위 10개 주식 표시
-            sorted_stocks = sorted(stock_counts.items(), key=lambda x: x[1]['count'], reverse=True)[:10]
-            for i, (stock, data) in enumerate(sorted_stocks, 1):
-                avg_score = data['total_score'] / data['count']
-                regions = ', '.join(data['regions'])
-                region_flag = "🇰🇷" if "한국" in regions else "🇺🇸" if "미국" in regions else "🌍"
-                print(f"   {i:2d}. {region_flag} {stock}")
-                print(f"       언급 횟수: {data['count']}회 | 평균 점수: {avg_score:.1f} | 국가: {regions}")
+            for i, row in enumerate(top_stocks.itertuples(index=False), 1):
+                region = row.region or '기타'
+                region_flag = "🇰🇷" if "한국" in region else "🇺🇸" if "미국" in region else "🌍"
+                realized = f" | 평균 수익률: {row.mean_return:+.2f}%" if pd.notna(row.mean_return) else ""
+                print(f"   {i:2d}. {region_flag} {row.key}")
+                print(f"       언급 횟수: {row.appearances}회 | 평균 점수: {row.avg_score:.1f} | 국가: {region}{realized}")
         
         print("\n" + "="*80)
         print("⚠️  참고: 실제 주가 변동 분석은 한국투자증권 API로 제공됩니다.")
         print("="*80)
 
     def analyze_weekly_performance(self, days_back: int = 7) -> Dict:
-        """지난 1주일간 주식 점수와 주가 변동 분석 - 한국투자증권 API 연동"""
+        """최근 days_back일간 예측 점수와 실제 수익률 분석 (performance_analytics 기반)"""
         performance_data = {
             'analysis_period': f"{(datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')} ~ {datetime.now().strftime('%Y-%m-%d')}",
             'stock_performance': [],
             'correlation_analysis': {},
             'accuracy_metrics': {},
-            'recommendations': []
+            'recommendations': [],
+            'analytics': {}
         }
         
         # 과거 결과 로드
@@ -454,101 +658,82 @@ class EnhancedStockRankingSystem:
         
         if not past_results:
             print(f"최근 {days_back}일간의 과거 데이터가 없습니다.")
-            # 테스트용 데이터 생성
-            print("📊 테스트용 데이터로 분석을 진행합니다...")
-            past_results = self._generate_test_data(days_back)
-        
-
-        performance_data = {
-            'analysis_period': f"{(datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')} ~ {datetime.now().strftime('%Y-%m-%d')}",
-            'stock_performance': [],
-            'correlation_analysis': {},
-            'accuracy_metrics': {},
-            'recommendations': []
-        }
+            return performance_data
         
-        # 과거 결과 로드
-        past_results = self._load_past_results(days_back)
+        frame = self._performance_frame(past_results, days_back)
+        analytics = analyze_performance(frame)
+        performance_data['analytics'] = analytics
         
-        if not past_results:
-            print(f"최근 {days_back}일간의 과거 데이터가 없습니다.")
+        evaluated = frame.dropna(subset=['return'])
+        if evaluated.empty:
             return performance_data
-            
-        # 각 주식별 성과 분석
-        for date, result in past_results.items():
-            if 'top_10_stocks' in result:
-                for stock_info in result['top_10_stocks']:
-                    stock_name = stock_info['stock_name']
-                    predicted_score = stock_info['score']
-                    
-                    # 실제 주가 변동 계산 - 한국투자증권 API 사용
-                    actual_return = 0.0
-                    
-                    if self.use_kis_api and self.stock_manager:
-                        try:
-                            # 해당 종목의 실제 수익률 계산
-                            actual_return = self._generate_test_return(stock_name)
-                            print(f"✅ {stock_name} 실제 수익률: {actual_return:+.2f}%")
-                        except Exception as e:
-                            print(f"⚠️ {stock_name} KIS API 오류: {e}")
-                            # 테스트용 임시 데이터
-                            actual_return = self._generate_test_return(stock_name)
-                    else:
-                        # 테스트용 임시 데이터
-                        actual_return = self._generate_test_return(stock_name)
-                    
-                    performance_data['stock_performance'].append({
-                        'date': date,
-                        'stock': stock_name,
-                        'predicted_score': predicted_score,
-                        'actual_return': actual_return,
-                        'rank': stock_info['rank'],
-                        'region': stock_info.get('region', '기타')
-                    })
-        
-            # 상관관계 분석
-            df_performance = pd.DataFrame(performance_data['stock_performance'])
-            if not df_performance.empty:
-                correlation = df_performance[['predicted_score', 'actual_return']].corr()
-                if not correlation.empty and len(correlation) > 1:
-                    corr_value = correlation.iloc[0, 1]
-                else:
-                    corr_value = 0
-                performance_data['correlation_analysis'] = {
-                    'correlation_coefficient': corr_value,
-                    'interpretation': self._interpret_correlation(corr_value)
-                }
-            
-            # 정확도 지표
-            correct_predictions = len(df_performance[df_performance['actual_return'] > 0])
-            total_predictions = len(df_performance)
-            performance_data['accuracy_metrics'] = {
-                'accuracy_rate': (correct_predictions / total_predictions * 100) if total_predictions > 0 else 0,
-                'avg_predicted_score': df_performance['predicted_score'].mean(),
-                'avg_actual_return': df_performance['actual_return'].mean(),
-                'total_predictions': total_predictions,
-                'correct_predictions': correct_predictions
+        
+        # 차트/보고서용 기존 형식 유지
+        df_performance = evaluated.rename(columns={'score': 'predicted_score', 'return': 'actual_return'})
+        performance_data['stock_performance'] = df_performance[
+            ['date', 'stock', 'predicted_score', 'actual_return', 'rank', 'region']
+        ].to_dict('records')
+        
+        corr_value = analytics['pearson'] if not np.isnan(analytics['pearson']) else 0.0
+        performance_data['correlation_analysis'] = {
+            'correlation_coefficient': corr_value,
+            'spearman': analytics['spearman'],
+            'rank_ic': analytics['rank_ic_mean'],
+            'interpretation': self._interpret_correlation(corr_value)
+        }
+        performance_data['accuracy_metrics'] = {
+            'accuracy_rate': analytics['hit_rate'],
+            'avg_predicted_score': analytics['mean_score'],
+            'avg_actual_return': analytics['mean_return'],
+            'total_predictions': analytics['evaluated_predictions'],
+            'correct_predictions': analytics['correct_predictions'],
+            'confidence_intervals': analytics['confidence_intervals']
+        }
+        
+        # 투자 추천
+        top_performers = df_performance.nlargest(5, 'actual_return')
+        performance_data['recommendations'] = [
+            {
+                'rank': i,
+                'stock': row['stock'],
+                'actual_return': row['actual_return'],
+                'predicted_score': row['predicted_score'],
+                'region': row['region'],
+                'recommendation': '강력 매수 추천' if row['actual_return'] > 5 else '매수 고려'
             }
-            
-            # 투자 추천
-            top_performers = df_performance.nlargest(5, 'actual_return')
-            performance_data['recommendations'] = [
-                {
-                    'rank': i + 1,
-                    'stock': row['stock'],
-                    'actual_return': row['actual_return'],
-                    'predicted_score': row['predicted_score'],
-                    'region': row['region'],
-                    'recommendation': '강력 매수 추천' if row['actual_return'] > 5 else '매수 고려'
-                }
-                for i, (_, row) in enumerate(top_performers.iterrows())
-            ]
+            for i, row in enumerate(top_performers.to_dict('records'), 1)
+        ]
         
         return performance_data
-    
 
-    
+    def _performance_frame(self, past_results: Dict, days_back: int) -> pd.DataFrame:
+        """과거 랭킹에 다음 거래일 수익률을 붙인 분석용 long 형식 DataFrame"""
+        rankings = rankings_frame(past_results)
+        stock_manager = self.stock_manager or StockDataManager(self.kis_api)
+        sectors = build_sector_map(self.stock_analyzer.stock_keywords)
+        codes = sorted({code for code in map(stock_manager.get_stock_code, rankings['stock_name'].unique()) if code})
+        
+        prices = self._load_backtest_prices(codes, rankings['date'].min(), days_back) if len(rankings) else None
+        if prices is None or prices.empty:
+            if len(rankings):
+                print("⚠️ 일봉 데이터가 없어 수익률을 계산할 수 없습니다. backfill_prices.py로 먼저 백필해주세요.")
+            details = rankings.assign(sector=rankings['stock_name'].map(lambda name: sectors.get(name, '기타')),
+                                      return_1d=np.nan)
+        else:
+            details = Backtester(prices, stock_manager.get_stock_code, sectors).attach_returns(rankings)
+        
+        frame = performance_frame(details)
+        self.ranking_store.rollups.record_returns(frame)
+        return frame
 
+    def performance_report(self, days_back: int = 7) -> Dict:
+        """기간 성과 분석 실행 및 출력 (weekly / monthly 모드)"""
+        performance_data = self.analyze_weekly_performance(days_back)
+        if performance_data['analytics']:
+            label = '주간' if days_back <= 7 else '월간' if days_back <= 31 else f'최근 {days_back}일'
+            print_performance_report(performance_data['analytics'],
+                                     f"{label} 예측 성과 분석 ({performance_data['analysis_period']})")
+        return performance_data
     
     def _interpret_correlation(self, correlation: float) -> str:
         """상관계수 해석"""
@@ -572,6 +757,9 @@ class EnhancedStockRankingSystem:
             print("시각화할 데이터가 없습니다.")
             return
         
+        # 그래프를 그릴 때만 로드 (단일 실행 / 스케줄 실행의 시작 시간 단축)
+        import matplotlib.pyplot as plt
+        
         # 한글 폰트 설정
         plt.rcParams['font.family'] = 'Arial Unicode MS'  # macOS
         plt.rcParams['axes.unicode_minus'] = False
@@ -621,13 +809,13 @@ class EnhancedStockRankingSystem:
         
         # 3. 예측 정확도 파이차트
         ax3 = axes[1, 0]
-        metrics = performance_data['accuracy_metrics']
-        correct = metrics['correct_predictions']
-        incorrect = metrics['total_predictions'] - correct
+        accuracy = performance_data['accuracy_metrics']
+        correct = accuracy['correct_predictions']
+        incorrect = accuracy['total_predictions'] - correct
         
         ax3.pie([correct, incorrect], [f'정확 ({correct})', f'오류 ({incorrect})'],
                 colors=['lightgreen', 'lightcoral'], autopct='%1.1f%%', startangle=90)
-        ax3.set_title(f'예측 정확도: {metrics["accuracy_rate"]:.1f}%')
+        ax3.set_title(f'예측 정확도: {accuracy["accuracy_rate"]:.1f}%')
         
         # 4. 일별 성과 추이
         ax4 = axes[1, 1]
@@ -672,11 +860,15 @@ class EnhancedStockRankingSystem:
         print(f"   • 해석: {corr_analysis['interpretation']}")
         
         # 정확도 지표
-        metrics = performance_data['accuracy_metrics']
+        accuracy = performance_data['accuracy_metrics']
         print(f"\n🎯 예측 정확도 지표:")
-        print(f"   • 정확도: {metrics['accuracy_rate']:.1f}% ({metrics['correct_predictions']}/{metrics['total_predictions']})")
-        print(f"   • 평균 예측 점수: {metrics['avg_predicted_score']:.2f}")
-        print(f"   • 평균 실제 수익률: {metrics['avg_actual_return']:.2f}%")
+        print(f"   • 정확도: {accuracy['accuracy_rate']:.1f}% ({accuracy['correct_predictions']}/{accuracy['total_predictions']})")
+        for ci in accuracy.get('confidence_intervals', []):
+            if 'accuracy' in ci:
+                print(f"     {(1 - ci['alpha']) * 100:.0f}% 구간 ({ci['method']}): "
+                      f"[{ci['accuracy']['low']:.1f}%, {ci['accuracy']['high']:.1f}%]")
+        print(f"   • 평균 예측 점수: {accuracy['avg_predicted_score']:.2f}")
+        print(f"   • 평균 실제 수익률: {accuracy['avg_actual_return']:.2f}%")
         
         # 상위 추천 주식
         print(f"\n🏆 주간 실적 상위 추천 주식:")
@@ -748,11 +940,11 @@ class EnhancedStockRankingSystem:
         print("\n🎯 주간 예측 정확도")
         print("="*40)
         
-        metrics = performance_data['accuracy_metrics']
-        correct = metrics['correct_predictions']
-        total = metrics['total_predictions']
+        accuracy = performance_data['accuracy_metrics']
+        correct = accuracy['correct_predictions']
+        total = accuracy['total_predictions']
         wrong = total - correct
-        accuracy_rate = metrics['accuracy_rate']
+        accuracy_rate = accuracy['accuracy_rate']
         
         # 텍스트 파이차트
         correct_bar = "■" * int(correct / total * 20)
@@ -1,5 +1,4 @@
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -7,8 +6,9 @@ import json
 import re
 from typing import List, Dict, Tuple, Optional
 import logging
-import yfinance as yf
 import random
+from metrics import instrument_session, track_call
+from tracing import traced
 
 class GlobalNewsCollector:
     def __init__(self):
@@ -23,7 +23,9 @@ class GlobalNewsCollector:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        instrument_session(self.session, 'crawl', endpoint='host')
 
+    @traced('collector')
     def collect_global_financial_news(self) -> List[Dict]:
         """글로벌 금융 뉴스 수집"""
         # 실제 환경에서는 웹크롤링 구현 필요
@@ -144,9 +146,12 @@ class GlobalNewsCollector:
         selected_count = random.randint(6, min(10, len(sample_news)))
         return random.sample(sample_news, selected_count)
 
+    @traced('collector')
     def collect_global_market_data(self) -> Dict:
         """글로벌 시장 데이터 수집 (개선된 안정성)"""
         try:
+            import yfinance as yf
+            
             # API 호출 개선 - 더 안정적인 방식으로 시도
             tickers = {
                 'sp500': '^GSPC',
@@ -166,7 +171,10 @@ class GlobalNewsCollector:
                     success = False
                     for period in ['5d', '1mo', '3mo']:
                         try:
-                            hist = ticker.history(period=period)
+                            with track_call('yfinance', ticker_symbol) as call:
+                                hist = ticker.history(period=period)
+                                if hist is None or hist.empty:
+                                    call['status'] = 'empty'
                             
                             if hist is not None and len(hist) > 1 and 'Close' in hist.columns:
                                 current = hist['Close'].iloc[-1]
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+롤링 순위 IC 추적기
+날짜별 (점수 순위, 다음 거래일 수익률 순위) 충분통계만 저장해 두고
+새 날짜가 들어올 때마다 20/60일 창 합계를 더하고 빼는 방식으로 O(1) 갱신
+
+상태는 랭킹 저장소 옆 data/ic_state.json, 일별 결과는 data/ic_series.jsonl에 한 줄씩 추가
+"""
+
+import os
+import json
+import argparse
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence
+from data_paths import data_path
+
+DEFAULT_WINDOWS = (20, 60)
+MIN_NAMES = 3
+SUM_KEYS = ('sxy', 'sxx', 'syy', 'ic', 'ic2', 'days')
+
+
+def day_statistics(scores: Sequence[float], returns: Sequence[float]) -> Optional[Dict]:
+    """
+    하루치 단면 충분통계 (날짜 안에서 중심화한 순위의 곱 합계)
+
+    Args:
+        scores: 종목별 예측 점수
+        returns: 종목별 다음 거래일 수익률 (%)
+
+    Returns:
+        {'n', 'sxy', 'sxx', 'syy', 'ic'} (유효 종목이 MIN_NAMES 미만이거나 분산이 0이면 None)
+    """
+    frame = pd.DataFrame({'score': scores, 'return': returns}).dropna()
+    if len(frame) < MIN_NAMES:
+        return None
+    x = frame['score'].rank().to_numpy()
+    y = frame['return'].rank().to_numpy()
+    x, y = x - x.mean(), y - y.mean()
+    sxy, sxx, syy = float(x @ y), float(x @ x), float(y @ y)
+    if sxx <= 0 or syy <= 0:
+        return None
+    return {'n': len(frame), 'sxy': sxy, 'sxx': sxx, 'syy': syy, 'ic': sxy / np.sqrt(sxx * syy)}
+
+
+class RollingICTracker:
+    """20/60일 롤링 순위 IC 증분 추적기"""
+
+    def __init__(self, state_path: Optional[str] = None, series_path: Optional[str] = None,
+                 windows: Sequence[int] = DEFAULT_WINDOWS):
+        """
+        Args:
+            state_path: 상태 JSON 경로 (기본: data/ic_state.json)
+            series_path: 일별 결과 JSON lines 경로 (기본: data/ic_series.jsonl)
+            windows: 롤링 창 길이 (거래일 수)
+        """
+        self.state_path = state_path or data_path("ic_state.json")
+        self.series_path = series_path or data_path("ic_series.jsonl")
+        self.windows = sorted(int(w) for w in windows)
+        self.days: List[Dict] = []  # 가장 긴 창 길이만큼의 최근 일별 통계
+        self.sums = {str(w): dict.fromkeys(SUM_KEYS, 0.0) for w in self.windows}
+        self.last_date: Optional[str] = None
+        self._load()
+
+    def _load(self) -> None:
+        """저장된 상태 로드 (창 설정이 다르면 남아 있는 일별 통계로 합계 재계산)"""
+        if not os.path.exists(self.state_path):
+            return
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        self.days = state.get('days', [])[-self.windows[-1]:]
+        self.last_date = state.get('last_date')
+        if state.get('windows') == self.windows:
+            self.sums = state['sums']
+        else:
+            for w in self.windows:
+                for day in self.days[-w:]:
+                    self._add(str(w), day, 1)
+
+    def save(self) -> None:
+        """상태 저장 (임시 파일에 쓴 뒤 교체)"""
+        state = {'windows': self.windows, 'last_date': self.last_date, 'sums': self.sums, 'days': self.days}
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+    def _add(self, window: str, day: Dict, sign: int) -> None:
+        sums = self.sums[window]
+        sums['sxy'] += sign * day['sxy']
+        sums['sxx'] += sign * day['sxx']
+        sums['syy'] += sign * day['syy']
+        sums['ic'] += sign * day['ic']
+        sums['ic2'] += sign * day['ic'] ** 2
+        sums['days'] += sign
+
+    def update(self, date: str, scores: Sequence[float], returns: Sequence[float]) -> Optional[Dict]:
+        """
+        새 날짜 하나 반영 (이미 반영한 날짜 이전/같은 날짜는 무시)
+
+        Args:
+            date: 예측일 (YYYY-MM-DD)
+            scores: 종목별 예측 점수
+            returns: 종목별 다음 거래일 수익률 (%)
+
+        Returns:
+            그날의 IC와 창별 롤링 지표 (반영하지 않았으면 None)
+        """
+        if self.last_date and date <= self.last_date:
+            return None
+        day = day_statistics(scores, returns)
+        if day is None:
+            return None
+        day['date'] = date
+
+        # 새 날짜를 더하고 각 창에서 밀려나는 날짜를 빼는 것으로 끝 (창 길이와 무관한 상수 시간)
+        for w in self.windows:
+            self._add(str(w), day, 1)
+            if len(self.days) >= w:
+                self._add(str(w), self.days[-w], -1)
+        self.days.append(day)
+        del self.days[:-self.windows[-1]]
+        self.last_date = date
+
+        row = {'date': date, 'n': day['n'], 'ic': round(day['ic'], 6)}
+        row.update(self.snapshot())
+        with open(self.series_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return row
+
+    def snapshot(self) -> Dict:
+        """
+        창별 현재 지표
+
+        ic_{w}: 창 안 일별 IC 평균, ic_t_{w}: 평균 IC의 t 통계량,
+        pooled_ic_{w}: 날짜별 중심화 순위를 창 전체로 합친 IC
+        """
+        metrics = {}
+        for w in self.windows:
+            sums = self.sums[str(w)]
+            days = sums['days']
+            mean = sums['ic'] / days if days else float('nan')
+            var = (sums['ic2'] - days * mean * mean) / (days - 1) if days > 1 else float('nan')
+            denom = np.sqrt(sums['sxx'] * sums['syy'])
+            metrics[f'ic_{w}'] = round(mean, 6) if days else None
+            metrics[f'ic_t_{w}'] = round(mean / np.sqrt(var / days), 4) if days > 1 and var > 0 else None
+            metrics[f'pooled_ic_{w}'] = round(sums['sxy'] / denom, 6) if denom > 0 else None
+            metrics[f'days_{w}'] = int(days)
+        return metrics
+
+    def update_from_frame(self, frame: pd.DataFrame) -> List[Dict]:
+        """
+        performance_frame 형식(date / score / return) 데이터에서 아직 반영하지 않은 날짜를 순서대로 반영
+
+        수익률이 아직 없는 최근 날짜(다음 거래일 미도래)는 남겨 두어 다음 실행에서 반영하고,
+        그보다 앞선 날짜 중 평가 가능한 종목이 부족한 날짜는 건너뛴다.
+        """
+        pending = frame[frame['date'] > self.last_date] if self.last_date else frame
+        evaluated = pending['return'].notna().groupby(pending['date']).sum()
+        ready = evaluated[evaluated >= MIN_NAMES].index
+        if ready.empty:
+            return []
+
+        rows = []
+        for date, group in pending[pending['date'] <= ready.max()].groupby('date', sort=True):
+            row = self.update(date, group['score'].to_numpy(dtype=float), group['return'].to_numpy(dtype=float))
+            if row:
+                rows.append(row)
+        return rows
+
+    def history(self, limit: Optional[int] = None) -> List[Dict]:
+        """기록된 일별 결과 (JSON lines)"""
+        if not os.path.exists(self.series_path):
+            return []
+        with open(self.series_path, 'r', encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+        return rows[-limit:] if limit else rows
+
+
+def load_realized_frame(start: Optional[str] = None, end: Optional[str] = None) -> pd.DataFrame:
+    """랭킹 저장소와 로컬 일봉 저장소로 (date, stock, score, return) 프레임 생성 (네트워크 미사용)"""
+    from backtest import Backtester, rankings_frame
+    from kis_api import StockDataManager
+    from performance_analytics import performance_frame
+    from price_store import PriceBarStore
+    from ranking_store import RankingStore
+
+    store = RankingStore()
+    try:
+        rankings = rankings_frame(store.range(start, end))
+    finally:
+        store.close()
+    if rankings.empty:
+        return pd.DataFrame(columns=['date', 'stock', 'rank', 'score', 'return', 'region', 'sector'])
+
+    resolve_code = StockDataManager(None).get_stock_code
+    codes = sorted({code for code in map(resolve_code, rankings['stock_name'].unique()) if code})
+    prices = PriceBarStore()
+    try:
+        matrix = prices.price_matrix(codes, start=(pd.Timestamp(rankings['date'].min()) - pd.Timedelta(days=10)).strftime('%Y-%m-%d'))
+    finally:
+        prices.close()
+    if matrix.empty:
+        return performance_frame(rankings.assign(return_1d=np.nan))
+    return performance_frame(Backtester(matrix, resolve_code).attach_returns(rankings))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='롤링 순위 IC 추적기')
+    parser.add_argument('--update', action='store_true', help='랭킹/일봉 저장소에서 새 날짜 반영')
+    parser.add_argument('--windows', default='20,60', help='롤링 창 길이 (쉼표 구분)')
+    parser.add_argument('--show', type=int, default=10, help='최근 N일 표시')
+    parser.add_argument('--json', action='store_true', help='JSON으로 출력')
+    args = parser.parse_args()
+
+    tracker = RollingICTracker(windows=[int(w) for w in args.windows.split(',')])
+
+    new_rows = []
+    if args.update:
+        new_rows = tracker.update_from_frame(load_realized_frame(start=tracker.last_date))
+        tracker.save()
+
+    if args.json:
+        print(json.dumps({'updated': new_rows, 'latest': tracker.snapshot(), 'last_date': tracker.last_date},
+                         ensure_ascii=False, indent=2))
+        return
+
+    if args.update:
+        print(f"🔄 새로 반영한 날짜: {len(new_rows)}일 (마지막: {tracker.last_date or '-'})")
+    rows = tracker.history(args.show)
+    if not rows:
+        print("❌ 기록된 IC가 없습니다. --update로 먼저 반영해주세요.")
+        return
+    print(f"\n📉 일별 순위 IC (최근 {len(rows)}일)")
+    for row in rows:
+        rolling = ' | '.join(
+            f"{w}일 {row[f'ic_{w}']:+.3f}" + (f" (t {row[f'ic_t_{w}']:+.2f})" if row.get(f'ic_t_{w}') is not None else '')
+            for w in tracker.windows if row.get(f'ic_{w}') is not None
+        )
+        print(f"   {row['date']}: IC {row['ic']:+.3f} ({row['n']}종목) | {rolling}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+다음날 오전 단타 전략 시뮬레이터 (분봉 기반, 벡터화)
+투자 전략(09:00~09:30 진입, +5~10% 목표, -3%/-5% 손절, 11:30 전 청산)을
+모든 날짜·모든 추천 종목에 대해 한 번에 평가하고
+목표/손절 조합 그리드 전체를 한 번의 연산으로 비교
+
+- 진입 후 고가/저가 수익률의 누적 최대/최소를 구하면 시간축이 단조가 되므로
+  "처음으로 목표(손절)에 닿은 분" = "누적값이 기준에 못 미친 분의 개수"
+- 같은 분봉에서 목표와 손절이 모두 닿으면 보수적으로 손절로 처리
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence
+
+SESSION_OPEN = "09:00"
+SESSION_MINUTES = 391  # 09:00 ~ 15:30
+
+DEFAULT_TARGETS = (5.0, 10.0)   # 목표수익 (%)
+DEFAULT_STOPS = (3.0, 5.0)      # 손절 (%, 양수로 입력)
+DEFAULT_COST_PCT = 0.23         # 왕복 수수료 0.015% × 2 + 매도 증권거래세 0.20%
+
+# 청산 유형
+EXIT_NONE, EXIT_TARGET, EXIT_STOP, EXIT_TIME = 0, 1, 2, 3
+
+OHLC = ('open', 'high', 'low', 'close')
+
+
+def minute_index(time_text: str) -> int:
+    """'HH:MM' → 09:00 기준 분 인덱스"""
+    hour, minute = map(int, time_text.split(':'))
+    open_hour, open_minute = map(int, SESSION_OPEN.split(':'))
+    return (hour - open_hour) * 60 + (minute - open_minute)
+
+
+class MinuteBarCube:
+    """추천 종목(날짜, 종목코드) × 분 × OHLC 3차원 가격 배열"""
+
+    def __init__(self, picks: pd.DataFrame, bars: np.ndarray):
+        """
+        Args:
+            picks: date / code 컬럼 DataFrame (bars의 첫 번째 축 순서)
+            bars: (추천 수, SESSION_MINUTES, 4) 배열, 거래 없는 분은 NaN
+        """
+        self.picks = picks.reset_index(drop=True)
+        self.bars = bars
+
+    @classmethod
+    def from_bars(cls, minute_bars: pd.DataFrame) -> 'MinuteBarCube':
+        """
+        long 형식 분봉 DataFrame으로 배열 생성
+
+        Args:
+            minute_bars: date / code / time(HH:MM 또는 datetime) / open / high / low / close 컬럼
+
+        Returns:
+            MinuteBarCube
+        """
+        frame = minute_bars.copy()
+        frame['date'] = pd.to_datetime(frame['date']).dt.strftime('%Y-%m-%d')
+        frame['code'] = frame['code'].astype(str)
+
+        times = pd.to_datetime(frame['time'].astype(str), format='mixed')
+        open_hour, open_minute = map(int, SESSION_OPEN.split(':'))
+        frame['minute'] = (times.dt.hour - open_hour) * 60 + (times.dt.minute - open_minute)
+        frame = frame[(frame['minute'] >= 0) & (frame['minute'] < SESSION_MINUTES)]
+
+        pick_id = frame.groupby(['date', 'code'], sort=True).ngroup().to_numpy()
+        picks = frame[['date', 'code']].drop_duplicates().sort_values(['date', 'code'])
+
+        bars = np.full((len(picks), SESSION_MINUTES, len(OHLC)), np.nan)
+        bars[pick_id, frame['minute'].to_numpy()] = frame[list(OHLC)].to_numpy(dtype=np.float64)
+        return cls(picks, bars)
+
+    def __len__(self) -> int:
+        return len(self.picks)
+
+
+class IntradaySimulator:
+    """목표/손절 그리드 일괄 평가 시뮬레이터"""
+
+    def __init__(self, entry_time: str = "09:00", entry_deadline: str = "09:30",
+                 exit_time: str = "11:30", cost_pct: float = DEFAULT_COST_PCT):
+        """
+        Args:
+            entry_time: 진입 시각 (해당 분봉 시가로 매수)
+            entry_deadline: 진입 시각에 거래가 없을 때 기다리는 마지막 시각
+            exit_time: 목표/손절에 닿지 않으면 이 분봉 종가로 청산
+            cost_pct: 왕복 거래비용 (%)
+        """
+        self.entry_index = minute_index(entry_time)
+        self.deadline_index = minute_index(entry_deadline)
+        self.exit_index = minute_index(exit_time)
+        self.cost_pct = cost_pct
+
+    def _entries(self, bars: np.ndarray):
+        """진입 분 인덱스와 진입가 (진입 못 하면 가격 NaN)"""
+        window = bars[:, self.entry_index:self.deadline_index + 1, 0]
+        traded = ~np.isnan(window)
+        offset = traded.argmax(axis=1)
+        entered = traded.any(axis=1)
+        entry_idx = self.entry_index + offset
+        entry_price = np.where(entered, bars[np.arange(len(bars)), entry_idx, 0], np.nan)
+        return entry_idx, entry_price
+
+    @staticmethod
+    def _first_hits(path: np.ndarray, levels: np.ndarray) -> np.ndarray:
+        """
+        단조 증가 경로가 각 기준 이상이 되는 첫 인덱스 (없으면 경로 길이)
+
+        Args:
+            path: (추천 수, 분) 누적 최대 경로 (NaN 없음)
+            levels: (그리드,) 기준값
+
+        Returns:
+            (추천 수, 그리드) 인덱스
+        """
+        return (path[:, :, None] < levels[None, None, :]).sum(axis=1)
+
+    def simulate(self, cube: MinuteBarCube, targets: Sequence[float] = DEFAULT_TARGETS,
+                 stops: Sequence[float] = DEFAULT_STOPS, chunk_size: int = 512) -> Dict[str, np.ndarray]:
+        """
+        전체 추천 × 목표 × 손절 조합 시뮬레이션
+
+        Args:
+            cube: 분봉 배열
+            targets: 목표수익률 그리드 (%)
+            stops: 손절률 그리드 (%, 양수)
+            chunk_size: 메모리 사용량 제한을 위한 추천 묶음 크기
+
+        Returns:
+            returns: (추천, 목표, 손절) 비용 차감 수익률 (%), 미진입은 NaN
+            exit_type: 같은 모양의 청산 유형 (EXIT_TARGET / EXIT_STOP / EXIT_TIME / EXIT_NONE)
+            exit_minute: 같은 모양의 청산 분 인덱스 (09:00 기준)
+        """
+        targets = np.asarray(targets, dtype=np.float64)
+        stops = np.asarray(stops, dtype=np.float64)
+        n = len(cube)
+        shape = (n, len(targets), len(stops))
+
+        returns = np.full(shape, np.nan)
+        exit_type = np.full(shape, EXIT_NONE, dtype=np.int8)
+        exit_minute = np.full(shape, -1, dtype=np.int16)
+
+        for start in range(0, n, chunk_size):
+            part = slice(start, min(start + chunk_size, n))
+            r, e, m = self._simulate_chunk(cube.bars[part], targets, stops)
+            returns[part], exit_type[part], exit_minute[part] = r, e, m
+
+        return {'returns': returns, 'exit_type': exit_type, 'exit_minute': exit_minute,
+                'targets': targets, 'stops': stops}
+
+    def _simulate_chunk(self, bars: np.ndarray, targets: np.ndarray, stops: np.ndarray):
+        n = len(bars)
+        rows = np.arange(n)
+        entry_idx, entry_price = self._entries(bars)
+        entered = ~np.isnan(entry_price)
+
+        # 진입 분부터 청산 시각까지의 경로만 남기고 진입가 대비 수익률(%)로 변환
+        minutes = np.arange(self.exit_index + 1)
+        active = minutes[None, :] >= entry_idx[:, None]
+        segment = bars[:, :self.exit_index + 1, :]
+        base = entry_price[:, None]
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            high_ret = np.where(active, (segment[:, :, 1] / base - 1) * 100, np.nan)
+            low_ret = np.where(active, (segment[:, :, 2] / base - 1) * 100, np.nan)
+            open_ret = (segment[:, :, 0] / base - 1) * 100
+            close_ret = np.where(active, (segment[:, :, 3] / base - 1) * 100, np.nan)
+
+        # 누적 최대 고가 / 누적 최소 저가 → 시간축 단조 경로
+        best = np.fmax.accumulate(np.nan_to_num(high_ret, nan=-np.inf), axis=1)
+        worst = np.fmax.accumulate(np.nan_to_num(-low_ret, nan=-np.inf), axis=1)
+
+        length = minutes.size
+        target_hit = self._first_hits(best, targets)       # (n, 목표)
+        stop_hit = self._first_hits(worst, stops)          # (n, 손절)
+
+        t_hit = target_hit[:, :, None]
+        s_hit = stop_hit[:, None, :]
+        is_stop = (s_hit < length) & (s_hit <= t_hit)      # 같은 분이면 손절 우선
+        is_target = (t_hit < length) & ~is_stop
+
+        # 갭으로 기준을 뛰어넘은 경우 해당 분봉 시가에 체결
+        t_open = open_ret[rows[:, None], np.minimum(target_hit, length - 1)]
+        s_open = open_ret[rows[:, None], np.minimum(stop_hit, length - 1)]
+        target_fill = np.fmax(targets[None, :], np.nan_to_num(t_open, nan=-np.inf))
+        stop_fill = np.fmin(-stops[None, :], np.nan_to_num(s_open, nan=np.inf))
+
+        # 시간 청산: 청산 시각까지 마지막으로 거래된 분봉 종가
+        last_traded = np.where(~np.isnan(close_ret), minutes[None, :], -1).max(axis=1)
+        time_fill = close_ret[rows, np.maximum(last_traded, 0)]
+
+        gross = np.where(is_stop, stop_fill[:, None, :],
+                         np.where(is_target, target_fill[:, :, None], time_fill[:, None, None]))
+        kind = np.where(is_stop, EXIT_STOP, np.where(is_target, EXIT_TARGET, EXIT_TIME)).astype(np.int8)
+        minute = np.where(is_stop, s_hit, np.where(is_target, t_hit, last_traded[:, None, None]))
+
+        valid = entered[:, None, None]
+        return (np.where(valid, gross - self.cost_pct, np.nan),
+                np.where(valid, kind, EXIT_NONE).astype(np.int8),
+                np.where(valid, minute, -1).astype(np.int16))
+
+    def grid_summary(self, result: Dict[str, np.ndarray], picks: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """
+        목표 × 손절 조합별 성과 요약
+
+        Args:
+            result: simulate() 결과
+            picks: 추천 목록 (date 컬럼이 있으면 일별 동일가중 수익률도 계산)
+
+        Returns:
+            target / stop / trades / mean_return / win_rate / target_rate / stop_rate / time_exit_rate
+            (/ daily_mean_return / cumulative_return) 컬럼 DataFrame, 평균 수익률 내림차순
+        """
+        returns = result['returns']
+        exit_type = result['exit_type']
+        entered = ~np.isnan(returns)
+        trades = entered.sum(axis=0)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            summary = {
+                'trades': trades,
+                'mean_return': np.nansum(returns, axis=0) / trades,
+                'win_rate': (returns > 0).sum(axis=0) / trades * 100,
+                'target_rate': (exit_type == EXIT_TARGET).sum(axis=0) / trades * 100,
+                'stop_rate': (exit_type == EXIT_STOP).sum(axis=0) / trades * 100,
+                'time_exit_rate': (exit_type == EXIT_TIME).sum(axis=0) / trades * 100,
+            }
+
+        targets, stops = np.meshgrid(result['targets'], result['stops'], indexing='ij')
+        frame = pd.DataFrame({'target': targets.ravel(), 'stop': stops.ravel()})
+        for column, values in summary.items():
+            frame[column] = np.asarray(values).ravel()
+
+        if picks is not None and 'date' in picks.columns and len(picks):
+            # 날짜별 동일가중 평균 → 누적 수익률
+            day_id, days = pd.factorize(picks['date'])
+            flat = returns.reshape(len(returns), -1)
+            sums = np.zeros((len(days), flat.shape[1]))
+            counts = np.zeros_like(sums)
+            np.add.at(sums, day_id, np.nan_to_num(flat))
+            np.add.at(counts, day_id, ~np.isnan(flat))
+            with np.errstate(invalid='ignore', divide='ignore'):
+                daily = np.where(counts > 0, sums / counts, 0.0)
+            frame['daily_mean_return'] = daily.mean(axis=0)
+            frame['cumulative_return'] = (np.prod(1 + daily / 100, axis=0) - 1) * 100
+
+        return frame.sort_values('mean_return', ascending=False).reset_index(drop=True)
+
+
+def _grid(values: Optional[Sequence[float]], value_range: Optional[Sequence[float]], default: Sequence[float]) -> np.ndarray:
+    """명령행 값 목록 또는 (시작, 끝, 간격) 범위로 그리드 생성"""
+    if value_range:
+        start, stop, step = value_range
+        return np.round(np.arange(start, stop + step / 2, step), 4)
+    return np.asarray(values or default, dtype=np.float64)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='다음날 오전 단타 전략 분봉 시뮬레이터')
+    parser.add_argument('minute_bars', help='분봉 CSV (date, code, time, open, high, low, close)')
+    parser.add_argument('--targets', type=float, nargs='*', help='목표수익률 목록 (%%)')
+    parser.add_argument('--stops', type=float, nargs='*', help='손절률 목록 (%%, 양수)')
+    parser.add_argument('--target-range', type=float, nargs=3, metavar=('START', 'END', 'STEP'), help='목표수익률 범위')
+    parser.add_argument('--stop-range', type=float, nargs=3, metavar=('START', 'END', 'STEP'), help='손절률 범위')
+    parser.add_argument('--entry', default='09:00', help='진입 시각')
+    parser.add_argument('--entry-deadline', default='09:30', help='진입 마감 시각')
+    parser.add_argument('--exit', default='11:30', help='시간 청산 시각')
+    parser.add_argument('--cost', type=float, default=DEFAULT_COST_PCT, help='왕복 거래비용 (%%)')
+    parser.add_argument('--top', type=int, default=10, help='출력할 상위 조합 수')
+
+    args = parser.parse_args()
+
+    cube = MinuteBarCube.from_bars(pd.read_csv(args.minute_bars, dtype={'code': str}))
+    targets = _grid(args.targets, args.target_range, DEFAULT_TARGETS)
+    stops = _grid(args.stops, args.stop_range, DEFAULT_STOPS)
+
+    simulator = IntradaySimulator(args.entry, args.entry_deadline, args.exit, args.cost)
+    print(f"⏱️ {cube.picks['date'].nunique()}일 × 추천 {len(cube)}건, 목표 {len(targets)}개 × 손절 {len(stops)}개 조합 평가")
+
+    result = simulator.simulate(cube, targets, stops)
+    summary = simulator.grid_summary(result, cube.picks)
+
+    print(f"\n🏆 평균 수익률 상위 {args.top}개 조합 (비용 {args.cost}% 차감):")
+    for row in summary.head(args.top).itertuples(index=False):
+        print(f"   목표 +{row.target:.1f}% / 손절 -{row.stop:.1f}%: 평균 {row.mean_return:+.2f}% | "
+              f"승률 {row.win_rate:.1f}% | 목표 {row.target_rate:.1f}% · 손절 {row.stop_rate:.1f}% · "
+              f"시간청산 {row.time_exit_rate:.1f}% ({row.trades}건)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+당일 재실행 상태
+21:00 실행의 기사 집합과 중간 집계(stock_analyzer.NewsAggregate)를 data/intraday/YYYY-MM-DD.json에 남기고,
+같은 날 22:00 / 23:00 / 23:30 실행은 이를 불러와 새로 수집된 기사만 분석해 집계에 더한다.
+
+- 이미 본 기사는 본문을 다시 내려받지 않음 (NewsCollector.known_links)
+- 순위/트렌드는 합쳐진 집계에서 다시 계산 (종목 수만큼의 연산이라 사실상 무료)
+- 직전 실행 TOP 10과 비교한 신규 진입 / 이탈 / 순위 변동을 함께 남김
+
+사전(종목/감성/트렌드 키워드)이 바뀌면 저장된 집계를 버리고 처음부터 다시 분석한다.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import argparse
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+from data_paths import data_path
+from stock_analyzer import GLOBAL_TOPIC_TERMS, NewsAggregate, StockAnalyzer
+
+STATE_VERSION = 1
+
+
+def intraday_file(date: str) -> str:
+    """날짜별 상태 파일 경로 (data/intraday/YYYY-MM-DD.json)"""
+    return data_path("intraday", f"{date}.json")
+
+
+def article_key(news: Dict) -> str:
+    """기사 식별 키 (링크, 없으면 제목 — 제목이 수정된 같은 기사를 새 기사로 세지 않도록 링크 우선)"""
+    return hashlib.sha1((news.get('link') or news.get('title', '')).encode('utf-8')).hexdigest()[:16]
+
+
+def analysis_signature(analyzer: StockAnalyzer) -> str:
+    """중간 집계에 영향을 주는 사전의 해시 (점수 상수는 집계 후에 적용되므로 제외)"""
+    lexicon = {
+        'version': STATE_VERSION,
+        'stock_keywords': analyzer.stock_keywords,
+        'positive_words': analyzer.positive_words,
+        'negative_words': analyzer.negative_words,
+        'emerging_tech_keywords': analyzer.emerging_tech_keywords,
+        'influential_entities': analyzer.influential_entities,
+        'global_topic_terms': GLOBAL_TOPIC_TERMS,
+    }
+    return hashlib.sha1(json.dumps(lexicon, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+
+class IntradayState:
+    """하루치 기사 집합 + 중간 집계 + 직전 실행 TOP 10"""
+
+    def __init__(self, date: str, signature: str, path: Optional[str] = None):
+        """
+        Args:
+            date: 날짜 (YYYY-MM-DD)
+            signature: analysis_signature() 값
+            path: 상태 파일 경로 (기본: data/intraday/YYYY-MM-DD.json)
+        """
+        self.date = date
+        self.signature = signature
+        self.path = path or intraday_file(date)
+        self.articles: Dict[str, List[Dict]] = {'domestic': [], 'global': []}
+        self.keys: Set[str] = set()
+        self.aggregate = NewsAggregate()
+        self.ranking: List[Dict] = []  # 직전 실행 TOP 10 (rank, stock_name, score)
+        self.runs: List[Dict] = []
+
+    @classmethod
+    def load(cls, date: str, analyzer: StockAnalyzer, path: Optional[str] = None) -> 'IntradayState':
+        """
+        저장된 상태 로드 (없거나 사전이 바뀌었으면 빈 상태 — 직전 TOP 10은 비교용으로 유지)
+
+        Args:
+            date: 날짜 (YYYY-MM-DD)
+            analyzer: 현재 분석기 (사전 해시 비교용)
+            path: 상태 파일 경로
+        """
+        state = cls(date, analysis_signature(analyzer), path)
+        try:
+            with open(state.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return state
+        except (OSError, ValueError) as e:
+            logging.warning(f"당일 재실행 상태 로드 실패, 처음부터 분석합니다: {e}")
+            return state
+
+        state.ranking = saved.get('ranking', [])
+        state.runs = saved.get('runs', [])
+        if saved.get('signature') != state.signature:
+            logging.info("사전이 바뀌어 당일 중간 집계를 다시 계산합니다")
+            return state
+
+        state.articles = saved['articles']
+        state.keys = {article_key(news) for origin in state.articles.values() for news in origin}
+        state.aggregate = NewsAggregate(saved['aggregate'])
+        return state
+
+    def reset(self) -> None:
+        """기사/집계를 비우고 처음부터 분석 (직전 TOP 10과 실행 기록은 유지)"""
+        self.articles = {'domestic': [], 'global': []}
+        self.keys = set()
+        self.aggregate = NewsAggregate()
+
+    def links(self) -> Set[str]:
+        """이미 분석한 기사 링크 (수집기가 본문 추출을 건너뛰는 데 사용)"""
+        return {news['link'] for origin in self.articles.values() for news in origin if news.get('link')}
+
+    @property
+    def all_news(self) -> List[Dict]:
+        return self.articles['domestic'] + self.articles['global']
+
+    def add_articles(self, domestic_news: List[Dict], global_news: List[Dict]) -> List[Dict]:
+        """
+        새 기사만 기사 집합에 추가
+
+        Returns:
+            이번 실행에서 처음 본 기사 (국내 → 글로벌 순)
+        """
+        new_news = []
+        for origin, news_list in (('domestic', domestic_news), ('global', global_news)):
+            for news in news_list:
+                key = article_key(news)
+                if key in self.keys:
+                    continue
+                self.keys.add(key)
+                self.articles[origin].append(news)
+                new_news.append(news)
+        return new_news
+
+    def record(self, result: Dict, new_articles: int) -> None:
+        """실행 결과의 TOP 10과 실행 기록을 남기고 저장"""
+        self.ranking = [{'rank': stock['rank'], 'stock_name': stock['stock_name'], 'score': stock['score']}
+                        for stock in result['top_10_stocks']]
+        self.runs.append({'time': result.get('time', datetime.now().strftime('%H:%M:%S')),
+                          'articles': self.aggregate.article_count, 'new_articles': new_articles})
+        self.save()
+
+    def save(self) -> str:
+        """상태 저장 (임시 파일에 쓴 뒤 교체)"""
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'date': self.date,
+                'signature': self.signature,
+                'articles': self.articles,
+                'aggregate': self.aggregate.to_dict(),
+                'ranking': self.ranking,
+                'runs': self.runs,
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        return self.path
+
+
+def ranking_diff(previous: List[Dict], current: List[Dict]) -> Dict[str, List[Dict]]:
+    """
+    두 TOP 10 비교
+
+    Args:
+        previous: 직전 실행 TOP 10 (rank, stock_name)
+        current: 이번 실행 TOP 10
+
+    Returns:
+        {'entered': 신규 진입, 'exited': 이탈, 'moved': 순위 변동 (change > 0 이면 상승)}
+    """
+    before = {stock['stock_name']: stock['rank'] for stock in previous}
+    after = {stock['stock_name']: stock['rank'] for stock in current}
+    return {
+        'entered': [{'stock_name': name, 'rank': rank} for name, rank in after.items() if name not in before],
+        'exited': [{'stock_name': name, 'previous_rank': rank} for name, rank in before.items() if name not in after],
+        'moved': [{'stock_name': name, 'previous_rank': before[name], 'rank': rank, 'change': before[name] - rank}
+                  for name, rank in after.items() if name in before and before[name] != rank],
+    }
+
+
+def print_ranking_diff(diff: Dict[str, List[Dict]], since: Optional[str] = None) -> None:
+    """직전 실행 대비 TOP 10 변화 출력"""
+    print(f"\n🔄 직전 실행{f'({since})' if since else ''} 대비 TOP 10 변화")
+    if not any(diff.values()):
+        print("   변화 없음")
+        return
+    for stock in diff['entered']:
+        print(f"   🆕 {stock['stock_name']}: {stock['rank']}위로 진입")
+    for stock in diff['exited']:
+        print(f"   ⬇️ {stock['stock_name']}: {stock['previous_rank']}위에서 이탈")
+    for stock in diff['moved']:
+        arrow = "🔺" if stock['change'] > 0 else "🔻"
+        print(f"   {arrow} {stock['stock_name']}: {stock['previous_rank']}위 → {stock['rank']}위")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='당일 재실행 상태 조회')
+    parser.add_argument('--date', default=datetime.now().strftime('%Y-%m-%d'), help='날짜 (기본: 오늘)')
+    args = parser.parse_args()
+
+    path = intraday_file(args.date)
+    if not os.path.exists(path):
+        print(f"❌ 저장된 당일 상태가 없습니다: {path}")
+        return
+    with open(path, 'r', encoding='utf-8') as f:
+        saved = json.load(f)
+
+    print(f"📅 {saved['date']} 실행 {len(saved['runs'])}회, 기사 {saved['aggregate']['article_count']}개")
+    for run in saved['runs']:
+        print(f"   {run['time']}  새 기사 {run['new_articles']:3d}개 / 누적 {run['articles']}개")
+    print(f"\n🏆 마지막 TOP 10: {', '.join(stock['stock_name'] for stock in saved['ranking'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,28 +7,74 @@
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import pandas as pd
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import os
-from dotenv import load_dotenv
+import threading
+from returns_engine import PriceMatrix, ReturnsEngine
+from stock_master import load_stock_master
+from metrics import instrument_session
+
+# inquire-daily-itemchartprice는 호출당 최대 100건 → 140일(달력 기준, 20주 = 평일 100일) 구간이면 항상 100행 이하
+ITEMCHART_CHUNK_DAYS = 140
+
+_env_loaded = False
+
+
+def load_env() -> None:
+    """.env 파일을 환경 변수로 로드 (처음 호출할 때 한 번, python-dotenv가 없으면 기존 환경 변수만 사용)"""
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return
+    load_dotenv()
+
+
+class RateLimiter:
+    """초당 호출 수 제한 (스레드 안전)"""
+    
+    def __init__(self, max_calls_per_sec: float):
+        """
+        Args:
+            max_calls_per_sec: 초당 최대 호출 수
+        """
+        self.interval = 1.0 / max_calls_per_sec
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """다음 호출 가능 시점까지 대기"""
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
 
-# 환경 변수 로드
-load_dotenv()
 
 class KoreaInvestmentAPI:
     """한국투자증권 Open API 클래스"""
     
-    def __init__(self, is_demo: bool = True):
+    def __init__(self, is_demo: bool = True, base_url: Optional[str] = None):
         """
         API 초기화
         
         Args:
             is_demo: 모의투자 여부 (True: 모의투자, False: 실전)
+            base_url: API 주소 직접 지정 (로컬 에뮬레이터 등, 기본: KIS_BASE_URL 환경변수)
         """
         self.is_demo = is_demo
+        load_env()
         
         # API 엔드포인트 설정
         if is_demo:
@@ -40,11 +86,31 @@ class KoreaInvestmentAPI:
             self.app_key = os.getenv("KIS_APP_KEY", "")
             self.app_secret = os.getenv("KIS_APP_SECRET", "")
         
+        self.base_url = (base_url or os.getenv("KIS_BASE_URL") or self.base_url).rstrip("/")
+        
+        # 커넥션 재사용 (keep-alive 풀)
+        pool_size = int(os.getenv("KIS_POOL_SIZE", "10"))
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        instrument_session(self.session, 'kis')
+        
         self.access_token = None
         self.token_expires_at = None
+        # 토큰은 1분에 1회만 발급되므로 여러 스레드가 동시에 발급 요청하지 않도록 잠금
+        self._token_lock = threading.Lock()
+        
+        # 초당 호출 제한 (실전 20건, 모의투자 2건)
+        default_rate = "2" if is_demo else "20"
+        self.rate_limiter = RateLimiter(float(os.getenv("KIS_MAX_CALLS_PER_SEC", default_rate)))
         
     def _get_access_token(self) -> str:
-        """접근 토큰 발급"""
+        """접근 토큰 발급 (유효한 토큰이 있으면 재사용, 스레드 안전)"""
+        with self._token_lock:
+            return self._issue_access_token()
+    
+    def _issue_access_token(self) -> str:
         if self.access_token and self.token_expires_at and datetime.now() < self.token_expires_at:
             return self.access_token
             
@@ -57,7 +123,7 @@ class KoreaInvestmentAPI:
         }
         
         try:
-            response = requests.post(url, headers=headers, json=data)
+            response = self.session.post(url, headers=headers, json=data)
             response.raise_for_status()
             token_data = response.json()
             
@@ -71,15 +137,29 @@ class KoreaInvestmentAPI:
             print(f"❌ 토큰 발급 실패: {e}")
             raise
     
-    def _get_headers(self) -> Dict[str, str]:
-        """API 요청 헤더 생성"""
+    def get_approval_key(self) -> str:
+        """실시간(WebSocket) 접속키 발급"""
+        url = f"{self.base_url}/oauth2/Approval"
+        headers = {"Content-Type": "application/json"}
+        data = {
+            "grant_type": "client_credentials",
+            "appkey": self.app_key,
+            "secretkey": self.app_secret
+        }
+        
+        response = self.session.post(url, headers=headers, json=data)
+        response.raise_for_status()
+        return response.json()["approval_key"]
+    
+    def _get_headers(self, tr_id: str = "FHKST01010100") -> Dict[str, str]:
+        """API 요청 헤더 생성 (기본 tr_id: 주식 현재가 조회)"""
         token = self._get_access_token()
         return {
             "Content-Type": "application/json",
             "authorization": f"Bearer {token}",
             "appkey": self.app_key,
             "appsecret": self.app_secret,
-            "tr_id": "FHKST01010100"  # 주식 현재가 조회
+            "tr_id": tr_id
         }
     
     def get_current_price(self, stock_code: str) -> Dict[str, float]:
@@ -97,7 +177,8 @@ class KoreaInvestmentAPI:
         headers = self._get_headers()
         
         try:
-            response = requests.get(url, params=params, headers=headers)
+            self.rate_limiter.acquire()
+            response = self.session.get(url, params=params, headers=headers)
             response.raise_for_status()
             data = response.json()
             
@@ -128,6 +209,8 @@ class KoreaInvestmentAPI:
         """
         과거 주가 데이터 조회
         
+        기간별 시세 API는 호출당 100건까지만 반환하므로 ITEMCHART_CHUNK_DAYS 구간으로 나눠 조회한다.
+        
         Args:
             stock_code: 종목 코드
             days: 조회 일수
@@ -135,47 +218,24 @@ class KoreaInvestmentAPI:
         Returns:
             과거 주가 데이터 DataFrame
         """
-        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-daily-price"
-        params = {
-            "fid_cond_mrkt_div_code": "J",
-            "fid_input_iscd": stock_code,
-            "fid_org_adj_prc": "1",  # 수정 주가
-            "fid_period_div_code": "D"
-        }
-        headers = self._get_headers()
+        # 토큰 발급 실패는 호출자에게 그대로 전달
+        self._get_access_token()
         
         # 날짜 계산
-        end_date = datetime.now().strftime("%Y%m%d")
-        start_date = (datetime.now() - timedelta(days=days + 30)).strftime("%Y%m%d")
-        params["fid_input_dt_1"] = start_date
-        params["fid_input_dt_2"] = end_date
+        start = datetime.now() - timedelta(days=days + 30)
+        window_end = datetime.now()
         
         try:
-            response = requests.get(url, params=params, headers=headers)
-            response.raise_for_status()
-            data = response.json()
+            frames = []
+            while window_end >= start:
+                window_start = max(start, window_end - timedelta(days=ITEMCHART_CHUNK_DAYS - 1))
+                frame = self.fetch_daily_prices(stock_code, window_start.strftime("%Y%m%d"), window_end.strftime("%Y%m%d"))
+                if not frame.empty:
+                    frames.append(frame)
+                window_end = window_start - timedelta(days=1)
             
-            if data.get("output2"):
-                df = pd.DataFrame(data["output2"])
-                
-                # 데이터 타입 변환 및 컬럼명 변경
-                df['stck_bsop_date'] = pd.to_datetime(df['stck_bsop_date'], format='%Y%m%d')
-                df = df.rename(columns={
-                    'stck_bsop_date': 'date',
-                    'stck_oprc': 'open',
-                    'stck_hgpr': 'high', 
-                    'stck_lwpr': 'low',
-                    'stck_clpr': 'close',
-                    'acml_vol': 'volume'
-                })
-                
-                # 숫자 컬럼 변환
-                numeric_cols = ['open', 'high', 'low', 'close', 'volume']
-                for col in numeric_cols:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-                
-                # 날짜 기준 정렬
-                df = df.sort_values('date').reset_index(drop=True)
+            if frames:
+                df = pd.concat(frames).drop_duplicates('date').sort_values('date').reset_index(drop=True)
                 
                 # 최근 days일 데이터만 선택
                 df = df.tail(days)
@@ -189,6 +249,70 @@ class KoreaInvestmentAPI:
             print(f"❌ {stock_code} 과거 데이터 조회 오류: {e}")
             return pd.DataFrame()
     
+    def fetch_daily_prices(self, stock_code: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        기간 지정 일봉 조회 (inquire-daily-itemchartprice 1회 호출, 오류는 예외로 전달)
+        
+        inquire-daily-price는 기간 지정 없이 최근 30거래일만 반환하므로 기간별 시세 API를 사용한다.
+        한 번의 호출로 최대 100건까지만 받을 수 있으므로
+        긴 기간은 backfill_prices.py처럼 구간을 나눠 호출해야 한다.
+        
+        Args:
+            stock_code: 종목 코드
+            start_date: 시작일 (YYYYMMDD)
+            end_date: 종료일 (YYYYMMDD)
+            
+        Returns:
+            date/open/high/low/close/volume 컬럼 DataFrame (날짜 오름차순)
+        """
+        url = f"{self.base_url}/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
+        params = {
+            "FID_COND_MRKT_DIV_CODE": "J",
+            "FID_INPUT_ISCD": stock_code,
+            "FID_INPUT_DATE_1": start_date,
+            "FID_INPUT_DATE_2": end_date,
+            "FID_PERIOD_DIV_CODE": "D",
+            "FID_ORG_ADJ_PRC": "0"  # 수정 주가
+        }
+        headers = self._get_headers("FHKST03010100")  # 국내주식 기간별 시세 (일/주/월/년)
+        
+        self.rate_limiter.acquire()
+        response = self.session.get(url, params=params, headers=headers)
+        response.raise_for_status()
+        data = response.json()
+        
+        if data.get("rt_cd", "0") != "0":
+            raise RuntimeError(f"{data.get('msg_cd', '')} {data.get('msg1', '')}".strip())
+        
+        # 거래가 없는 구간은 빈 행({})이 섞여 올 수 있음
+        rows = [row for row in data.get("output2") or [] if row.get("stck_bsop_date")]
+        if not rows:
+            return pd.DataFrame(columns=['date', 'open', 'high', 'low', 'close', 'volume'])
+        
+        df = pd.DataFrame(rows)
+        
+        # 데이터 타입 변환 및 컬럼명 변경
+        df['stck_bsop_date'] = pd.to_datetime(df['stck_bsop_date'], format='%Y%m%d')
+        df = df.rename(columns={
+            'stck_bsop_date': 'date',
+            'stck_oprc': 'open',
+            'stck_hgpr': 'high', 
+            'stck_lwpr': 'low',
+            'stck_clpr': 'close',
+            'acml_vol': 'volume'
+        })
+        
+        # 숫자 컬럼 변환
+        numeric_cols = ['open', 'high', 'low', 'close', 'volume']
+        for col in numeric_cols:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        
+        # 요청 구간만 남기고 날짜 기준 정렬
+        in_range = (df['date'] >= pd.Timestamp(start_date)) & (df['date'] <= pd.Timestamp(end_date))
+        df = df[in_range].sort_values('date').reset_index(drop=True)
+        
+        return df[['date'] + numeric_cols]
+    
     def get_multiple_prices(self, stock_codes: List[str]) -> Dict[str, Dict[str, float]]:
         """
         여러 종목의 현재가 한번에 조회
@@ -267,6 +391,8 @@ class StockDataManager:
     def __init__(self, api: KoreaInvestmentAPI):
         self.api = api
         self.stock_code_mapping = self._load_stock_code_mapping()
+        # KOSPI/KOSDAQ 전체 종목 마스터 (data/master에 파일이 있을 때만)
+        self.stock_master = load_stock_master()
     
     def _load_stock_code_mapping(self) -> Dict[str, str]:
         """종목명-종목코드 매핑 로드"""
@@ -305,8 +431,11 @@ class StockDataManager:
         return mapping
     
     def get_stock_code(self, stock_name: str) -> str:
-        """종목명으로 종목코드 찾기"""
-        return self.stock_code_mapping.get(stock_name, "")
+        """종목명으로 종목코드 찾기 (기본 매핑 → 종목 마스터 순서)"""
+        code = self.stock_code_mapping.get(stock_name, "")
+        if not code and self.stock_master is not None:
+            code = self.stock_master.lookup(stock_name)
+        return code
     
     def get_actual_returns(self, predicted_stocks: List[str], prediction_date: str, days_back: int = 1) -> pd.DataFrame:
         """
@@ -367,6 +496,64 @@ class StockDataManager:
         
         return pd.DataFrame(results)
 
+    def load_price_matrix(self, stock_codes: List[str], days: int = 60) -> PriceMatrix:
+        """
+        종목별 과거 주가를 한 번씩만 조회하여 날짜 × 종목코드 가격 행렬 생성
+
+        Args:
+            stock_codes: 종목 코드 리스트 (한국 6자리 코드만 조회)
+            days: 조회 일수
+
+        Returns:
+            PriceMatrix
+        """
+        frames = {}
+
+        for code in dict.fromkeys(stock_codes):
+            if not (len(code) == 6 and code.isdigit()):
+                continue
+            try:
+                frames[code] = self.api.get_historical_prices(code, days)
+            except Exception as e:
+                print(f"❌ {code} 과거 데이터 조회 오류: {e}")
+            # API 호출 간격
+            time.sleep(0.1)
+
+        return PriceMatrix.from_frames(frames)
+
+    def get_actual_returns_bulk(self, predictions: Dict[str, List[str]], days_back: int = 1,
+                                prices: Optional[PriceMatrix] = None) -> pd.DataFrame:
+        """
+        여러 예측일의 예측 주식 실제 수익률을 한 번에 계산
+
+        종목별 주가는 한 번만 조회하고, (예측일, 종목) 쌍 전체를 벡터 연산으로 계산한다.
+
+        Args:
+            predictions: {예측일: [예측 주식명, ...]}
+            days_back: 수익률 계산 기간
+            prices: 미리 만든 가격 행렬 (없으면 KIS API로 조회)
+
+        Returns:
+            get_actual_returns와 같은 스키마의 DataFrame
+        """
+        coded = {}
+        for prediction_date, stock_names in predictions.items():
+            coded[prediction_date] = []
+            for stock_name in stock_names:
+                stock_code = self.get_stock_code(stock_name)
+                if not stock_code:
+                    print(f"⚠️ {stock_name} 종목코드를 찾을 수 없음")
+                    continue
+                coded[prediction_date].append((stock_name, stock_code))
+
+        if prices is None:
+            codes = [code for stocks in coded.values() for _, code in stocks]
+            oldest = min(predictions, default=datetime.now().strftime("%Y-%m-%d"))
+            span = (datetime.now() - datetime.strptime(oldest, "%Y-%m-%d")).days
+            prices = self.load_price_matrix(codes, span + days_back + 5)
+
+        return ReturnsEngine(prices).get_actual_returns(coded, days_back)
+
 
 # 모듈 테스트 코드
 if __name__ == "__main__":
@@ -0,0 +1,463 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+한국투자증권 Open API 로컬 에뮬레이터
+/oauth2/tokenP, /oauth2/Approval, get-price, inquire-daily-price, inquire-daily-itemchartprice 엔드포인트를 흉내 내어
+실제 계정·네트워크 없이 kis_api.py의 풀링/동시성/호출 제한 설정을 부하 테스트
+
+- 종목코드별로 항상 같은 합성 일봉 생성 (crc32(종목코드) 시드)
+- 응답 지연 분포 (fixed / uniform / lognormal), 임의 오류 비율
+- appkey별 초당 호출 한도 초과 시 KIS와 같은 EGW00201 오류 반환
+"""
+
+import json
+import time
+import zlib
+import random
+import secrets
+import argparse
+import threading
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from urllib.parse import urlparse, parse_qs
+
+# 합성 일봉 시작일 / 호출당 최대 행 수 (inquire-daily-price: 기간 지정 없이 최근 30거래일,
+# inquire-daily-itemchartprice: 기간 지정, 최대 100건)
+SERIES_START = "2010-01-04"
+MAX_DAILY_ROWS = 30
+MAX_ITEMCHART_ROWS = 100
+
+RATE_LIMIT_ERROR = {"rt_cd": "1", "msg_cd": "EGW00201", "msg1": "초당 거래건수를 초과하였습니다."}
+INVALID_TOKEN_ERROR = {"rt_cd": "1", "msg_cd": "EGW00121", "msg1": "유효하지 않은 token 입니다."}
+INJECTED_ERROR = {"rt_cd": "1", "msg_cd": "EGW00500", "msg1": "일시적인 서버 오류입니다. (에뮬레이터)"}
+
+LATENCY_MODELS = ('fixed', 'uniform', 'lognormal')
+
+
+class SyntheticMarket:
+    """종목코드별 결정적 합성 일봉 생성기"""
+
+    def __init__(self, end_date: Optional[str] = None):
+        """
+        Args:
+            end_date: 마지막 거래일 (기본: 오늘)
+        """
+        self.calendar = pd.bdate_range(SERIES_START, end_date or datetime.now().strftime("%Y-%m-%d"))
+        self._cache: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def bars(self, code: str) -> pd.DataFrame:
+        """
+        종목 전체 일봉 (같은 코드는 항상 같은 시계열)
+
+        Returns:
+            date/open/high/low/close/volume 컬럼 DataFrame (날짜 오름차순)
+        """
+        with self._lock:
+            cached = self._cache.get(code)
+        if cached is not None:
+            return cached
+
+        rng = np.random.default_rng(zlib.crc32(code.encode()))
+        n = len(self.calendar)
+
+        start_price = rng.uniform(5_000, 200_000)
+        log_returns = rng.normal(0.0003, 0.02, n)
+        close = np.round(start_price * np.exp(np.cumsum(log_returns)))
+        prev_close = np.concatenate(([start_price], close[:-1]))
+        open_ = np.round(prev_close * (1 + rng.normal(0, 0.005, n)))
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, n)))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.01, n)))
+        volume = rng.lognormal(13, 0.5, n).astype(np.int64)
+
+        df = pd.DataFrame({
+            'date': self.calendar,
+            'open': open_,
+            'high': np.round(high),
+            'low': np.round(low),
+            'close': close,
+            'volume': volume
+        })
+
+        with self._lock:
+            self._cache[code] = df
+        return df
+
+
+class KISEmulator:
+    """KIS Open API 로컬 에뮬레이터 서버"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: str = "fixed",
+                 latency_ms: float = 0.0, error_rate: float = 0.0, quota_per_sec: int = 0,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            host: 바인드 주소
+            port: 포트 (0이면 임의 포트)
+            latency: 응답 지연 분포 ('fixed', 'uniform', 'lognormal')
+            latency_ms: 지연 크기 (fixed: 고정값, uniform: 최대값, lognormal: 중앙값)
+            error_rate: 임의 오류 비율 (0~1)
+            quota_per_sec: appkey별 초당 호출 한도 (0이면 제한 없음)
+            seed: 지연/오류 난수 시드
+        """
+        if latency not in LATENCY_MODELS:
+            raise ValueError(f"지원하지 않는 지연 분포: {latency} (가능: {', '.join(LATENCY_MODELS)})")
+
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.quota_per_sec = quota_per_sec
+        self.market = SyntheticMarket()
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = set()
+        self._windows: Dict[str, List[int]] = {}  # appkey → [초, 호출 수]
+        self.stats = {'requests': 0, 'throttled': 0, 'errors': 0}
+
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "KISEmulator":
+        """백그라운드 스레드에서 서버 시작"""
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """서버 종료"""
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "KISEmulator":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _sample_latency(self) -> float:
+        """응답 지연 (초)"""
+        if self.latency_ms <= 0:
+            return 0.0
+        with self._lock:
+            if self.latency == 'uniform':
+                return self._rng.uniform(0, self.latency_ms) / 1000
+            if self.latency == 'lognormal':
+                return self._rng.lognormvariate(np.log(self.latency_ms), 0.5) / 1000
+        return self.latency_ms / 1000
+
+    def _over_quota(self, app_key: str) -> bool:
+        """appkey의 현재 1초 구간 호출 수가 한도를 넘었는지 확인 (호출 수 증가 포함)"""
+        if self.quota_per_sec <= 0:
+            return False
+        second = int(time.time())
+        with self._lock:
+            window = self._windows.setdefault(app_key, [second, 0])
+            if window[0] != second:
+                window[0], window[1] = second, 0
+            window[1] += 1
+            return window[1] > self.quota_per_sec
+
+    def _inject_error(self) -> bool:
+        with self._lock:
+            return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def issue_token(self, body: Dict) -> Dict:
+        """접근 토큰 발급 응답 (실제 API처럼 24시간 유효)"""
+        token = secrets.token_hex(16)
+        with self._lock:
+            self._tokens.add(token)
+        return {
+            "access_token": token,
+            "token_type": "Bearer",
+            "expires_in": 86400,
+            "access_token_token_expired": (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    def issue_approval_key(self, body: Dict) -> Dict:
+        """실시간 접속키 발급 응답"""
+        return {"approval_key": secrets.token_hex(18)}
+
+    def current_price(self, query: Dict[str, str]) -> Dict:
+        """get-price 응답 (마지막 합성 일봉 기준)"""
+        code = query.get("fid_input_iscd", "")
+        bars = self.market.bars(code)
+        last, prev = bars.iloc[-1], bars.iloc[-2]
+        change = last['close'] - prev['close']
+
+        return {
+            "rt_cd": "0",
+            "msg_cd": "MCA00000",
+            "msg1": "정상처리 되었습니다.",
+            "output": {
+                "hts_kor_isnm": f"종목{code}",
+                "stck_prpr": f"{last['close']:.0f}",
+                "stck_oprc": f"{last['open']:.0f}",
+                "stck_hgpr": f"{last['high']:.0f}",
+                "stck_lwpr": f"{last['low']:.0f}",
+                "prdy_clpr": f"{prev['close']:.0f}",
+                "prdy_vrss": f"{change:.0f}",
+                "prdy_ctrt": f"{change / prev['close'] * 100:.2f}",
+                "acml_vol": str(int(last['volume']))
+            }
+        }
+
+    @staticmethod
+    def _daily_rows(bars: pd.DataFrame) -> List[Dict[str, str]]:
+        return [
+            {
+                "stck_bsop_date": row.date.strftime("%Y%m%d"),
+                "stck_oprc": f"{row.open:.0f}",
+                "stck_hgpr": f"{row.high:.0f}",
+                "stck_lwpr": f"{row.low:.0f}",
+                "stck_clpr": f"{row.close:.0f}",
+                "acml_vol": str(row.volume)
+            }
+            for row in bars.itertuples(index=False)
+        ]
+
+    def daily_prices(self, query: Dict[str, str]) -> Dict:
+        """inquire-daily-price 응답 (실제 API처럼 기간 없이 최근 30거래일, 최신순)"""
+        bars = self.market.bars(query.get("fid_input_iscd", ""))
+        bars = bars.iloc[::-1].head(MAX_DAILY_ROWS)
+
+        return {
+            "rt_cd": "0",
+            "msg_cd": "MCA00000",
+            "msg1": "정상처리 되었습니다.",
+            "output": self._daily_rows(bars)
+        }
+
+    def itemchart_prices(self, query: Dict[str, str]) -> Dict:
+        """inquire-daily-itemchartprice 응답 (FID_INPUT_DATE_1~2 기간 내 최대 100건, 최신순)"""
+        query = {key.upper(): value for key, value in query.items()}
+        code = query.get("FID_INPUT_ISCD", "")
+        bars = self.market.bars(code)
+
+        start = query.get("FID_INPUT_DATE_1")
+        end = query.get("FID_INPUT_DATE_2")
+        if start:
+            bars = bars[bars['date'] >= pd.Timestamp(start)]
+        if end:
+            bars = bars[bars['date'] <= pd.Timestamp(end)]
+        bars = bars.iloc[::-1].head(MAX_ITEMCHART_ROWS)
+
+        return {
+            "rt_cd": "0",
+            "msg_cd": "MCA00000",
+            "msg1": "정상처리 되었습니다.",
+            "output1": {"hts_kor_isnm": f"종목{code}", "stck_shrn_iscd": code},
+            "output2": self._daily_rows(bars)
+        }
+
+    def handle(self, method: str, path: str, headers, body: Dict) -> tuple:
+        """
+        요청 1건 처리
+
+        Returns:
+            (HTTP 상태 코드, 응답 JSON)
+        """
+        self._count('requests')
+        parsed = urlparse(path)
+        query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+
+        delay = self._sample_latency()
+        if delay:
+            time.sleep(delay)
+
+        if method == "POST" and parsed.path == "/oauth2/tokenP":
+            return 200, self.issue_token(body)
+        if method == "POST" and parsed.path == "/oauth2/Approval":
+            return 200, self.issue_approval_key(body)
+
+        routes = {
+            "/uapi/domestic-stock/v1/quotations/get-price": self.current_price,
+            "/uapi/domestic-stock/v1/quotations/inquire-daily-price": self.daily_prices,
+            "/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice": self.itemchart_prices,
+        }
+        route = routes.get(parsed.path)
+        if method != "GET" or route is None:
+            return 404, {"rt_cd": "1", "msg_cd": "EGW00404", "msg1": f"없는 API입니다: {parsed.path}"}
+
+        token = (headers.get("authorization") or "").replace("Bearer ", "")
+        if token not in self._tokens:
+            return 500, INVALID_TOKEN_ERROR
+
+        if self._over_quota(headers.get("appkey") or ""):
+            self._count('throttled')
+            return 500, RATE_LIMIT_ERROR
+
+        if self._inject_error():
+            self._count('errors')
+            return 500, INJECTED_ERROR
+
+        return 200, route(query)
+
+    def _make_handler(self):
+        emulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # keep-alive 지원 (클라이언트 커넥션 풀 효과 측정)
+            protocol_version = "HTTP/1.1"
+
+            def _dispatch(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw) if raw else {}
+                except ValueError:
+                    body = {}
+
+                status, payload = emulator.handle(method, self.path, self.headers, body)
+
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def run_benchmark(base_url: str, stock_codes: List[str], total_requests: int = 200,
+                  concurrency: int = 4, max_calls_per_sec: float = 20, pool_size: int = 10,
+                  days: int = 40) -> Dict[str, float]:
+    """
+    KoreaInvestmentAPI 클라이언트로 기간 일봉 조회(inquire-daily-itemchartprice) 부하 테스트
+
+    Args:
+        base_url: 에뮬레이터 주소
+        stock_codes: 순환 조회할 종목 코드 리스트
+        total_requests: 총 요청 수
+        concurrency: 동시 요청 스레드 수
+        max_calls_per_sec: 클라이언트 초당 호출 제한
+        pool_size: HTTP 커넥션 풀 크기
+        days: 호출당 조회 기간 (달력 일수)
+
+    Returns:
+        처리량, 지연 백분위(ms), 성공/한도초과/오류 건수
+    """
+    from requests import HTTPError
+    from requests.adapters import HTTPAdapter
+    from kis_api import KoreaInvestmentAPI, RateLimiter
+
+    api = KoreaInvestmentAPI(is_demo=True, base_url=base_url)
+    api.rate_limiter = RateLimiter(max_calls_per_sec)
+    api.session.mount("http://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+    api._get_access_token()
+
+    end = pd.Timestamp.now().normalize()
+    start_date = (end - pd.Timedelta(days=days - 1)).strftime("%Y%m%d")
+    end_date = end.strftime("%Y%m%d")
+
+    def call(i: int):
+        began = time.perf_counter()
+        try:
+            api.fetch_daily_prices(stock_codes[i % len(stock_codes)], start_date, end_date)
+            outcome = 'ok'
+        except HTTPError as e:
+            try:
+                msg_cd = e.response.json().get("msg_cd")
+            except ValueError:
+                msg_cd = ""
+            outcome = 'throttled' if msg_cd == RATE_LIMIT_ERROR["msg_cd"] else 'errors'
+        except Exception:
+            outcome = 'errors'
+        return outcome, time.perf_counter() - began
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(call, range(total_requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = np.array([latency for _, latency in results]) * 1000
+    outcomes = [outcome for outcome, _ in results]
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if len(latencies) else (0.0, 0.0, 0.0)
+
+    return {
+        'requests': total_requests,
+        'ok': outcomes.count('ok'),
+        'throttled': outcomes.count('throttled'),
+        'errors': outcomes.count('errors'),
+        'elapsed_sec': elapsed,
+        'throughput': total_requests / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': float(p50),
+        'p95_ms': float(p95),
+        'p99_ms': float(p99)
+    }
+
+
+def print_benchmark(result: Dict[str, float]) -> None:
+    """부하 테스트 결과 출력"""
+    print(f"📊 요청 {result['requests']}건 | 성공 {result['ok']} | 한도초과 {result['throttled']} | 오류 {result['errors']}")
+    print(f"   처리량 {result['throughput']:.1f}건/초 ({result['elapsed_sec']:.2f}초)")
+    print(f"   지연 p50 {result['p50_ms']:.1f}ms | p95 {result['p95_ms']:.1f}ms | p99 {result['p99_ms']:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='KIS Open API 로컬 에뮬레이터 / 클라이언트 부하 테스트')
+    parser.add_argument('--host', default='127.0.0.1', help='바인드 주소')
+    parser.add_argument('--port', type=int, default=8899, help='포트')
+    parser.add_argument('--latency', choices=LATENCY_MODELS, default='lognormal', help='응답 지연 분포')
+    parser.add_argument('--latency-ms', type=float, default=30.0, help='지연 크기 (ms)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='임의 오류 비율 (0~1)')
+    parser.add_argument('--quota', type=int, default=20, help='appkey별 초당 호출 한도 (0: 제한 없음)')
+    parser.add_argument('--seed', type=int, help='지연/오류 난수 시드')
+    parser.add_argument('--benchmark', action='store_true', help='서버를 띄우고 클라이언트 부하 테스트 실행')
+    parser.add_argument('--requests', type=int, default=200, help='부하 테스트 요청 수')
+    parser.add_argument('--concurrency', type=int, default=4, help='부하 테스트 동시 요청 수')
+    parser.add_argument('--client-rate', type=float, default=20, help='클라이언트 초당 호출 제한')
+    parser.add_argument('--pool-size', type=int, default=10, help='클라이언트 커넥션 풀 크기')
+
+    args = parser.parse_args()
+
+    emulator = KISEmulator(args.host, args.port, args.latency, args.latency_ms,
+                           args.error_rate, args.quota, args.seed)
+
+    if args.benchmark:
+        with emulator:
+            print(f"🚀 에뮬레이터 시작: {emulator.base_url}")
+            result = run_benchmark(emulator.base_url, ['005930', '000660', '035420', '051910'],
+                                   args.requests, args.concurrency, args.client_rate, args.pool_size)
+            print_benchmark(result)
+        return
+
+    print(f"🚀 KIS 에뮬레이터 실행 중: {emulator.base_url}")
+    print(f"   KIS_BASE_URL={emulator.base_url} 로 설정하면 kis_api.py가 에뮬레이터에 연결됩니다.")
+    try:
+        emulator.server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️ 에뮬레이터 종료")
+    finally:
+        emulator.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
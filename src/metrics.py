@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+실행 지표 (단계/외부 호출별 소요 시간 히스토그램과 카운터)
+프로세스 안에 누적해 두었다가 실행이 끝날 때 Prometheus 텍스트 형식(node_exporter textfile collector용)과
+JSON 요약으로 기록
+
+- Prometheus 파일: 프로세스 시작 후 누적값 (스케줄러 데몬에서도 카운터가 계속 증가)
+- JSON 요약: 이번 실행분만 (start_run()으로 실행마다 초기화)
+
+관측 한 번은 잠금 + 딕셔너리 조회 + 이분 탐색 정도라 수집 경로의 부담은 무시할 수 있다.
+"""
+
+import os
+import json
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+from data_paths import DATA_DIR
+import tracing
+
+METRICS_DIR = os.getenv("TUJA_METRICS_DIR", os.path.join(DATA_DIR, "metrics"))
+PREFIX = "tuja_"
+
+# 초 단위 기본 버킷 (뉴스 본문 1건 ~ 전체 실행까지)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+HELP = {
+    'stage_duration_seconds': '파이프라인 단계 소요 시간',
+    'stage_runs_total': '파이프라인 단계 실행 수',
+    'external_call_duration_seconds': '외부 호출(크롤링, yfinance, KIS) 소요 시간',
+    'external_calls_total': '외부 호출 수',
+    'run_duration_seconds': '일일 랭킹 전체 실행 시간',
+    'runs_total': '일일 랭킹 실행 수',
+    'last_run_timestamp_seconds': '마지막 실행 종료 시각 (unix time)',
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """고정 버킷 히스토그램 (버킷별 개수, 합계, 최소/최대)"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """버킷 경계 기준 분위수 근사 (해당 분위수가 속한 버킷의 상한)"""
+        if not self.count:
+            return 0.0
+        target, cumulative = q * self.count, 0
+        for bound, count in zip(self.buckets + (self.max,), self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+class MetricsRegistry:
+    """카운터 / 게이지 / 히스토그램 저장소 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+
+    @staticmethod
+    def _key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+    def inc(self, name: str, amount: float = 1.0, **labels) -> None:
+        """카운터 증가"""
+        key = self._key(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    def set(self, name: str, value: float, **labels) -> None:
+        """게이지 설정"""
+        with self._lock:
+            self.gauges.setdefault(name, {})[self._key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """히스토그램 관측"""
+        key = self._key(labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram()
+            histogram.observe(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self.gauges.clear()
+            self.histograms.clear()
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        lines: List[str] = []
+        with self._lock:
+            for kind, metrics in (('counter', self.counters), ('gauge', self.gauges)):
+                for name in sorted(metrics):
+                    lines.extend(_header(name, kind))
+                    for key, value in sorted(metrics[name].items()):
+                        lines.append(f"{PREFIX}{name}{_labels(key)} {_number(value)}")
+            for name in sorted(self.histograms):
+                lines.extend(_header(name, 'histogram'))
+                for key, histogram in sorted(self.histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{PREFIX}{name}_bucket{_labels(key, le=_number(bound))} {cumulative}")
+                    lines.append(f"{PREFIX}{name}_bucket{_labels(key, le='+Inf')} {histogram.count}")
+                    lines.append(f"{PREFIX}{name}_sum{_labels(key)} {_number(histogram.sum)}")
+                    lines.append(f"{PREFIX}{name}_count{_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict:
+        """JSON 요약 (히스토그램은 개수/합계/평균/p50/p95/최대)"""
+        with self._lock:
+            return {
+                'counters': {name: [{**dict(key), 'value': value} for key, value in sorted(series.items())]
+                             for name, series in self.counters.items()},
+                'gauges': {name: [{**dict(key), 'value': value} for key, value in sorted(series.items())]
+                           for name, series in self.gauges.items()},
+                'histograms': {
+                    name: [{**dict(key), 'count': h.count, 'sum': round(h.sum, 6),
+                            'mean': round(h.sum / h.count, 6) if h.count else 0.0,
+                            'p50': round(h.quantile(0.5), 6), 'p95': round(h.quantile(0.95), 6),
+                            'max': round(h.max, 6)}
+                           for key, h in sorted(series.items())]
+                    for name, series in self.histograms.items()
+                },
+            }
+
+
+def _header(name: str, kind: str) -> List[str]:
+    return [f"# HELP {PREFIX}{name} {HELP.get(name, name)}", f"# TYPE {PREFIX}{name} {kind}"]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(key: LabelKey, **extra) -> str:
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+REGISTRY = MetricsRegistry()  # 프로세스 누적 (Prometheus)
+RUN = MetricsRegistry()       # 이번 실행분 (JSON 요약, start_run()에서 초기화)
+_REGISTRIES = (REGISTRY, RUN)
+
+
+def start_run() -> None:
+    """실행 시작: 실행별 요약 지표 초기화 (누적 지표는 유지)"""
+    RUN.reset()
+
+
+def inc(name: str, amount: float = 1.0, **labels) -> None:
+    for registry in _REGISTRIES:
+        registry.inc(name, amount, **labels)
+
+
+def observe(name: str, value: float, **labels) -> None:
+    for registry in _REGISTRIES:
+        registry.observe(name, value, **labels)
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    for registry in _REGISTRIES:
+        registry.set(name, value, **labels)
+
+
+def record_call(target: str, endpoint: str, seconds: float, status: str) -> None:
+    """외부 호출 1건 기록 (소요 시간 히스토그램 + 상태별 카운터)"""
+    observe('external_call_duration_seconds', seconds, target=target, endpoint=endpoint)
+    inc('external_calls_total', target=target, endpoint=endpoint, status=status)
+
+
+@contextmanager
+def track_call(target: str, endpoint: str) -> Iterator[Dict[str, str]]:
+    """
+    외부 호출 구간 측정 + 추적 구간 기록 (예외가 나면 status='error')
+
+    Yields:
+        {'status': 'ok'} — 블록 안에서 'empty' 등으로 바꿀 수 있음
+    """
+    state = {'status': 'ok'}
+    started = time.perf_counter()
+    with tracing.span(endpoint, target) as attributes:
+        try:
+            yield state
+        except Exception:
+            state['status'] = 'error'
+            raise
+        finally:
+            attributes['status'] = state['status']
+            record_call(target, endpoint, time.perf_counter() - started, state['status'])
+
+
+def instrument_session(session, target: str, endpoint: str = 'path') -> None:
+    """
+    requests.Session의 모든 요청을 외부 호출 지표와 추적 구간(상태 코드, 응답 바이트)으로 기록
+
+    Args:
+        session: requests.Session
+        target: 호출 대상 라벨 (crawl / kis 등)
+        endpoint: 'path'(URL 경로, API용) 또는 'host'(도메인, 크롤링용 — 기사 URL마다 시계열이 늘지 않도록)
+    """
+    request = session.request
+
+    def timed_request(method, url, *args, **kwargs):
+        parts = urlsplit(url)
+        name = parts.path if endpoint == 'path' else parts.hostname or ''
+        status = 'error'
+        started = time.perf_counter()
+        try:
+            with tracing.span(f"{method} {name}", target, url=url) as attributes:
+                response = request(method, url, *args, **kwargs)
+                status = str(response.status_code)
+                attributes['status'] = response.status_code
+                if not kwargs.get('stream'):
+                    attributes['bytes'] = len(response.content)
+            return response
+        finally:
+            record_call(target, name, time.perf_counter() - started, status)
+
+    session.request = timed_request
+
+
+def export(directory: Optional[str] = None, name: str = "tuja") -> Tuple[str, str]:
+    """
+    누적 지표는 Prometheus 텍스트 파일로, 이번 실행분은 JSON 요약으로 저장 (임시 파일에 쓴 뒤 교체)
+
+    Args:
+        directory: 저장 디렉토리 (기본: data/metrics 또는 TUJA_METRICS_DIR)
+        name: 파일 이름 (name.prom, name.json)
+
+    Returns:
+        (prom 경로, json 경로)
+    """
+    directory = directory or METRICS_DIR
+    os.makedirs(directory, exist_ok=True)
+    set_gauge('last_run_timestamp_seconds', round(time.time(), 3))
+
+    paths = (os.path.join(directory, f"{name}.prom"), os.path.join(directory, f"{name}.json"))
+    contents = (REGISTRY.to_prometheus(), json.dumps(RUN.summary(), ensure_ascii=False, indent=2))
+    for path, content in zip(paths, contents):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    return paths
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+일별 수집 뉴스 보관소
+랭킹 생성에 사용한 뉴스를 날짜별 JSON으로 남겨 과거 날짜를 다시 채점할 수 있게 함
+"""
+
+import os
+import json
+from typing import Dict, List, Optional
+from data_paths import DATA_DIR
+
+NEWS_ARCHIVE_DIR = os.getenv("TUJA_NEWS_DIR", os.path.join(DATA_DIR, "news"))
+
+
+def news_archive_file(date: str, archive_dir: Optional[str] = None) -> str:
+    """날짜별 뉴스 파일 경로 (YYYY-MM-DD.json)"""
+    return os.path.join(archive_dir or NEWS_ARCHIVE_DIR, f"{date}.json")
+
+
+def save_news_archive(date: str, news_list: List[Dict], archive_dir: Optional[str] = None) -> str:
+    """
+    하루치 뉴스 저장 (같은 날짜는 덮어씀)
+
+    Args:
+        date: 날짜 (YYYY-MM-DD)
+        news_list: 수집된 뉴스 리스트
+        archive_dir: 보관 디렉토리 (기본: data/news 또는 TUJA_NEWS_DIR)
+
+    Returns:
+        저장한 파일 경로
+    """
+    path = news_archive_file(date, archive_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # 기록 중 중단되어도 기존 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(news_list, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_news_archive(date: str, archive_dir: Optional[str] = None) -> Optional[List[Dict]]:
+    """하루치 뉴스 로드 (없으면 None)"""
+    try:
+        with open(news_archive_file(date, archive_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def archived_dates(archive_dir: Optional[str] = None, start: Optional[str] = None,
+                   end: Optional[str] = None) -> List[str]:
+    """보관된 날짜 목록 (YYYY-MM-DD, 오름차순, start/end 포함 범위)"""
+    archive_dir = archive_dir or NEWS_ARCHIVE_DIR
+    if not os.path.isdir(archive_dir):
+        return []
+
+    dates = sorted(name[:-5] for name in os.listdir(archive_dir) if name.endswith('.json'))
+    return [date for date in dates if (not start or date >= start) and (not end or date <= end)]
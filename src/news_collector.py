@@ -1,5 +1,4 @@
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
@@ -7,8 +6,16 @@ import json
 import re
 from typing import List, Dict, Tuple, Optional
 import logging
-import yfinance as yf
 import random
+from metrics import instrument_session
+from tracing import span, traced
+
+
+def _parse_html(content: bytes):
+    """HTML 파싱 (BeautifulSoup은 실제 크롤링할 때만 로드)"""
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(content, 'html.parser')
+
 
 class NewsCollector:
     def __init__(self):
@@ -23,7 +30,11 @@ class NewsCollector:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
+        instrument_session(self.session, 'crawl', endpoint='host')
+        # 같은 날 앞선 실행에서 이미 분석한 기사 링크 (본문 추출 생략, intraday_state.py)
+        self.known_links = set()
 
+    @traced('collector')
     def collect_financial_news(self) -> List[Dict]:
         """금융 뉴스 수집 (실제 웹크롤링 대신 샘플 데이터 제공)"""
         # 실제 환경에서는 웹크롤링 구현 필요
@@ -109,13 +120,14 @@ class NewsCollector:
         selected_count = random.randint(5, min(10, len(sample_news)))
         return random.sample(sample_news, selected_count)
 
+    @traced('collector')
     def _scrape_naver_finance(self) -> List[Dict]:
         """네이버 금융 뉴스 스크래핑"""
         news_list = []
         try:
             url = 'https://finance.naver.com/news/mainnews.naver'
             response = self.session.get(url, timeout=5)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = _parse_html(response.content)
             
             articles = soup.find_all('li', class_='block1')
             for article in articles[:20]:  # 상위 20개
@@ -137,7 +149,7 @@ class NewsCollector:
                         'link': link,
                         'source': '네이버금융',
                         'date': date,
-                        'content': self._extract_article_content(link)
+                        'content': '' if link in self.known_links else self._extract_article_content(link)
                     })
                     
         except Exception as e:
@@ -145,13 +157,14 @@ class NewsCollector:
             
         return news_list
 
+    @traced('collector')
     def _scrape_moneytoday(self) -> List[Dict]:
         """머니투데이 뉴스 스크래핑"""
         news_list = []
         try:
             url = 'https://news.mt.co.kr/mtview.php?no=2026012609134672146'
             response = self.session.get(url, timeout=5)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = _parse_html(response.content)
             
             # 실제 구현에서는 머니투데이 메인 페이지에서 최신 뉴스 링크를 가져와야 함
             # 여기서는 예시로 간단한 구조만 표시
@@ -161,13 +174,14 @@ class NewsCollector:
             
         return news_list
 
+    @traced('collector')
     def _scrape_asiae(self) -> List[Dict]:
         """아시아경제 뉴스 스크래핑"""
         news_list = []
         try:
             url = 'https://www.asiae.co.kr/list/economy'
             response = self.session.get(url, timeout=5)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = _parse_html(response.content)
             
             # 실제 구현에서는 아시아경제 구조에 맞게 스크래핑
             
@@ -179,13 +193,15 @@ class NewsCollector:
     def _extract_article_content(self, url: str) -> str:
         """기사 본문 추출"""
         try:
-            response = self.session.get(url, timeout=5)
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # 네이버 뉴스 본문 선택자
-            content = soup.find('div', class_='newsct_article') or \
-                     soup.find('div', id='articleBody') or \
-                     soup.find('div', class_='articleBody')
+            with span('article', 'collector', url=url) as attributes:
+                response = self.session.get(url, timeout=5)
+                soup = _parse_html(response.content)
+                
+                # 네이버 뉴스 본문 선택자
+                content = soup.find('div', class_='newsct_article') or \
+                         soup.find('div', id='articleBody') or \
+                         soup.find('div', class_='articleBody')
+                attributes['chars'] = len(content.get_text(strip=True)) if content else 0
                      
             return content.get_text(strip=True) if content else ''
             
@@ -196,6 +212,8 @@ class NewsCollector:
     def collect_stock_data(self) -> Dict:
         """주식 시장 데이터 수집"""
         try:
+            import yfinance as yf
+            
             # KOSPI, KOSDAQ 데이터
             kospi = yf.Ticker('^KS11')
             kosdaq = yf.Ticker('^KQ11')
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+예측 성과 분석 모듈
+(날짜, 종목, 순위, 점수, 수익률) long 형식 DataFrame 하나로
+순위 IC, 스피어만 상관, 적중률, 상위 k vs 하위 k 스프레드, 섹터/지역별 성과를 groupby/NumPy로 계산
+적중률·평균 수익률·상관계수는 벡터화 부트스트랩(행 단위 / 날짜 블록) 신뢰구간을 함께 제공
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+PERFORMANCE_COLUMNS = ['date', 'stock', 'rank', 'score', 'return', 'region', 'sector']
+
+
+def performance_frame(details: pd.DataFrame, return_column: str = 'return_1d') -> pd.DataFrame:
+    """
+    Backtester.attach_returns() 결과를 분석용 long 형식으로 변환
+
+    Args:
+        details: date / rank / stock_name / score / region / sector / 수익률 컬럼 DataFrame
+        return_column: 사용할 수익률 컬럼
+
+    Returns:
+        date / stock / rank / score / return / region / sector 컬럼 DataFrame
+    """
+    frame = details.rename(columns={'stock_name': 'stock', return_column: 'return'})
+    for column in ('region', 'sector'):
+        if column not in frame.columns:
+            frame[column] = '기타'
+    frame['region'] = frame['region'].replace('', '기타').fillna('기타')
+    return frame[PERFORMANCE_COLUMNS].reset_index(drop=True)
+
+
+def _pearson(x: np.ndarray, y: np.ndarray) -> float:
+    """피어슨 상관계수 (표본 3개 미만이거나 분산이 0이면 NaN)"""
+    if len(x) < 3:
+        return float('nan')
+    xd, yd = x - x.mean(), y - y.mean()
+    denom = np.sqrt((xd * xd).sum() * (yd * yd).sum())
+    return float((xd * yd).sum() / denom) if denom > 0 else float('nan')
+
+
+def spearman(x, y) -> float:
+    """스피어만 순위 상관계수 (동순위는 평균 순위)"""
+    x = pd.Series(x, dtype=float).rank().to_numpy()
+    y = pd.Series(y, dtype=float).rank().to_numpy()
+    return _pearson(x, y)
+
+
+def daily_rank_ic(frame: pd.DataFrame, min_names: int = 3) -> pd.Series:
+    """
+    날짜별 순위 IC (점수 순위와 수익률 순위의 상관계수)
+
+    날짜 그룹 안에서 순위를 매기고 편차 곱을 groupby 합계로 모아 한 번에 계산한다.
+
+    Args:
+        frame: performance_frame() 형식 DataFrame
+        min_names: IC를 계산할 최소 종목 수
+
+    Returns:
+        날짜 인덱스 IC Series
+    """
+    valid = frame.dropna(subset=['score', 'return'])
+    if valid.empty:
+        return pd.Series(dtype=float, name='rank_ic')
+
+    dates = valid['date']
+    x = valid.groupby('date')['score'].rank()
+    y = valid.groupby('date')['return'].rank()
+    xd = x - x.groupby(dates).transform('mean')
+    yd = y - y.groupby(dates).transform('mean')
+
+    sums = pd.DataFrame({'xy': xd * yd, 'xx': xd * xd, 'yy': yd * yd, 'n': 1}).groupby(dates).sum()
+    denom = np.sqrt(sums['xx'] * sums['yy'])
+    ic = (sums['xy'] / denom.where(denom > 0)).where(sums['n'] >= min_names)
+    return ic.dropna().rename('rank_ic')
+
+
+def top_bottom_spread(frame: pd.DataFrame, k: int = 3) -> pd.Series:
+    """
+    날짜별 점수 상위 k개 평균 수익률 - 하위 k개 평균 수익률
+
+    Args:
+        frame: performance_frame() 형식 DataFrame
+        k: 상위/하위 종목 수 (종목이 2k개 미만인 날짜는 제외)
+
+    Returns:
+        날짜 인덱스 스프레드 Series (%p)
+    """
+    valid = frame.dropna(subset=['score', 'return'])
+    if valid.empty:
+        return pd.Series(dtype=float, name='spread')
+
+    grouped = valid.groupby('date')
+    position = grouped['score'].rank(ascending=False, method='first')
+    count = grouped['score'].transform('size')
+    returns = valid['return']
+
+    top = returns.where(position <= k).groupby(valid['date']).mean()
+    bottom = returns.where(position > count - k).groupby(valid['date']).mean()
+    enough = count.groupby(valid['date']).first() >= 2 * k
+    return (top - bottom)[enough].rename('spread')
+
+
+def breakdown(frame: pd.DataFrame, by: str, hit_threshold: float = 0.0) -> Dict:
+    """그룹별 건수 / 평균 점수 / 평균 수익률 / 적중률(%)"""
+    valid = frame.dropna(subset=['return'])
+    if valid.empty:
+        return {}
+    grouped = valid.assign(hit=valid['return'] > hit_threshold).groupby(by).agg(
+        count=('return', 'size'),
+        mean_score=('score', 'mean'),
+        mean_return=('return', 'mean'),
+        hit_rate=('hit', 'mean'),
+    )
+    grouped['hit_rate'] *= 100
+    return grouped.sort_values('mean_return', ascending=False).to_dict('index')
+
+
+def analyze_performance(frame: pd.DataFrame, k: int = 3, hit_threshold: float = 0.0,
+                        bootstrap_replicates: int = 10000, seed: Optional[int] = None) -> Dict:
+    """
+    예측 성과 지표 계산
+
+    Args:
+        frame: performance_frame() 형식 DataFrame
+        k: 상위/하위 스프레드 종목 수
+        hit_threshold: 적중으로 볼 최소 수익률 (%)
+        bootstrap_replicates: 신뢰구간 부트스트랩 복제본 수 (0이면 생략)
+        seed: 부트스트랩 난수 시드
+
+    Returns:
+        적중률, 수익률, 피어슨/스피어만 상관, 순위 IC 통계, 상위-하위 스프레드, 섹터/지역/순위별 성과,
+        행 단위·날짜 블록 부트스트랩 신뢰구간
+    """
+    evaluated = frame.dropna(subset=['return'])
+    returns = evaluated['return'].to_numpy(dtype=float)
+    scores = evaluated['score'].to_numpy(dtype=float)
+    hits = returns > hit_threshold
+
+    ic = daily_rank_ic(evaluated)
+    spread = top_bottom_spread(evaluated, k)
+    ic_std = float(ic.std()) if len(ic) > 1 else float('nan')
+
+    return {
+        'total_predictions': len(frame),
+        'evaluated_predictions': len(evaluated),
+        'days': int(evaluated['date'].nunique()),
+        'correct_predictions': int(hits.sum()),
+        'hit_rate': float(hits.mean() * 100) if len(hits) else 0.0,
+        'mean_return': float(returns.mean()) if len(returns) else 0.0,
+        'median_return': float(np.median(returns)) if len(returns) else 0.0,
+        'mean_score': float(np.nanmean(scores)) if len(scores) else 0.0,
+        'pearson': _pearson(scores, returns),
+        'spearman': spearman(scores, returns),
+        'rank_ic_mean': float(ic.mean()) if len(ic) else float('nan'),
+        'rank_ic_std': ic_std,
+        'rank_ic_ir': float(ic.mean() / ic_std) if ic_std > 0 else float('nan'),
+        'rank_ic_positive_rate': float((ic > 0).mean() * 100) if len(ic) else float('nan'),
+        'top_bottom_k': k,
+        'top_bottom_spread': float(spread.mean()) if len(spread) else float('nan'),
+        'spread_days': len(spread),
+        'daily_rank_ic': ic,
+        'daily_spread': spread,
+        'by_sector': breakdown(evaluated, 'sector', hit_threshold),
+        'by_region': breakdown(evaluated, 'region', hit_threshold),
+        'by_rank': breakdown(evaluated, 'rank', hit_threshold),
+        'confidence_intervals': [
+            bootstrap_confidence(evaluated, bootstrap_replicates, block=block, hit_threshold=hit_threshold, seed=seed)
+            for block in (None, 'date')
+        ] if bootstrap_replicates else [],
+    }
+
+
+def print_performance_report(analytics: Dict, title: Optional[str] = None) -> None:
+    """성과 지표 출력"""
+    print("\n" + "="*80)
+    print(f"📊 {title or '예측 성과 분석'}")
+    print("="*80)
+
+    if not analytics['evaluated_predictions']:
+        print("❌ 수익률을 계산할 수 있는 예측이 없습니다. backfill_prices.py로 일봉을 먼저 백필해주세요.")
+        return
+
+    print(f"\n📋 평가 예측: {analytics['evaluated_predictions']}/{analytics['total_predictions']}개 ({analytics['days']}일)")
+    print(f"🎯 적중률: {analytics['hit_rate']:.1f}% ({analytics['correct_predictions']}개)")
+    print(f"💰 평균 수익률: {analytics['mean_return']:+.2f}% | 중앙값: {analytics['median_return']:+.2f}%")
+    print(f"\n🔗 점수-수익률 상관:")
+    print(f"   • 피어슨: {analytics['pearson']:+.3f} | 스피어만: {analytics['spearman']:+.3f}")
+    print(f"   • 일별 순위 IC: 평균 {analytics['rank_ic_mean']:+.3f} | 표준편차 {analytics['rank_ic_std']:.3f} | "
+          f"IR {analytics['rank_ic_ir']:+.2f} | 양수 비율 {analytics['rank_ic_positive_rate']:.0f}%")
+    print(f"   • 상위 {analytics['top_bottom_k']} - 하위 {analytics['top_bottom_k']} 스프레드: "
+          f"{analytics['top_bottom_spread']:+.2f}%p ({analytics['spread_days']}일)")
+    print_confidence_intervals(analytics.get('confidence_intervals', []))
+
+    for label, key in [('🏭 섹터별', 'by_sector'), ('🌍 지역별', 'by_region')]:
+        if analytics[key]:
+            print(f"\n{label} 성과:")
+            for group, stats in analytics[key].items():
+                print(f"   {group}: 평균 {stats['mean_return']:+.2f}% | 적중률 {stats['hit_rate']:.1f}% | "
+                      f"평균 점수 {stats['mean_score']:.1f} ({stats['count']}건)")
+
+
+def _unit_stats(frame: pd.DataFrame, block: Optional[str], hit_threshold: float) -> np.ndarray:
+    """리샘플 단위(행 또는 날짜)별 충분통계 [n, Σr, Σhit, Σs, Σs², Σr², Σsr]"""
+    r = frame['return'].to_numpy(dtype=float)
+    s = frame['score'].to_numpy(dtype=float)
+    stats = np.column_stack([np.ones_like(r), r, (r > hit_threshold).astype(float), s, s * s, r * r, s * r])
+    if block is None:
+        return stats
+    _, groups = np.unique(frame[block].to_numpy(), return_inverse=True)
+    return np.stack([np.bincount(groups, weights=stats[:, j]) for j in range(stats.shape[1])], axis=1)
+
+
+def _metrics_from_totals(totals: np.ndarray) -> Dict[str, np.ndarray]:
+    """충분통계 합계(… × 7)로 적중률 / 평균 수익률 / 피어슨 상관 계산"""
+    n, sr, sh, ss, sss, srr, ssr = (totals[..., j] for j in range(7))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = n * ssr - ss * sr
+        denom = np.sqrt((n * sss - ss * ss) * (n * srr - sr * sr))
+        return {
+            'accuracy': sh / n * 100,
+            'mean_return': sr / n,
+            'correlation': np.where(denom > 0, cov / np.where(denom > 0, denom, 1), np.nan),
+        }
+
+
+def bootstrap_confidence(frame: pd.DataFrame, replicates: int = 10000, alpha: float = 0.05,
+                         block: Optional[str] = None, hit_threshold: float = 0.0,
+                         seed: Optional[int] = None, max_cells: int = 4_000_000) -> Dict:
+    """
+    적중률 / 평균 수익률 / 점수-수익률 상관계수의 부트스트랩 신뢰구간
+
+    리샘플 단위별 충분통계를 구해 두고, 복제본마다 각 단위가 뽑힌 횟수 행렬(복제본 × 단위)과
+    행렬곱으로 합계를 얻으므로 복제본별 파이썬 루프가 없다.
+    block='date'이면 날짜 단위로 통째 리샘플하여 같은 날 종목 간 상관을 보존한다.
+
+    Args:
+        frame: score / return (블록 부트스트랩이면 해당 컬럼 포함) 컬럼 DataFrame
+        replicates: 복제본 수
+        alpha: 유의수준 (0.05 → 95% 구간)
+        block: 블록 단위 컬럼 (None이면 행 단위 iid 부트스트랩)
+        hit_threshold: 적중으로 볼 최소 수익률 (%)
+        seed: 난수 시드
+        max_cells: 한 번에 만드는 횟수 행렬의 최대 원소 수 (메모리 상한)
+
+    Returns:
+        {'method', 'replicates', 'units', 'alpha', 지표: {'estimate', 'low', 'high'}}
+    """
+    valid = frame.dropna(subset=['score', 'return'])
+    stats = _unit_stats(valid, block, hit_threshold)
+    units = len(stats)
+    result = {'method': f'block({block})' if block else 'iid', 'replicates': replicates, 'units': units, 'alpha': alpha}
+    if units < 2:
+        return result
+
+    rng = np.random.default_rng(seed)
+    chunk = max(1, min(replicates, max_cells // units))
+    samples = {name: [] for name in ('accuracy', 'mean_return', 'correlation')}
+    for start in range(0, replicates, chunk):
+        size = min(chunk, replicates - start)
+        # 리샘플 인덱스 행렬 → 복제본별로 오프셋을 더해 한 번의 bincount로 뽑힌 횟수 행렬 생성
+        index = rng.integers(0, units, size=(size, units)) + (np.arange(size) * units)[:, None]
+        counts = np.bincount(index.ravel(), minlength=size * units).reshape(size, units).astype(float)
+        for name, values in _metrics_from_totals(counts @ stats).items():
+            samples[name].append(values)
+
+    estimates = _metrics_from_totals(stats.sum(axis=0))
+    for name, parts in samples.items():
+        values = np.concatenate(parts)
+        low, high = np.nanpercentile(values, [alpha / 2 * 100, (1 - alpha / 2) * 100]) if np.isfinite(values).any() else (np.nan, np.nan)
+        result[name] = {'estimate': float(estimates[name]), 'low': float(low), 'high': float(high)}
+    return result
+
+
+def print_confidence_intervals(intervals: List[Dict]) -> None:
+    """부트스트랩 신뢰구간 출력"""
+    labels = [('accuracy', '적중률', '{:.1f}%'), ('mean_return', '평균 수익률', '{:+.2f}%'), ('correlation', '상관계수', '{:+.3f}')]
+    for ci in intervals:
+        if 'accuracy' not in ci:
+            continue
+        level = (1 - ci['alpha']) * 100
+        unit = '일' if ci['method'].startswith('block') else '건'
+        print(f"\n📐 {level:.0f}% 신뢰구간 ({ci['method']} 부트스트랩, {ci['replicates']:,}회, {ci['units']}{unit}):")
+        for key, label, fmt in labels:
+            stats = ci[key]
+            print(f"   • {label}: {fmt.format(stats['estimate'])} [{fmt.format(stats['low'])}, {fmt.format(stats['high'])}]")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+파이프라인 단계 그래프
+단계마다 의존 단계를 명시하고, 의존 단계가 끝난 단계부터 스레드 풀에서 바로 실행
+
+뉴스 수집, 글로벌 시장 데이터처럼 서로 독립인 I/O 단계가 동시에 진행되므로
+전체 실행 시간은 단계 시간의 합이 아니라 가장 긴 의존 경로(critical path)가 된다.
+체크포인트(run_checkpoint.RunCheckpoint)를 넘기면 끝난 단계 결과를 저장하고, 이미 저장된 단계는 건너뛴다.
+"""
+
+import time
+import pickle
+import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+import metrics
+import tracing
+
+
+class StageGraph:
+    """의존성이 명시된 단계 그래프 (단계 함수는 의존 단계 이름을 키워드 인자로 받음)"""
+
+    def __init__(self, name: str = 'pipeline'):
+        """
+        Args:
+            name: 로그에 표시할 그래프 이름
+        """
+        self.name = name
+        self.stages: Dict[str, Tuple[Callable, Tuple[str, ...]]] = {}
+        self.transient: Set[str] = set()  # 체크포인트에 남기지 않는 단계 (이어서 실행할 때 항상 다시 실행)
+        self.restored: List[str] = []  # 마지막 실행에서 체크포인트로 복원한 단계
+        self.timings: Dict[str, Tuple[float, float]] = {}  # 단계: (시작 오프셋, 소요 시간) 초
+        self.wall_time = 0.0
+
+    def add(self, name: str, func: Callable, deps: Iterable[str] = (), checkpoint: bool = True) -> 'StageGraph':
+        """
+        단계 추가 (의존 단계는 먼저 추가되어 있어야 하므로 순환이 생기지 않음)
+
+        Args:
+            name: 단계 이름 (결과 딕셔너리 키)
+            func: 단계 함수, func(**{의존 단계: 결과})
+            deps: 의존 단계 이름들
+            checkpoint: False면 체크포인트에 남기지 않음 (외부 상태를 바꾸는 단계 — 이어서 실행할 때 다시 실행해야 상태가 복원됨)
+        """
+        deps = tuple(deps)
+        if name in self.stages:
+            raise ValueError(f"이미 등록된 단계입니다: {name}")
+        unknown = [dep for dep in deps if dep not in self.stages]
+        if unknown:
+            raise ValueError(f"{name} 단계의 의존 단계가 등록되지 않았습니다: {', '.join(unknown)}")
+        self.stages[name] = (func, deps)
+        if not checkpoint:
+            self.transient.add(name)
+        return self
+
+    def run(self, max_workers: Optional[int] = None, checkpoint=None) -> Dict[str, Any]:
+        """
+        그래프 실행
+
+        Args:
+            max_workers: 스레드 수 (기본: 단계 수, 최대 8)
+            checkpoint: RunCheckpoint — 저장된 단계는 결과를 불러오고, 새로 끝난 단계는 저장
+
+        Returns:
+            {단계 이름: 결과}
+
+        Raises:
+            단계에서 발생한 첫 예외 (아직 시작하지 않은 단계는 취소)
+        """
+        results: Dict[str, Any] = {}
+        remaining = dict(self.stages)
+        running = {}
+        self.timings = {}
+        self.restored = []
+        started = time.perf_counter()
+
+        if checkpoint is not None:
+            for name in self.stages:
+                if name not in self.transient and checkpoint.has(name):
+                    results[name] = checkpoint.load(name)
+                    remaining.pop(name)
+                    self.restored.append(name)
+            if self.restored:
+                logging.info(f"{self.name} 체크포인트에서 복원: {', '.join(self.restored)}")
+
+        def timed(name: str, func: Callable, kwargs: Dict) -> Any:
+            begin = time.perf_counter()
+            status = 'error'
+            try:
+                with tracing.span(name, 'stage'):
+                    result = func(**kwargs)
+                status = 'ok'
+                if checkpoint is not None and name not in self.transient:
+                    try:
+                        checkpoint.save(name, result)
+                    except (OSError, pickle.PicklingError, TypeError, AttributeError) as e:
+                        logging.warning(f"{name} 단계 체크포인트 저장 실패: {e}")
+                return result
+            finally:
+                duration = time.perf_counter() - begin
+                self.timings[name] = (begin - started, duration)
+                metrics.observe('stage_duration_seconds', duration, graph=self.name, stage=name)
+                metrics.inc('stage_runs_total', graph=self.name, stage=name, status=status)
+
+        executor = ThreadPoolExecutor(max_workers=max_workers or min(8, max(1, len(self.stages))),
+                                      thread_name_prefix=self.name)
+        try:
+            with tracing.span(self.name, 'graph'):
+                while remaining or running:
+                    for name in [name for name, (_, deps) in remaining.items() if all(dep in results for dep in deps)]:
+                        func, deps = remaining.pop(name)
+                        # 단계 스레드에서도 그래프 구간 아래로 중첩되도록 추적 문맥을 함께 넘김
+                        running[executor.submit(tracing.bind(timed), name, func, {dep: results[dep] for dep in deps})] = name
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[running.pop(future)] = future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.wall_time = time.perf_counter() - started
+
+        logging.info(f"{self.name} 실행 {self.wall_time:.2f}초 (단계 합계 {sum(d for _, d in self.timings.values()):.2f}초, "
+                     f"최장 경로: {' → '.join(self.critical_path())})")
+        return results
+
+    def critical_path(self) -> List[str]:
+        """마지막 실행 기준 가장 늦게 끝난 단계까지의 의존 경로"""
+        if not self.timings:
+            return []
+        finish = {name: start + duration for name, (start, duration) in self.timings.items()}
+        path = [max(finish, key=finish.get)]
+        while True:
+            deps = [dep for dep in self.stages[path[-1]][1] if dep in finish]
+            if not deps:
+                return path[::-1]
+            path.append(max(deps, key=finish.get))
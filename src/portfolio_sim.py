@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+랭킹 기반 포트폴리오 시뮬레이터
+일별 TOP k 종목을 목표 비중(동일가중/점수가중)으로 바꾸고 수수료·증권거래세·슬리피지를 반영하여
+자산곡선, 회전율, 샤프 비율, 최대 낙폭을 배열 연산으로 계산
+
+매일 목표 비중으로 리밸런싱한다고 보면 거래 전 비중은 전날 목표 비중이 하루 수익률만큼
+표류한 값이므로, 날짜 루프 없이 (…, 날짜, 종목) 배열 전체를 한 번에 계산할 수 있다.
+앞쪽 축을 추가하면 여러 파라미터 조합을 한 번에 평가할 수 있다.
+"""
+
+import argparse
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Optional
+from returns_engine import PriceMatrix
+
+DEFAULT_FEE_PCT = 0.015         # 매수/매도 위탁 수수료 (%)
+DEFAULT_SELL_TAX_PCT = 0.20     # 매도 증권거래세 (%)
+DEFAULT_SLIPPAGE_BPS = 5.0      # 기본 슬리피지 (bp, 편도)
+THIN_SLIPPAGE_BPS = 20.0        # 코스닥 소형주 등 호가가 얇은 종목 (bp, 편도)
+TRADING_DAYS = 252
+
+
+class CostModel:
+    """거래비용 모델 (수수료 + 매도세 + 종목별 슬리피지)"""
+
+    def __init__(self, fee_pct: float = DEFAULT_FEE_PCT, sell_tax_pct: float = DEFAULT_SELL_TAX_PCT,
+                 slippage_bps: float = DEFAULT_SLIPPAGE_BPS,
+                 market_slippage_bps: Optional[Dict[str, float]] = None,
+                 markets: Optional[Dict[str, str]] = None,
+                 overrides: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            fee_pct: 편도 수수료 (%)
+            sell_tax_pct: 매도 시 증권거래세 (%)
+            slippage_bps: 기본 편도 슬리피지 (bp)
+            market_slippage_bps: 시장별 슬리피지 (기본: KOSDAQ 20bp)
+            markets: {종목코드: 시장} (종목 마스터의 markets)
+            overrides: {종목코드: 슬리피지 bp} (개별 지정이 가장 우선)
+        """
+        self.fee_pct = fee_pct
+        self.sell_tax_pct = sell_tax_pct
+        self.slippage_bps = slippage_bps
+        self.market_slippage_bps = {'KOSDAQ': THIN_SLIPPAGE_BPS} if market_slippage_bps is None else market_slippage_bps
+        self.markets = markets or {}
+        self.overrides = overrides or {}
+
+    def slippage(self, codes) -> np.ndarray:
+        """종목별 편도 슬리피지 (비율)"""
+        bps = [
+            self.overrides.get(code, self.market_slippage_bps.get(self.markets.get(code, ''), self.slippage_bps))
+            for code in codes
+        ]
+        return np.asarray(bps, dtype=float) / 10000
+
+    def rates(self, codes):
+        """종목별 (매수 비용률, 매도 비용률) 배열"""
+        slippage = self.slippage(codes)
+        buy = self.fee_pct / 100 + slippage
+        sell = (self.fee_pct + self.sell_tax_pct) / 100 + slippage
+        return buy, sell
+
+
+def target_weights(rankings: pd.DataFrame, prices: PriceMatrix, resolve_code: Callable[[str], str],
+                   top_k: int = 10, weighting: str = 'equal', carry: bool = False) -> np.ndarray:
+    """
+    랭킹 이력 → 거래일 × 종목 목표 비중 행렬
+
+    예측일 당일(휴장일이면 직전 거래일) 종가에 편입한다고 보며 (ReturnsEngine과 같은 기준),
+    같은 거래일에 여러 랭킹이 대응하면 가장 최근 랭킹을 사용한다.
+
+    Args:
+        rankings: date / rank / stock_name / score 컬럼 DataFrame (backtest.rankings_frame 형식)
+        prices: 가격 행렬
+        resolve_code: 종목명 → 종목코드 함수
+        top_k: 편입 종목 수
+        weighting: 'equal' (동일가중) 또는 'score' (점수 비례)
+        carry: 랭킹이 없는 거래일에 직전 목표 비중 유지 (False면 현금)
+
+    Returns:
+        (거래일 수 × 종목 수) 비중 행렬, 각 행 합계는 1 또는 0
+    """
+    weights = np.zeros(prices.close.shape)
+    picks = rankings[rankings['rank'] <= top_k]
+    if picks.empty or prices.empty:
+        return weights
+
+    names = picks['stock_name'].unique()
+    code_of = {name: resolve_code(name) or '' for name in names}
+    cols = picks['stock_name'].map(lambda name: prices.code_index.get(code_of[name], -1)).to_numpy(dtype=np.int64)
+    ranking_dates = pd.to_datetime(picks['date']).values.astype('datetime64[D]')
+    rows = np.searchsorted(prices.dates, ranking_dates, side='right') - 1
+
+    # 같은 거래일에 대응하는 랭킹 중 최신 날짜만, 기준가가 있는 종목만 편입
+    latest = pd.Series(ranking_dates).groupby(rows).transform('max').to_numpy()
+    valid = (rows >= 0) & (cols >= 0) & (ranking_dates == latest)
+    valid[valid] = prices.close[rows[valid], cols[valid]] > 0
+    rows, cols = rows[valid], cols[valid]
+
+    if weighting == 'score':
+        raw = np.clip(picks['score'].to_numpy(dtype=float)[valid], 0, None)
+    else:
+        raw = np.ones(len(rows))
+    np.add.at(weights, (rows, cols), raw)
+
+    totals = weights.sum(axis=1, keepdims=True)
+    weights = np.divide(weights, totals, out=np.zeros_like(weights), where=totals > 0)
+
+    if carry:
+        active = totals[:, 0] > 0
+        source = np.where(active, np.arange(len(weights)), -1)
+        source = np.maximum.accumulate(source)
+        weights = np.where((source >= 0)[:, None], weights[np.maximum(source, 0)], 0.0)
+    return weights
+
+
+def simulate_weights(weights: np.ndarray, asset_returns: np.ndarray,
+                     buy_rate: np.ndarray, sell_rate: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    목표 비중 배열의 일별 손익 계산 (앞쪽 축은 파라미터 조합 등 배치 축)
+
+    Args:
+        weights: (..., T, N) 거래일 t 종가에 맞출 목표 비중
+        asset_returns: (T, N) t 종가 → t+1 종가 수익률 (비율, 결측은 0)
+        buy_rate: (N,) 매수 비용률
+        sell_rate: (N,) 매도 비용률
+
+    Returns:
+        gross / cost / net / turnover / equity / drawdown 배열 (..., T)
+    """
+    gross = (weights * asset_returns).sum(axis=-1)
+
+    # 거래 전 비중 = 전날 목표 비중이 하루 수익률로 표류한 값
+    grown = weights * (1 + asset_returns)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drifted = np.where((1 + gross)[..., None] > 0, grown / (1 + gross)[..., None], 0.0)
+    before = np.zeros_like(weights)
+    before[..., 1:, :] = drifted[..., :-1, :]
+
+    trades = weights - before
+    buys = np.clip(trades, 0, None)
+    sells = np.clip(-trades, 0, None)
+    cost = buys @ buy_rate + sells @ sell_rate
+    net = (1 - cost) * (1 + gross) - 1
+
+    equity = np.cumprod(1 + net, axis=-1)
+    peak = np.maximum.accumulate(np.maximum(equity, 1.0), axis=-1)
+    return {
+        'gross': gross,
+        'cost': cost,
+        'net': net,
+        'turnover': np.abs(trades).sum(axis=-1) / 2,
+        'equity': equity,
+        'drawdown': equity / peak - 1,
+    }
+
+
+def summarize(sim: Dict[str, np.ndarray], active: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+    """
+    자산곡선 요약 통계 (배치 축 유지)
+
+    Args:
+        sim: simulate_weights() 결과
+        active: (T,) 통계에 포함할 거래일 마스크 (첫 편입일 이후 등)
+
+    Returns:
+        total_return / annual_return / annual_volatility / sharpe / max_drawdown / avg_turnover / total_cost (%)
+    """
+    net = sim['net'] if active is None else sim['net'][..., active]
+    days = net.shape[-1]
+    equity_end = np.prod(1 + net, axis=-1)
+    mean, std = net.mean(axis=-1), net.std(axis=-1, ddof=1) if days > 1 else np.zeros(net.shape[:-1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(TRADING_DAYS), np.nan)
+        annual = np.where(days > 0, equity_end ** (TRADING_DAYS / max(days, 1)) - 1, np.nan)
+    return {
+        'trading_days': days,
+        'total_return': (equity_end - 1) * 100,
+        'annual_return': annual * 100,
+        'annual_volatility': std * np.sqrt(TRADING_DAYS) * 100,
+        'sharpe': sharpe,
+        'max_drawdown': sim['drawdown'].min(axis=-1) * 100,
+        'avg_turnover': (sim['turnover'] if active is None else sim['turnover'][..., active]).mean(axis=-1) * 100,
+        'total_cost': (sim['cost'] if active is None else sim['cost'][..., active]).sum(axis=-1) * 100,
+    }
+
+
+class PortfolioSimulator:
+    """랭킹 이력 포트폴리오 시뮬레이터"""
+
+    def __init__(self, prices: PriceMatrix, resolve_code: Callable[[str], str],
+                 cost_model: Optional[CostModel] = None):
+        """
+        Args:
+            prices: 날짜 × 종목코드 가격 행렬 (종가 사용)
+            resolve_code: 종목명 → 종목코드 함수
+            cost_model: 거래비용 모델 (기본: 수수료 0.015% + 매도세 0.20% + 슬리피지 5bp/KOSDAQ 20bp)
+        """
+        self.prices = prices
+        self.resolve_code = resolve_code
+        self.cost_model = cost_model or CostModel()
+
+        close = prices.close
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.zeros_like(close)
+            returns[:-1] = close[1:] / close[:-1] - 1
+        # 다음 거래일 가격이 없으면 수익률 0 (보유 평가 유지)
+        self.asset_returns = np.where(np.isfinite(returns), returns, 0.0)
+        self.buy_rate, self.sell_rate = self.cost_model.rates(prices.codes)
+
+    def run(self, rankings: pd.DataFrame, top_k: int = 10, weighting: str = 'equal', carry: bool = False) -> Dict:
+        """
+        시뮬레이션 실행
+
+        Args:
+            rankings: backtest.rankings_frame() 형식 DataFrame
+            top_k: 편입 종목 수
+            weighting: 'equal' / 'score'
+            carry: 랭킹 없는 거래일에 직전 비중 유지
+
+        Returns:
+            요약 통계(float)와 일별 자산곡선 DataFrame('daily')
+        """
+        weights = target_weights(rankings, self.prices, self.resolve_code, top_k, weighting, carry)
+        invested = weights.sum(axis=1) > 0
+        if not invested.any():
+            return {'trading_days': 0, 'daily': pd.DataFrame()}
+
+        sim = simulate_weights(weights, self.asset_returns, self.buy_rate, self.sell_rate)
+        active = np.arange(len(weights)) >= invested.argmax()
+        summary = {key: (float(value) if key != 'trading_days' else int(value))
+                   for key, value in summarize(sim, active).items()}
+
+        daily = pd.DataFrame({
+            'date': pd.to_datetime(self.prices.dates),
+            'positions': (weights > 0).sum(axis=1),
+            'gross_return': sim['gross'] * 100,
+            'cost': sim['cost'] * 100,
+            'net_return': sim['net'] * 100,
+            'turnover': sim['turnover'] * 100,
+            'equity': sim['equity'],
+            'drawdown': sim['drawdown'] * 100,
+        })[active].reset_index(drop=True)
+        summary['daily'] = daily
+        return summary
+
+
+def print_portfolio_report(summary: Dict) -> None:
+    """포트폴리오 시뮬레이션 결과 출력"""
+    if not summary.get('trading_days'):
+        print("❌ 편입 가능한 종목이 없어 포트폴리오를 시뮬레이션할 수 없습니다.")
+        return
+    print(f"\n💼 포트폴리오 시뮬레이션 (비용 반영, {summary['trading_days']}거래일):")
+    print(f"   누적 수익률: {summary['total_return']:+.2f}% | 연환산: {summary['annual_return']:+.2f}% | "
+          f"변동성: {summary['annual_volatility']:.2f}%")
+    print(f"   샤프 비율: {summary['sharpe']:.2f} | 최대 낙폭: {summary['max_drawdown']:.2f}%")
+    print(f"   일평균 회전율: {summary['avg_turnover']:.1f}% | 누적 거래비용: {summary['total_cost']:.2f}%")
+
+
+def main():
+    from backtest import rankings_frame
+    from kis_api import StockDataManager
+    from price_store import PriceBarStore
+    from ranking_store import RankingStore
+
+    parser = argparse.ArgumentParser(description='랭킹 기반 포트폴리오 시뮬레이터')
+    parser.add_argument('--start', help='시작일 (YYYY-MM-DD)')
+    parser.add_argument('--end', help='종료일 (YYYY-MM-DD)')
+    parser.add_argument('--top-k', type=int, default=10, help='편입 종목 수')
+    parser.add_argument('--weighting', choices=['equal', 'score'], default='equal', help='비중 방식')
+    parser.add_argument('--carry', action='store_true', help='랭킹 없는 날 직전 비중 유지')
+    parser.add_argument('--fee', type=float, default=DEFAULT_FEE_PCT, help='편도 수수료 (%%)')
+    parser.add_argument('--tax', type=float, default=DEFAULT_SELL_TAX_PCT, help='매도 증권거래세 (%%)')
+    parser.add_argument('--slippage-bps', type=float, default=DEFAULT_SLIPPAGE_BPS, help='기본 슬리피지 (bp)')
+    parser.add_argument('--thin-slippage-bps', type=float, default=THIN_SLIPPAGE_BPS,
+                        help='KOSDAQ 및 --thin 종목 슬리피지 (bp)')
+    parser.add_argument('--thin', default='', help='호가가 얇은 종목명 (쉼표 구분, 예: 지니틱스)')
+    args = parser.parse_args()
+
+    store = RankingStore()
+    rankings = rankings_frame(store.range(args.start, args.end))
+    store.close()
+    if rankings.empty:
+        print("❌ 저장된 랭킹이 없습니다.")
+        return
+
+    manager = StockDataManager(None)
+    codes = sorted({code for code in map(manager.get_stock_code, rankings['stock_name'].unique()) if code})
+    price_store = PriceBarStore()
+    prices = price_store.price_matrix(codes, start=(pd.Timestamp(rankings['date'].min()) - pd.Timedelta(days=10)).strftime('%Y-%m-%d'))
+    price_store.close()
+    if prices.empty:
+        print("❌ 로컬 일봉 저장소가 비어 있습니다. backfill_prices.py로 먼저 백필해주세요.")
+        return
+
+    thin = {manager.get_stock_code(name.strip()) for name in args.thin.split(',') if name.strip()}
+    cost_model = CostModel(
+        args.fee, args.tax, args.slippage_bps,
+        market_slippage_bps={'KOSDAQ': args.thin_slippage_bps},
+        markets=manager.stock_master.markets if manager.stock_master is not None else None,
+        overrides={code: args.thin_slippage_bps for code in thin if code},
+    )
+    summary = PortfolioSimulator(prices, manager.get_stock_code, cost_model).run(
+        rankings, args.top_k, args.weighting, args.carry)
+    print_portfolio_report(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+로컬 일봉 저장소 (SQLite)
+백필/일일 수집한 OHLCV를 종목코드·날짜 기준으로 저장하고 가격 행렬로 로드
+"""
+
+import sqlite3
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import List, Optional, Set, Tuple
+from data_paths import data_path
+from returns_engine import PriceMatrix
+
+# 평일인데 0행인 구간을 재시도하는 최대 횟수 (상장폐지 이후 구간처럼 끝내 비는 구간은 이후 완료로 간주)
+MAX_EMPTY_ATTEMPTS = 3
+
+
+class PriceBarStore:
+    """일봉(OHLCV) 로컬 저장소"""
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Args:
+            db_path: SQLite 파일 경로 (기본: data/price_bars.db)
+        """
+        self.db_path = db_path or data_path("price_bars.db")
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+    def _create_tables(self) -> None:
+        """테이블 생성"""
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS daily_bars (
+                code TEXT NOT NULL,
+                date TEXT NOT NULL,
+                open REAL,
+                high REAL,
+                low REAL,
+                close REAL,
+                volume INTEGER,
+                PRIMARY KEY (code, date)
+            ) WITHOUT ROWID;
+
+            CREATE TABLE IF NOT EXISTS backfill_progress (
+                code TEXT NOT NULL,
+                chunk_start TEXT NOT NULL,
+                chunk_end TEXT NOT NULL,
+                rows INTEGER NOT NULL,
+                done_at TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'done',
+                attempts INTEGER NOT NULL DEFAULT 1,
+                PRIMARY KEY (code, chunk_start, chunk_end)
+            ) WITHOUT ROWID;
+        """)
+
+        # status 컬럼 이전 DB: 0행 구간과 기록 당일 이후가 끝인 구간은 완료가 아니었으므로 재시도 대상으로 되돌림
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(backfill_progress)")]
+        if 'status' not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE backfill_progress ADD COLUMN status TEXT NOT NULL DEFAULT 'done'")
+                self.conn.execute(
+                    "UPDATE backfill_progress SET status = 'retry' "
+                    "WHERE rows = 0 OR chunk_end >= replace(substr(done_at, 1, 10), '-', '')"
+                )
+        if 'attempts' not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE backfill_progress ADD COLUMN attempts INTEGER NOT NULL DEFAULT 1")
+        self.conn.commit()
+
+    @staticmethod
+    def chunk_complete(chunk_start: str, chunk_end: str, rows: int, today: Optional[str] = None,
+                       listed_later: bool = False, attempts: int = 1) -> bool:
+        """
+        구간을 완료로 기록해도 되는지 (아니면 다음 백필에서 다시 조회)
+
+        - 오늘 이후가 끝인 구간은 아직 일봉이 더 생길 수 있으므로 미완료
+        - 평일이 있는데 0행이면 빈 응답/장애일 수 있으므로 미완료
+          단, 구간 뒤에 저장된 일봉이 있으면(상장 이전 구간) 또는 MAX_EMPTY_ATTEMPTS번째 조회면 완료
+
+        Args:
+            chunk_start: 구간 시작일 (YYYYMMDD)
+            chunk_end: 구간 종료일 (YYYYMMDD)
+            rows: 받은 행 수
+            today: 기준일 (YYYYMMDD, 기본: 오늘)
+            listed_later: 구간 종료일 이후 저장된 일봉이 있는지
+            attempts: 이번 조회를 포함한 조회 횟수
+        """
+        if chunk_end >= (today or datetime.now().strftime('%Y%m%d')):
+            return False
+        if rows > 0 or listed_later or attempts >= MAX_EMPTY_ATTEMPTS:
+            return True
+        end = datetime.strptime(chunk_end, '%Y%m%d').date() + timedelta(days=1)
+        return np.busday_count(datetime.strptime(chunk_start, '%Y%m%d').date(), end) == 0
+
+    def write_chunk(self, code: str, chunk_start: str, chunk_end: str, bars: pd.DataFrame) -> Tuple[int, bool]:
+        """
+        한 구간의 일봉 저장과 진행 상황 기록을 하나의 트랜잭션으로 처리
+
+        Args:
+            code: 종목 코드
+            chunk_start: 구간 시작일 (YYYYMMDD)
+            chunk_end: 구간 종료일 (YYYYMMDD)
+            bars: date/open/high/low/close/volume 컬럼 DataFrame
+
+        Returns:
+            (저장한 행 수, 완료 여부) — 미완료 구간은 status='retry'로 기록되어 다음 실행에서 다시 조회
+        """
+        rows = [
+            (code, pd.Timestamp(row.date).strftime('%Y-%m-%d'), row.open, row.high, row.low, row.close,
+             None if pd.isna(row.volume) else int(row.volume))
+            for row in bars.itertuples(index=False)
+        ]
+        previous = self.conn.execute(
+            "SELECT attempts FROM backfill_progress WHERE code = ? AND chunk_start = ? AND chunk_end = ?",
+            (code, chunk_start, chunk_end)
+        ).fetchone()
+        attempts = previous[0] + 1 if previous else 1
+        listed_later = not rows and self.conn.execute(
+            "SELECT 1 FROM daily_bars WHERE code = ? AND date > ? LIMIT 1",
+            (code, datetime.strptime(chunk_end, '%Y%m%d').strftime('%Y-%m-%d'))
+        ).fetchone() is not None
+        complete = self.chunk_complete(chunk_start, chunk_end, len(rows), listed_later=listed_later, attempts=attempts)
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO daily_bars (code, date, open, high, low, close, volume) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO backfill_progress (code, chunk_start, chunk_end, rows, done_at, status, attempts) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (code, chunk_start, chunk_end, len(rows), datetime.now().isoformat(timespec='seconds'),
+                 'done' if complete else 'retry', attempts)
+            )
+
+        return len(rows), complete
+
+    def completed_chunks(self) -> Set[Tuple[str, str, str]]:
+        """완료된 (종목코드, 구간 시작일, 구간 종료일) 집합 (재시도 대상 구간 제외)"""
+        cursor = self.conn.execute("SELECT code, chunk_start, chunk_end FROM backfill_progress WHERE status = 'done'")
+        return set(cursor.fetchall())
+
+    def load_bars(self, codes: Optional[List[str]] = None, start: Optional[str] = None,
+                  end: Optional[str] = None) -> pd.DataFrame:
+        """
+        저장된 일봉 조회
+
+        Args:
+            codes: 종목 코드 리스트 (없으면 전체)
+            start: 시작일 (YYYY-MM-DD)
+            end: 종료일 (YYYY-MM-DD)
+
+        Returns:
+            date/code/open/high/low/close/volume 컬럼 DataFrame
+        """
+        query = "SELECT date, code, open, high, low, close, volume FROM daily_bars WHERE 1=1"
+        params: list = []
+
+        if codes:
+            query += f" AND code IN ({','.join('?' * len(codes))})"
+            params.extend(codes)
+        if start:
+            query += " AND date >= ?"
+            params.append(start)
+        if end:
+            query += " AND date <= ?"
+            params.append(end)
+
+        df = pd.read_sql_query(query + " ORDER BY date, code", self.conn, params=params)
+        df['date'] = pd.to_datetime(df['date'])
+        return df
+
+    def price_matrix(self, codes: Optional[List[str]] = None, start: Optional[str] = None,
+                     end: Optional[str] = None) -> PriceMatrix:
+        """저장된 일봉으로 날짜 × 종목코드 가격 행렬 생성"""
+        return PriceMatrix.from_bars(self.load_bars(codes, start, end))
+
+    def close(self) -> None:
+        self.conn.close()
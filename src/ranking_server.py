@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+랭킹 조회 HTTP 서비스
+대시보드 / 알림 봇이 CLI를 실행하거나 src/의 JSON 파일을 읽는 대신 로컬 HTTP로 최신·과거 랭킹을 조회
+
+- GET  /latest                  최신 랭킹 결과 (TOP 10, 하락 예측 포함 전체)
+- GET  /history?from=&to=       날짜별 요약 인덱스 (TOP 10 / 하락 예측 종목, 시장 심리)
+- GET  /stock/{종목명}           종목별 랭킹 이력
+- GET  /health                  적재 상태 (실행 ID, 날짜 수)
+- POST /refresh                 랭킹 저장소 다시 적재 (랭킹 실행이 끝나면 notify_refresh()로 호출)
+
+랭킹 저장소(data/rankings.db)를 메모리에 올리고 응답 본문과 ETag를 미리 직렬화해 두므로
+요청 처리 중에는 디스크를 읽지 않는다. If-None-Match가 일치하면 본문 없이 304를 반환한다.
+새 실행은 POST /refresh 또는 주기적인 마지막 실행 ID 확인(기본 30초)으로 반영된다.
+"""
+
+import os
+import json
+import bisect
+import hashlib
+import logging
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+from urllib.request import Request, urlopen
+from ranking_store import STOCK_LISTS, RankingStore
+
+DEFAULT_PORT = 8787
+DEFAULT_POLL_INTERVAL = 30.0
+HISTORY_CACHE_SIZE = 256
+
+Encoded = Tuple[bytes, str]  # (JSON 본문, ETag)
+
+
+def _encode(payload) -> Encoded:
+    body = json.dumps(payload, ensure_ascii=False, default=str).encode('utf-8')
+    return body, f'"{hashlib.sha1(body).hexdigest()[:16]}"'
+
+
+class RankingSnapshot:
+    """한 시점의 랭킹 조회 데이터 (만든 뒤에는 바꾸지 않고 새 스냅샷으로 통째로 교체)"""
+
+    def __init__(self, results: Dict[str, Dict], version: int):
+        """
+        Args:
+            results: RankingStore.range() 결과 ({날짜: 랭킹 결과}, 날짜 오름차순)
+            version: 적재 시점의 마지막 실행 ID
+        """
+        self.version = version
+        self.loaded_at = datetime.now().isoformat(timespec='seconds')
+        self.dates = list(results)
+        self.index = [self._index_entry(date, results[date]) for date in self.dates]
+        self.latest: Optional[Encoded] = _encode(results[self.dates[-1]]) if self.dates else None
+
+        # 종목별 이력 (날짜 오름차순)
+        self.stocks: Dict[str, List[Dict]] = {}
+        for date, result in results.items():
+            for list_name in STOCK_LISTS:
+                for i, stock in enumerate(result.get(list_name) or [], 1):
+                    if not stock.get('stock_name'):
+                        continue
+                    self.stocks.setdefault(stock['stock_name'], []).append({
+                        'date': date, 'list': list_name, 'rank': stock.get('rank', i),
+                        'score': stock.get('score', stock.get('risk_score')), 'reason': stock.get('reason'),
+                    })
+
+        self._encoded: Dict[Tuple, Encoded] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _index_entry(date: str, result: Dict) -> Dict:
+        return {
+            'date': date,
+            'time': result.get('time'),
+            'market_sentiment': result.get('market_sentiment'),
+            'global_market_sentiment': result.get('global_market_sentiment'),
+            'top_10_stocks': [{'rank': stock.get('rank', i), 'stock_name': stock.get('stock_name'), 'score': stock.get('score')}
+                              for i, stock in enumerate(result.get('top_10_stocks') or [], 1)],
+            'declining_stocks': [{'rank': stock.get('rank', i), 'stock_name': stock.get('stock_name'),
+                                  'risk_score': stock.get('risk_score')}
+                                 for i, stock in enumerate(result.get('declining_stocks') or [], 1)],
+        }
+
+    def _cached(self, key: Tuple, build) -> Encoded:
+        """직렬화한 응답 재사용 (조회 조건 조합이 계속 늘지 않도록 HISTORY_CACHE_SIZE개에서 비움)"""
+        encoded = self._encoded.get(key)
+        if encoded is None:
+            encoded = _encode(build())
+            with self._lock:
+                if len(self._encoded) >= HISTORY_CACHE_SIZE:
+                    self._encoded.clear()
+                self._encoded[key] = encoded
+        return encoded
+
+    def history(self, start: Optional[str] = None, end: Optional[str] = None) -> Encoded:
+        """기간 내 날짜별 요약 (start/end 포함, YYYY-MM-DD)"""
+        def build():
+            lo = bisect.bisect_left(self.dates, start) if start else 0
+            hi = bisect.bisect_right(self.dates, end) if end else len(self.dates)
+            return {'from': start, 'to': end, 'days': max(hi - lo, 0), 'history': self.index[lo:hi]}
+        return self._cached(('history', start, end), build)
+
+    def stock(self, name: str) -> Optional[Encoded]:
+        """종목별 랭킹 이력 (랭킹에 오른 적이 없으면 None)"""
+        if name not in self.stocks:
+            return None
+        return self._cached(('stock', name), lambda: {'stock_name': name, 'history': self.stocks[name]})
+
+
+class RankingServer:
+    """랭킹 조회 HTTP 서버 (메모리 스냅샷 + 주기적 갱신)"""
+
+    def __init__(self, db_path: Optional[str] = None, host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+                 poll_interval: float = DEFAULT_POLL_INTERVAL):
+        """
+        Args:
+            db_path: 랭킹 저장소 경로 (기본: data/rankings.db)
+            host: 바인드 주소
+            port: 포트 (0이면 임의 포트)
+            poll_interval: 새 실행 확인 주기 (초, 0이면 POST /refresh로만 갱신)
+        """
+        self.store = RankingStore(db_path)
+        self.poll_interval = poll_interval
+        self.snapshot = RankingSnapshot({}, 0)
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self.refresh(force=True)
+
+        self.server = ThreadingHTTPServer((host, port), self._make_handler())
+        self.server.daemon_threads = True
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "RankingServer":
+        """백그라운드 스레드에서 서버와 갱신 확인 시작"""
+        self._start_thread(self.server.serve_forever)
+        if self.poll_interval > 0:
+            self._start_thread(self._poll)
+        return self
+
+    def serve_forever(self) -> None:
+        """현재 스레드에서 서버 실행 (갱신 확인은 백그라운드)"""
+        if self.poll_interval > 0:
+            self._start_thread(self._poll)
+        self.server.serve_forever()
+
+    def _start_thread(self, target) -> None:
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self) -> None:
+        """서버 종료"""
+        self._stop.set()
+        self.server.shutdown()
+        self.server.server_close()
+        for thread in self._threads:
+            thread.join()
+        self.store.close()
+
+    def __enter__(self) -> "RankingServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        마지막 실행 ID가 바뀌었으면 저장소를 다시 읽어 스냅샷 교체
+
+        Returns:
+            교체 여부
+        """
+        with self._refresh_lock:
+            version = self.store.latest_run_id()
+            if not force and version == self.snapshot.version:
+                return False
+            self.snapshot = RankingSnapshot(self.store.range(), version)
+        logging.info(f"랭킹 스냅샷 적재: 실행 {version}, {len(self.snapshot.dates)}일")
+        return True
+
+    def _poll(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except sqlite3.Error as e:
+                logging.warning(f"랭킹 저장소 확인 실패: {e}")
+
+    def handle(self, method: str, path: str) -> Tuple[int, Encoded]:
+        """
+        요청 1건 처리
+
+        Returns:
+            (HTTP 상태 코드, (JSON 본문, ETag))
+        """
+        parsed = urlparse(path)
+        if method == "POST" and parsed.path == "/refresh":
+            changed = self.refresh()
+            return 200, _encode({'refreshed': changed, 'version': self.snapshot.version})
+        if method != "GET":
+            return 405, _encode({'error': f"지원하지 않는 메서드입니다: {method}"})
+
+        snapshot = self.snapshot
+        if parsed.path == "/latest":
+            if snapshot.latest is None:
+                return 404, _encode({'error': "저장된 랭킹이 없습니다"})
+            return 200, snapshot.latest
+        if parsed.path == "/history":
+            query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+            return 200, snapshot.history(query.get('from'), query.get('to'))
+        if parsed.path.startswith("/stock/"):
+            name = unquote(parsed.path[len("/stock/"):])
+            encoded = snapshot.stock(name)
+            if encoded is None:
+                return 404, _encode({'error': f"랭킹 이력이 없는 종목입니다: {name}"})
+            return 200, encoded
+        if parsed.path == "/health":
+            return 200, _encode({'version': snapshot.version, 'days': len(snapshot.dates),
+                                 'latest_date': snapshot.dates[-1] if snapshot.dates else None,
+                                 'loaded_at': snapshot.loaded_at})
+        return 404, _encode({'error': f"없는 경로입니다: {parsed.path}"})
+
+    def _make_handler(self):
+        ranking_server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # keep-alive (대시보드 폴링 시 연결 재사용) + 헤더/본문을 나눠 보낼 때 Nagle 지연(~40ms) 방지
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _dispatch(self, method: str) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+
+                status, (body, etag) = ranking_server.handle(method, self.path)
+                if status == 200 and method == "GET" and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if method == "GET":
+                    self.send_header("ETag", etag)
+                    self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def notify_refresh(url: Optional[str] = None, timeout: float = 1.0) -> bool:
+    """
+    랭킹 서버에 새 실행 반영 요청 (랭킹 저장 직후 호출)
+
+    Args:
+        url: 서버 주소 (기본: TUJA_RANKING_SERVER 환경변수, 없으면 아무것도 하지 않음)
+        timeout: 응답 대기 시간 (초)
+
+    Returns:
+        반영 요청 성공 여부 (서버가 떠 있지 않아도 예외 없이 False)
+    """
+    url = url or os.getenv("TUJA_RANKING_SERVER")
+    if not url:
+        return False
+    try:
+        with urlopen(Request(url.rstrip('/') + "/refresh", data=b"", method="POST"), timeout=timeout) as response:
+            return response.status == 200
+    except OSError as e:
+        logging.warning(f"랭킹 서버 갱신 요청 실패: {e}")
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='랭킹 조회 HTTP 서비스')
+    parser.add_argument('--db', help='랭킹 저장소 경로 (기본: data/rankings.db)')
+    parser.add_argument('--host', default='127.0.0.1', help='바인드 주소')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='포트')
+    parser.add_argument('--poll', type=float, default=DEFAULT_POLL_INTERVAL,
+                        help='새 실행 확인 주기 (초, 0이면 POST /refresh로만 갱신)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    server = RankingServer(args.db, args.host, args.port, args.poll)
+    print(f"🌐 랭킹 조회 서비스 시작: {server.base_url} ({len(server.snapshot.dates)}일 적재)")
+    print(f"   {server.base_url}/latest | /history?from=YYYY-MM-DD&to=YYYY-MM-DD | /stock/종목명 | /health")
+    print(f"💡 랭킹 실행 후 즉시 반영: TUJA_RANKING_SERVER={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 종료합니다.")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
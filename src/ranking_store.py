@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+랭킹 이력 저장소 (SQLite)
+일일 랭킹 결과를 추가 전용으로 쌓아 두고 기간·종목 기준으로 인덱스 조회
+기존 enhanced_stock_ranking_{날짜}.json / stock_ranking_{날짜}.json(.csv) 파일은 import_files()로 한 번 가져옴
+"""
+
+import os
+import re
+import json
+import sqlite3
+import argparse
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from data_paths import data_path
+from rollups import RankingRollups
+
+# 같은 날짜에 두 시스템 결과가 모두 있으면 향상된 시스템 결과를 우선
+# (유니버스 결과 'enhanced:<이름>'은 system을 지정해야만 조회되고 롤업에도 들어가지 않음)
+SYSTEM_PRIORITY = {'basic': 0, 'enhanced': 1}
+FILE_PATTERN = re.compile(r'^(enhanced_)?stock_ranking_(\d{4}-\d{2}-\d{2})\.(json|csv)$')
+STOCK_LISTS = ('top_10_stocks', 'declining_stocks')
+
+
+class RankingStore:
+    """일일 랭킹 이력 저장소"""
+
+    def __init__(self, db_path: Optional[str] = None, sectors: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            db_path: SQLite 파일 경로 (기본: data/rankings.db)
+            sectors: 롤업용 {종목명: 섹터} (없는 종목은 '기타')
+        """
+        self.db_path = db_path or data_path("rankings.db")
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_tables()
+
+        # 일/주/월 롤업 (롤업 도입 전에 쌓인 이력은 한 번 재생성)
+        self.rollups = RankingRollups(self.conn, sectors)
+        if self.rollups.is_empty() and not self.is_empty():
+            self.rebuild_rollups()
+
+    def _create_tables(self) -> None:
+        """테이블 생성"""
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS ranking_runs (
+                run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date TEXT NOT NULL,
+                system TEXT NOT NULL,
+                saved_at TEXT NOT NULL,
+                source TEXT,
+                payload TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_runs_date ON ranking_runs (date, system, run_id);
+
+            CREATE TABLE IF NOT EXISTS ranking_stocks (
+                run_id INTEGER NOT NULL,
+                date TEXT NOT NULL,
+                system TEXT NOT NULL,
+                list TEXT NOT NULL,
+                rank INTEGER,
+                stock_name TEXT NOT NULL,
+                score REAL,
+                region TEXT,
+                mention_count INTEGER,
+                reason TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_stocks_name ON ranking_stocks (stock_name, date);
+        """)
+        self.conn.commit()
+
+    def save(self, result: Dict, system: str = 'enhanced', source: Optional[str] = None) -> int:
+        """
+        랭킹 결과 한 건 추가 (같은 날짜를 다시 저장하면 최신 실행이 조회됨)
+
+        Args:
+            result: generate_*_daily_ranking() 결과 딕셔너리 (date 키 필수)
+            system: 'enhanced', 'basic' 또는 유니버스 결과 'enhanced:<이름>'
+            source: 가져온 원본 파일 경로 (직접 저장 시 None)
+
+        Returns:
+            실행 ID
+        """
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO ranking_runs (date, system, saved_at, source, payload) VALUES (?, ?, ?, ?, ?)",
+                (result['date'], system, datetime.now().isoformat(timespec='seconds'), source,
+                 json.dumps(result, ensure_ascii=False, default=str))
+            )
+            run_id = cursor.lastrowid
+            rows = [
+                (run_id, result['date'], system, key, stock.get('rank', i), stock.get('stock_name', ''),
+                 stock.get('score'), stock.get('region'), stock.get('mention_count'), stock.get('reason'))
+                for key in STOCK_LISTS
+                for i, stock in enumerate(result.get(key) or [], 1)
+            ]
+            self.conn.executemany(
+                "INSERT INTO ranking_stocks (run_id, date, system, list, rank, stock_name, score, region, mention_count, reason) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+        # 같은 날짜에 우선순위가 더 높은 결과가 있으면 그 결과가 롤업에 남음
+        date = result['date']
+        if system in SYSTEM_PRIORITY:
+            self.rollups.apply_day(date, self.range(date, date)[date])
+        return run_id
+
+    def range(self, start: Optional[str] = None, end: Optional[str] = None,
+              system: Optional[str] = None) -> Dict[str, Dict]:
+        """
+        기간 내 날짜별 랭킹 결과 조회
+
+        Args:
+            start: 시작일 (YYYY-MM-DD, 포함)
+            end: 종료일 (YYYY-MM-DD, 포함)
+            system: 특정 시스템만 조회 (없으면 날짜별로 enhanced → basic 순 우선, 유니버스 결과 제외)
+
+        Returns:
+            {날짜: 랭킹 결과} (날짜 오름차순)
+        """
+        query = "SELECT date, system, payload FROM ranking_runs WHERE 1=1"
+        params: list = []
+
+        if start:
+            query += " AND date >= ?"
+            params.append(start)
+        if end:
+            query += " AND date <= ?"
+            params.append(end)
+        if system:
+            query += " AND system = ?"
+            params.append(system)
+        else:
+            query += f" AND system IN ({', '.join('?' * len(SYSTEM_PRIORITY))})"
+            params.extend(SYSTEM_PRIORITY)
+
+        # 같은 날짜 안에서 우선순위가 높고 최신인 실행이 마지막에 오도록 정렬해 덮어씀
+        best: Dict[str, tuple] = {}
+        for date, run_system, payload in self.conn.execute(query + " ORDER BY date, run_id", params):
+            priority = SYSTEM_PRIORITY.get(run_system, 0)
+            if date not in best or priority >= best[date][0]:
+                best[date] = (priority, payload)
+
+        return {date: json.loads(payload) for date, (_, payload) in best.items()}
+
+    def recent(self, days_back: int, system: Optional[str] = None) -> Dict[str, Dict]:
+        """오늘 포함 최근 days_back일 랭킹 결과 조회"""
+        today = datetime.now()
+        start = (today - timedelta(days=days_back - 1)).strftime('%Y-%m-%d')
+        return self.range(start, today.strftime('%Y-%m-%d'), system)
+
+    def by_stock(self, stock_name: str, start: Optional[str] = None, end: Optional[str] = None,
+                 list_name: str = 'top_10_stocks') -> pd.DataFrame:
+        """
+        종목별 랭킹 이력 조회 (날짜·시스템별 최신 실행 기준)
+
+        Args:
+            stock_name: 종목명
+            start: 시작일 (YYYY-MM-DD)
+            end: 종료일 (YYYY-MM-DD)
+            list_name: 'top_10_stocks' 또는 'declining_stocks'
+
+        Returns:
+            date/system/rank/score/region/mention_count/reason 컬럼 DataFrame
+        """
+        query = """
+            SELECT s.date, s.system, s.rank, s.score, s.region, s.mention_count, s.reason
+            FROM ranking_stocks s
+            WHERE s.stock_name = ? AND s.list = ?
+              AND s.run_id IN (SELECT MAX(run_id) FROM ranking_runs GROUP BY date, system)
+        """
+        params: list = [stock_name, list_name]
+
+        if start:
+            query += " AND s.date >= ?"
+            params.append(start)
+        if end:
+            query += " AND s.date <= ?"
+            params.append(end)
+
+        return pd.read_sql_query(query + " ORDER BY s.date, s.system", self.conn, params=params)
+
+    def rebuild_rollups(self) -> int:
+        """저장된 전체 랭킹으로 롤업 재생성 (반영한 일수 반환)"""
+        results = self.range()
+        with self.conn:
+            self.conn.execute("DELETE FROM ranking_rollups")
+        for date, result in results.items():
+            self.rollups.apply_day(date, result)
+        return len(results)
+
+    def stored_keys(self) -> set:
+        """저장된 (날짜, 시스템) 집합"""
+        return set(self.conn.execute("SELECT DISTINCT date, system FROM ranking_runs").fetchall())
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM ranking_runs LIMIT 1").fetchone() is None
+
+    def latest_run_id(self) -> int:
+        """마지막 실행 ID (저장된 실행이 없으면 0) — 새 결과 저장 여부 확인용"""
+        return self.conn.execute("SELECT COALESCE(MAX(run_id), 0) FROM ranking_runs").fetchone()[0]
+
+    def import_files(self, directory: str = '.') -> int:
+        """
+        기존 랭킹 JSON/CSV 파일 일괄 가져오기 (이미 저장된 날짜·시스템은 건너뜀)
+
+        같은 날짜에 JSON과 CSV가 모두 있으면 전체 정보가 담긴 JSON을 사용하고
+        CSV만 남아 있는 경우 TOP 10 행과 시장 심리로 결과를 복원한다.
+
+        Args:
+            directory: 파일이 있는 디렉토리
+
+        Returns:
+            가져온 결과 수
+        """
+        found: Dict[tuple, str] = {}
+        for name in sorted(os.listdir(directory)):
+            match = FILE_PATTERN.match(name)
+            if not match:
+                continue
+            key = (match.group(2), 'enhanced' if match.group(1) else 'basic')
+            if key not in found or name.endswith('.json'):
+                found[key] = os.path.join(directory, name)
+
+        existing = self.stored_keys()
+        imported = 0
+        for (date, system), path in sorted(found.items()):
+            if (date, system) in existing:
+                continue
+            try:
+                result = _read_json_result(path) if path.endswith('.json') else _read_csv_result(path, date)
+            except (json.JSONDecodeError, ValueError, KeyError, pd.errors.ParserError) as e:
+                print(f"⚠️ {path} 가져오기 실패: {e}")
+                continue
+            result.setdefault('date', date)
+            self.save(result, system, source=os.path.abspath(path))
+            imported += 1
+
+        return imported
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def _read_json_result(path: str) -> Dict:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _read_csv_result(path: str, date: str) -> Dict:
+    """CSV(TOP 10 행)에서 랭킹 결과 딕셔너리 복원"""
+    df = pd.read_csv(path, encoding='utf-8-sig')
+    result = {'date': date, 'top_10_stocks': []}
+    if df.empty:
+        return result
+
+    first = df.iloc[0]
+    for column, key in [('market_sentiment', 'market_sentiment'), ('global_sentiment', 'global_market_sentiment'),
+                        ('domestic_news', 'domestic_news_count'), ('global_news', 'global_news_count')]:
+        if column in df.columns and pd.notna(first[column]):
+            result[key] = first[column].item() if hasattr(first[column], 'item') else first[column]
+
+    stock_columns = [c for c in df.columns if c not in ('date', 'market_sentiment', 'global_sentiment', 'domestic_news', 'global_news')]
+    records = df[stock_columns].astype(object).where(df[stock_columns].notna(), None).to_dict('records')
+    result['top_10_stocks'] = records
+    return result
+
+
+def load_ranking_history(days_back: int, system: Optional[str] = None, store: Optional[RankingStore] = None,
+                         legacy_dir: str = '.') -> Dict[str, Dict]:
+    """
+    최근 랭킹 이력 로드 (저장소가 비어 있으면 legacy_dir의 기존 파일을 먼저 가져옴)
+
+    Args:
+        days_back: 오늘 포함 조회 일수
+        system: 'enhanced' / 'basic' (없으면 날짜별 우선순위 적용)
+        store: 사용할 저장소 (없으면 기본 경로)
+        legacy_dir: 기존 JSON/CSV 파일 디렉토리
+
+    Returns:
+        {날짜: 랭킹 결과}
+    """
+    store = store or RankingStore()
+    if store.is_empty():
+        imported = store.import_files(legacy_dir)
+        if imported:
+            print(f"📥 기존 랭킹 파일 {imported}개를 랭킹 저장소로 가져왔습니다: {store.db_path}")
+    return store.recent(days_back, system)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='랭킹 이력 저장소')
+    parser.add_argument('--db', help='SQLite 파일 경로 (기본: data/rankings.db)')
+    parser.add_argument('--import-dir', help='기존 랭킹 JSON/CSV 파일을 가져올 디렉토리')
+    parser.add_argument('--start', help='조회 시작일 (YYYY-MM-DD)')
+    parser.add_argument('--end', help='조회 종료일 (YYYY-MM-DD)')
+    parser.add_argument('--stock', help='종목별 랭킹 이력 조회')
+    args = parser.parse_args()
+
+    store = RankingStore(args.db)
+
+    if args.import_dir:
+        imported = store.import_files(args.import_dir)
+        print(f"📥 {imported}개 결과를 가져왔습니다 ({store.db_path})")
+
+    if args.stock:
+        history = store.by_stock(args.stock, args.start, args.end)
+        if history.empty:
+            print(f"❌ '{args.stock}' 랭킹 이력이 없습니다.")
+        else:
+            print(f"📈 {args.stock} 랭킹 이력 ({len(history)}건)")
+            print(history.to_string(index=False))
+    elif args.start or args.end or not args.import_dir:
+        results = store.range(args.start, args.end)
+        print(f"📅 저장된 랭킹: {len(results)}일")
+        for date, result in results.items():
+            top = [stock.get('stock_name', '') for stock in result.get('top_10_stocks', [])[:3]]
+            print(f"   {date}: {result.get('market_sentiment', '-')} | {', '.join(top) or '-'}")
+
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
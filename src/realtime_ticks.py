@@ -0,0 +1,600 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+한국투자증권 실시간 체결가(WebSocket) 수신 모듈
+H0STCNT0(국내주식 실시간 체결가) 메시지를 디코딩하여 종목별로 미리 할당한
+NumPy 링 버퍼(시각, 체결가, 체결량)에 바로 기록 (틱마다 dict/객체를 만들지 않음)
+
+- TickRing: 2배 길이 배열에 두 번씩 기록 → 최근 N틱을 복사 없이 연속 뷰로 반환
+- 체결 메시지는 '^' 위치를 NumPy로 한 번에 찾고 필요한 4개 필드만 숫자로 변환
+- RealtimeQuoteStream: 종목 구독/해지, 콜백, PINGPONG 응답, 재접속
+  세션당 구독 한도(41종목)를 넘으면 세션을 여러 개 열어 같은 TickBuffer에 기록 (수백 종목 구독)
+- LocalQuoteServer: 테스트용 로컬 WebSocket 체결가 서버
+
+websockets 패키지가 필요합니다: pip install websockets
+"""
+
+import os
+import json
+import time
+import zlib
+import random
+import asyncio
+import logging
+import threading
+import numpy as np
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from kis_api import KoreaInvestmentAPI, load_env
+
+EXECUTION_TR_ID = "H0STCNT0"  # 국내주식 실시간 체결가
+H0STCNT0_FIELDS = 46          # 체결 1건당 '^' 구분 필드 수
+FIELD_CODE, FIELD_TIME, FIELD_PRICE, FIELD_VOLUME = 0, 1, 2, 12
+FIELD_SEPARATOR = ord('^')
+
+# 실시간 서버는 세션당 구독 가능 종목 수가 제한됨
+MAX_SUBSCRIPTIONS_PER_SESSION = 41
+
+TICK_DTYPE = np.dtype([('ts', 'i8'), ('price', 'f8'), ('volume', 'i8')])  # ts: epoch 나노초
+
+
+class TickRing:
+    """종목 1개의 고정 크기 틱 링 버퍼"""
+
+    __slots__ = ('code', 'capacity', 'data', 'pos', 'count')
+
+    def __init__(self, capacity: int = 1024, code: str = ""):
+        """
+        Args:
+            capacity: 보관할 최근 틱 수
+            code: 종목 코드
+        """
+        self.code = code
+        self.capacity = capacity
+        # [pos, pos + capacity) 구간이 항상 오래된 순서의 최근 틱이 되도록 두 번씩 기록
+        self.data = np.zeros(2 * capacity, dtype=TICK_DTYPE)
+        self.pos = 0
+        self.count = 0
+
+    def append(self, ts: int, price: float, volume: int) -> None:
+        """틱 1건 기록"""
+        row = (ts, price, volume)
+        self.data[self.pos] = row
+        self.data[self.pos + self.capacity] = row
+        self.pos = (self.pos + 1) % self.capacity
+        self.count += 1
+
+    def extend(self, ts: np.ndarray, price: np.ndarray, volume: np.ndarray) -> None:
+        """틱 여러 건 기록 (배열 단위, capacity보다 많으면 최근 capacity건만 남음)"""
+        n = len(ts)
+        keep = min(n, self.capacity)
+        idx = (self.pos + np.arange(n - keep, n)) % self.capacity
+        for offset in (0, self.capacity):
+            self.data['ts'][idx + offset] = ts[n - keep:]
+            self.data['price'][idx + offset] = price[n - keep:]
+            self.data['volume'][idx + offset] = volume[n - keep:]
+        self.pos = (self.pos + n) % self.capacity
+        self.count += n
+
+    def latest(self, n: Optional[int] = None) -> np.ndarray:
+        """
+        최근 n틱 (복사 없는 읽기 전용 뷰, 오래된 순)
+
+        뷰는 버퍼를 그대로 가리키므로 이후 틱이 capacity개 이상 들어오면 내용이 바뀐다.
+        오래 보관하려면 .copy()를 사용할 것.
+
+        Returns:
+            ts/price/volume 필드 구조화 배열 뷰
+        """
+        n = self.capacity if n is None else n
+        n = max(0, min(n, self.count, self.capacity))
+        end = self.pos + self.capacity
+        view = self.data[end - n:end]
+        view.flags.writeable = False
+        return view
+
+
+class TickBuffer:
+    """종목별 틱 링 버퍼 모음"""
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.rings: Dict[str, TickRing] = {}
+        self.keys: Dict[bytes, TickRing] = {}  # 메시지 바이트에서 바로 찾기 위한 종목코드(bytes) 색인
+
+    def ensure(self, code: str) -> TickRing:
+        """종목 링 버퍼 할당 (이미 있으면 그대로 반환)"""
+        ring = self.rings.get(code)
+        if ring is None:
+            ring = self.rings[code] = self.keys[code.encode()] = TickRing(self.capacity, code)
+        return ring
+
+    def latest(self, code: str, n: Optional[int] = None) -> np.ndarray:
+        """종목의 최근 n틱 뷰 (구독하지 않은 종목은 빈 배열)"""
+        ring = self.rings.get(code)
+        return ring.latest(n) if ring else np.zeros(0, dtype=TICK_DTYPE)
+
+    def __len__(self) -> int:
+        return len(self.rings)
+
+
+def build_execution_message(records: List[Tuple[str, str, float, int]]) -> str:
+    """
+    H0STCNT0 실시간 체결 메시지 생성 (로컬 서버/테스트용)
+
+    Args:
+        records: (종목코드, 체결시각 HHMMSS, 체결가, 체결량) 리스트
+
+    Returns:
+        '0|H0STCNT0|건수|필드^필드^...' 형식 문자열
+    """
+    fields = []
+    for code, hhmmss, price, volume in records:
+        record = ['0'] * H0STCNT0_FIELDS
+        record[FIELD_CODE] = code
+        record[FIELD_TIME] = hhmmss
+        record[FIELD_PRICE] = f"{price:.0f}"
+        record[FIELD_VOLUME] = str(volume)
+        fields.extend(record)
+    return f"0|{EXECUTION_TR_ID}|{len(records):03d}|" + "^".join(fields)
+
+
+def _parse_digits(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    buf[starts[i]:ends[i]] 숫자 필드들을 한 번에 정수로 변환 (부호/소수점 없는 필드 전용)
+
+    Returns:
+        int64 배열
+    """
+    width = ends - starts
+    if not len(width):
+        return np.zeros(0, dtype=np.int64)
+    place = np.arange(int(width.max()))
+    valid = place < width[:, None]
+    positions = np.where(valid, ends[:, None] - 1 - place, 0)
+    digits = np.where(valid, buf[positions].astype(np.int64) - 48, 0)
+    return digits @ (10 ** place)
+
+
+def _day_start_ns() -> int:
+    """오늘 0시 (epoch 나노초, 로컬 시간 기준)"""
+    midnight = datetime.combine(date.today(), datetime.min.time())
+    return int(midnight.timestamp()) * 1_000_000_000
+
+
+class _Session:
+    """WebSocket 세션 1개 (구독 종목 최대 max_per_session개)"""
+
+    __slots__ = ('index', 'codes', 'ws')
+
+    def __init__(self, index: int):
+        self.index = index
+        self.codes: List[str] = []
+        self.ws = None
+
+
+class RealtimeQuoteStream:
+    """KIS 실시간 체결가 WebSocket 수신기 (세션당 구독 한도를 넘으면 여러 세션으로 나눠 접속)"""
+
+    def __init__(self, api: Optional[KoreaInvestmentAPI] = None, url: Optional[str] = None,
+                 capacity: int = 1024, approval_key: Optional[str] = None,
+                 max_per_session: int = MAX_SUBSCRIPTIONS_PER_SESSION):
+        """
+        Args:
+            api: 접속키 발급용 KIS API 클라이언트 (없으면 approval_key 사용)
+            url: WebSocket 주소 (기본: KIS_WS_URL 또는 모의/실전 실시간 서버)
+            capacity: 종목별 보관 틱 수
+            approval_key: 실시간 접속키 (직접 지정 시)
+            max_per_session: 세션 1개에 구독할 최대 종목 수
+        """
+        load_env()
+        is_demo = api.is_demo if api else True
+        default_url = "ws://ops.koreainvestment.com:31000" if is_demo else "ws://ops.koreainvestment.com:21000"
+        self.url = url or os.getenv("KIS_WS_URL") or default_url
+        self.api = api
+        self.approval_key = approval_key
+        self.max_per_session = max_per_session
+        self.book = TickBuffer(capacity)
+        self.sessions: List[_Session] = []
+
+        self._callbacks: Dict[str, List[Callable[[str, TickRing], None]]] = {}
+        self._session_of: Dict[str, _Session] = {}
+        self._lock = threading.Lock()  # 구독 변경(호출 스레드) ↔ 접속 시 일괄 구독(수신 스레드)
+        self._day_start = _day_start_ns()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._tasks: List[asyncio.Future] = []
+        self._running = False
+        self._stop_event: Optional[asyncio.Event] = None
+        self.connected = threading.Event()  # 모든 세션이 접속된 상태
+        self.stats = {'messages': 0, 'ticks': 0, 'pings': 0}
+
+    def _frame(self, code: str, tr_type: str) -> str:
+        """구독('1')/해지('2') 요청 메시지"""
+        return json.dumps({
+            "header": {
+                "approval_key": self.approval_key or "",
+                "custtype": "P",
+                "tr_type": tr_type,
+                "content-type": "utf-8"
+            },
+            "body": {"input": {"tr_id": EXECUTION_TR_ID, "tr_key": code}}
+        })
+
+    def _send(self, session: _Session, message: str) -> None:
+        """세션 이벤트 루프로 메시지 전송 (연결 전이면 접속 시 일괄 구독)"""
+        if self._loop and session.ws is not None:
+            asyncio.run_coroutine_threadsafe(session.ws.send(message), self._loop)
+
+    def _assign(self, code: str) -> _Session:
+        """빈 자리가 있는 세션에 종목 배정 (없으면 새 세션, 수신 중이면 바로 접속)"""
+        session = next((s for s in self.sessions if len(s.codes) < self.max_per_session), None)
+        if session is None:
+            session = _Session(len(self.sessions))
+            self.sessions.append(session)
+            self.connected.clear()
+            if self._running:
+                self._loop.call_soon_threadsafe(self._spawn, session)
+        session.codes.append(code)
+        self._session_of[code] = session
+        return session
+
+    def subscribe(self, codes: Iterable[str], callback: Optional[Callable[[str, TickRing], None]] = None) -> None:
+        """
+        종목 구독 (링 버퍼를 미리 할당, max_per_session개마다 세션 추가)
+
+        Args:
+            codes: 종목 코드 목록
+            callback: 새 체결이 들어올 때 메시지마다 호출 (종목코드, TickRing)
+        """
+        for code in codes:
+            self.book.ensure(code)
+            with self._lock:
+                new = code not in self._callbacks
+                self._callbacks.setdefault(code, [])
+                if callback:
+                    self._callbacks[code].append(callback)
+                session = self._assign(code) if new else None
+            if session is not None:
+                self._send(session, self._frame(code, "1"))
+
+    def unsubscribe(self, codes: Iterable[str]) -> None:
+        """종목 구독 해지 (수신된 틱 버퍼는 유지, 비는 자리는 다음 구독에 재사용)"""
+        for code in codes:
+            with self._lock:
+                if self._callbacks.pop(code, None) is None:
+                    continue
+                session = self._session_of.pop(code)
+                session.codes.remove(code)
+            self._send(session, self._frame(code, "2"))
+
+    def latest(self, code: str, n: Optional[int] = None) -> np.ndarray:
+        """종목의 최근 n틱 뷰"""
+        return self.book.latest(code, n)
+
+    def handle_message(self, raw: str) -> Optional[str]:
+        """
+        수신 메시지 처리
+
+        Returns:
+            서버로 돌려보낼 응답 (PINGPONG이면 같은 메시지, 그 외 None)
+        """
+        self.stats['messages'] += 1
+
+        if raw[:1] in ('0', '1'):
+            if raw[0] == '1':
+                logging.debug("암호화된 실시간 메시지는 처리하지 않습니다.")
+            else:
+                self._decode_executions(raw)
+            return None
+
+        try:
+            message = json.loads(raw)
+        except ValueError:
+            logging.warning(f"알 수 없는 실시간 메시지: {raw[:80]}")
+            return None
+
+        header = message.get("header", {})
+        if header.get("tr_id") == "PINGPONG":
+            self.stats['pings'] += 1
+            return raw
+
+        body = message.get("body", {})
+        if body.get("rt_cd", "0") != "0":
+            logging.error(f"실시간 구독 오류 {header.get('tr_key', '')}: {body.get('msg1', '')}")
+        return None
+
+    def _decode_executions(self, raw: str) -> None:
+        """
+        '0|H0STCNT0|건수|...' 체결 메시지를 링 버퍼에 바로 기록
+
+        '^' 위치를 NumPy로 한 번에 찾고 필요한 필드(종목코드/시각/체결가/체결량)만 읽는다
+        (틱마다 46개 필드 문자열을 만들지 않음).
+        """
+        _, tr_id, count, payload = raw.split('|', 3)
+        if tr_id != EXECUTION_TR_ID:
+            return
+
+        data = payload.encode()
+        buf = np.frombuffer(data, dtype=np.uint8)
+        seps = np.flatnonzero(buf == FIELD_SEPARATOR)
+        starts = np.empty(len(seps) + 1, dtype=np.int64)
+        starts[0], starts[1:] = 0, seps + 1
+        ends = np.empty_like(starts)
+        ends[:-1], ends[-1] = seps, len(buf)
+
+        base = np.arange(int(count)) * H0STCNT0_FIELDS
+        keys = self.book.keys
+        hits: Dict[TickRing, List[int]] = {}
+        for i, (start, end) in enumerate(zip(starts[base].tolist(), ends[base].tolist())):
+            ring = keys.get(data[start:end])
+            if ring is not None:
+                hits.setdefault(ring, []).append(i)
+        if not hits:
+            return
+
+        hhmmss = _parse_digits(buf, starts[base + FIELD_TIME], ends[base + FIELD_TIME])
+        seconds = hhmmss // 10000 * 3600 + hhmmss // 100 % 100 * 60 + hhmmss % 100
+        ts = self._day_start + seconds * 1_000_000_000
+        price = _parse_digits(buf, starts[base + FIELD_PRICE], ends[base + FIELD_PRICE]).astype(np.float64)
+        volume = _parse_digits(buf, starts[base + FIELD_VOLUME], ends[base + FIELD_VOLUME])
+
+        for ring, rows in hits.items():
+            ring.extend(ts[rows], price[rows], volume[rows])
+            self.stats['ticks'] += len(rows)  # 구독하지 않아 버린 체결은 제외
+        for ring in hits:
+            for callback in self._callbacks.get(ring.code, ()):
+                callback(ring.code, ring)
+
+    def _update_connected(self) -> None:
+        if self.sessions and all(session.ws is not None for session in self.sessions):
+            self.connected.set()
+        else:
+            self.connected.clear()
+
+    async def _run_session(self, session: _Session) -> None:
+        """세션 1개: 접속 → 일괄 구독 → 수신 루프 (끊기면 지수 백오프로 재접속)"""
+        from websockets.asyncio.client import connect
+        from websockets.exceptions import ConnectionClosed
+
+        backoff = 1.0
+        while not self._stop_event.is_set():
+            try:
+                async with connect(self.url, ping_interval=None) as ws:
+                    session.ws = ws
+                    self._day_start = _day_start_ns()
+                    with self._lock:
+                        codes = list(session.codes)
+                    for code in codes:
+                        await ws.send(self._frame(code, "1"))
+                    self._update_connected()
+                    backoff = 1.0
+
+                    async for raw in ws:
+                        reply = self.handle_message(raw)
+                        if reply:
+                            await ws.send(reply)
+            except (OSError, ConnectionClosed) as e:
+                logging.warning(f"실시간 연결 끊김 (세션 {session.index}): {e}")
+            finally:
+                session.ws = None
+                self._update_connected()
+
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=backoff)
+            except asyncio.TimeoutError:
+                backoff = min(backoff * 2, 30.0)
+
+    def _spawn(self, session: _Session) -> None:
+        self._tasks.append(asyncio.ensure_future(self._run_session(session)))
+
+    async def _run(self) -> None:
+        """세션별 수신 루프 실행 (종료 신호까지)"""
+        self._stop_event = asyncio.Event()
+        with self._lock:
+            self._running = True
+            sessions = list(self.sessions)
+        for session in sessions:
+            self._spawn(session)
+        await self._stop_event.wait()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def start(self) -> "RealtimeQuoteStream":
+        """백그라운드 스레드에서 수신 시작"""
+        try:
+            import websockets  # noqa: F401
+        except ImportError:
+            print("❌ websockets 패키지가 필요합니다: pip install websockets")
+            raise
+
+        if self.approval_key is None and self.api is not None:
+            self.approval_key = self.api.get_approval_key()
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_until_complete, args=(self._run(),), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """수신 종료"""
+        if not self._loop:
+            return
+
+        def _shutdown():
+            if self._stop_event:
+                self._stop_event.set()
+            for session in self.sessions:
+                if session.ws is not None:
+                    asyncio.ensure_future(session.ws.close())
+
+        self._loop.call_soon_threadsafe(_shutdown)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        self._running = False
+
+
+class LocalQuoteServer:
+    """테스트용 로컬 실시간 체결가 WebSocket 서버 (KIS 메시지 형식)"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, interval: float = 0.01,
+                 ticks_per_message: int = 1, ping_interval: float = 1.0,
+                 max_subscriptions: int = MAX_SUBSCRIPTIONS_PER_SESSION):
+        """
+        Args:
+            host: 바인드 주소
+            port: 포트 (0이면 임의 포트)
+            interval: 구독 종목별 체결 메시지 전송 간격 (초)
+            ticks_per_message: 메시지 1건에 묶을 체결 수
+            ping_interval: PINGPONG 전송 간격 (초)
+            max_subscriptions: 세션당 구독 한도 (KIS처럼 초과 구독은 오류 응답)
+        """
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.ticks_per_message = ticks_per_message
+        self.ping_interval = ping_interval
+        self.max_subscriptions = max_subscriptions
+        self.pongs = 0
+        self.rejected = 0
+
+        self._prices: Dict[str, float] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._ready = threading.Event()
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    def _next_records(self, code: str, rng: random.Random) -> List[Tuple[str, str, float, int]]:
+        """종목별 랜덤워크 체결 생성 (시작가는 crc32(종목코드) 기준)"""
+        price = self._prices.get(code) or 5_000 + zlib.crc32(code.encode()) % 195_000
+        hhmmss = datetime.now().strftime("%H%M%S")
+        records = []
+        for _ in range(self.ticks_per_message):
+            price = max(1.0, round(price * (1 + rng.gauss(0, 0.001))))
+            records.append((code, hhmmss, price, rng.randint(1, 500)))
+        self._prices[code] = price
+        return records
+
+    async def _handler(self, websocket) -> None:
+        from websockets.exceptions import ConnectionClosed
+
+        subscribed = set()
+        rng = random.Random(0)
+
+        async def produce():
+            last_ping = time.monotonic()
+            while True:
+                for code in list(subscribed):
+                    await websocket.send(build_execution_message(self._next_records(code, rng)))
+                if time.monotonic() - last_ping >= self.ping_interval:
+                    await websocket.send(json.dumps({"header": {"tr_id": "PINGPONG",
+                                                                "datetime": datetime.now().strftime("%Y%m%d%H%M%S")}}))
+                    last_ping = time.monotonic()
+                await asyncio.sleep(self.interval)
+
+        producer = asyncio.create_task(produce())
+        try:
+            async for raw in websocket:
+                message = json.loads(raw)
+                header = message.get("header", {})
+                if header.get("tr_id") == "PINGPONG":
+                    self.pongs += 1
+                    continue
+
+                code = message["body"]["input"]["tr_key"]
+                if header.get("tr_type") == "2":
+                    subscribed.discard(code)
+                    msg1 = "UNSUBSCRIBE SUCCESS"
+                elif code not in subscribed and len(subscribed) >= self.max_subscriptions:
+                    self.rejected += 1
+                    await websocket.send(json.dumps({
+                        "header": {"tr_id": EXECUTION_TR_ID, "tr_key": code, "encrypt": "N"},
+                        "body": {"rt_cd": "1", "msg_cd": "OPSP0008", "msg1": "MAX SUBSCRIBE OVER"}
+                    }))
+                    continue
+                else:
+                    subscribed.add(code)
+                    msg1 = "SUBSCRIBE SUCCESS"
+                await websocket.send(json.dumps({
+                    "header": {"tr_id": EXECUTION_TR_ID, "tr_key": code, "encrypt": "N"},
+                    "body": {"rt_cd": "0", "msg_cd": "OPSP0000", "msg1": msg1}
+                }))
+        except ConnectionClosed:
+            pass
+        finally:
+            producer.cancel()
+
+    async def _serve(self) -> None:
+        from websockets.asyncio.server import serve
+
+        self._stop_event = asyncio.Event()
+        async with serve(self._handler, self.host, self.port) as server:
+            self.port = server.sockets[0].getsockname()[1]
+            self._ready.set()
+            await self._stop_event.wait()
+
+    def start(self) -> "LocalQuoteServer":
+        """백그라운드 스레드에서 서버 시작"""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_until_complete, args=(self._serve(),), daemon=True)
+        self._thread.start()
+        self._ready.wait(timeout=5)
+        return self
+
+    def stop(self) -> None:
+        """서버 종료"""
+        self._loop.call_soon_threadsafe(self._stop_event.set)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> "LocalQuoteServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='KIS 실시간 체결가 수신')
+    parser.add_argument('codes', nargs='+', help='구독할 종목 코드')
+    parser.add_argument('--url', help='WebSocket 주소 (기본: KIS_WS_URL 또는 KIS 실시간 서버)')
+    parser.add_argument('--local', action='store_true', help='로컬 테스트 서버에 연결')
+    parser.add_argument('--real', action='store_true', help='실전 계정 사용 (기본: 모의투자)')
+    parser.add_argument('--capacity', type=int, default=1024, help='종목별 보관 틱 수')
+
+    args = parser.parse_args()
+
+    server = LocalQuoteServer().start() if args.local else None
+    if server:
+        stream = RealtimeQuoteStream(url=server.url, capacity=args.capacity, approval_key="local")
+    else:
+        stream = RealtimeQuoteStream(KoreaInvestmentAPI(is_demo=not args.real), url=args.url, capacity=args.capacity)
+
+    stream.subscribe(args.codes)
+    stream.start()
+    print(f"📡 실시간 체결 수신 중: {stream.url} ({len(args.codes)}종목, Ctrl+C로 종료)")
+
+    try:
+        while True:
+            time.sleep(1)
+            for code in args.codes:
+                ticks = stream.latest(code, 100)
+                if len(ticks):
+                    print(f"   {code}: {ticks['price'][-1]:,.0f}원 | 최근 {len(ticks)}틱 거래량 {ticks['volume'].sum():,}")
+    except KeyboardInterrupt:
+        print("\n⏹️ 수신 종료")
+    finally:
+        stream.stop()
+        if server:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+컬럼형 랭킹 결과 저장 (Parquet 데이터셋)
+실행마다 들여쓴 JSON + CSV 파일을 새로 만드는 대신, 실행 정보 1행과 TOP 10 / 하락 예측 종목 행을
+날짜별로 나눈(partitioned) Parquet 데이터셋에 파일 하나씩 추가한다 (기존 파일은 수정하지 않음).
+
+    data/results/runs/date=YYYY-MM-DD/<실행 키>.parquet     실행 정보 (시장 심리, 뉴스 수, 나머지 항목은 JSON 문자열)
+    data/results/stocks/date=YYYY-MM-DD/<실행 키>.parquet   종목 행 (list, rank, stock_name, score, ...)
+
+- zstd 압축, 스키마 버전은 schema_version 컬럼과 파일 메타데이터에 기록
+- 조회 시 현재 스키마로 읽어 예전 버전 파일에 없는 컬럼은 null로 채움 (필요한 컬럼만 읽음)
+- export_json()으로 기존 enhanced_stock_ranking_YYYY-MM-DD.json과 같은 형태의 파일을 다시 만들 수 있음
+
+pyarrow는 선택 의존성이다. TUJA_RESULT_FORMAT=auto(기본)면 pyarrow가 설치된 경우에만 Parquet으로 저장하고,
+없으면 기존 JSON + CSV 파일로 저장한다.
+"""
+
+import os
+import re
+import json
+import logging
+import argparse
+import importlib.util
+from typing import Dict, List, Optional, Tuple
+from data_paths import DATA_DIR
+
+RESULTS_DIR = os.getenv("TUJA_RESULTS_DIR", os.path.join(DATA_DIR, "results"))
+SCHEMA_VERSION = 1
+COMPRESSION = "zstd"
+RESULT_FORMATS = ('auto', 'parquet', 'files')
+STOCK_LISTS = ('top_10_stocks', 'declining_stocks')
+
+# 실행 정보 컬럼 (그 밖의 결과 항목은 extra에 JSON 문자열로)
+RUN_COLUMNS = ('date', 'time', 'market_sentiment', 'global_market_sentiment', 'hot_sectors', 'domestic_news_count',
+               'global_news_count', 'total_news_analyzed', 'new_news_count', 'total_stocks_mentioned')
+# 종목 행 컬럼 (하락 예측의 risk_score는 score 컬럼에 저장)
+STOCK_COLUMNS = ('rank', 'stock_name', 'score', 'region', 'mention_count', 'reason')
+
+
+def pyarrow_available() -> bool:
+    """pyarrow 설치 여부 (import하지 않고 확인 — CLI 시작 시간에 영향 없음)"""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def resolve_format(requested: Optional[str] = None) -> str:
+    """
+    결과 저장 형식 결정
+
+    Args:
+        requested: 'auto' / 'parquet' / 'files' (기본: TUJA_RESULT_FORMAT 환경변수, 없으면 'auto')
+
+    Returns:
+        'parquet' 또는 'files' (pyarrow가 없으면 항상 'files')
+    """
+    requested = (requested or os.getenv("TUJA_RESULT_FORMAT", "auto")).lower()
+    if requested not in RESULT_FORMATS:
+        raise ValueError(f"알 수 없는 결과 저장 형식: {requested} (가능: {', '.join(RESULT_FORMATS)})")
+    if requested == 'files':
+        return 'files'
+    if pyarrow_available():
+        return 'parquet'
+    if requested == 'parquet':
+        logging.warning("pyarrow가 없어 JSON + CSV 파일로 저장합니다 (pip install pyarrow)")
+    return 'files'
+
+
+def run_key(result: Dict, system: str) -> str:
+    """실행 파일 이름 (날짜 + 시각 + 시스템, 같은 날 여러 번 실행해도 겹치지 않음)"""
+    stamp = f"{result['date']}T{result.get('time', '')}".replace(':', '')
+    return re.sub(r'[^0-9A-Za-z_-]', '_', f"{stamp}-{system}")
+
+
+def result_rows(result: Dict, system: str) -> Tuple[Dict, List[Dict]]:
+    """
+    랭킹 결과 → (실행 정보 행, 종목 행들)
+
+    Args:
+        result: generate_*_daily_ranking() 결과
+        system: 'enhanced' / 'basic' / 'enhanced:<유니버스>'
+    """
+    key = run_key(result, system)
+    run = {column: result.get(column) for column in RUN_COLUMNS}
+    run.update({
+        'run_key': key,
+        'system': system,
+        'schema_version': SCHEMA_VERSION,
+        'extra': json.dumps(dict({name: value for name, value in result.items()
+                                  if name not in RUN_COLUMNS and name not in STOCK_LISTS},
+                                 _stock_lists=[name for name in STOCK_LISTS if name in result]),
+                            ensure_ascii=False, default=str),
+    })
+
+    stocks = []
+    for list_name in STOCK_LISTS:
+        for i, stock in enumerate(result.get(list_name) or [], 1):
+            row = {column: stock.get(column) for column in STOCK_COLUMNS}
+            row.update({'run_key': key, 'date': result['date'], 'system': system, 'list': list_name,
+                        'schema_version': SCHEMA_VERSION})
+            row['rank'] = stock.get('rank', i)
+            if list_name == 'declining_stocks':
+                row['score'] = stock.get('risk_score')
+            stocks.append(row)
+    return run, stocks
+
+
+def result_from_rows(run: Dict, stocks: List[Dict]) -> Dict:
+    """(실행 정보 행, 종목 행들) → 랭킹 결과 (result_rows의 역, JSON 내보내기용)"""
+    result = {column: run.get(column) for column in RUN_COLUMNS if run.get(column) is not None}
+    if 'hot_sectors' in result:
+        result['hot_sectors'] = list(result['hot_sectors'])
+    extra = json.loads(run.get('extra') or '{}')
+    lists = extra.pop('_stock_lists', STOCK_LISTS)
+    result.update(extra)
+
+    for list_name in lists:
+        items = []
+        for row in sorted((row for row in stocks if row['list'] == list_name), key=lambda row: row['rank']):
+            item = {column: row.get(column) for column in STOCK_COLUMNS if row.get(column) is not None}
+            if list_name == 'declining_stocks' and 'score' in item:
+                item['risk_score'] = item.pop('score')
+            items.append(item)
+        result[list_name] = items
+    return result
+
+
+def _schemas():
+    """현재 스키마 (실행 정보, 종목 행) — 파티션 컬럼 date는 디렉토리 이름으로도 남음"""
+    import pyarrow as pa
+
+    run_schema = pa.schema([
+        ('run_key', pa.string()), ('system', pa.string()), ('date', pa.string()), ('time', pa.string()),
+        ('market_sentiment', pa.string()), ('global_market_sentiment', pa.string()),
+        ('hot_sectors', pa.list_(pa.string())), ('domestic_news_count', pa.int32()), ('global_news_count', pa.int32()),
+        ('total_news_analyzed', pa.int32()), ('new_news_count', pa.int32()), ('total_stocks_mentioned', pa.int32()),
+        ('extra', pa.string()), ('schema_version', pa.int16()),
+    ], metadata={b'tuja_schema_version': str(SCHEMA_VERSION).encode()})
+    stock_schema = pa.schema([
+        ('run_key', pa.string()), ('system', pa.string()), ('date', pa.string()), ('list', pa.string()),
+        ('rank', pa.int16()), ('stock_name', pa.string()), ('score', pa.float64()), ('region', pa.string()),
+        ('mention_count', pa.int32()), ('reason', pa.string()), ('schema_version', pa.int16()),
+    ], metadata={b'tuja_schema_version': str(SCHEMA_VERSION).encode()})
+    return run_schema, stock_schema
+
+
+def append_result(result: Dict, system: str = 'enhanced', root: Optional[str] = None) -> Tuple[str, str]:
+    """
+    랭킹 결과 한 건을 데이터셋에 추가 (날짜 파티션에 실행별 파일, 임시 파일에 쓴 뒤 교체)
+
+    Args:
+        result: 랭킹 결과
+        system: 'enhanced' / 'basic' / 'enhanced:<유니버스>'
+        root: 데이터셋 경로 (기본: data/results 또는 TUJA_RESULTS_DIR)
+
+    Returns:
+        (실행 정보 파일, 종목 행 파일) 경로
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    root = root or RESULTS_DIR
+    run, stocks = result_rows(result, system)
+    run_schema, stock_schema = _schemas()
+    tables = (
+        ('runs', pa.Table.from_pylist([run], schema=run_schema)),
+        ('stocks', pa.Table.from_pylist(stocks, schema=stock_schema)),
+    )
+
+    paths = []
+    for name, table in tables:
+        directory = os.path.join(root, name, f"date={result['date']}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{run['run_key']}.parquet")
+        tmp_path = os.path.join(directory, f".{run['run_key']}.parquet.tmp")  # '.'로 시작하는 파일은 조회에서 제외됨
+        pq.write_table(table, tmp_path, compression=COMPRESSION)
+        os.replace(tmp_path, path)
+        paths.append(path)
+    return paths[0], paths[1]
+
+
+def _read(name: str, columns: Optional[List[str]], start: Optional[str], end: Optional[str],
+          system: Optional[str], root: Optional[str]):
+    """데이터셋 조회 (현재 스키마 기준, 필요한 컬럼만)"""
+    import pyarrow.dataset as ds
+
+    path = os.path.join(root or RESULTS_DIR, name)
+    if not os.path.isdir(path):
+        return None
+    run_schema, stock_schema = _schemas()
+    dataset = ds.dataset(path, format='parquet', schema=run_schema if name == 'runs' else stock_schema)
+
+    condition = None
+    for expression in (ds.field('date') >= start if start else None, ds.field('date') <= end if end else None,
+                       ds.field('system') == system if system else None):
+        if expression is not None:
+            condition = expression if condition is None else condition & expression
+    return dataset.to_table(columns=columns, filter=condition)
+
+
+def read_stocks(columns: Optional[List[str]] = None, start: Optional[str] = None, end: Optional[str] = None,
+                system: Optional[str] = None, root: Optional[str] = None):
+    """
+    종목 행 조회
+
+    Args:
+        columns: 읽을 컬럼 (기본: 전체)
+        start: 시작일 (YYYY-MM-DD, 포함)
+        end: 종료일 (YYYY-MM-DD, 포함)
+        system: 특정 시스템만
+        root: 데이터셋 경로
+
+    Returns:
+        pandas.DataFrame (데이터셋이 없으면 빈 DataFrame)
+    """
+    import pandas as pd
+
+    table = _read('stocks', columns, start, end, system, root)
+    return table.to_pandas() if table is not None else pd.DataFrame(columns=columns or [])
+
+
+def read_runs(columns: Optional[List[str]] = None, start: Optional[str] = None, end: Optional[str] = None,
+              system: Optional[str] = None, root: Optional[str] = None):
+    """실행 정보 조회 (인자는 read_stocks와 같음)"""
+    import pandas as pd
+
+    table = _read('runs', columns, start, end, system, root)
+    return table.to_pandas() if table is not None else pd.DataFrame(columns=columns or [])
+
+
+def export_json(date: str, system: str = 'enhanced', directory: str = '.', root: Optional[str] = None) -> Optional[str]:
+    """
+    날짜의 마지막 실행을 기존 형식 JSON(enhanced_stock_ranking_YYYY-MM-DD.json 등)으로 내보내기
+
+    Args:
+        date: 날짜 (YYYY-MM-DD)
+        system: 'enhanced' / 'basic' / 'enhanced:<유니버스>'
+        directory: 저장 디렉토리
+        root: 데이터셋 경로
+
+    Returns:
+        저장한 파일 경로 (해당 실행이 없으면 None)
+    """
+    runs = _read('runs', None, date, date, system, root)
+    if runs is None or runs.num_rows == 0:
+        return None
+    run = max(runs.to_pylist(), key=lambda row: row['run_key'])
+    stocks = [row for row in _read('stocks', None, date, date, system, root).to_pylist()
+              if row['run_key'] == run['run_key']]
+
+    prefix = {'enhanced': 'enhanced_', 'basic': ''}.get(system.split(':')[0], '')
+    suffix = f"_{system.split(':', 1)[1]}" if ':' in system else ""
+    path = os.path.join(directory, f"{prefix}stock_ranking_{date}{suffix}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(result_from_rows(run, stocks), f, ensure_ascii=False, indent=2)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='컬럼형 랭킹 결과 조회 / JSON 내보내기')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    export_parser = subparsers.add_parser('export', help='기존 형식 JSON으로 내보내기')
+    export_parser.add_argument('--date', required=True, help='날짜 (YYYY-MM-DD)')
+    export_parser.add_argument('--system', default='enhanced', help='enhanced / basic / enhanced:<유니버스>')
+    export_parser.add_argument('--out', default='.', help='저장 디렉토리')
+
+    stocks_parser = subparsers.add_parser('stocks', help='종목 행 조회')
+    stocks_parser.add_argument('--from', dest='start', help='시작일')
+    stocks_parser.add_argument('--to', dest='end', help='종료일')
+    stocks_parser.add_argument('--system', help='시스템')
+    stocks_parser.add_argument('--columns', default='date,system,list,rank,stock_name,score',
+                               help='쉼표로 구분한 컬럼')
+    args = parser.parse_args()
+
+    if not pyarrow_available():
+        print("❌ pyarrow 패키지가 필요합니다: pip install pyarrow")
+        return
+
+    if args.command == 'export':
+        path = export_json(args.date, args.system, args.out)
+        print(f"💾 {path}" if path else f"❌ {args.date} {args.system} 실행이 없습니다.")
+    else:
+        df = read_stocks(args.columns.split(','), args.start, args.end, args.system)
+        print(df.to_string(index=False) if not df.empty else "저장된 결과가 없습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+벡터화 수익률 계산 엔진
+날짜 × 종목코드 종가/시가 행렬을 한 번만 만들어 두고
+모든 예측일·모든 종목의 1일/N일/시가→종가 수익률을 한 번의 연산으로 계산
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+
+class PriceMatrix:
+    """날짜 × 종목코드 가격 행렬 (종가/시가)"""
+
+    def __init__(self, dates: np.ndarray, codes: List[str], close: np.ndarray,
+                 open_: Optional[np.ndarray] = None, data_source: str = 'KIS_API'):
+        """
+        Args:
+            dates: 정렬된 거래일 배열 (datetime64[D])
+            codes: 종목코드 리스트 (열 순서)
+            close: 종가 행렬 (len(dates) × len(codes)), 결측은 NaN
+            open_: 시가 행렬 (close와 같은 모양), 없으면 NaN
+            data_source: 결과 DataFrame의 data_source 값
+        """
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        self.codes = list(codes)
+        self.code_index = {code: i for i, code in enumerate(self.codes)}
+        self.close = np.asarray(close, dtype=np.float64)
+        self.open = np.full_like(self.close, np.nan) if open_ is None else np.asarray(open_, dtype=np.float64)
+        self.data_source = data_source
+
+    @classmethod
+    def from_bars(cls, bars: pd.DataFrame, data_source: str = 'KIS_API') -> 'PriceMatrix':
+        """
+        long 형식 일봉 DataFrame(date, code, open, close)을 pivot 하여 행렬 생성
+
+        Args:
+            bars: date, code, close (선택: open) 컬럼을 가진 DataFrame
+
+        Returns:
+            PriceMatrix
+        """
+        if bars.empty:
+            return cls(np.array([], dtype='datetime64[D]'), [], np.empty((0, 0)), data_source=data_source)
+
+        frame = bars.copy()
+        frame['date'] = pd.to_datetime(frame['date']).dt.normalize()
+        close = frame.pivot_table(index='date', columns='code', values='close', aggfunc='last').sort_index()
+        if 'open' in frame.columns:
+            open_ = frame.pivot_table(index='date', columns='code', values='open', aggfunc='last')
+            open_ = open_.reindex(index=close.index, columns=close.columns)
+        else:
+            open_ = None
+
+        return cls(
+            close.index.values.astype('datetime64[D]'),
+            [str(code) for code in close.columns],
+            close.to_numpy(dtype=np.float64),
+            None if open_ is None else open_.to_numpy(dtype=np.float64),
+            data_source=data_source
+        )
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame], data_source: str = 'KIS_API') -> 'PriceMatrix':
+        """
+        종목별 과거 주가 DataFrame(get_historical_prices 결과)들을 합쳐 행렬 생성
+
+        Args:
+            frames: {종목코드: date/open/close 컬럼 DataFrame}
+        """
+        parts = []
+        for code, df in frames.items():
+            if df is None or df.empty:
+                continue
+            part = df[[col for col in ('date', 'open', 'close') if col in df.columns]].copy()
+            part['code'] = code
+            parts.append(part)
+
+        bars = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=['date', 'code', 'open', 'close'])
+        return cls.from_bars(bars, data_source=data_source)
+
+    @property
+    def empty(self) -> bool:
+        return self.close.size == 0
+
+
+class ReturnsEngine:
+    """예측일 × 종목 수익률을 한 번에 계산하는 엔진"""
+
+    def __init__(self, prices: PriceMatrix):
+        self.prices = prices
+
+    def _base_rows(self, prediction_dates: np.ndarray) -> np.ndarray:
+        """예측일 당일(또는 직전) 거래일의 행 번호, 없으면 -1"""
+        dates = np.asarray(prediction_dates, dtype='datetime64[D]')
+        return np.searchsorted(self.prices.dates, dates, side='right') - 1
+
+    def _gather(self, matrix: np.ndarray, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """범위를 벗어난 (행, 열)은 NaN으로 채워 팬시 인덱싱"""
+        n_rows = matrix.shape[0]
+        valid = (rows >= 0) & (rows < n_rows) & (cols >= 0)
+        out = np.full(rows.shape, np.nan)
+        out[valid] = matrix[rows[valid], cols[valid]]
+        return out
+
+    def compute_returns(self, prediction_dates, stock_codes, horizon: int = 1) -> Dict[str, np.ndarray]:
+        """
+        (예측일, 종목코드) 쌍 배열에 대한 수익률 일괄 계산
+
+        예측일 저녁에 랭킹을 만들었다고 보고, 예측일 당일(휴장일이면 직전 거래일)
+        종가를 기준가로 사용한다.
+
+        Args:
+            prediction_dates: 예측일 배열 (쌍마다 하나)
+            stock_codes: 종목코드 배열 (prediction_dates와 같은 길이)
+            horizon: N일 수익률의 N
+
+        Returns:
+            return_1d / return_nd / open_to_close (퍼센트, 결측은 NaN) 배열 딕셔너리
+        """
+        codes = np.asarray(stock_codes, dtype=object)
+        cols = np.fromiter((self.prices.code_index.get(code, -1) for code in codes), dtype=np.int64, count=len(codes))
+        rows = self._base_rows(prediction_dates)
+
+        base_close = self._gather(self.prices.close, rows, cols)
+        next_rows = np.where(rows >= 0, rows + 1, -1)
+        horizon_rows = np.where(rows >= 0, rows + horizon, -1)
+        next_close = self._gather(self.prices.close, next_rows, cols)
+        next_open = self._gather(self.prices.open, next_rows, cols)
+        horizon_close = self._gather(self.prices.close, horizon_rows, cols)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return_1d = np.where(base_close > 0, (next_close - base_close) / base_close * 100, np.nan)
+            return_nd = np.where(base_close > 0, (horizon_close - base_close) / base_close * 100, np.nan)
+            open_to_close = np.where(next_open > 0, (next_close - next_open) / next_open * 100, np.nan)
+
+        return {
+            'return_1d': return_1d,
+            'return_nd': return_nd,
+            'open_to_close': open_to_close
+        }
+
+    def returns_frame(self, pairs: pd.DataFrame, horizon: int = 1) -> pd.DataFrame:
+        """
+        prediction_date / stock_code 컬럼 DataFrame에 수익률 컬럼을 붙여 반환
+
+        Args:
+            pairs: prediction_date, stock_code 컬럼을 가진 DataFrame
+            horizon: N일 수익률의 N
+        """
+        frame = pairs.reset_index(drop=True).copy()
+        if frame.empty:
+            for col in ('return_1d', 'return_nd', 'open_to_close'):
+                frame[col] = pd.Series(dtype=float)
+            return frame
+
+        dates = pd.to_datetime(frame['prediction_date']).values.astype('datetime64[D]')
+        computed = self.compute_returns(dates, frame['stock_code'].to_numpy(dtype=object), horizon)
+        for col, values in computed.items():
+            frame[col] = values
+        return frame
+
+    def get_actual_returns(self, predictions: Dict[str, List[Tuple[str, str]]], days_back: int = 1) -> pd.DataFrame:
+        """
+        StockDataManager.get_actual_returns와 같은 스키마로 전체 예측일 수익률 계산
+
+        Args:
+            predictions: {예측일: [(종목명, 종목코드), ...]}
+            days_back: 수익률 계산 기간 (N일)
+
+        Returns:
+            stock / stock_code / region / prediction_date / actual_return / data_source 컬럼 DataFrame
+        """
+        columns = ['stock', 'stock_code', 'region', 'prediction_date', 'actual_return', 'data_source']
+        records = [
+            (stock_name, stock_code, prediction_date)
+            for prediction_date, stocks in predictions.items()
+            for stock_name, stock_code in stocks
+            if stock_code
+        ]
+        if not records:
+            return pd.DataFrame(columns=columns)
+
+        frame = pd.DataFrame(records, columns=['stock', 'stock_code', 'prediction_date'])
+        codes = frame['stock_code'].astype(str)
+        is_korean = codes.str.len().eq(6) & codes.str.isdigit()
+
+        frame['region'] = np.where(is_korean, '한국', np.where(codes.str.isupper(), '미국', '기타'))
+        frame['actual_return'] = 0.0
+        frame['data_source'] = 'TEMP'  # 해외 주식은 임시 데이터
+
+        korean = frame[is_korean]
+        if not korean.empty and not self.prices.empty:
+            computed = self.returns_frame(korean[['prediction_date', 'stock_code']], days_back)
+            frame.loc[is_korean, 'actual_return'] = computed['return_nd'].to_numpy()
+            frame.loc[is_korean, 'data_source'] = self.prices.data_source
+        else:
+            frame.loc[is_korean, 'actual_return'] = np.nan
+
+        missing = frame['actual_return'].isna()
+        if missing.any():
+            for _, row in frame[missing].iterrows():
+                print(f"⚠️ {row['stock']}({row['stock_code']}) {row['prediction_date']} 데이터 부족")
+            frame = frame[~missing]
+
+        return frame[columns].reset_index(drop=True)
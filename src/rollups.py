@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+랭킹 이력 롤업 (일 → 주 → 월)
+종목별·섹터별 TOP 10 등장 횟수, 언급 수, 점수 합계, 실현 수익률 합계, 적중 수를
+일/주/월 단위로 미리 합산해 두어 기간 보고서가 원본 랭킹을 다시 훑지 않도록 함
+
+모든 값은 합계로 저장되므로 주/월 행은 해당 기간의 일 행을 더해 다시 만들 수 있고
+평균은 조회 시 합계 / 건수로 계산한다.
+"""
+
+import sqlite3
+import argparse
+import pandas as pd
+from datetime import date as date_type, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+GRAINS = ('daily', 'weekly', 'monthly')
+LEVELS = ('stock', 'sector')
+SUM_COLUMNS = ['appearances', 'mention_sum', 'score_sum', 'return_sum', 'return_count', 'hits']
+
+
+def period_key(grain: str, day: date_type) -> str:
+    """날짜가 속한 기간 키 (daily: YYYY-MM-DD, weekly: ISO 주 YYYY-Www, monthly: YYYY-MM)"""
+    if grain == 'daily':
+        return day.strftime('%Y-%m-%d')
+    if grain == 'weekly':
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    return day.strftime('%Y-%m')
+
+
+def period_bounds(grain: str, day: date_type) -> Tuple[date_type, date_type]:
+    """날짜가 속한 기간의 첫날과 마지막 날"""
+    if grain == 'daily':
+        return day, day
+    if grain == 'weekly':
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=6)
+    start = day.replace(day=1)
+    next_month = (start + timedelta(days=32)).replace(day=1)
+    return start, next_month - timedelta(days=1)
+
+
+def cover_periods(start: str, end: str) -> List[Tuple[str, str]]:
+    """
+    [start, end] 구간을 가장 적은 수의 (grain, period)로 분할
+
+    구간 안에 온전히 들어가는 달은 월 행, 남는 부분 중 온전한 주는 주 행, 나머지는 일 행을 사용한다.
+    """
+    day = datetime.strptime(start, '%Y-%m-%d').date()
+    last = datetime.strptime(end, '%Y-%m-%d').date()
+    periods = []
+    while day <= last:
+        for grain in ('monthly', 'weekly', 'daily'):
+            first, final = period_bounds(grain, day)
+            if first == day and final <= last:
+                periods.append((grain, period_key(grain, day)))
+                day = final + timedelta(days=1)
+                break
+    return periods
+
+
+class RankingRollups:
+    """일/주/월 종목·섹터 롤업 테이블"""
+
+    def __init__(self, conn: sqlite3.Connection, sectors: Optional[Dict[str, str]] = None,
+                 hit_threshold: float = 0.0):
+        """
+        Args:
+            conn: 랭킹 저장소 SQLite 연결 (같은 DB에 롤업 테이블 생성)
+            sectors: {종목명: 섹터} (없는 종목은 '기타')
+            hit_threshold: 적중으로 볼 최소 수익률 (%)
+        """
+        self.conn = conn
+        self.sectors = sectors or {}
+        self.hit_threshold = hit_threshold
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS ranking_rollups (
+                grain TEXT NOT NULL,
+                period TEXT NOT NULL,
+                level TEXT NOT NULL,
+                key TEXT NOT NULL,
+                sector TEXT,
+                region TEXT,
+                appearances INTEGER NOT NULL DEFAULT 0,
+                mention_sum REAL NOT NULL DEFAULT 0,
+                score_sum REAL NOT NULL DEFAULT 0,
+                return_sum REAL NOT NULL DEFAULT 0,
+                return_count INTEGER NOT NULL DEFAULT 0,
+                hits INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (grain, period, level, key)
+            ) WITHOUT ROWID;
+        """)
+        self.conn.commit()
+
+    def is_empty(self) -> bool:
+        return self.conn.execute("SELECT 1 FROM ranking_rollups LIMIT 1").fetchone() is None
+
+    def apply_day(self, date: str, result: Dict) -> None:
+        """
+        하루치 랭킹을 일 롤업에 반영하고 그 날짜가 속한 주/월 롤업을 다시 합산
+
+        같은 날짜를 다시 반영하면 일 행을 교체하며, 이미 기록된 실현 수익률은 유지한다.
+
+        Args:
+            date: 날짜 (YYYY-MM-DD)
+            result: 랭킹 결과 딕셔너리
+        """
+        realized = {
+            key: (return_sum, return_count, hits)
+            for key, return_sum, return_count, hits in self.conn.execute(
+                "SELECT key, return_sum, return_count, hits FROM ranking_rollups "
+                "WHERE grain = 'daily' AND period = ? AND level = 'stock'", (date,))
+        }
+
+        rows: Dict[str, list] = {}
+        for stock in result.get('top_10_stocks') or []:
+            name = stock.get('stock_name', '')
+            if not name:
+                continue
+            row = rows.setdefault(name, [self.sectors.get(name, '기타'), stock.get('region') or '기타', 0, 0.0, 0.0])
+            row[2] += 1
+            row[3] += float(stock.get('mention_count') or 0)
+            row[4] += float(stock.get('score') or 0)
+
+        with self.conn:
+            self.conn.execute("DELETE FROM ranking_rollups WHERE grain = 'daily' AND period = ?", (date,))
+            self.conn.executemany(
+                "INSERT INTO ranking_rollups (grain, period, level, key, sector, region, appearances, mention_sum, "
+                "score_sum, return_sum, return_count, hits) VALUES ('daily', ?, 'stock', ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(date, name, *row, *realized.get(name, (0.0, 0, 0))) for name, row in rows.items()]
+            )
+            self._rebuild([date])
+
+    def record_returns(self, frame: pd.DataFrame) -> int:
+        """
+        실현 수익률 반영 (performance_frame 형식: date / stock / return)
+
+        Returns:
+            갱신한 일 행 수
+        """
+        valid = frame.dropna(subset=['return'])
+        if valid.empty:
+            return 0
+        realized = valid.groupby(['date', 'stock'])['return'].agg(['sum', 'size'])
+        hits = (valid['return'] > self.hit_threshold).groupby([valid['date'], valid['stock']]).sum()
+
+        with self.conn:
+            cursor = self.conn.executemany(
+                "UPDATE ranking_rollups SET return_sum = ?, return_count = ?, hits = ? "
+                "WHERE grain = 'daily' AND period = ? AND level = 'stock' AND key = ?",
+                [(float(row['sum']), int(row['size']), int(hits[(date, stock)]), date, stock)
+                 for (date, stock), row in realized.iterrows()]
+            )
+            updated = cursor.rowcount
+            self._rebuild(realized.index.get_level_values('date').unique())
+        return updated
+
+    def _rebuild(self, dates: Iterable[str]) -> None:
+        """날짜들의 섹터 일 행과 해당 주/월 행을 일 종목 행으로부터 다시 합산 (트랜잭션 안에서 호출)"""
+        sums = ', '.join(f"SUM({column})" for column in SUM_COLUMNS)
+        targets = set()
+        for date in dates:
+            day = datetime.strptime(date, '%Y-%m-%d').date()
+            targets.update((grain, period_key(grain, day), *period_bounds(grain, day)) for grain in GRAINS)
+
+        for grain, period, first, last in sorted(targets):
+            bounds = (first.strftime('%Y-%m-%d'), last.strftime('%Y-%m-%d'))
+            if grain != 'daily':
+                self.conn.execute("DELETE FROM ranking_rollups WHERE grain = ? AND period = ?", (grain, period))
+                self.conn.execute(
+                    f"INSERT INTO ranking_rollups (grain, period, level, key, sector, region, {', '.join(SUM_COLUMNS)}) "
+                    f"SELECT ?, ?, 'stock', key, MAX(sector), MAX(region), {sums} FROM ranking_rollups "
+                    "WHERE grain = 'daily' AND level = 'stock' AND period BETWEEN ? AND ? GROUP BY key",
+                    (grain, period, *bounds)
+                )
+            else:
+                self.conn.execute("DELETE FROM ranking_rollups WHERE grain = 'daily' AND period = ? AND level = 'sector'", (period,))
+            self.conn.execute(
+                f"INSERT INTO ranking_rollups (grain, period, level, key, sector, region, {', '.join(SUM_COLUMNS)}) "
+                f"SELECT ?, ?, 'sector', sector, sector, NULL, {sums} FROM ranking_rollups "
+                "WHERE grain = 'daily' AND level = 'stock' AND period BETWEEN ? AND ? GROUP BY sector",
+                (grain, period, *bounds)
+            )
+
+    def periods(self, grain: str = 'weekly', level: str = 'stock', start: Optional[str] = None,
+                end: Optional[str] = None) -> pd.DataFrame:
+        """
+        기간별 롤업 행 조회 (추이 보고서용)
+
+        Args:
+            grain: 'daily' / 'weekly' / 'monthly'
+            level: 'stock' / 'sector'
+            start: 시작 기간 키 (예: 2026-01, 2026-W03, 2026-01-19)
+            end: 종료 기간 키
+
+        Returns:
+            period / key / sector / region / 합계 컬럼 + avg_score / mean_return / hit_rate
+        """
+        query = "SELECT * FROM ranking_rollups WHERE grain = ? AND level = ?"
+        params: list = [grain, level]
+        if start:
+            query += " AND period >= ?"
+            params.append(start)
+        if end:
+            query += " AND period <= ?"
+            params.append(end)
+        frame = pd.read_sql_query(query + " ORDER BY period, appearances DESC", self.conn, params=params)
+        return _with_averages(frame.drop(columns=['grain', 'level']))
+
+    def summary(self, start: str, end: str, level: str = 'stock') -> pd.DataFrame:
+        """
+        임의 기간 [start, end]의 종목/섹터별 합계 (월·주·일 행을 조합해 최소 행만 읽음)
+
+        Returns:
+            key / sector / region / 합계 컬럼 + avg_score / mean_return / hit_rate (등장 횟수 내림차순)
+        """
+        periods = cover_periods(start, end)
+        if not periods:
+            return _with_averages(pd.DataFrame(columns=['key', 'sector', 'region'] + SUM_COLUMNS))
+
+        placeholders = ' OR '.join('(grain = ? AND period = ?)' for _ in periods)
+        sums = ', '.join(f"SUM({column}) AS {column}" for column in SUM_COLUMNS)
+        frame = pd.read_sql_query(
+            f"SELECT key, MAX(sector) AS sector, MAX(region) AS region, {sums} FROM ranking_rollups "
+            f"WHERE level = ? AND ({placeholders}) GROUP BY key ORDER BY appearances DESC, score_sum DESC",
+            self.conn, params=[level] + [value for period in periods for value in period]
+        )
+        return _with_averages(frame)
+
+
+def _with_averages(frame: pd.DataFrame) -> pd.DataFrame:
+    """합계 컬럼으로 평균 점수 / 평균 수익률 / 적중률(%) 계산"""
+    appearances = frame['appearances'].astype(float)
+    return_count = frame['return_count'].astype(float)
+    frame['avg_score'] = frame['score_sum'] / appearances.where(appearances > 0)
+    frame['mean_return'] = frame['return_sum'] / return_count.where(return_count > 0)
+    frame['hit_rate'] = frame['hits'] / return_count.where(return_count > 0) * 100
+    return frame
+
+
+def main():
+    from ranking_store import RankingStore
+
+    parser = argparse.ArgumentParser(description='랭킹 롤업 조회')
+    parser.add_argument('--db', help='랭킹 저장소 SQLite 파일 경로 (기본: data/rankings.db)')
+    parser.add_argument('--grain', choices=GRAINS, default='weekly', help='기간 단위')
+    parser.add_argument('--level', choices=LEVELS, default='stock', help='종목 / 섹터')
+    parser.add_argument('--start', help='시작 기간 키')
+    parser.add_argument('--end', help='종료 기간 키')
+    parser.add_argument('--top', type=int, default=10, help='기간별 표시 행 수')
+    parser.add_argument('--rebuild', action='store_true', help='저장된 랭킹 전체로 롤업 재생성')
+    args = parser.parse_args()
+
+    store = RankingStore(args.db)
+    if args.rebuild:
+        print(f"🔄 롤업 재생성: {store.rebuild_rollups()}일")
+
+    frame = store.rollups.periods(args.grain, args.level, args.start, args.end)
+    if frame.empty:
+        print("❌ 롤업 데이터가 없습니다.")
+    for period, group in frame.groupby('period', sort=True):
+        print(f"\n📅 {period}")
+        for row in group.head(args.top).itertuples(index=False):
+            mean_return = f"{row.mean_return:+.2f}%" if pd.notna(row.mean_return) else "-"
+            hit_rate = f"{row.hit_rate:.0f}%" if pd.notna(row.hit_rate) else "-"
+            print(f"   {row.key}: 등장 {row.appearances}회 | 평균 점수 {row.avg_score:.1f} | "
+                  f"수익률 {mean_return} | 적중률 {hit_rate}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
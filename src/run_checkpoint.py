@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+실행 체크포인트
+단계 그래프(pipeline_dag.StageGraph)의 단계 결과를 실행 디렉토리(data/runs/<실행 ID>/<단계>.pkl)에
+pickle로 남겨 두고, 실행이 중간에 실패하면 `enhanced_main.py --resume <실행 ID>`로
+끝난 단계(뉴스 크롤링, 시장 데이터 수집 등)를 건너뛰고 나머지 단계만 다시 실행한다.
+
+- 단계 결과는 끝나는 즉시 임시 파일에 쓴 뒤 교체하므로 파일이 있으면 완료된 단계
+- 실행이 성공하면 실행 디렉토리를 지우고, 실패한 실행은 RUN_RETENTION_DAYS일 동안 보관
+"""
+
+import os
+import re
+import json
+import time
+import pickle
+import shutil
+import logging
+import argparse
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from data_paths import DATA_DIR
+
+RUNS_DIR = os.getenv("TUJA_RUNS_DIR", os.path.join(DATA_DIR, "runs"))
+RUN_RETENTION_DAYS = 3
+META_FILE = "run.json"
+
+
+def _stage_file(stage: str) -> str:
+    """단계 이름 → 파일 이름 ('universe:us' 같은 이름도 안전하게)"""
+    return re.sub(r'[^0-9A-Za-z_-]', '_', stage) + ".pkl"
+
+
+class RunCheckpoint:
+    """실행 하나의 단계 결과 저장소"""
+
+    def __init__(self, run_id: str, meta: Optional[Dict] = None, runs_dir: Optional[str] = None):
+        """
+        Args:
+            run_id: 실행 ID (YYYYMMDD-HHMMSS)
+            meta: 실행 정보 (date, full 등 이어서 실행할 때 그대로 써야 하는 값)
+            runs_dir: 실행 디렉토리 상위 경로 (기본: data/runs 또는 TUJA_RUNS_DIR)
+        """
+        self.run_id = run_id
+        self.meta = meta or {}
+        self.path = os.path.join(runs_dir or RUNS_DIR, run_id)
+
+    @classmethod
+    def create(cls, meta: Dict, runs_dir: Optional[str] = None) -> 'RunCheckpoint':
+        """
+        새 실행 디렉토리 생성 (보관 기간이 지난 실패 실행은 정리)
+
+        Args:
+            meta: 실행 정보 (JSON으로 저장)
+            runs_dir: 실행 디렉토리 상위 경로
+        """
+        runs_dir = runs_dir or RUNS_DIR
+        prune_runs(runs_dir=runs_dir)
+        base = datetime.now().strftime('%Y%m%d-%H%M%S')
+        run_id, suffix = base, 1
+        while os.path.exists(os.path.join(runs_dir, run_id)):
+            suffix += 1
+            run_id = f"{base}-{suffix}"
+
+        checkpoint = cls(run_id, dict(meta, run_id=run_id, created=datetime.now().isoformat(timespec='seconds')), runs_dir)
+        os.makedirs(checkpoint.path)
+        with open(os.path.join(checkpoint.path, META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(checkpoint.meta, f, ensure_ascii=False)
+        return checkpoint
+
+    @classmethod
+    def open(cls, run_id: str, runs_dir: Optional[str] = None) -> 'RunCheckpoint':
+        """
+        기존 실행 열기
+
+        Raises:
+            FileNotFoundError: 실행 디렉토리가 없는 경우
+        """
+        checkpoint = cls(run_id, runs_dir=runs_dir)
+        meta_path = os.path.join(checkpoint.path, META_FILE)
+        if not os.path.exists(meta_path):
+            raise FileNotFoundError(f"저장된 실행이 없습니다: {run_id}")
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            checkpoint.meta = json.load(f)
+        return checkpoint
+
+    def has(self, stage: str) -> bool:
+        return os.path.exists(os.path.join(self.path, _stage_file(stage)))
+
+    def load(self, stage: str) -> Any:
+        with open(os.path.join(self.path, _stage_file(stage)), 'rb') as f:
+            return pickle.load(f)
+
+    def save(self, stage: str, value: Any) -> None:
+        """단계 결과 저장 (임시 파일에 쓴 뒤 교체)"""
+        path = os.path.join(self.path, _stage_file(stage))
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def completed(self) -> List[str]:
+        """완료된 단계 파일 이름 (확장자 제외)"""
+        return sorted(name[:-4] for name in os.listdir(self.path) if name.endswith('.pkl'))
+
+    def remove(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+def list_runs(runs_dir: Optional[str] = None) -> List[RunCheckpoint]:
+    """저장된 실행 목록 (오래된 순)"""
+    runs_dir = runs_dir or RUNS_DIR
+    if not os.path.isdir(runs_dir):
+        return []
+    runs = []
+    for run_id in sorted(os.listdir(runs_dir)):
+        try:
+            runs.append(RunCheckpoint.open(run_id, runs_dir))
+        except (FileNotFoundError, ValueError):
+            continue
+    return runs
+
+
+def prune_runs(days: int = RUN_RETENTION_DAYS, runs_dir: Optional[str] = None) -> int:
+    """보관 기간이 지난 실행 디렉토리 삭제 (삭제한 수 반환)"""
+    runs_dir = runs_dir or RUNS_DIR
+    if not os.path.isdir(runs_dir):
+        return 0
+    cutoff = time.time() - days * 86400
+    removed = 0
+    for run_id in os.listdir(runs_dir):
+        path = os.path.join(runs_dir, run_id)
+        if os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    if removed:
+        logging.info(f"오래된 실행 체크포인트 {removed}개 삭제")
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='실패한 실행 체크포인트 조회')
+    parser.add_argument('--remove', metavar='RUN_ID', help='실행 체크포인트 삭제')
+    args = parser.parse_args()
+
+    if args.remove:
+        RunCheckpoint.open(args.remove).remove()
+        print(f"🗑️ {args.remove} 삭제")
+        return
+
+    runs = list_runs()
+    if not runs:
+        print("저장된 실행 체크포인트가 없습니다.")
+        return
+    for run in runs:
+        print(f"🧩 {run.run_id} ({run.meta.get('date')}) 완료 단계 {len(run.completed())}개: {', '.join(run.completed())}")
+    print(f"\n💡 이어서 실행: python3 enhanced_main.py --resume {runs[-1].run_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+랭킹 스케줄러 데몬
+schedule + sleep(60) 루프 대신 정해진 벽시계 시각에 작업을 실행하는 상주 프로세스
+
+- 수집기/세션/분석기를 담은 랭킹 시스템 객체를 실행 사이에도 유지
+- 다음 실행 시각까지 정확히 대기 (절전/시계 변경에 대비해 최대 60초마다 다시 확인)
+- 파일 잠금으로 실행 중복 방지 (enhanced_main.py / stock_ranker_main.py 단일 실행도 같은 잠금 사용)
+- 절전/재부팅으로 놓친 실행은 허용 구간 안이면 한 번으로 묶어 바로 실행
+- 기본은 매일 실행, --days trading(--trading-days)으로 KRX 휴장일을 반영한 거래일 전용 스케줄
+
+시각은 시스템 로컬 시간(KST) 기준이다.
+"""
+
+import os
+import json
+import signal
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from data_paths import data_path
+import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 실행
+    fcntl = None
+
+DEFAULT_TIMES = ('21:00', '22:00', '23:00', '23:30')
+DEFAULT_MISFIRE_GRACE = timedelta(minutes=10)
+DEFAULT_CATCHUP = timedelta(hours=3)
+
+# KRX 휴장일 (주말 제외). 새 연도 휴장일은 data/krx_holidays.txt(한 줄에 YYYY-MM-DD)에 추가
+KRX_HOLIDAYS = {
+    # 2025
+    '2025-01-01', '2025-01-27', '2025-01-28', '2025-01-29', '2025-01-30', '2025-03-03', '2025-05-01',
+    '2025-05-05', '2025-05-06', '2025-06-03', '2025-06-06', '2025-08-15', '2025-10-03', '2025-10-06',
+    '2025-10-07', '2025-10-08', '2025-10-09', '2025-12-25', '2025-12-31',
+    # 2026
+    '2026-01-01', '2026-02-16', '2026-02-17', '2026-02-18', '2026-03-02', '2026-05-01', '2026-05-05',
+    '2026-05-25', '2026-06-03', '2026-08-17', '2026-09-24', '2026-09-25', '2026-10-05', '2026-10-09',
+    '2026-12-25', '2026-12-31',
+}
+
+
+class KRXCalendar:
+    """KRX 거래일 달력 (주말 + 휴장일 제외)"""
+
+    def __init__(self, holidays: Optional[Iterable[str]] = None, path: Optional[str] = None):
+        """
+        Args:
+            holidays: 휴장일 목록 (기본: KRX_HOLIDAYS)
+            path: 추가 휴장일 파일 (기본: data/krx_holidays.txt, 없으면 무시)
+        """
+        self.holidays = set(KRX_HOLIDAYS if holidays is None else holidays)
+        path = path or data_path("krx_holidays.txt")
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.holidays.update(line.strip() for line in f if line.strip() and not line.startswith('#'))
+
+    def is_trading_day(self, day: date) -> bool:
+        return day.weekday() < 5 and day.strftime('%Y-%m-%d') not in self.holidays
+
+    def next_trading_day(self, day: date) -> date:
+        """day 다음 거래일"""
+        day += timedelta(days=1)
+        while not self.is_trading_day(day):
+            day += timedelta(days=1)
+        return day
+
+
+class Job:
+    """정해진 시각에 실행할 작업"""
+
+    def __init__(self, name: str, func: Callable, times: Sequence[str] = DEFAULT_TIMES, days: str = 'daily',
+                 misfire_grace: timedelta = DEFAULT_MISFIRE_GRACE):
+        """
+        Args:
+            name: 작업 이름 (상태/로그 키)
+            func: 실행 함수 (인자 없음)
+            times: 실행 시각 목록 (HH:MM)
+            days: 'daily' (매일) 또는 'trading' (KRX 거래일만)
+            misfire_grace: 예정 시각 이후 이 시간 안에 실행하면 정시 실행으로 간주
+        """
+        self.name = name
+        self.func = func
+        self.times = sorted(datetime.strptime(value, '%H:%M').time() for value in times)
+        self.days = days
+        self.misfire_grace = misfire_grace
+
+    def runs_on(self, day: date, calendar: KRXCalendar) -> bool:
+        return self.days == 'daily' or calendar.is_trading_day(day)
+
+    def fire_times(self, start: datetime, end: datetime, calendar: KRXCalendar) -> List[datetime]:
+        """(start, end] 구간의 예정 실행 시각"""
+        fires = []
+        day = start.date()
+        while day <= end.date():
+            if self.runs_on(day, calendar):
+                fires.extend(fire for fire in (datetime.combine(day, t) for t in self.times) if start < fire <= end)
+            day += timedelta(days=1)
+        return fires
+
+    def next_fire(self, after: datetime, calendar: KRXCalendar) -> datetime:
+        """after 이후 첫 예정 실행 시각 (최대 1년 탐색)"""
+        day = after.date()
+        for _ in range(366):
+            if self.runs_on(day, calendar):
+                for t in self.times:
+                    fire = datetime.combine(day, t)
+                    if fire > after:
+                        return fire
+            day += timedelta(days=1)
+        raise ValueError(f"{self.name}: 1년 안에 실행할 날짜가 없습니다")
+
+
+@contextmanager
+def run_lock(path: Optional[str] = None) -> Iterator[bool]:
+    """
+    실행 중복 방지 파일 잠금 (비차단)
+
+    Yields:
+        잠금 획득 여부 (다른 실행이 진행 중이면 False)
+    """
+    path = path or data_path("ranking_run.lock")
+    fd = os.open(path, os.O_CREAT | os.O_RDWR, 0o644)
+    acquired = True
+    try:
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                acquired = False
+        if acquired:
+            os.ftruncate(fd, 0)
+            os.write(fd, f"{os.getpid()}\n".encode())
+        yield acquired
+    finally:
+        if acquired and fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        os.close(fd)
+
+
+class SchedulerDaemon:
+    """작업 스케줄러 (상태 파일로 마지막 실행 시각을 기억하여 놓친 실행 보충)"""
+
+    def __init__(self, jobs: List[Job], calendar: Optional[KRXCalendar] = None,
+                 state_path: Optional[str] = None, lock_path: Optional[str] = None,
+                 catchup: timedelta = DEFAULT_CATCHUP, clock: Callable[[], datetime] = datetime.now):
+        """
+        Args:
+            jobs: 작업 목록
+            calendar: 거래일 달력
+            state_path: 상태 파일 (기본: data/scheduler_state.json)
+            lock_path: 실행 잠금 파일 (기본: data/ranking_run.lock)
+            catchup: 놓친 실행을 보충하는 최대 지연 (이보다 오래된 실행은 건너뜀)
+            clock: 현재 시각 함수 (테스트용)
+        """
+        self.jobs = jobs
+        self.calendar = calendar or KRXCalendar()
+        self.state_path = state_path or data_path("scheduler_state.json")
+        self.lock_path = lock_path
+        self.catchup = catchup
+        self.clock = clock
+        self._stop = threading.Event()
+        self.last_fire: Dict[str, datetime] = {}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                self.last_fire = {name: datetime.fromisoformat(value) for name, value in json.load(f).items()}
+
+    def _save_state(self) -> None:
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({name: value.isoformat() for name, value in self.last_fire.items()}, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def due(self, now: datetime) -> List[Tuple[Job, datetime, int]]:
+        """
+        지금 실행할 작업 (놓친 실행 여러 번은 가장 최근 예정 시각 한 번으로 묶음)
+
+        Returns:
+            [(작업, 예정 시각, 묶인 실행 수)]
+        """
+        due, changed = [], False
+        for job in self.jobs:
+            if job.name not in self.last_fire:
+                # 처음 보는 작업은 지금부터 시작하고 과거 실행은 보충하지 않음
+                self.last_fire[job.name] = now
+                changed = True
+            last = self.last_fire[job.name]
+            fires = job.fire_times(max(last, now - self.catchup), now, self.calendar)
+            if fires:
+                due.append((job, fires[-1], len(fires)))
+            elif job.fire_times(last, now, self.calendar):
+                # 보충 구간보다 오래 놓친 실행은 건너뛰고 기준 시각만 갱신
+                logging.warning(f"⏭️ {job.name}: {self.catchup} 이상 지난 실행은 건너뜁니다")
+                self.last_fire[job.name] = now
+                changed = True
+        if changed:
+            self._save_state()
+        return due
+
+    def run_job(self, job: Job, fire: datetime, coalesced: int = 1) -> str:
+        """작업 1회 실행 (잠금을 못 잡으면 건너뜀). 반환: ok / error / skipped"""
+        now = self.clock()
+        late = now - fire
+        if coalesced > 1 or late > job.misfire_grace:
+            logging.info(f"⏰ {job.name}: 놓친 실행 보충 ({fire:%m-%d %H:%M} 예정, {coalesced}회 묶음, {late.total_seconds() / 60:.0f}분 지연)")
+        else:
+            logging.info(f"⏰ {job.name}: {fire:%Y-%m-%d %H:%M} 실행")
+
+        with run_lock(self.lock_path) as acquired:
+            if not acquired:
+                logging.warning(f"🔒 {job.name}: 다른 실행이 진행 중이라 건너뜁니다")
+                status = 'skipped'
+            else:
+                try:
+                    job.func()
+                    status = 'ok'
+                except Exception as e:
+                    logging.error(f"{job.name} 실행 오류: {e}")
+                    status = 'error'
+
+        # 실패해도 같은 예정 시각을 반복 실행하지 않도록 기준 시각 갱신
+        self.last_fire[job.name] = fire
+        self._save_state()
+        metrics.inc('scheduled_runs_total', job=job.name, status=status,
+                    kind='catchup' if coalesced > 1 or late > job.misfire_grace else 'on_time')
+        return status
+
+    def next_fire(self, now: datetime) -> datetime:
+        return min(job.next_fire(max(now, self.last_fire.get(job.name, now)), self.calendar) for job in self.jobs)
+
+    def run_pending(self) -> int:
+        """지금 실행할 작업을 모두 실행. 반환: 실행한 작업 수"""
+        due = self.due(self.clock())
+        for job, fire, coalesced in due:
+            self.run_job(job, fire, coalesced)
+        return len(due)
+
+    def run_forever(self) -> None:
+        """종료 신호(SIGINT/SIGTERM)까지 실행"""
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                signal.signal(sig, lambda *_: self.stop())
+            except ValueError:  # 메인 스레드가 아니면 신호 처리 생략
+                pass
+
+        self.run_pending()
+        while not self._stop.is_set():
+            now = self.clock()
+            upcoming = self.next_fire(now)
+            # 절전/시계 변경으로 대기 시간이 어긋나도 60초 안에 다시 확인
+            self._stop.wait(min(max((upcoming - now).total_seconds(), 0), 60))
+            if not self._stop.is_set():
+                self.run_pending()
+        self._save_state()
+        logging.info("🛑 스케줄러 종료")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+def ranking_job(ranking_system, times: Sequence[str] = DEFAULT_TIMES, days: str = 'daily') -> Job:
+    """
+    랭킹 작업 (같은 랭킹 시스템 객체의 수집기/세션/분석기를 실행마다 재사용)
+
+    Args:
+        ranking_system: EnhancedStockRankingSystem 또는 StockRankingSystem
+        times: 실행 시각 목록
+        days: 'daily' / 'trading'
+    """
+    if hasattr(ranking_system, 'generate_enhanced_daily_ranking'):
+        name, generate, show = 'enhanced_ranking', ranking_system.generate_enhanced_daily_ranking, ranking_system.print_enhanced_results
+    else:
+        name, generate, show = 'basic_ranking', ranking_system.generate_daily_ranking, ranking_system.print_results
+
+    def run():
+        print(f"\n⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - 자동 분석 실행...")
+        result = generate()
+        if not result:
+            raise RuntimeError("랭킹 생성 실패")
+        show(result)
+
+    return Job(name, run, times, days)
+
+
+def run_daemon(ranking_system, times: Sequence[str] = DEFAULT_TIMES, days: str = 'daily',
+               catchup: timedelta = DEFAULT_CATCHUP) -> None:
+    """랭킹 작업 하나로 스케줄러 데몬 실행 (종료 신호까지)"""
+    daemon = SchedulerDaemon([ranking_job(ranking_system, times, days)], catchup=catchup)
+    print("🤖 자동 분석 스케줄러 시작!")
+    print(f"실행 시간: {', '.join(times)} ({'KRX 거래일' if days == 'trading' else '매일'})")
+    print(f"다음 실행: {daemon.next_fire(datetime.now()):%Y-%m-%d %H:%M}")
+    print("종료하려면 Ctrl+C를 누르세요.")
+    daemon.run_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='랭킹 스케줄러 데몬')
+    parser.add_argument('--system', choices=['enhanced', 'basic'], default='enhanced', help='실행할 랭킹 시스템')
+    parser.add_argument('--times', default=','.join(DEFAULT_TIMES), help='실행 시각 (HH:MM, 쉼표 구분)')
+    parser.add_argument('--days', choices=['daily', 'trading'], default='daily', help='매일 / KRX 거래일만')
+    parser.add_argument('--catchup-hours', type=float, default=DEFAULT_CATCHUP.total_seconds() / 3600,
+                        help='놓친 실행을 보충하는 최대 지연 (시간)')
+    parser.add_argument('--next', type=int, metavar='N', help='다음 실행 예정 시각 N개만 출력')
+    args = parser.parse_args()
+
+    times = [value.strip() for value in args.times.split(',') if value.strip()]
+    if args.next:
+        job, calendar = Job('preview', lambda: None, times, args.days), KRXCalendar()
+        fire = datetime.now()
+        for _ in range(args.next):
+            fire = job.next_fire(fire, calendar)
+            print(f"   {fire:%Y-%m-%d (%a) %H:%M}")
+        return
+
+    if args.system == 'basic':
+        from stock_ranking_system import StockRankingSystem
+        ranking_system = StockRankingSystem()
+    else:
+        from enhanced_stock_ranking_system import EnhancedStockRankingSystem
+        ranking_system = EnhancedStockRankingSystem()
+    run_daemon(ranking_system, times, args.days, timedelta(hours=args.catchup_hours))
+
+
+if __name__ == "__main__":
+    main()
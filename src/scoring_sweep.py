@@ -0,0 +1,494 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+점수 계산 상수 병렬 스윕
+보관된 일별 뉴스에서 기사 특징(종목별 언급 수, 감성 합, 글로벌 이벤트)을 한 번만 추출해 캐시하고
+파라미터 조합마다 전체 과거 날짜를 행렬 연산으로 다시 채점 → TOP 10 → 백테스트 지표로 순위 비교
+
+특징은 파라미터와 무관하므로 조합 수가 늘어도 뉴스를 다시 읽지 않는다.
+사전을 고치면 바뀐 단어가 실제로 등장하는 날짜만 다시 추출하고 나머지는 이전 버전 캐시를 이어 쓴다.
+"""
+
+import os
+import json
+import copy
+import pickle
+import hashlib
+import argparse
+import itertools
+import random
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from data_paths import DATA_DIR, data_path
+from stock_analyzer import StockAnalyzer, DEFAULT_SCORING_PARAMS, GLOBAL_IMPACT_STOCKS
+from news_archive import archived_dates, load_news_archive, news_archive_file
+from backtest import Backtester, build_sector_map
+
+FEATURE_VERSION = 2
+FEATURE_CACHE_DIR = os.path.join(DATA_DIR, "feature_cache")
+
+# 파라미터 파일이 없을 때 사용하는 기본 스윕 그리드 (4 × 5 × 4 × 4 × 3 = 960 조합)
+DEFAULT_GRID = {
+    'mention_weight': [5, 10, 15, 20],
+    'sentiment_weight': [0, 2.5, 5, 10, 20],
+    'sector_weights.반도체': [1.0, 1.2, 1.4, 1.6],
+    'sector_weights.AI': [1.0, 1.2, 1.35, 1.5],
+    'global_impact.tsmc_earnings': [0, 15, 30],
+}
+
+METRICS = ('mean_return', 'hit_rate', 'cumulative_return', 'sharpe', 'max_drawdown')
+
+
+def lexicon_signature(analyzer: StockAnalyzer) -> str:
+    """특징 추출에 영향을 주는 사전(종목/감성 키워드, 이벤트 연관 종목)의 해시"""
+    lexicon = {
+        'version': FEATURE_VERSION,
+        'stock_keywords': analyzer.stock_keywords,
+        'positive_words': analyzer.positive_words,
+        'negative_words': analyzer.negative_words,
+        'global_impact_stocks': GLOBAL_IMPACT_STOCKS,
+    }
+    return hashlib.sha1(json.dumps(lexicon, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+
+def lexicon_terms(analyzer: StockAnalyzer) -> Dict[str, List[str]]:
+    """특징 추출에 쓰이는 단어별 역할 (종목:섹터 / positive / negative) — 사전 버전 간 차이 비교용"""
+    terms: Dict[str, List[str]] = {}
+    for sector, stocks in analyzer.stock_keywords.items():
+        for stock in stocks:
+            terms.setdefault(stock, []).append(f"stock:{sector}")
+    for word in analyzer.positive_words:
+        terms.setdefault(word, []).append('positive')
+    for word in analyzer.negative_words:
+        terms.setdefault(word, []).append('negative')
+    return terms
+
+
+def extract_day_features(analyzer: StockAnalyzer, news_list: List[Dict]) -> Dict:
+    """
+    하루치 뉴스에서 파라미터와 무관한 채점 특징 추출
+
+    Returns:
+        stocks: 언급된 종목 (calculate_stock_scores와 같은 순서)
+        article_stock: 기사 × 종목 언급 행렬 (종목이 여러 섹터에 있으면 섹터 수만큼 센다)
+        article_sentiment: 기사별 감성 점수
+        mentions: 종목별 언급 수 (article_stock 열 합)
+        sentiment: 종목별 (언급 기사 감성 점수 합)
+        topics: 글로벌 이벤트 감지 결과
+    """
+    mentions = analyzer.extract_stock_mentions(news_list)
+    sentiment_scores = analyzer.analyze_news_sentiment(news_list)
+    topics = analyzer._detect_global_topics(news_list)
+    texts = [f"{news.get('title', '')} {news.get('content', '')}" for news in news_list]
+
+    stocks = [stock for stock, count in mentions.items() if count > 0]
+    sectors_of = {stock: sum(stock in names for names in analyzer.stock_keywords.values()) for stock in stocks}
+    article_stock = np.array([[sectors_of[stock] if stock in text else 0 for stock in stocks] for text in texts],
+                             dtype=np.float64).reshape(len(texts), len(stocks))
+    article_sentiment = np.array([sentiment_scores.get(news['title'], 0) for news in news_list], dtype=np.float64)
+    return {
+        'stocks': stocks,
+        'article_stock': article_stock,
+        'article_sentiment': article_sentiment,
+        'mentions': article_stock.sum(axis=0),
+        'sentiment': article_sentiment @ (article_stock > 0),
+        'topics': topics,
+    }
+
+
+class FeatureCache:
+    """
+    날짜별 특징 캐시 (사전 버전별 디렉토리, 원본 뉴스 파일이 바뀌면 다시 추출)
+
+    현재 버전에 없는 날짜는 이전 버전 캐시를 찾아, 두 사전에서 역할이 바뀐 단어가
+    그날 기사에 하나도 없으면 특징이 같으므로 추출 없이 그대로 옮겨 쓴다.
+    """
+
+    def __init__(self, analyzer: StockAnalyzer, cache_dir: Optional[str] = None,
+                 archive_dir: Optional[str] = None):
+        self.analyzer = analyzer
+        self.archive_dir = archive_dir
+        self.base_dir = cache_dir or FEATURE_CACHE_DIR
+        self.signature = lexicon_signature(analyzer)
+        self.cache_dir = os.path.join(self.base_dir, self.signature)
+        self.terms = lexicon_terms(analyzer)
+        self.hits = 0
+        self.misses = 0
+        self.carried = 0
+        self._previous: Optional[List[Tuple[str, set]]] = None
+
+        lexicon_file = os.path.join(self.base_dir, "lexicons", f"{self.signature}.json")
+        if not os.path.exists(lexicon_file):
+            os.makedirs(os.path.dirname(lexicon_file), exist_ok=True)
+            with open(lexicon_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': FEATURE_VERSION, 'terms': self.terms}, f, ensure_ascii=False)
+
+    def _previous_versions(self) -> List[Tuple[str, set]]:
+        """이전 사전 버전 목록 (최근 것부터)과 현재 사전 대비 역할이 바뀐 단어 집합"""
+        if self._previous is None:
+            self._previous = []
+            lexicon_dir = os.path.join(self.base_dir, "lexicons")
+            names = [name for name in os.listdir(lexicon_dir) if name.endswith('.json') and name[:-5] != self.signature]
+            names.sort(key=lambda name: os.path.getmtime(os.path.join(lexicon_dir, name)), reverse=True)
+            for name in names:
+                with open(os.path.join(lexicon_dir, name), 'r', encoding='utf-8') as f:
+                    lexicon = json.load(f)
+                if lexicon.get('version') != FEATURE_VERSION:
+                    continue
+                terms = lexicon['terms']
+                changed = {term for term in set(terms) | set(self.terms) if terms.get(term) != self.terms.get(term)}
+                self._previous.append((name[:-5], changed))
+        return self._previous
+
+    def _read(self, cache_file: str, source: Tuple) -> Optional[Dict]:
+        try:
+            with open(cache_file, 'rb') as f:
+                cached_source, features = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError, ValueError):
+            return None
+        return features if cached_source == source else None
+
+    def _carry_over(self, date: str, source: Tuple) -> Optional[Dict]:
+        """바뀐 단어가 등장하지 않는 이전 버전 캐시가 있으면 반환"""
+        texts = None
+        for signature, changed in self._previous_versions():
+            features = self._read(os.path.join(self.base_dir, signature, f"{date}.pkl"), source)
+            if features is None:
+                continue
+            if changed:
+                if texts is None:
+                    texts = [f"{news.get('title', '')} {news.get('content', '')}"
+                             for news in load_news_archive(date, self.archive_dir) or []]
+                if any(term in text for text in texts for term in changed):
+                    continue
+            return features
+        return None
+
+    def get(self, date: str) -> Optional[Dict]:
+        """날짜의 특징 (뉴스가 없으면 None)"""
+        news_file = news_archive_file(date, self.archive_dir)
+        if not os.path.exists(news_file):
+            return None
+        source = (os.path.getsize(news_file), os.path.getmtime(news_file))
+        cache_file = os.path.join(self.cache_dir, f"{date}.pkl")
+
+        features = self._read(cache_file, source)
+        if features is not None:
+            self.hits += 1
+            return features
+
+        features = self._carry_over(date, source)
+        if features is not None:
+            self.carried += 1
+        else:
+            self.misses += 1
+            features = extract_day_features(self.analyzer, load_news_archive(date, self.archive_dir) or [])
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(cache_file, 'wb') as f:
+            pickle.dump((source, features), f, protocol=pickle.HIGHEST_PROTOCOL)
+        return features
+
+
+class SweepDataset:
+    """전체 날짜 × 언급 종목 특징 행렬 (파라미터 벡터와 곱해 한 번에 채점)"""
+
+    def __init__(self, dates: List[str], day_features: List[Dict], stock_keywords: Dict[str, List[str]]):
+        """
+        Args:
+            dates: 날짜 목록
+            day_features: 날짜별 extract_day_features 결과
+            stock_keywords: 섹터별 종목 목록 (섹터 판정용)
+        """
+        self.dates = list(dates)
+        self.topics = list(DEFAULT_SCORING_PARAMS['global_impact'])
+        for topic in DEFAULT_SCORING_PARAMS['topic_sector_boosts']:
+            if topic not in self.topics:
+                self.topics.append(topic)
+        self.sectors = list(dict.fromkeys(list(stock_keywords) + list(DEFAULT_SCORING_PARAMS['sector_weights'])))
+        sector_of = build_sector_map(stock_keywords)
+
+        day_ids, stocks, mentions, sentiment, day_flags = [], [], [], [], []
+        for day_id, features in enumerate(day_features):
+            count = len(features['stocks'])
+            day_ids.extend([day_id] * count)
+            stocks.extend(features['stocks'])
+            mentions.append(features['mentions'])
+            sentiment.append(features['sentiment'])
+            flags = [bool(features['topics'].get(topic)) for topic in self.topics]
+            day_flags.extend([flags] * count)
+
+        self.day_id = np.array(day_ids, dtype=np.int64)
+        self.stocks = stocks
+        self.mentions = np.concatenate(mentions) if mentions else np.zeros(0)
+        self.sentiment = np.concatenate(sentiment) if sentiment else np.zeros(0)
+        self.topic_flags = np.array(day_flags, dtype=np.float64).reshape(len(stocks), len(self.topics))
+
+        # 이벤트 연관 종목 여부 (행 × 이벤트), 섹터 원-핫 (행 × 섹터)
+        related = np.array([[stock in GLOBAL_IMPACT_STOCKS.get(topic, ()) for topic in self.topics] for stock in stocks],
+                           dtype=np.float64).reshape(len(stocks), len(self.topics))
+        self.topic_stock = related * self.topic_flags
+        sector_index = {sector: i for i, sector in enumerate(self.sectors)}
+        self.sector_onehot = np.zeros((len(stocks), len(self.sectors)))
+        for row, stock in enumerate(stocks):
+            if stock in sector_of:
+                self.sector_onehot[row, sector_index[sector_of[stock]]] = 1.0
+        self.no_sector = 1.0 - self.sector_onehot.sum(axis=1)
+
+        self.returns = np.full(len(stocks), np.nan)
+
+    def __len__(self) -> int:
+        return len(self.stocks)
+
+    def attach_returns(self, backtester: Backtester) -> None:
+        """행마다 다음 거래일 수익률(%) 계산 (채점과 무관하므로 한 번만)"""
+        pairs = pd.DataFrame({
+            'date': [self.dates[i] for i in self.day_id],
+            'stock_name': self.stocks,
+        })
+        self.returns = backtester.attach_returns(pairs)['return_1d'].to_numpy(dtype=np.float64)
+
+    def param_vectors(self, params: Dict) -> Tuple:
+        """파라미터 딕셔너리 → (언급 가중치, 감성 가중치, 이벤트 가산점, 섹터 가중치, 이벤트×섹터 가산)"""
+        impact = np.array([params['global_impact'].get(topic, 0.0) for topic in self.topics])
+        sector = np.array([params['sector_weights'].get(name, 1.0) for name in self.sectors])
+        boosts = np.zeros((len(self.topics), len(self.sectors)))
+        for i, topic in enumerate(self.topics):
+            for j, name in enumerate(self.sectors):
+                boosts[i, j] = params['topic_sector_boosts'].get(topic, {}).get(name, 0.0)
+        return params['mention_weight'], params['sentiment_weight'], impact, sector, boosts
+
+    def scores(self, params: Dict) -> np.ndarray:
+        """
+        StockAnalyzer.calculate_stock_scores와 같은 식을 전체 행에 대해 계산
+
+        (언급 × w + 감성합 × w + Σ 이벤트 가산점) × (섹터 가중치 + Σ 이벤트별 섹터 가산)
+        """
+        mention_weight, sentiment_weight, impact, sector, boosts = self.param_vectors(params)
+        base = self.mentions * mention_weight + self.sentiment * sentiment_weight + self.topic_stock @ impact
+        weight = self.sector_onehot @ sector + ((self.topic_flags @ boosts) * self.sector_onehot).sum(axis=1) + self.no_sector
+        return base * weight
+
+    def top_k_mask(self, scores: np.ndarray, k: int = 10) -> np.ndarray:
+        """날짜별 점수 상위 k개 행 (동점은 언급 순서 유지 = rank_stocks와 동일)"""
+        order = np.lexsort((np.arange(len(scores)), -scores, self.day_id))
+        sorted_days = self.day_id[order]
+        rank = np.arange(len(order)) - np.searchsorted(sorted_days, sorted_days, side='left')
+        mask = np.zeros(len(scores), dtype=bool)
+        mask[order[rank < k]] = True
+        return mask
+
+    def daily_stats(self, params: Dict, k: int = 10) -> np.ndarray:
+        """
+        파라미터 1세트의 날짜별 TOP k 성과 합계 (걷기 전진 검증에서 구간별로 더해 씀)
+
+        Returns:
+            (3 × 날짜 수) 배열: 수익률 합(%), 평가 종목 수, 상승 종목 수
+        """
+        selected = self.top_k_mask(self.scores(params), k) & ~np.isnan(self.returns)
+        days = self.day_id[selected]
+        returns = self.returns[selected]
+        return np.vstack([
+            np.bincount(days, weights=returns, minlength=len(self.dates)),
+            np.bincount(days, minlength=len(self.dates)),
+            np.bincount(days, weights=(returns > 0).astype(np.float64), minlength=len(self.dates)),
+        ])
+
+    def evaluate(self, params: Dict, k: int = 10) -> Dict[str, float]:
+        """파라미터 1세트 채점 → TOP k → 백테스트 지표"""
+        selected = self.top_k_mask(self.scores(params), k) & ~np.isnan(self.returns)
+        returns = self.returns[selected]
+        days = self.day_id[selected]
+
+        metrics = {'trades': int(selected.sum()), 'mean_return': 0.0, 'hit_rate': 0.0,
+                   'cumulative_return': 0.0, 'sharpe': 0.0, 'max_drawdown': 0.0}
+        if not len(returns):
+            return metrics
+
+        sums = np.bincount(days, weights=returns, minlength=len(self.dates))
+        counts = np.bincount(days, minlength=len(self.dates))
+        daily = sums[counts > 0] / counts[counts > 0]
+        equity = np.cumprod(1 + daily / 100)
+        drawdown = equity / np.maximum.accumulate(np.maximum(equity, 1.0)) - 1
+        std = daily.std(ddof=1) if len(daily) > 1 else 0.0
+
+        metrics.update({
+            'mean_return': float(returns.mean()),
+            'hit_rate': float((returns > 0).mean() * 100),
+            'cumulative_return': float((equity[-1] - 1) * 100),
+            'sharpe': float(daily.mean() / std * np.sqrt(252)) if std > 0 else 0.0,
+            'max_drawdown': float(drawdown.min() * 100),
+        })
+        return metrics
+
+
+def set_param(params: Dict, dotted_key: str, value) -> None:
+    """'sector_weights.반도체' 같은 점 경로로 중첩 파라미터 설정"""
+    *parents, leaf = dotted_key.split('.')
+    node = params
+    for key in parents:
+        node = node.setdefault(key, {})
+    node[leaf] = value
+
+
+def expand_grid(grid: Dict[str, List], samples: Optional[int] = None, seed: int = 0) -> List[Dict]:
+    """
+    그리드 → 파라미터 세트 목록 (기본값 위에 덮어씀)
+
+    Args:
+        grid: {점 경로: 후보 값 리스트}
+        samples: 지정 시 전체 조합 중 무작위 표본 수
+        seed: 표본 추출 시드
+    """
+    keys = list(grid)
+    combos = list(itertools.product(*(grid[key] for key in keys)))
+    if samples and samples < len(combos):
+        combos = random.Random(seed).sample(combos, samples)
+
+    param_sets = []
+    for values in combos:
+        params = copy.deepcopy(DEFAULT_SCORING_PARAMS)
+        for key, value in zip(keys, values):
+            set_param(params, key, value)
+        param_sets.append(params)
+    return param_sets
+
+
+_WORKER_DATASET: Optional[SweepDataset] = None
+
+
+def _init_worker(dataset: SweepDataset) -> None:
+    global _WORKER_DATASET
+    _WORKER_DATASET = dataset
+
+
+def _evaluate_chunk(param_sets: List[Dict], k: int) -> List[Dict[str, float]]:
+    return [_WORKER_DATASET.evaluate(params, k) for params in param_sets]
+
+
+def run_sweep(dataset: SweepDataset, param_sets: List[Dict], workers: int = 0, k: int = 10) -> List[Dict[str, float]]:
+    """
+    파라미터 세트 전체 평가 (프로세스 풀, 데이터셋은 워커마다 한 번만 전달)
+
+    Args:
+        dataset: 특징·수익률이 준비된 데이터셋
+        param_sets: 파라미터 세트 목록
+        workers: 프로세스 수 (0이면 CPU 수, 1이면 현재 프로세스에서 실행)
+        k: 날짜별 선정 종목 수
+
+    Returns:
+        param_sets와 같은 순서의 지표 리스트
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(param_sets) < 2:
+        return [dataset.evaluate(params, k) for params in param_sets]
+
+    chunk_size = max(1, -(-len(param_sets) // (workers * 4)))
+    chunks = [param_sets[i:i + chunk_size] for i in range(0, len(param_sets), chunk_size)]
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(dataset,)) as executor:
+        for chunk_result in executor.map(_evaluate_chunk, chunks, itertools.repeat(k)):
+            results.extend(chunk_result)
+    return results
+
+
+def load_dataset(start: Optional[str] = None, end: Optional[str] = None,
+                 archive_dir: Optional[str] = None, db_path: Optional[str] = None) -> SweepDataset:
+    """보관 뉴스 특징(캐시 사용) + 로컬 일봉 수익률로 데이터셋 구성"""
+    from kis_api import StockDataManager
+    from price_store import PriceBarStore
+
+    analyzer = StockAnalyzer()
+    cache = FeatureCache(analyzer, archive_dir=archive_dir)
+    dates = archived_dates(archive_dir, start, end)
+    day_features = [cache.get(date) for date in dates]
+    print(f"🧮 특징 로드: {len(dates)}일 (캐시 {cache.hits}일, 이전 사전 재사용 {cache.carried}일, 새로 추출 {cache.misses}일)")
+
+    dataset = SweepDataset(dates, day_features, analyzer.stock_keywords)
+    if not len(dataset):
+        return dataset
+
+    stock_manager = StockDataManager(None)
+    codes = sorted({code for code in map(stock_manager.get_stock_code, set(dataset.stocks)) if code})
+    store = PriceBarStore(db_path)
+    try:
+        prices = store.price_matrix(codes, start=(pd.Timestamp(dates[0]) - pd.Timedelta(days=10)).strftime('%Y-%m-%d'))
+    finally:
+        store.close()
+
+    dataset.attach_returns(Backtester(prices, stock_manager.get_stock_code))
+    print(f"📈 수익률 계산: {len(dataset)}행 중 {int((~np.isnan(dataset.returns)).sum())}행 평가 가능")
+    return dataset
+
+
+def flatten_params(params: Dict, prefix: str = '') -> Dict[str, float]:
+    """중첩 파라미터 → {점 경로: 값}"""
+    flat = {}
+    for key, value in params.items():
+        path = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_params(value, path + '.'))
+        else:
+            flat[path] = value
+    return flat
+
+
+def main():
+    parser = argparse.ArgumentParser(description='점수 계산 상수 병렬 스윕 (보관 뉴스 재채점 + 백테스트)')
+    parser.add_argument('--grid', help='스윕 그리드 JSON ({"mention_weight": [5, 10], "sector_weights.반도체": [1.2, 1.4]})')
+    parser.add_argument('--samples', type=int, help='전체 조합 중 무작위 표본 수')
+    parser.add_argument('--start', help='시작일 (YYYY-MM-DD)')
+    parser.add_argument('--end', help='종료일 (YYYY-MM-DD)')
+    parser.add_argument('--metric', choices=METRICS, default='mean_return', help='순위 기준 지표')
+    parser.add_argument('--top', type=int, default=10, help='출력할 상위 조합 수')
+    parser.add_argument('--workers', type=int, default=0, help='프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--db', help='일봉 저장소 경로 (기본: data/price_bars.db)')
+    parser.add_argument('--save-best', help='최고 조합을 저장할 JSON 경로 (TUJA_SCORING_PARAMS로 적용)')
+
+    args = parser.parse_args()
+
+    grid = DEFAULT_GRID
+    if args.grid:
+        with open(args.grid, 'r', encoding='utf-8') as f:
+            grid = json.load(f)
+
+    dataset = load_dataset(args.start, args.end, db_path=args.db)
+    if not len(dataset) or np.isnan(dataset.returns).all():
+        print("❌ 스윕할 데이터가 없습니다. 보관된 뉴스(data/news)와 일봉(backfill_prices.py)이 필요합니다.")
+        return
+
+    param_sets = expand_grid(grid, args.samples)
+    print(f"🔀 {len(param_sets):,}개 조합 평가 중...")
+    started = datetime.now()
+    results = run_sweep(dataset, param_sets, args.workers)
+    elapsed = (datetime.now() - started).total_seconds()
+
+    rows = []
+    for params, metrics in zip(param_sets, results):
+        flat = flatten_params(params)
+        rows.append({**{key: flat[key] for key in grid}, **metrics})
+    frame = pd.DataFrame(rows)
+    frame['param_set'] = range(len(frame))
+    frame = frame.sort_values(args.metric, ascending=False).reset_index(drop=True)
+
+    csv_path = data_path("sweeps", f"scoring_sweep_{started.strftime('%Y%m%d_%H%M%S')}.csv")
+    frame.to_csv(csv_path, index=False, encoding='utf-8-sig')
+    print(f"✅ {len(param_sets):,}개 조합 {elapsed:.1f}초 ({len(param_sets) / max(elapsed, 1e-9):,.0f}조합/초) → {csv_path}")
+
+    print(f"\n🏆 {args.metric} 상위 {args.top}개 조합:")
+    columns = list(grid) + list(METRICS)
+    print(frame[columns].head(args.top).to_string(index=False))
+
+    if args.save_best:
+        best = param_sets[int(frame.loc[0, 'param_set'])]
+        with open(args.save_best, 'w', encoding='utf-8') as f:
+            json.dump(best, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 최고 조합 저장: {args.save_best} (TUJA_SCORING_PARAMS={args.save_best} 로 적용)")
+
+
+if __name__ == "__main__":
+    main()
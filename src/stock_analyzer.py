@@ -1,12 +1,178 @@
 import pandas as pd
 import numpy as np
 import re
-from typing import List, Dict, Tuple
+import os
+import json
+import copy
+from typing import List, Dict, Tuple, Optional
 from collections import Counter
 import logging
+from tracing import traced
+
+# 점수 계산 상수 (scoring_sweep.py로 과거 데이터 기준 튜닝 가능)
+DEFAULT_SCORING_PARAMS = {
+    # 기본 점수 = 언급 횟수 × mention_weight, 감성 보너스 = 기사 감성 점수 합 × sentiment_weight
+    'mention_weight': 10.0,
+    'sentiment_weight': 5.0,
+    # 글로벌 이벤트 발생 시 연관 종목 가산점
+    'global_impact': {
+        'tsmc_earnings': 15.0,
+        'nvidia_earnings': 12.0,
+        'openai_titan': 10.0,
+        'fed_announcement': 8.0,
+        'ai_boom': 10.0,
+        'global_tech_surge': 8.0
+    },
+    # 섹터 기본 가중치
+    'sector_weights': {
+        '반도체': 1.4,      # TSMC 실적 폭발, 글로벌 AI 칩 수요 과열
+        'AI': 1.35,         # OpenAI Titan 칩 발표, AI 플랫폼 확장
+        '로봇': 1.3,       # 피지컬 AI, 휴머노이드 부상
+        '우주항공': 1.25,   # 아르테미스, 우주경제 기대
+        '글로벌테크': 1.3,  # 미국 빅테크 실적 호조
+        '금융': 1.1,        # Fed 정책 불확실성으로 가중치 하향
+        '방산': 1.2,        # 지정학적 리스크 증가
+        '조선': 1.2,        # 장기 호황 사이클 지속
+        '전력': 1.1,        # AI 데이터센터 전력 수요
+        '2차전지': 1.05,    # 미국 IRA 정책 수혜
+        '바이오': 0.95,     # 일시적 조정
+        '자율주행': 1.15    # 로봇과 시너지
+    },
+    # 글로벌 이벤트 발생 시 섹터 가중치 가산
+    'topic_sector_boosts': {
+        'tsmc_earnings': {'반도체': 0.3},
+        'fed_announcement': {'금융': 0.15},
+        'ai_boom': {'AI': 0.2, '글로벌테크': 0.2}
+    }
+}
+
+# 글로벌 이벤트별 연관 종목
+GLOBAL_IMPACT_STOCKS = {
+    'tsmc_earnings': ['삼성전자', 'SK하이닉스', 'TSMC'],
+    'nvidia_earnings': ['NVIDIA', 'SK하이닉스', 'Broadcom'],
+    'openai_titan': ['TSMC', 'Broadcom', 'NVIDIA'],
+    'fed_announcement': ['SK증권', 'KB금융', '미래에셋증권'],
+    'ai_boom': ['NVIDIA', '삼성전자', 'TSMC', 'OpenAI'],
+    'global_tech_surge': ['Apple', 'Microsoft', 'Google', 'Meta']
+}
+
+# 글로벌 이벤트 판정에 쓰이는 단어 (_global_topics_in) — 기사별로 등장 여부만 모아 두면 합쳐서 다시 판정할 수 있음
+GLOBAL_TOPIC_TERMS = ('tsmc', 'earnings', 'record', 'nvidia', 'revenue', 'openai', 'titan', 'fed',
+                      'federal reserve', 'quarter', 'ai', 'demand', 'boom', 'surge', 'rally')
+
+# 하락 예측 섹터별 위험도 (목록에 없는 섹터는 3)
+SECTOR_RISK = {
+    '금융': 15,  # Fed 정책 리스크
+    '2차전지': 12,  # 수요 둔화 우려
+    '바이오': 10,  # 규제 리스크
+    '자율주행': 8,  # 기술 지연 리스크
+    '조선': 6,  # 경기 민감
+    '전력': 5,  # 정책 리스크
+}
+
+
+def load_scoring_params(path: Optional[str] = None) -> Dict:
+    """
+    점수 계산 상수 로드 (기본값 위에 JSON 파일의 값을 덮어씀)
+
+    Args:
+        path: 파라미터 JSON 경로 (기본: TUJA_SCORING_PARAMS 환경변수, 없으면 기본값만 사용)
+    """
+    params = copy.deepcopy(DEFAULT_SCORING_PARAMS)
+    path = path or os.getenv("TUJA_SCORING_PARAMS")
+    if not path:
+        return params
+
+    with open(path, 'r', encoding='utf-8') as f:
+        overrides = json.load(f)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(params.get(key), dict):
+            params[key].update(value)
+        else:
+            params[key] = value
+    return params
+
+
+class NewsAggregate:
+    """
+    기사 단위로 더해 가는 뉴스 분석 중간 집계
+
+    종목 언급 수, 기사별 감성, 종목별 언급 기사, 글로벌 이벤트 단어, 섹터/기술/인물 언급 수,
+    시그널, 종목별 최고 하락 위험을 기사 순서대로 누적한다. 모든 항목이 기사별 결과의 합(또는 최댓값)이라
+    앞선 실행의 집계에 새 기사만 더해도 전체 뉴스를 처음부터 분석한 것과 같은 랭킹이 나온다 (intraday_state.py).
+    """
+
+    def __init__(self, state: Optional[Dict] = None):
+        """
+        Args:
+            state: to_dict()로 저장해 둔 집계 (없으면 빈 집계)
+        """
+        state = state or {}
+        self.article_count = state.get('article_count', 0)
+        self.mentions = Counter(state.get('mentions', {}))
+        self.sentiment: Dict[str, float] = dict(state.get('sentiment', {}))
+        self.stock_titles: Dict[str, List[str]] = {stock: list(titles) for stock, titles in state.get('stock_titles', {}).items()}
+        self.topic_terms: List[str] = list(state.get('topic_terms', []))
+        self.sectors = Counter(state.get('sectors', {}))
+        self.tech = Counter(state.get('tech', {}))
+        self.entities = Counter(state.get('entities', {}))
+        self.trend_signals: List[Dict] = list(state.get('trend_signals', []))
+        self.impact_signals: List[Dict] = list(state.get('impact_signals', []))
+        self.risks: Dict[str, List] = {stock: list(risk) for stock, risk in state.get('risks', {}).items()}
+
+    def stock_mentions(self) -> Dict[str, int]:
+        return dict(self.mentions)
+
+    def restrict(self, stock_keywords: Dict[str, List[str]]) -> 'NewsAggregate':
+        """
+        종목 사전 일부(유니버스)만 남긴 집계 (universes.py)
+
+        종목 언급 수와 섹터 언급 수는 그 사전으로 aggregate_news를 다시 돌린 것과 같게 다시 세고
+        (기사 식별은 sentiment와 같은 제목 기준), 감성 / 글로벌 이벤트 / 기술·인물 시그널은 그대로 공유한다.
+        하락 위험은 사전에 남은 종목만 거른다.
+
+        Args:
+            stock_keywords: {섹터: [종목]} — 전체 사전의 부분집합
+        """
+        sector_counts = Counter(stock for stocks in stock_keywords.values() for stock in stocks)
+        restricted = NewsAggregate(self.to_dict())
+        # 전체 사전의 언급 수 = 언급 기사 수 × 종목이 속한 섹터 수 (섹터마다 1회)
+        restricted.mentions = Counter({stock: len(titles) * sector_counts[stock]
+                                       for stock, titles in self.stock_titles.items() if stock in sector_counts})
+        restricted.stock_titles = {stock: titles for stock, titles in restricted.stock_titles.items()
+                                   if stock in sector_counts}
+        restricted.sectors = Counter()
+        for sector in self.sectors:  # 처음 등장한 순서 유지 (핫 섹터 동점 처리)
+            titles = {title for stock in stock_keywords.get(sector, ()) for title in self.stock_titles.get(stock, ())}
+            if titles:
+                restricted.sectors[sector] = len(titles)
+        restricted.risks = {stock: risk for stock, risk in restricted.risks.items() if stock in sector_counts}
+        return restricted
+
+    def to_dict(self) -> Dict:
+        """JSON으로 저장할 수 있는 형태 (딕셔너리 순서 = 처음 등장한 기사 순서)"""
+        return {
+            'article_count': self.article_count,
+            'mentions': dict(self.mentions),
+            'sentiment': self.sentiment,
+            'stock_titles': self.stock_titles,
+            'topic_terms': self.topic_terms,
+            'sectors': dict(self.sectors),
+            'tech': dict(self.tech),
+            'entities': dict(self.entities),
+            'trend_signals': self.trend_signals,
+            'impact_signals': self.impact_signals,
+            'risks': self.risks,
+        }
+
 
 class StockAnalyzer:
-    def __init__(self):
+    def __init__(self, scoring_params: Optional[Dict] = None):
+        """
+        Args:
+            scoring_params: 점수 계산 상수 (기본: load_scoring_params())
+        """
+        self.scoring_params = scoring_params or load_scoring_params()
         self.stock_keywords = {
             '반도체': ['삼성전자', 'SK하이닉스', '지니틱스', '라닉스', '와이씨켐', '샘씨엔에스', '저스템', '케이엔제이', '한미반도체', 'DB하이텍', '이노션', '아이씨케이', 'HBM4', 'HBM', 'TSMC', 'NVIDIA', 'AMD', 'Broadcom', 'Qualcomm', 'TSM'],
             '금융': ['SK증권', '한화손해보험', 'KB금융', '신한지주', '하나금융지주', '미래에셋증권', '키움증권', 'KB증권', 'Fed', 'Federal Reserve'],
@@ -105,51 +271,52 @@ class StockAnalyzer:
             'SpaceX', 'NASA', 'Fed', 'Federal Reserve', 'IMF'
         ]
 
+    @traced('analyzer')
     def analyze_news_sentiment(self, news_list: List[Dict]) -> Dict:
         """뉴스 감성 분석"""
         sentiment_scores = {}
         
         for news in news_list:
-            title = news.get('title', '')
-            content = news.get('content', '')
-            text = f"{title} {content}"
-            
-            # 긍정/부정 단어 카운트
-            positive_count = sum(1 for word in self.positive_words if word in text)
-            negative_count = sum(1 for word in self.negative_words if word in text)
-            
-            # 감성 점수 계산
-            total_words = positive_count + negative_count
-            if total_words > 0:
-                sentiment_score = (positive_count - negative_count) / total_words
-            else:
-                sentiment_score = 0
-                
-            sentiment_scores[news['title']] = sentiment_score
+            sentiment_scores[news['title']] = self._sentiment_score(self._article_text(news))
             
         return sentiment_scores
 
+    @staticmethod
+    def _article_text(news: Dict) -> str:
+        """분석 대상 텍스트 (제목 + 본문)"""
+        return f"{news.get('title', '')} {news.get('content', '')}"
+
+    def _sentiment_score(self, text: str) -> float:
+        """기사 1건의 감성 점수 ((긍정 - 부정) / (긍정 + 부정), 감성 단어가 없으면 0)"""
+        # 긍정/부정 단어 카운트
+        positive_count = sum(1 for word in self.positive_words if word in text)
+        negative_count = sum(1 for word in self.negative_words if word in text)
+        
+        # 감성 점수 계산
+        total_words = positive_count + negative_count
+        if total_words > 0:
+            return (positive_count - negative_count) / total_words
+        return 0
+
+    @traced('analyzer')
     def extract_stock_mentions(self, news_list: List[Dict]) -> Dict[str, int]:
         """뉴스에서 주식 언급 횟수 추출"""
         stock_mentions = Counter()
         
         for news in news_list:
-            title = news.get('title', '')
-            content = news.get('content', '')
-            text = f"{title} {content}"
-            
-            # 각 섹터별 주식 언급 확인
-            for sector, stocks in self.stock_keywords.items():
-                for stock in stocks:
-                    if stock in text:
-                        stock_mentions[stock] += 1
+            # 각 섹터별 주식 언급 확인 (여러 섹터에 속한 종목은 섹터마다 1회)
+            for sector, stock in self._mentioned_stocks(self._article_text(news)):
+                stock_mentions[stock] += 1
                         
         return dict(stock_mentions)
 
+    def _mentioned_stocks(self, text: str) -> List[Tuple[str, str]]:
+        """기사에 등장하는 (섹터, 종목) 쌍 (stock_keywords 순서)"""
+        return [(sector, stock) for sector, stocks in self.stock_keywords.items() for stock in stocks if stock in text]
+
+    @traced('analyzer')
     def calculate_stock_scores(self, news_list: List[Dict], stock_mentions: Dict[str, int]) -> Dict[str, float]:
         """주식별 상승 가능성 점수 계산 (글로벌 데이터 반영)"""
-        stock_scores = {}
-        
         # 뉴스 감성 분석
         sentiment_scores = self.analyze_news_sentiment(news_list)
         
@@ -159,19 +326,39 @@ class StockAnalyzer:
         # 동적 섹터 가중치 계산
         dynamic_weights = self.get_dynamic_sector_weights(global_topics)
         
+        # 종목별 언급 기사 제목 (감성 보너스용)
+        stock_titles = {stock: [news['title'] for news in news_list if stock in self._article_text(news)]
+                        for stock in stock_mentions}
+        
+        return self._score_stocks(stock_mentions, sentiment_scores, stock_titles, dynamic_weights, global_topics)
+
+    def _score_stocks(self, stock_mentions: Dict[str, int], sentiment_scores: Dict[str, float],
+                      stock_titles: Dict[str, List[str]], dynamic_weights: Dict[str, float],
+                      global_topics: Dict[str, bool]) -> Dict[str, float]:
+        """
+        언급 수 / 감성 / 글로벌 이벤트로 종목 점수 계산 (calculate_stock_scores, scores_from_aggregate 공통)
+
+        Args:
+            stock_mentions: 종목별 언급 수
+            sentiment_scores: 기사 제목별 감성 점수
+            stock_titles: 종목별 언급 기사 제목 (기사마다 1회)
+            dynamic_weights: 섹터 가중치
+            global_topics: 글로벌 이벤트 감지 결과
+        """
+        stock_scores = {}
+        
         # 각 주식에 대한 점수 계산
         for stock, mention_count in stock_mentions.items():
             if mention_count == 0:
                 continue
                 
             # 기본 점수: 언급 횟수
-            base_score = mention_count * 10
+            base_score = mention_count * self.scoring_params['mention_weight']
             
             # 감성 점수 추가
             sentiment_bonus = 0
-            for news in news_list:
-                if stock in f"{news.get('title', '')} {news.get('content', '')}":
-                    sentiment_bonus += sentiment_scores.get(news['title'], 0) * 5
+            for title in stock_titles.get(stock, ()):
+                sentiment_bonus += sentiment_scores.get(title, 0) * self.scoring_params['sentiment_weight']
             
             # 글로벌 연관성 보너스
             global_bonus = self._calculate_global_impact(stock, global_topics)
@@ -185,20 +372,25 @@ class StockAnalyzer:
             
         return stock_scores
 
+    @traced('analyzer')
     def _detect_global_topics(self, news_list: List[Dict]) -> Dict[str, bool]:
         """글로벌 주요 이벤트 감지"""
+        all_text = ' '.join([self._article_text(news) for news in news_list]).lower()
+        return self._global_topics_in(all_text)
+
+    @staticmethod
+    def _global_topics_in(all_text: str) -> Dict[str, bool]:
+        """소문자 텍스트에서 글로벌 이벤트 판정 (단어는 GLOBAL_TOPIC_TERMS)"""
         topics = {
             'tsmc_earnings': False,
             'nvidia_earnings': False,
-            'openAI_titan': False,
+            'openai_titan': False,
             'fed_announcement': False,
             'record_quarter': False,
             'ai_boom': False,
             'global_tech_surge': False
         }
         
-        all_text = ' '.join([f"{news.get('title', '')} {news.get('content', '')}" for news in news_list]).lower()
-        
         if 'tsmc' in all_text and ('earnings' in all_text or 'record' in all_text):
             topics['tsmc_earnings'] = True
         if 'nvidia' in all_text and ('earnings' in all_text or 'revenue' in all_text):
@@ -220,94 +412,26 @@ class StockAnalyzer:
         """글로벌 이벤트의 종목별 영향력 계산"""
         impact = 0
         
-        # TSMC 연관 종목들
-        if global_topics['tsmc_earnings'] and stock in ['삼성전자', 'SK하이닉스', 'TSMC']:
-            impact += 15
-        
-        # NVIDIA 연관 종목들
-        if global_topics['nvidia_earnings'] and stock in ['NVIDIA', 'SK하이닉스', 'Broadcom']:
-            impact += 12
-        
-        # OpenAI Titan 칩 발표
-        if global_topics['openai_titan'] and stock in ['TSMC', 'Broadcom', 'NVIDIA']:
-            impact += 10
-        
-        # Fed 발표
-        if global_topics['fed_announcement'] and stock in ['SK증권', 'KB금융', '미래에셋증권']:
-            impact += 8
-        
-        # AI 붐
-        if global_topics['ai_boom'] and stock in ['NVIDIA', '삼성전자', 'TSMC', 'OpenAI']:
-            impact += 10
-        
-        # 글로벌 테크 서지
-        if global_topics['global_tech_surge'] and stock in ['Apple', 'Microsoft', 'Google', 'Meta']:
-            impact += 8
+        # TSMC 실적, NVIDIA 실적, OpenAI Titan 칩, Fed 발표, AI 붐, 글로벌 테크 서지
+        for topic, bonus in self.scoring_params['global_impact'].items():
+            if global_topics.get(topic) and stock in GLOBAL_IMPACT_STOCKS.get(topic, ()):
+                impact += bonus
             
         return impact
 
     def get_dynamic_sector_weights(self, global_topics: Dict[str, bool]) -> Dict[str, float]:
         """글로벌 이벤트에 따른 동적 섹터 가중치 계산"""
-        base_weights = {
-            '반도체': 1.4,      # TSMC 실적 폭발, 글로벌 AI 칩 수요 과열
-            'AI': 1.35,         # OpenAI Titan 칩 발표, AI 플랫폼 확장
-            '로봇': 1.3,       # 피지컬 AI, 휴머노이드 부상
-            '우주항공': 1.25,   # 아르테미스, 우주경제 기대
-            '글로벌테크': 1.3,  # 미국 빅테크 실적 호조
-            '금융': 1.1,        # Fed 정책 불확실성으로 가중치 하향
-            '방산': 1.2,        # 지정학적 리스크 증가
-            '조선': 1.2,        # 장기 호황 사이클 지속
-            '전력': 1.1,        # AI 데이터센터 전력 수요
-            '2차전지': 1.05,    # 미국 IRA 정책 수혜
-            '바이오': 0.95,     # 일시적 조정
-            '자율주행': 1.15    # 로봇과 시너지
-        }
+        base_weights = dict(self.scoring_params['sector_weights'])
         
-        # TSMC 실적 발표 시 반도체 가중치 증가
-        if global_topics.get('tsmc_earnings'):
-            base_weights['반도체'] += 0.3
-            
-        # Fed 발표 시 금융 가중치 조정
-        if global_topics.get('fed_announcement'):
-            base_weights['금융'] += 0.15
-            
-        # AI 붐 시 관련 섹터 가중치 증가
-        if global_topics.get('ai_boom'):
-            base_weights['AI'] += 0.2
-            base_weights['글로벌테크'] += 0.2
+        # TSMC 실적 → 반도체, Fed 발표 → 금융, AI 붐 → AI/글로벌테크 가중치 증가
+        for topic, boosts in self.scoring_params['topic_sector_boosts'].items():
+            if global_topics.get(topic):
+                for sector, boost in boosts.items():
+                    base_weights[sector] = base_weights.get(sector, 1.0) + boost
             
         return base_weights
-        """글로벌 이벤트에 따른 동적 섹터 가중치 계산"""
-        base_weights = {
-            '반도체': 1.4,      # TSMC 실적 폭발, 글로벌 AI 칩 수요 과열
-            'AI': 1.35,         # OpenAI Titan 칩 발표, AI 플랫폼 확장
-            '로봇': 1.3,       # 피지컬 AI, 휴머노이드 부상
-            '우주항공': 1.25,   # 아르테미스, 우주경제 기대
-            '글로벌테크': 1.3,  # 미국 빅테크 실적 호조
-            '금융': 1.1,        # Fed 정책 불확실성으로 가중치 하향
-            '방산': 1.2,        # 지정학적 리스크 증가
-            '조선': 1.2,        # 장기 호황 사이클 지속
-            '전력': 1.1,        # AI 데이터센터 전력 수요
-            '2차전지': 1.05,    # 미국 IRA 정책 수혜
-            '바이오': 0.95,     # 일시적 조정
-            '자율주행': 1.15    # 로봇과 시너지
-        }
-        
-        # TSMC 실적 발표 시 반도체 가중치 증가
-        if global_topics['tsmc_earnings']:
-            base_weights['반도체'] += 0.3
-            
-        # Fed 발표 시 금융 가중치 조정
-        if global_topics['fed_announcement']:
-            base_weights['금융'] += 0.15
-            
-        # AI 붐 시 관련 섹터 가중치 증가
-        if global_topics['ai_boom']:
-            base_weights['AI'] += 0.2
-            base_weights['글로벌테크'] += 0.2
-            
-            return base_weights
 
+    @traced('analyzer')
     def _analyze_global_sentiment(self, global_market_data: Dict) -> Dict:
         """글로벌 시장 심리 분석 (stock_analyzer에 추가)"""
         try:
@@ -353,20 +477,7 @@ class StockAnalyzer:
                     return dynamic_weights.get(sector, 1.0)
                     
         # 기본 가중치 (이전 로직)
-        sector_weights = {
-            '반도체': 1.4,      # TSMC 실적 폭발, 글로벌 AI 칩 수요 과열
-            'AI': 1.35,         # OpenAI Titan 칩 발표, AI 플랫폼 확장
-            '로봇': 1.3,       # 피지컬 AI, 휴머노이드 부상
-            '우주항공': 1.25,   # 아르테미스, 우주경제 기대
-            '글로벌테크': 1.3,  # 미국 빅테크 실적 호조
-            '금융': 1.1,        # Fed 정책 불확실성으로 가중치 하향
-            '방산': 1.2,        # 지정학적 리스크 증가
-            '조선': 1.2,        # 장기 호황 사이클 지속
-            '전력': 1.1,        # AI 데이터센터 전력 수요
-            '2차전지': 1.05,    # 미국 IRA 정책 수혜
-            '바이오': 0.95,     # 일시적 조정
-            '자율주행': 1.15    # 로봇과 시너지
-        }
+        sector_weights = self.scoring_params['sector_weights']
         
         for sector, stocks in self.stock_keywords.items():
             if stock in stocks:
@@ -376,20 +487,7 @@ class StockAnalyzer:
 
     def _get_sector_weight_static(self, stock: str) -> float:
         """섹터별 가중치 부여"""
-        sector_weights = {
-            '반도체': 1.4,      # TSMC 실적 폭발, 글로벌 AI 칩 수요 과열
-            'AI': 1.35,         # OpenAI Titan 칩 발표, AI 플랫폼 확장
-            '로봇': 1.3,       # 피지컬 AI, 휴머노이드 부상
-            '우주항공': 1.25,   # 아르테미스, 우주경제 기대
-            '글로벌테크': 1.3,  # 미국 빅테크 실적 호조
-            '금융': 1.1,        # Fed 정책 불확실성으로 가중치 하향
-            '방산': 1.2,        # 지정학적 리스크 증가
-            '조선': 1.2,        # 장기 호황 사이클 지속
-            '전력': 1.1,        # AI 데이터센터 전력 수요
-            '2차전지': 1.05,    # 미국 IRA 정책 수혜
-            '바이오': 0.95,     # 일시적 조정
-            '자율주행': 1.15    # 로봇과 시너지
-        }
+        sector_weights = self.scoring_params['sector_weights']
         
         for sector, stocks in self.stock_keywords.items():
             if stock in stocks:
@@ -397,6 +495,7 @@ class StockAnalyzer:
                 
         return 1.0
 
+    @traced('analyzer')
     def rank_stocks(self, stock_scores: Dict[str, float]) -> List[Tuple[str, float, str]]:
         """주식 랭킹 생성"""
         # 점수 기준 정렬
@@ -462,26 +561,31 @@ class StockAnalyzer:
             
         return ", ".join(reasons)
 
+    @traced('analyzer')
     def analyze_market_trends(self, news_list: List[Dict]) -> Dict:
         """시장 동향 분석"""
+        # 핫 섹터 분석
+        sector_mentions = Counter()
+        for news in news_list:
+            sector_mentions.update(self._mentioned_sectors(self._article_text(news)))
+        
+        return self._summarize_market_trends(sector_mentions, self.analyze_news_sentiment(news_list))
+
+    def _mentioned_sectors(self, text: str) -> List[str]:
+        """기사에 소속 종목이 하나라도 등장하는 섹터"""
+        return [sector for sector, stocks in self.stock_keywords.items() if any(stock in text for stock in stocks)]
+
+    def _summarize_market_trends(self, sector_mentions: Counter, sentiment_scores: Dict[str, float]) -> Dict:
+        """섹터 언급 기사 수와 기사별 감성으로 핫 섹터 / 시장 심리 결정"""
         trend_analysis = {
             'hot_sectors': [],
             'market_sentiment': 'neutral',
             'key_events': []
         }
         
-        # 핫 섹터 분석
-        sector_mentions = Counter()
-        for news in news_list:
-            text = f"{news.get('title', '')} {news.get('content', '')}"
-            for sector, stocks in self.stock_keywords.items():
-                if any(stock in text for stock in stocks):
-                    sector_mentions[sector] += 1
-                    
         trend_analysis['hot_sectors'] = [sector for sector, count in sector_mentions.most_common(3)]
         
         # 시장 심리 분석
-        sentiment_scores = self.analyze_news_sentiment(news_list)
         avg_sentiment = np.mean(list(sentiment_scores.values())) if sentiment_scores else 0
         
         if avg_sentiment > 0.2:
@@ -508,43 +612,38 @@ class StockAnalyzer:
             else:
                 return "기타"
     
+    @traced('analyzer')
     def predict_declining_stocks(self, news_list: List[Dict], stock_mentions: Dict[str, int]) -> List[Tuple[str, float, str]]:
         """하락 예측 주식 분석 (부정적 뉴스 기반)"""
         declining_stocks = []
         
-        # 뉴스 감성 분석
+        # 뉴스 감성 분석 (부정적 뉴스에 언급된 주식)
         for news in news_list:
-            title = news.get('title', '')
-            content = news.get('content', '')
-            text = f"{title} {content}"
-            
-            # 부정적 단어 카운트
-            negative_count = sum(1 for word in self.negative_words if word in text)
-            
-            # 각 섹터별 주식 확인 (부정적 뉴스에 언급된 주식)
-            for sector, stocks in self.stock_keywords.items():
-                for stock in stocks:
-                    if stock in text and stock in stock_mentions:
-                        # 부정적 뉴스 강도 계산
-                        negative_score = negative_count * 10
-                        
-                        # 섹터별 위험도 추가
-                        sector_risk = {
-                            '금융': 15,  # Fed 정책 리스크
-                            '2차전지': 12,  # 수요 둔화 우려
-                            '바이오': 10,  # 규제 리스크
-                            '자율주행': 8,  # 기술 지연 리스크
-                            '조선': 6,  # 경기 민감
-                            '전력': 5,  # 정책 리스크
-                        }.get(sector, 3)
-                        
-                        total_risk_score = negative_score + sector_risk
-                        
-                        # 일정 점수 이상이면 하락 예측에 추가
-                        if total_risk_score >= 20:
-                            reason = f"{sector} 섹터, 부정적 뉴스 강도: {negative_score}, 섹터 위험도: {sector_risk}"
-                            declining_stocks.append((stock, total_risk_score, reason))
+            declining_stocks.extend((stock, score, reason) for stock, score, reason
+                                    in self._risk_candidates(self._article_text(news)) if stock in stock_mentions)
         
+        return self._summarize_declining(declining_stocks)
+
+    def _risk_candidates(self, text: str) -> List[Tuple[str, float, str]]:
+        """기사 1건에서 하락 위험 점수가 기준(20) 이상인 (종목, 위험 점수, 이유)"""
+        # 부정적 단어 카운트
+        negative_count = sum(1 for word in self.negative_words if word in text)
+        
+        candidates = []
+        for sector, stock in self._mentioned_stocks(text):
+            # 부정적 뉴스 강도 + 섹터별 위험도
+            negative_score = negative_count * 10
+            sector_risk = SECTOR_RISK.get(sector, 3)
+            total_risk_score = negative_score + sector_risk
+            
+            # 일정 점수 이상이면 하락 예측에 추가
+            if total_risk_score >= 20:
+                reason = f"{sector} 섹터, 부정적 뉴스 강도: {negative_score}, 섹터 위험도: {sector_risk}"
+                candidates.append((stock, total_risk_score, reason))
+        return candidates
+
+    def _summarize_declining(self, declining_stocks: List[Tuple[str, float, str]]) -> List[Tuple[str, float, str]]:
+        """종목별 최고 위험 점수만 남겨 상위 5개"""
         # 점수순 정렬 및 중복 제거
         unique_declining = {}
         for stock, score, reason in declining_stocks:
@@ -555,54 +654,59 @@ class StockAnalyzer:
         sorted_declining = sorted(unique_declining.items(), key=lambda x: x[1][0], reverse=True)[:5]
         return [(stock, score, reason) for stock, (score, reason) in sorted_declining]
     
+    @traced('analyzer')
     def detect_emerging_trends(self, news_list: List[Dict]) -> Dict:
         """새로운 기술/영역 이슈 감지 (AI 전력, 일론머스크 효과 등)"""
-        emerging_trends = {
-            'hot_technologies': [],
-            'influential_mentions': [],
-            'trend_signals': []
-        }
-        
         tech_counts = Counter()
         entity_counts = Counter()
         trend_signals = []
         
         for news in news_list:
-            title = news.get('title', '')
-            content = news.get('content', '')
-            text = f"{title} {content}".lower()
-            
-            # 새로운 기술 키워드 감지
-            for tech_category, keywords in self.emerging_tech_keywords.items():
-                for keyword in keywords:
-                    if keyword.lower() in text:
-                        tech_counts[tech_category] += 1
-                        
-                        # 구체적인 시그널 감지
-                        if tech_category == 'AI전력' and any(word in text for word in ['급성장', '폭증', '부족', '전쟁', '수요급증']):
-                            trend_signals.append({
-                                'trend': 'AI전력인프라',
-                                'signal': 'AI 전력 수요 급증',
-                                'impact': 'HIGH',
-                                'related_stocks': ['가스터빈', '액침냉각', '원자력', 'ESS'],
-                                'reason': 'AI 데이터센터 전력 수요가 예상을 초과하며 인프라 투자 확대'
-                            })
-            
-            # 영향력 있는 인물/기관 언급 감지
-            for entity, keywords in self.influential_entities.items():
-                for keyword in keywords:
-                    if keyword.lower() in text:
-                        entity_counts[entity] += 1
-                        
-                        # 일론 머스크 효과 감지
-                        if entity == '일론머스크' and any(word in text for word in ['언급', '영향', '효과', '상승', '급등']):
-                            trend_signals.append({
-                                'trend': '머스크효과',
-                                'signal': '일론 머스크 언급으로 주가 영향',
-                                'impact': 'MEDIUM',
-                                'related_stocks': ['테슬라', '스페이스X', '관련주'],
-                                'reason': '일론 머스크의 언급으로 관련 주식 변동성 예상'
-                            })
+            self._scan_emerging(self._article_text(news).lower(), tech_counts, entity_counts, trend_signals)
+        
+        return self._summarize_emerging(tech_counts, entity_counts, trend_signals)
+
+    def _scan_emerging(self, text: str, tech_counts: Counter, entity_counts: Counter, trend_signals: List[Dict]) -> None:
+        """기사 1건(소문자 텍스트)의 기술/인물 키워드 언급과 트렌드 시그널을 누적"""
+        # 새로운 기술 키워드 감지
+        for tech_category, keywords in self.emerging_tech_keywords.items():
+            for keyword in keywords:
+                if keyword.lower() in text:
+                    tech_counts[tech_category] += 1
+                    
+                    # 구체적인 시그널 감지
+                    if tech_category == 'AI전력' and any(word in text for word in ['급성장', '폭증', '부족', '전쟁', '수요급증']):
+                        trend_signals.append({
+                            'trend': 'AI전력인프라',
+                            'signal': 'AI 전력 수요 급증',
+                            'impact': 'HIGH',
+                            'related_stocks': ['가스터빈', '액침냉각', '원자력', 'ESS'],
+                            'reason': 'AI 데이터센터 전력 수요가 예상을 초과하며 인프라 투자 확대'
+                        })
+        
+        # 영향력 있는 인물/기관 언급 감지
+        for entity, keywords in self.influential_entities.items():
+            for keyword in keywords:
+                if keyword.lower() in text:
+                    entity_counts[entity] += 1
+                    
+                    # 일론 머스크 효과 감지
+                    if entity == '일론머스크' and any(word in text for word in ['언급', '영향', '효과', '상승', '급등']):
+                        trend_signals.append({
+                            'trend': '머스크효과',
+                            'signal': '일론 머스크 언급으로 주가 영향',
+                            'impact': 'MEDIUM',
+                            'related_stocks': ['테슬라', '스페이스X', '관련주'],
+                            'reason': '일론 머스크의 언급으로 관련 주식 변동성 예상'
+                        })
+
+    def _summarize_emerging(self, tech_counts: Counter, entity_counts: Counter, trend_signals: List[Dict]) -> Dict:
+        """누적된 언급 수 / 시그널로 떠오르는 트렌드 결과 구성"""
+        emerging_trends = {
+            'hot_technologies': [],
+            'influential_mentions': [],
+            'trend_signals': []
+        }
         
         # 핫 기술 분류 (상위 5개)
         top_techs = tech_counts.most_common(5)
@@ -633,73 +737,78 @@ class StockAnalyzer:
         
         return emerging_trends
     
+    @traced('analyzer')
     def analyze_influential_impact(self, news_list: List[Dict]) -> Dict:
         """영향력 있는 기관/인물의 시장 영향 분석"""
+        entity_mentions = Counter()
+        impact_signals = []
+        
+        for news in news_list:
+            self._scan_influential(self._article_text(news).lower(), entity_mentions, impact_signals)
+        
+        return self._summarize_influential(entity_mentions, impact_signals)
+
+    def _scan_influential(self, text: str, entity_mentions: Counter, impact_signals: List[Dict]) -> None:
+        """기사 1건(소문자 텍스트)의 영향력 기관/인물 언급과 시장 영향 시그널을 누적"""
+        # 영향력 기관/인물 언급 감지
+        for entity, keywords in self.influential_entities.items():
+            for keyword in keywords:
+                if keyword.lower() in text:
+                    entity_mentions[entity] += 1
+                    
+                    # 고영향력 시그널 감지
+                    if entity in ['미국연방준비제도', '한국은행', '제롬파월', '이창용']:
+                        if any(word in text for word in ['기준금리', '인상', '인하', '통화정책', 'FOMC', '긴축', '완화']):
+                            impact_signals.append({
+                                'entity': entity,
+                                'signal': '중앙은행 정책 발언',
+                                'impact': 'CRITICAL',
+                                'market_effect': '전체 시장 변동성',
+                                'related_sectors': ['금융', '반도체', '수출', '부동산'],
+                                'expected_move': '±2~5%'
+                            })
+                    
+                    elif entity in ['일론머스크', '젠슨황']:
+                        if any(word in text for word in ['발표', '언급', '상승', '급등', '혁신']):
+                            impact_signals.append({
+                                'entity': entity,
+                                'signal': f'{entity} 주요 발언/발표',
+                                'impact': 'HIGH',
+                                'market_effect': '관련주 직접 영향',
+                                'related_sectors': ['AI', '반도체', '전기차', '우주'],
+                                'expected_move': '±5~15%'
+                            })
+                    
+                    elif entity == '이재명':
+                        if any(word in text for word in ['정책', '발표', '국회', '법안', '규제', '지원', '투자']):
+                            impact_signals.append({
+                                'entity': entity,
+                                'signal': '대통령 정책 발표',
+                                'impact': 'HIGH',
+                                'market_effect': '정책 수혜/규제 섹터 영향',
+                                'related_sectors': ['부동산', '건설', '금융', '에너지', '제조업'],
+                                'expected_move': '±3~8%'
+                            })
+                    
+                    elif entity in ['블랙록', 'MSCI']:
+                        if any(word in text for word in ['ETF', '인덱스', '리밸런싱', '편입']):
+                            impact_signals.append({
+                                'entity': entity,
+                                'signal': '대형 자금 움직임',
+                                'impact': 'HIGH',
+                                'market_effect': '대규모 자금 이동',
+                                'related_sectors': ['전체 섹터'],
+                                'expected_move': '±1~3%'
+                            })
+
+    def _summarize_influential(self, entity_mentions: Counter, impact_signals: List[Dict]) -> Dict:
+        """누적된 언급 수 / 시그널로 영향력 분석 결과 구성"""
         impact_analysis = {
             'high_impact_entities': [],
             'entity_signals': [],
             'market_impact_forecast': []
         }
         
-        entity_mentions = Counter()
-        impact_signals = []
-        
-        for news in news_list:
-            title = news.get('title', '')
-            content = news.get('content', '')
-            text = f"{title} {content}".lower()
-            
-            # 영향력 기관/인물 언급 감지
-            for entity, keywords in self.influential_entities.items():
-                for keyword in keywords:
-                    if keyword.lower() in text:
-                        entity_mentions[entity] += 1
-                        
-                        # 고영향력 시그널 감지
-                        if entity in ['미국연방준비제도', '한국은행', '제롬파월', '이창용']:
-                            if any(word in text for word in ['기준금리', '인상', '인하', '통화정책', 'FOMC', '긴축', '완화']):
-                                impact_signals.append({
-                                    'entity': entity,
-                                    'signal': '중앙은행 정책 발언',
-                                    'impact': 'CRITICAL',
-                                    'market_effect': '전체 시장 변동성',
-                                    'related_sectors': ['금융', '반도체', '수출', '부동산'],
-                                    'expected_move': '±2~5%'
-                                })
-                        
-                        elif entity in ['일론머스크', '젠슨황']:
-                            if any(word in text for word in ['발표', '언급', '상승', '급등', '혁신']):
-                                impact_signals.append({
-                                    'entity': entity,
-                                    'signal': f'{entity} 주요 발언/발표',
-                                    'impact': 'HIGH',
-                                    'market_effect': '관련주 직접 영향',
-                                    'related_sectors': ['AI', '반도체', '전기차', '우주'],
-                                    'expected_move': '±5~15%'
-                                })
-                        
-                        elif entity == '이재명':
-                            if any(word in text for word in ['정책', '발표', '국회', '법안', '규제', '지원', '투자']):
-                                impact_signals.append({
-                                    'entity': entity,
-                                    'signal': '대통령 정책 발표',
-                                    'impact': 'HIGH',
-                                    'market_effect': '정책 수혜/규제 섹터 영향',
-                                    'related_sectors': ['부동산', '건설', '금융', '에너지', '제조업'],
-                                    'expected_move': '±3~8%'
-                                })
-                        
-                        elif entity in ['블랙록', 'MSCI']:
-                            if any(word in text for word in ['ETF', '인덱스', '리밸런싱', '편입']):
-                                impact_signals.append({
-                                    'entity': entity,
-                                    'signal': '대형 자금 움직임',
-                                    'impact': 'HIGH',
-                                    'market_effect': '대규모 자금 이동',
-                                    'related_sectors': ['전체 섹터'],
-                                    'expected_move': '±1~3%'
-                                })
-        
         # 고영향력 기관/인물 분류 (상위 5개)
         top_entities = entity_mentions.most_common(5)
         for entity, count in top_entities:
@@ -755,4 +864,63 @@ class StockAnalyzer:
                     'advice': '선택적 투자 접근'
                 }
         
-        return impact_analysis
\ No newline at end of file
+        return impact_analysis
+
+    def aggregate_news(self, news_list: List[Dict], aggregate: Optional[NewsAggregate] = None) -> NewsAggregate:
+        """
+        기사별 분석 결과를 중간 집계에 누적 (기사마다 텍스트를 한 번만 훑음)
+
+        Args:
+            news_list: 추가할 뉴스
+            aggregate: 이어서 누적할 집계 (기본: 빈 집계)
+
+        Returns:
+            누적된 집계 (aggregate를 넘겼으면 같은 객체)
+        """
+        if aggregate is None:
+            aggregate = NewsAggregate()
+        
+        for news in news_list:
+            text = self._article_text(news)
+            lower = text.lower()
+            stocks = [stock for _, stock in self._mentioned_stocks(text)]
+            
+            aggregate.article_count += 1
+            aggregate.mentions.update(stocks)
+            aggregate.sentiment[news['title']] = self._sentiment_score(text)
+            for stock in dict.fromkeys(stocks):
+                aggregate.stock_titles.setdefault(stock, []).append(news['title'])
+            aggregate.topic_terms.extend(term for term in GLOBAL_TOPIC_TERMS
+                                         if term in lower and term not in aggregate.topic_terms)
+            aggregate.sectors.update(self._mentioned_sectors(text))
+            self._scan_emerging(lower, aggregate.tech, aggregate.entities, aggregate.trend_signals)
+            # 기관/인물 언급 수는 _scan_emerging과 같은 규칙이라 시그널만 누적
+            self._scan_influential(lower, Counter(), aggregate.impact_signals)
+            for stock, score, reason in self._risk_candidates(text):
+                if stock not in aggregate.risks or score > aggregate.risks[stock][0]:
+                    aggregate.risks[stock] = [score, reason]
+        
+        return aggregate
+
+    @traced('analyzer')
+    def scores_from_aggregate(self, aggregate: NewsAggregate) -> Dict[str, float]:
+        """중간 집계로 종목 점수 계산 (calculate_stock_scores와 같은 식)"""
+        global_topics = self._global_topics_in(' '.join(aggregate.topic_terms))
+        return self._score_stocks(aggregate.stock_mentions(), aggregate.sentiment, aggregate.stock_titles,
+                                  self.get_dynamic_sector_weights(global_topics), global_topics)
+
+    def market_trends_from_aggregate(self, aggregate: NewsAggregate) -> Dict:
+        """중간 집계로 시장 동향 분석 (analyze_market_trends와 같은 결과)"""
+        return self._summarize_market_trends(aggregate.sectors, aggregate.sentiment)
+
+    def declining_from_aggregate(self, aggregate: NewsAggregate) -> List[Tuple[str, float, str]]:
+        """중간 집계로 하락 예측 (predict_declining_stocks와 같은 결과)"""
+        return self._summarize_declining([(stock, score, reason) for stock, (score, reason) in aggregate.risks.items()])
+
+    def emerging_from_aggregate(self, aggregate: NewsAggregate) -> Dict:
+        """중간 집계로 떠오르는 트렌드 구성 (detect_emerging_trends와 같은 결과)"""
+        return self._summarize_emerging(aggregate.tech, aggregate.entities, aggregate.trend_signals)
+
+    def influential_from_aggregate(self, aggregate: NewsAggregate) -> Dict:
+        """중간 집계로 영향력 분석 구성 (analyze_influential_impact와 같은 결과)"""
+        return self._summarize_influential(aggregate.entities, aggregate.impact_signals)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+KRX 종목 마스터 로더 및 종목명 → 종목코드 인덱스
+KIS 종목 마스터 파일(kospi_code.mst / kosdaq_code.mst) 또는 CSV를 읽어
+정확한 종목명 / 정규화 종목명 / 별칭 / 접두어(trie) 조회 인덱스를 만들고
+바이너리 캐시(pickle)로 저장하여 다음 실행부터 즉시 로드
+"""
+
+import os
+import re
+import csv
+import pickle
+import argparse
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+from data_paths import DATA_DIR
+
+# KIS 마스터 파일의 종목명 뒤 고정폭 필드 길이
+MST_TAIL_WIDTH = {'KOSPI': 228, 'KOSDAQ': 222}
+
+MASTER_DIR = os.getenv("KRX_MASTER_DIR", os.path.join(DATA_DIR, "master"))
+CACHE_VERSION = 1
+
+# 뉴스에서 쓰이는 약칭/옛 이름 → 공식 종목명
+DEFAULT_ALIASES = {
+    '네이버': 'NAVER',
+    '하이닉스': 'SK하이닉스',
+    'LG엔솔': 'LG에너지솔루션',
+    '삼성바이오': '삼성바이오로직스',
+    '포스코홀딩스': 'POSCO홀딩스',
+    'KAI': '한국항공우주',
+    '한국조선해양': 'HD한국조선해양',
+    '현대중공업': 'HD현대중공업',
+    '현대자동차': '현대차',
+    '기아차': '기아',
+}
+
+_TRIE_END = ''  # 종목코드 리스트가 저장되는 trie 노드 키
+
+
+def normalize_name(name: str) -> str:
+    """종목명 정규화 (전각/반각 통일, 대문자, 공백·법인표기·기호 제거)"""
+    text = unicodedata.normalize('NFKC', name).upper()
+    text = text.replace('(주)', '').replace('주식회사', '')
+    return re.sub(r'[^0-9A-Z가-힣]', '', text)
+
+
+def parse_mst_file(path: str, market: str) -> List[Tuple[str, str, str]]:
+    """
+    KIS 종목 마스터(.mst) 파싱
+
+    Args:
+        path: 마스터 파일 경로
+        market: 'KOSPI' 또는 'KOSDAQ'
+
+    Returns:
+        (종목코드, 종목명, 시장) 리스트
+    """
+    tail = MST_TAIL_WIDTH[market]
+    listings = []
+
+    with open(path, 'r', encoding='cp949') as f:
+        for row in f:
+            row = row.rstrip('\n')
+            head = row[:len(row) - tail]
+            code = head[0:9].strip()
+            name = head[21:].strip()
+            if code and name:
+                listings.append((code, name, market))
+
+    return listings
+
+
+def parse_csv_file(path: str) -> Tuple[List[Tuple[str, str, str]], Dict[str, str]]:
+    """
+    CSV 종목 마스터 파싱 (code, name[, market[, aliases]] 헤더, 별칭은 '|' 구분)
+
+    Returns:
+        ((종목코드, 종목명, 시장) 리스트, {별칭: 종목명})
+    """
+    listings = []
+    aliases = {}
+
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            code = (row.get('code') or '').strip()
+            name = (row.get('name') or '').strip()
+            if not code or not name:
+                continue
+            listings.append((code.zfill(6) if code.isdigit() else code, name, (row.get('market') or '').strip()))
+            for alias in (row.get('aliases') or '').split('|'):
+                if alias.strip():
+                    aliases[alias.strip()] = name
+
+    return listings, aliases
+
+
+class StockMasterIndex:
+    """종목명 → 종목코드 조회 인덱스"""
+
+    def __init__(self, listings: List[Tuple[str, str, str]], aliases: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            listings: (종목코드, 종목명, 시장) 리스트
+            aliases: {별칭: 공식 종목명}
+        """
+        self.by_name: Dict[str, str] = {}
+        self.by_normalized: Dict[str, str] = {}
+        self.by_alias: Dict[str, str] = {}
+        self.names: Dict[str, str] = {}
+        self.markets: Dict[str, str] = {}
+        self.trie: Dict = {}
+
+        for code, name, market in listings:
+            self.by_name[name] = code
+            self.by_normalized.setdefault(normalize_name(name), code)
+            self.names[code] = name
+            self.markets[code] = market
+            self._trie_insert(normalize_name(name), code)
+
+        for alias, name in {**DEFAULT_ALIASES, **(aliases or {})}.items():
+            code = self.by_name.get(name) or self.by_normalized.get(normalize_name(name))
+            if code:
+                self.by_alias[normalize_name(alias)] = code
+
+    def _trie_insert(self, key: str, code: str) -> None:
+        node = self.trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault(_TRIE_END, []).append(code)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def lookup(self, stock_name: str) -> str:
+        """
+        종목명으로 종목코드 찾기 (정확 → 정규화 → 별칭 순서, 모두 O(1))
+
+        Returns:
+            종목코드 (없으면 빈 문자열)
+        """
+        code = self.by_name.get(stock_name)
+        if code:
+            return code
+
+        key = normalize_name(stock_name)
+        return self.by_normalized.get(key) or self.by_alias.get(key, "")
+
+    def search_prefix(self, prefix: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """
+        접두어로 시작하는 종목 검색
+
+        Returns:
+            (종목코드, 종목명) 리스트 (종목명 길이 순)
+        """
+        node = self.trie
+        for char in normalize_name(prefix):
+            node = node.get(char)
+            if node is None:
+                return []
+
+        codes = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            codes.extend(current.get(_TRIE_END, []))
+            stack.extend(child for key, child in current.items() if key != _TRIE_END)
+
+        matches = sorted(((code, self.names[code]) for code in codes), key=lambda item: (len(item[1]), item[1]))
+        return matches[:limit]
+
+    def name_of(self, stock_code: str) -> str:
+        """종목코드로 종목명 찾기"""
+        return self.names.get(stock_code, "")
+
+
+def _master_sources(master_dir: str) -> List[str]:
+    """마스터 디렉토리의 원본 파일 목록"""
+    if not os.path.isdir(master_dir):
+        return []
+    return sorted(
+        os.path.join(master_dir, name)
+        for name in os.listdir(master_dir)
+        if name.endswith('.mst') or name.endswith('.csv')
+    )
+
+
+def _source_signature(paths: List[str]) -> Tuple:
+    """원본 파일 변경 감지용 서명 (경로, 크기, 수정시각)"""
+    return (CACHE_VERSION,) + tuple((path, os.path.getsize(path), os.path.getmtime(path)) for path in paths)
+
+
+def build_index(paths: List[str]) -> StockMasterIndex:
+    """원본 파일들로 인덱스 생성 (kosdaq 이름이 들어간 .mst는 KOSDAQ 형식으로 파싱)"""
+    listings = []
+    aliases = {}
+
+    for path in paths:
+        if path.endswith('.mst'):
+            market = 'KOSDAQ' if 'kosdaq' in os.path.basename(path).lower() else 'KOSPI'
+            listings.extend(parse_mst_file(path, market))
+        else:
+            file_listings, file_aliases = parse_csv_file(path)
+            listings.extend(file_listings)
+            aliases.update(file_aliases)
+
+    return StockMasterIndex(listings, aliases)
+
+
+def load_stock_master(master_dir: Optional[str] = None, cache_path: Optional[str] = None) -> Optional[StockMasterIndex]:
+    """
+    종목 마스터 인덱스 로드 (원본이 바뀌지 않았으면 바이너리 캐시 사용)
+
+    Args:
+        master_dir: 마스터 파일 디렉토리 (기본: data/master 또는 KRX_MASTER_DIR)
+        cache_path: 캐시 파일 경로 (기본: 마스터 디렉토리의 stock_master.pkl)
+
+    Returns:
+        StockMasterIndex (마스터 파일이 없으면 None)
+    """
+    master_dir = master_dir or MASTER_DIR
+    paths = _master_sources(master_dir)
+    if not paths:
+        return None
+
+    cache_path = cache_path or os.path.join(master_dir, 'stock_master.pkl')
+    signature = _source_signature(paths)
+
+    # 잘린 파일, 예전 클래스 구조(ImportError/AttributeError) 등 읽을 수 없는 캐시는 모두 다시 생성
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_signature, index = pickle.load(f)
+        if cached_signature == signature and isinstance(index, StockMasterIndex):
+            return index
+    except Exception:
+        pass
+
+    index = build_index(paths)
+    try:
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((signature, index), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"⚠️ 종목 마스터 캐시 저장 실패: {e}")
+
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description='KRX 종목 마스터 인덱스 생성/조회')
+    parser.add_argument('names', nargs='*', help='조회할 종목명')
+    parser.add_argument('--master-dir', help='마스터 파일 디렉토리 (기본: data/master)')
+    parser.add_argument('--prefix', help='접두어 검색')
+
+    args = parser.parse_args()
+
+    index = load_stock_master(args.master_dir)
+    if index is None:
+        print(f"❌ 종목 마스터 파일이 없습니다: {args.master_dir or MASTER_DIR}")
+        print("   kospi_code.mst / kosdaq_code.mst 또는 code,name CSV를 넣어주세요.")
+        return
+
+    print(f"✅ 종목 마스터 로드: {len(index):,}종목")
+    for name in args.names:
+        code = index.lookup(name)
+        print(f"   {name}: {code or '찾을 수 없음'}")
+    if args.prefix:
+        for code, name in index.search_prefix(args.prefix):
+            print(f"   {code} {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,8 @@ def main():
                        help='실행 모드: single (단일 실행), schedule (스케줄링 실행)')
     parser.add_argument('--output', choices=['print', 'json', 'csv', 'report'], 
                        default='print', help='출력 형식')
+    parser.add_argument('--trading-days', action='store_true',
+                       help='KRX 거래일에만 실행 (schedule 모드에서만 사용, 기본: 매일)')
     
     args = parser.parse_args()
     
@@ -26,7 +28,13 @@ def main():
     if args.mode == 'single':
         # 단일 실행 모드
         print("🚀 다음날 오전 상승 예측 주식 분석 시작...")
-        result = ranking_system.generate_daily_ranking()
+        # 스케줄러 실행과 겹치지 않도록 같은 잠금 사용
+        from scheduler import run_lock
+        with run_lock() as acquired:
+            if not acquired:
+                print("🔒 다른 랭킹 실행(스케줄러 등)이 진행 중입니다. 끝난 뒤 다시 실행해주세요.")
+                sys.exit(1)
+            result = ranking_system.generate_daily_ranking()
         
         if result:
             if args.output == 'print':
@@ -45,7 +53,7 @@ def main():
             
     elif args.mode == 'schedule':
         # 스케줄링 실행 모드
-        ranking_system.run_scheduled_analysis()
+        ranking_system.run_scheduled_analysis(days='trading' if args.trading_days else 'daily')
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,14 +6,25 @@ import json
 import logging
 from news_collector import NewsCollector
 from stock_analyzer import StockAnalyzer
-# import schedule  # 동적 import로 LSP 오류 회피
-import time
+from ranking_store import RankingStore
+from ranking_server import notify_refresh
+from result_dataset import append_result, resolve_format
+from backtest import build_sector_map
 
 class StockRankingSystem:
-    def __init__(self):
+    def __init__(self, ranking_store: Optional[RankingStore] = None, results_root: Optional[str] = None):
+        """
+        Args:
+            ranking_store: 랭킹 저장소 (기본: data/rankings.db)
+            results_root: 결과 데이터셋 경로 (기본: data/results 또는 TUJA_RESULTS_DIR)
+        """
         self.news_collector = NewsCollector()
         self.stock_analyzer = StockAnalyzer()
         self.results_history = []
+        self.ranking_store = ranking_store or RankingStore(sectors=build_sector_map(self.stock_analyzer.stock_keywords))
+        # 결과 파일 형식: parquet(pyarrow 설치 시 기본, result_dataset.py) 또는 files(JSON + CSV) — TUJA_RESULT_FORMAT
+        self.result_format = resolve_format()
+        self.results_root = results_root
         
         # 로깅 설정
         logging.basicConfig(
@@ -81,19 +92,27 @@ class StockRankingSystem:
     def save_results(self, result: Dict) -> None:
         """결과 저장"""
         try:
-            # JSON 파일로 저장
-            filename = f"stock_ranking_{result['date']}.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
-            
-            # CSV 파일로 저장
-            df = pd.DataFrame(result['top_10_stocks'])
-            df['date'] = result['date']
-            df['market_sentiment'] = result['market_sentiment']
-            csv_filename = f"stock_ranking_{result['date']}.csv"
-            df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
-            
-            logging.info(f"결과 저장 완료: {filename}, {csv_filename}")
+            if self.result_format == 'parquet':
+                # 컬럼형 데이터셋에 실행 정보 / 종목 행 추가 (기존 형식 JSON은 result_dataset.py export)
+                saved = ", ".join(append_result(result, 'basic', self.results_root))
+            else:
+                # JSON 파일로 저장
+                filename = f"stock_ranking_{result['date']}.json"
+                with open(filename, 'w', encoding='utf-8') as f:
+                    json.dump(result, f, ensure_ascii=False, indent=2)
+                
+                # CSV 파일로 저장
+                df = pd.DataFrame(result['top_10_stocks'])
+                df['date'] = result['date']
+                df['market_sentiment'] = result['market_sentiment']
+                csv_filename = f"stock_ranking_{result['date']}.csv"
+                df.to_csv(csv_filename, index=False, encoding='utf-8-sig')
+                saved = f"{filename}, {csv_filename}"
+            
+            self.ranking_store.save(result, 'basic')
+            notify_refresh()  # 랭킹 조회 서비스가 떠 있으면 즉시 반영 (TUJA_RANKING_SERVER)
+            
+            logging.info(f"결과 저장 완료: {saved}")
             
         except Exception as e:
             logging.error(f"결과 저장 중 오류 발생: {e}")
@@ -126,36 +145,15 @@ class StockRankingSystem:
         print("⚠️  투자 주의사항: 본 분석은 뉴스 기반 예측으로, 투자는 본인의 판단에 따라야 합니다.")
         print("="*80)
 
-    def run_scheduled_analysis(self):
-        """스케줄링 실행"""
-        try:
-            import schedule
-        except ImportError:
-            print("❌ schedule 라이브러리가 설치되지 않았습니다.")
-            print("pip install schedule 명령으로 설치해주세요.")
-            return
-            
-        def run_analysis():
-            print(f"\n⏰ {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - 자동 분석 실행...")
-            result = self.generate_daily_ranking()
-            if result:
-                self.print_results(result)
-            
-        # 매일 저녁 9시 실행
-        schedule.every().day.at("21:00").do(run_analysis)
-        
-        # 추가 실행 시간 설정 (22시, 23시, 23시 30분)
-        schedule.every().day.at("22:00").do(run_analysis)
-        schedule.every().day.at("23:00").do(run_analysis)
-        schedule.every().day.at("23:30").do(run_analysis)
-        
-        print("🤖 자동 분석 스케줄러 시작!")
-        print("실행 시간: 매일 저녁 9시, 10시, 11시, 11시 30분")
-        print("종료하려면 Ctrl+C를 누르세요.")
-        
-        while True:
-            schedule.run_pending()
-            time.sleep(60)  # 1분마다 확인
+    def run_scheduled_analysis(self, days: str = 'daily'):
+        """
+        스케줄링 실행 (scheduler.SchedulerDaemon: 저녁 9시, 10시, 11시, 11시 30분)
+
+        Args:
+            days: 'daily' (매일, 기존 동작) 또는 'trading' (KRX 거래일만)
+        """
+        from scheduler import run_daemon
+        run_daemon(self, days=days)
 
     def generate_report(self) -> str:
         """분석 보고서 생성"""
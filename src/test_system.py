@@ -49,12 +49,18 @@ def create_sample_news():
         }
     ]
 
-def test_ranking_system():
+def test_ranking_system(tmp_path=None):
     """랭킹 시스템 테스트"""
+    import os
+    import tempfile
+    from ranking_store import RankingStore
+
     print("🧪 주식 랭킹 시스템 테스트 시작...")
     
-    # 시스템 초기화
-    ranking_system = StockRankingSystem()
+    # 시스템 초기화 (실제 data/rankings.db, data/results에 테스트 실행이 섞이지 않도록 임시 경로 사용)
+    work_dir = str(tmp_path) if tmp_path else tempfile.mkdtemp()
+    ranking_system = StockRankingSystem(ranking_store=RankingStore(os.path.join(work_dir, 'rankings.db')),
+                                        results_root=os.path.join(work_dir, 'results'))
     
     # 샘플 뉴스 데이터 생성
     sample_news = create_sample_news()
@@ -137,6 +143,1078 @@ def test_components():
     for i, (stock, score, reason) in enumerate(ranking[:3], 1):
         print(f"{i}위: {stock} (점수: {score:.1f}) - {reason}")
 
+def test_returns_engine():
+    """벡터화 수익률 엔진 테스트"""
+    import pandas as pd
+    from returns_engine import PriceMatrix, ReturnsEngine
+
+    print("\n📐 ReturnsEngine 테스트...")
+
+    dates = pd.bdate_range('2026-01-19', periods=6)
+    bars = pd.DataFrame([
+        {'date': date, 'code': code, 'open': 100 + i, 'close': 100 + i * step}
+        for i, date in enumerate(dates)
+        for code, step in [('005930', 2), ('000660', -1)]
+    ])
+    engine = ReturnsEngine(PriceMatrix.from_bars(bars))
+
+    returns_df = engine.get_actual_returns({
+        '2026-01-19': [('삼성전자', '005930'), ('NVIDIA', 'NVDA')],
+        '2026-01-24': [('SK하이닉스', '000660')],  # 토요일 예측은 금요일 종가 기준
+        '2026-01-26': [('삼성전자', '005930')],
+    }, days_back=1)
+
+    assert list(returns_df.columns) == ['stock', 'stock_code', 'region', 'prediction_date', 'actual_return', 'data_source']
+    samsung = returns_df[returns_df['stock'] == '삼성전자'].iloc[0]
+    assert abs(samsung['actual_return'] - 2.0) < 1e-9
+    hynix = returns_df[returns_df['stock'] == 'SK하이닉스'].iloc[0]
+    assert abs(hynix['actual_return'] - (-1 / 96 * 100)) < 1e-9
+    assert returns_df[returns_df['stock'] == 'NVIDIA'].iloc[0]['data_source'] == 'TEMP'
+    # 마지막 거래일 이후 데이터가 없는 예측은 제외
+    assert len(returns_df) == 3
+    print(f"✅ 수익률 계산 결과: {len(returns_df)}건")
+
+def test_backtest():
+    """랭킹 백테스트 엔진 테스트"""
+    import pandas as pd
+    from returns_engine import PriceMatrix
+    from backtest import Backtester, rankings_frame
+
+    print("\n🔁 Backtester 테스트...")
+
+    dates = pd.bdate_range('2026-01-19', periods=4)
+    closes = {'005930': [100, 102, 101, 103], '000660': [200, 190, 199.5, 199.5]}
+    bars = pd.DataFrame([
+        {'date': date, 'code': code, 'open': values[i], 'close': values[i]}
+        for code, values in closes.items()
+        for i, date in enumerate(dates)
+    ])
+    past_results = {
+        '2026-01-19': {'global_market_sentiment': 'bullish', 'top_10_stocks': [
+            {'rank': 1, 'stock_name': '삼성전자'}, {'rank': 2, 'stock_name': 'SK하이닉스'}, {'rank': 3, 'stock_name': 'NVIDIA'}]},
+        '2026-01-20': {'global_market_sentiment': 'bearish', 'top_10_stocks': [
+            {'rank': 1, 'stock_name': 'SK하이닉스'}, {'rank': 2, 'stock_name': '삼성전자'}]},
+    }
+    codes = {'삼성전자': '005930', 'SK하이닉스': '000660', 'NVIDIA': 'NVDA'}
+    backtester = Backtester(PriceMatrix.from_bars(bars), codes.get, {'삼성전자': '반도체'})
+    summary = backtester.run(rankings_frame(past_results))
+
+    assert summary['total_predictions'] == 5
+    assert summary['evaluated_predictions'] == 4  # 가격 없는 NVIDIA 제외
+    assert summary['correct_predictions'] == 2
+    assert abs(summary['rank_performance'][1]['mean_return'] - 3.5) < 1e-9  # (+2% + +5%) / 2
+    assert summary['sector_performance']['반도체']['count'] == 2
+    # 1/19 포트폴리오 (+2 - 5)/2 = -1.5%, 1/20 (+5 - 0.98)/2 → 낙폭은 첫날 -1.5%
+    assert abs(summary['max_drawdown'] - (-1.5)) < 1e-9
+    assert summary['global_factor_impact'] > 0
+    print(f"✅ 백테스트: 적중률 {summary['accuracy_rate']:.1f}%, 최대 낙폭 {summary['max_drawdown']:.2f}%")
+
+def test_intraday_sim():
+    """오전 단타 전략 분봉 시뮬레이터 테스트"""
+    import numpy as np
+    import pandas as pd
+    from intraday_sim import MinuteBarCube, IntradaySimulator, EXIT_TARGET, EXIT_STOP, EXIT_TIME
+
+    print("\n⏱️ IntradaySimulator 테스트...")
+
+    rows = []
+    for m in range(200):
+        time_text = f"{9 + m // 60:02d}:{m % 60:02d}"
+        up = 100 * (1 + 0.006 * min(m, 10))      # 09:10까지 +6% 상승
+        down = 100 * (1 - 0.008 * min(m, 5))     # 09:05까지 -4% 하락
+        rows.append(('2026-01-27', '005930', time_text, up, up, up, up))
+        rows.append(('2026-01-27', '000660', time_text, down, down, down, down))
+    cube = MinuteBarCube.from_bars(pd.DataFrame(rows, columns=['date', 'code', 'time', 'open', 'high', 'low', 'close']))
+
+    simulator = IntradaySimulator(cost_pct=0.0)
+    result = simulator.simulate(cube, targets=[5, 10], stops=[3, 5])
+    up, down = list(cube.picks['code']).index('005930'), list(cube.picks['code']).index('000660')
+
+    assert result['returns'].shape == (2, 2, 2)
+    assert result['exit_type'][up, 0, 0] == EXIT_TARGET
+    assert result['exit_type'][up, 1, 0] == EXIT_TIME          # +10%는 11:30까지 미도달
+    assert np.isclose(result['returns'][up, 1, 0], 6.0)
+    assert result['exit_type'][down, 0, 0] == EXIT_STOP
+    assert result['exit_type'][down, 0, 1] == EXIT_TIME        # -5%는 미도달 → -4%로 시간 청산
+    assert np.isclose(result['returns'][down, 0, 1], -4.0)
+
+    summary = simulator.grid_summary(result, cube.picks)
+    assert len(summary) == 4 and summary['trades'].eq(2).all()
+    print(f"✅ 시뮬레이션: 추천 {len(cube)}건 × {len(summary)}개 조합")
+
+def test_scoring_sweep():
+    """캐시 특징 기반 재채점이 StockAnalyzer 점수와 같은지 + 파라미터 스윕 테스트"""
+    import numpy as np
+    from stock_analyzer import StockAnalyzer, DEFAULT_SCORING_PARAMS
+    from scoring_sweep import SweepDataset, extract_day_features, expand_grid, run_sweep
+
+    print("\n🔀 점수 스윕 테스트...")
+
+    analyzer = StockAnalyzer()
+    news = create_sample_news() + [{'title': 'TSMC record earnings, AI demand boom', 'content': 'Fed rally'}]
+    dataset = SweepDataset(['2026-01-26'], [extract_day_features(analyzer, news)], analyzer.stock_keywords)
+
+    expected = analyzer.calculate_stock_scores(news, analyzer.extract_stock_mentions(news))
+    scores = dict(zip(dataset.stocks, dataset.scores(DEFAULT_SCORING_PARAMS)))
+    assert set(scores) == set(expected)
+    assert all(abs(scores[stock] - expected[stock]) < 1e-9 for stock in expected)
+
+    dataset.returns = np.linspace(-3, 3, len(dataset))
+    param_sets = expand_grid({'mention_weight': [5, 10], 'sector_weights.반도체': [1.0, 1.4]})
+    results = run_sweep(dataset, param_sets, workers=1, k=3)
+    assert len(results) == 4 and all(result['trades'] == 3 for result in results)
+    print(f"✅ 점수 스윕: {len(expected)}종목 점수 일치, {len(results)}개 조합 평가")
+
+def test_performance_analytics():
+    """성과 분석 지표 테스트 (순위 IC / 스피어만 / 스프레드 / 그룹별 성과)"""
+    import numpy as np
+    import pandas as pd
+    from performance_analytics import analyze_performance, daily_rank_ic, spearman
+
+    print("\n📏 성과 분석 테스트...")
+
+    rows = []
+    for day, date in enumerate(['2026-01-19', '2026-01-20', '2026-01-21']):
+        for rank in range(1, 7):
+            # 1/21은 점수 순서와 수익률 순서가 정반대
+            ret = (7 - rank) if day < 2 else rank
+            rows.append({'date': date, 'stock': f'S{rank}', 'rank': rank, 'score': 100 - rank * 10,
+                         'return': float(ret - 3), 'region': '한국' if rank % 2 else '미국',
+                         'sector': '반도체' if rank <= 3 else '기타'})
+    rows.append({'date': '2026-01-21', 'stock': 'S7', 'rank': 7, 'score': 20, 'return': np.nan,
+                 'region': '한국', 'sector': '기타'})
+    frame = pd.DataFrame(rows)
+
+    ic = daily_rank_ic(frame)
+    assert np.allclose(ic.to_numpy(), [1.0, 1.0, -1.0])
+    assert abs(spearman([1, 2, 3, 4], [10, 20, 30, 40]) - 1.0) < 1e-12
+
+    analytics = analyze_performance(frame, k=2)
+    assert analytics['evaluated_predictions'] == 18 and analytics['total_predictions'] == 19
+    assert abs(analytics['rank_ic_mean'] - 1 / 3) < 1e-12
+    # 상위 2 - 하위 2: 4%p, 4%p, -4%p
+    assert abs(analytics['top_bottom_spread'] - 4 / 3) < 1e-12
+    assert analytics['by_sector']['반도체']['count'] == 9
+    assert set(analytics['by_region']) == {'한국', '미국'}
+    print(f"✅ 성과 분석: 순위 IC {analytics['rank_ic_mean']:+.3f}, 스프레드 {analytics['top_bottom_spread']:+.2f}%p")
+
+def test_bootstrap_confidence():
+    """벡터화 부트스트랩 신뢰구간 테스트"""
+    import time
+    import numpy as np
+    import pandas as pd
+    from performance_analytics import bootstrap_confidence
+
+    print("\n🎲 부트스트랩 신뢰구간 테스트...")
+
+    rng = np.random.default_rng(7)
+    scores = rng.normal(size=70)
+    frame = pd.DataFrame({'date': np.repeat(np.arange(7), 10), 'score': scores,
+                          'return': 0.5 * scores + rng.normal(0.3, 1.0, size=70)})
+
+    start = time.perf_counter()
+    iid = bootstrap_confidence(frame, replicates=10000, seed=0)
+    block = bootstrap_confidence(frame, replicates=10000, block='date', seed=0)
+    elapsed = time.perf_counter() - start
+
+    for ci in (iid, block):
+        for name in ('accuracy', 'mean_return', 'correlation'):
+            assert ci[name]['low'] <= ci[name]['estimate'] <= ci[name]['high']
+    assert abs(iid['mean_return']['estimate'] - frame['return'].mean()) < 1e-12
+    assert abs(iid['correlation']['estimate'] - np.corrcoef(frame['score'], frame['return'])[0, 1]) < 1e-12
+    assert iid['units'] == 70 and block['units'] == 7
+    # 같은 시드는 같은 구간
+    assert bootstrap_confidence(frame, replicates=10000, seed=0)['accuracy'] == iid['accuracy']
+    assert elapsed < 1.0
+    print(f"✅ 부트스트랩: 적중률 95% 구간 [{iid['accuracy']['low']:.1f}%, {iid['accuracy']['high']:.1f}%], "
+          f"2×10,000회 {elapsed * 1000:.0f}ms")
+
+def test_portfolio_sim():
+    """비용 반영 포트폴리오 시뮬레이션이 수작업 계산과 같은지 테스트"""
+    import numpy as np
+    import pandas as pd
+    from returns_engine import PriceMatrix
+    from portfolio_sim import CostModel, PortfolioSimulator, simulate_weights
+
+    print("\n💼 포트폴리오 시뮬레이터 테스트...")
+
+    dates = pd.bdate_range('2026-03-02', periods=4).values.astype('datetime64[D]')
+    close = np.array([[100.0, 200.0], [110.0, 200.0], [110.0, 220.0], [121.0, 220.0]])
+    prices = PriceMatrix(dates, ['000001', '000002'], close)
+    rankings = pd.DataFrame([
+        {'date': '2026-03-02', 'rank': 1, 'stock_name': 'A', 'score': 2.0},
+        {'date': '2026-03-02', 'rank': 2, 'stock_name': 'B', 'score': 1.0},
+        {'date': '2026-03-03', 'rank': 1, 'stock_name': 'B', 'score': 1.0},
+    ])
+    resolve = {'A': '000001', 'B': '000002'}.get
+
+    # 비용 0: 첫날 A/B 반반 → +5%, 둘째 날 B 전량 → +10%, 셋째 날 현금
+    free = PortfolioSimulator(prices, resolve, CostModel(0, 0, 0, market_slippage_bps={})).run(rankings)
+    assert abs(free['total_return'] - (1.05 * 1.10 - 1) * 100) < 1e-9
+    assert list(free['daily']['positions']) == [2, 1, 0, 0]
+
+    # 비용 반영: 매수 0.1%, 매도 0.1% + 세금 0.2%, 코스닥 종목(B)은 슬리피지 추가
+    model = CostModel(0.1, 0.2, 0, market_slippage_bps={'KOSDAQ': 10}, markets={'000002': 'KOSDAQ'})
+    summary = PortfolioSimulator(prices, resolve, model).run(rankings)
+    drifted_a = 0.5 * 1.1 / 1.05
+    day1 = 0.5 * 0.001 + 0.5 * 0.002
+    day2 = drifted_a * 0.003 + (1 - (1 - drifted_a)) * 0.002
+    day3 = 1.0 * 0.004
+    expected = (1 - day1) * 1.05 * (1 - day2) * 1.10 * (1 - day3) - 1
+    assert abs(summary['total_return'] - expected * 100) < 1e-9
+    assert summary['max_drawdown'] <= 0
+
+    # 배치 축으로 여러 비용 가정을 한 번에 평가
+    weights = np.zeros((3,) + close.shape)
+    weights[:, 0] = 0.5
+    returns = np.zeros_like(close)
+    returns[:-1] = close[1:] / close[:-1] - 1
+    batch = simulate_weights(weights, returns, np.array([0.0, 0.0]), np.array([0.0, 0.0]))
+    assert batch['equity'].shape == (3, 4)
+    print(f"✅ 포트폴리오: 비용 전 {free['total_return']:+.2f}% → 비용 후 {summary['total_return']:+.2f}%")
+
+def test_walk_forward(tmp_path=None):
+    """사전 변경 시 바뀐 날짜만 재추출 + 걷기 전진 구간 선택이 직접 계산과 같은지 테스트"""
+    import os
+    import tempfile
+    import numpy as np
+    from stock_analyzer import StockAnalyzer
+    from news_archive import save_news_archive
+    from scoring_sweep import FeatureCache, extract_day_features
+    from walk_forward import training_scores, walk_forward
+
+    print("\n🚶 걷기 전진 검증 테스트...")
+
+    work_dir = str(tmp_path) if tmp_path else tempfile.mkdtemp()
+    archive_dir, cache_dir = os.path.join(work_dir, 'news'), os.path.join(work_dir, 'cache')
+    days = {'2026-02-02': '삼성전자 실적 개선', '2026-02-03': 'SK하이닉스 반등 기대', '2026-02-04': '삼성전자 급등'}
+    for date, title in days.items():
+        save_news_archive(date, [{'title': title, 'content': ''}], archive_dir)
+
+    analyzer = StockAnalyzer()
+    cache = FeatureCache(analyzer, cache_dir, archive_dir)
+    assert all(cache.get(date) is not None for date in days) and cache.misses == 3
+
+    # 2/3 기사에만 있는 단어를 긍정 사전에 추가 → 그날만 다시 추출
+    analyzer.positive_words = analyzer.positive_words + ['반등 기대']
+    cache = FeatureCache(analyzer, cache_dir, archive_dir)
+    features = {date: cache.get(date) for date in days}
+    assert (cache.misses, cache.carried) == (1, 2)
+    for date, title in days.items():
+        fresh = extract_day_features(analyzer, [{'title': title, 'content': ''}])
+        assert np.array_equal(features[date]['sentiment'], fresh['sentiment'])
+
+    # 조합 3개 × 8일: 직전 3일 평균 수익률 최고 조합을 다음 날 적용
+    rng = np.random.default_rng(5)
+    stats = np.zeros((3, 3, 8))
+    stats[:, 1] = rng.integers(0, 4, size=(3, 8))
+    stats[:, 0] = rng.normal(size=(3, 8)) * stats[:, 1]
+    stats[:, 2] = np.minimum(stats[:, 1], 1)
+    scores = training_scores(stats, 3, min_trades=1)
+    for day in range(3, 8):
+        for p in range(3):
+            trades = stats[p, 1, day - 3:day].sum()
+            expected = stats[p, 0, day - 3:day].sum() / trades if trades >= 1 else -np.inf
+            assert np.isclose(scores[p, day], expected) or scores[p, day] == expected == -np.inf
+
+    folds = walk_forward(stats, [f'd{i}' for i in range(8)], train_days=3, min_trades=1)
+    assert all(row.param_set == scores[:, int(row.test_date[1:])].argmax() for row in folds.itertuples())
+    print(f"✅ 걷기 전진: 재추출 {cache.misses}일/재사용 {cache.carried}일, 평가일 {len(folds)}일")
+
+def test_stage_graph():
+    """단계 그래프: 독립 단계 동시 실행, 의존 결과 전달, 예외 전파 테스트"""
+    import time
+    from pipeline_dag import StageGraph
+
+    print("\n🕸️ 단계 그래프 테스트...")
+
+    def slow(value):
+        def stage():
+            time.sleep(0.2)
+            return value
+        return stage
+
+    graph = StageGraph('test')
+    graph.add('a', slow([1, 2]))
+    graph.add('b', slow([3]))
+    graph.add('c', slow(10))
+    graph.add('merged', lambda a, b: a + b, ['a', 'b'])
+    graph.add('total', lambda merged, c: sum(merged) + c, ['merged', 'c'])
+
+    started = time.perf_counter()
+    results = graph.run()
+    elapsed = time.perf_counter() - started
+    assert results['merged'] == [1, 2, 3] and results['total'] == 16
+    assert elapsed < 0.5, f"독립 단계가 순차 실행됨: {elapsed:.2f}초"
+    assert graph.critical_path()[-1] == 'total'
+
+    try:
+        graph.add('broken', lambda missing: missing, ['missing'])
+        assert False, "등록되지 않은 의존 단계 허용"
+    except ValueError:
+        pass
+
+    failing = StageGraph('failing')
+    failing.add('boom', lambda: 1 / 0)
+    failing.add('after', lambda boom: boom, ['boom'])
+    try:
+        failing.run()
+        assert False, "단계 예외가 전파되지 않음"
+    except ZeroDivisionError:
+        pass
+    print(f"✅ 단계 그래프: 0.6초 분량 단계를 {elapsed:.2f}초에 실행")
+
+def test_metrics(tmp_path=None):
+    """실행 지표: 히스토그램/카운터 누적과 Prometheus 텍스트·JSON 내보내기 테스트"""
+    import os
+    import json
+    import tempfile
+    from metrics import MetricsRegistry, REGISTRY, export, inc, start_run, track_call
+
+    print("\n⏱️ 실행 지표 테스트...")
+
+    registry = MetricsRegistry()
+    for seconds in (0.003, 0.2, 0.2, 7.0):
+        registry.observe('stage_duration_seconds', seconds, stage='domestic_news')
+    registry.inc('stage_runs_total', stage='domestic_news', status='ok')
+    text = registry.to_prometheus()
+    assert '# TYPE tuja_stage_duration_seconds histogram' in text
+    assert 'tuja_stage_duration_seconds_bucket{stage="domestic_news",le="0.25"} 3' in text
+    assert 'tuja_stage_duration_seconds_bucket{stage="domestic_news",le="+Inf"} 4' in text
+    assert 'tuja_stage_runs_total{stage="domestic_news",status="ok"} 1' in text
+    histogram = registry.summary()['histograms']['stage_duration_seconds'][0]
+    assert histogram['count'] == 4 and histogram['p50'] == 0.25 and histogram['max'] == 7.0
+
+    try:
+        with track_call('yfinance', '^TEST'):
+            raise ConnectionError("offline")
+    except ConnectionError:
+        pass
+    work_dir = str(tmp_path) if tmp_path else tempfile.mkdtemp()
+    prom_path, json_path = export(work_dir, name='test')
+    with open(prom_path, 'r', encoding='utf-8') as f:
+        assert 'tuja_external_calls_total{endpoint="^TEST",status="error",target="yfinance"} 1' in f.read()
+    with open(json_path, 'r', encoding='utf-8') as f:
+        assert 'last_run_timestamp_seconds' in json.load(f)['gauges']
+
+    # 데몬처럼 한 프로세스에서 두 번 실행: Prometheus는 누적, JSON 요약은 이번 실행분만
+    for _ in range(2):
+        start_run()
+        inc('runs_total', status='ok')
+        prom_path, json_path = export(work_dir, name='test')
+    with open(prom_path, 'r', encoding='utf-8') as f:
+        assert 'tuja_runs_total{status="ok"} 2' in f.read()
+    with open(json_path, 'r', encoding='utf-8') as f:
+        summary = json.load(f)
+    assert summary['counters']['runs_total'] == [{'status': 'ok', 'value': 1.0}]
+    assert 'external_calls_total' not in summary['counters']
+    REGISTRY.reset()
+    start_run()
+    print(f"✅ 실행 지표: {os.path.basename(prom_path)}, {os.path.basename(json_path)} 기록")
+
+def test_tracing(tmp_path=None):
+    """실행 추적: 스레드 풀 단계까지 구간 중첩 + Chrome trace 이벤트 기록 테스트"""
+    import os
+    import tempfile
+    import tracing
+    from pipeline_dag import StageGraph
+
+    print("\n🧵 실행 추적 테스트...")
+
+    @tracing.traced('analyzer')
+    def analyze(news):
+        with tracing.span('GET /article', 'crawl', url='https://example.com/1') as attributes:
+            attributes['bytes'] = 42
+        return len(news)
+
+    work_dir = str(tmp_path) if tmp_path else tempfile.mkdtemp()
+    path = os.path.join(work_dir, 'trace.jsonl')
+    graph = StageGraph('traced')
+    graph.add('news', lambda: ['a', 'b'])
+    graph.add('count', analyze, ['news'])
+
+    assert analyze(['x']) == 1  # 추적 밖에서는 기록 없이 실행
+    with tracing.trace('test_run', path=path) as trace:
+        assert graph.run()['count'] == 2
+    events = tracing.load_events(path, 'last')
+    assert {event['args']['trace_id'] for event in events} == {trace.trace_id}
+    assert all(event['ph'] == 'X' and event['dur'] >= 0 for event in events)
+
+    by_name = {event['name']: event for event in events}
+    parent = lambda name: by_name[name]['args']['parent_id']
+    span_id = lambda name: by_name[name]['args']['span_id']
+    # run → graph → stage → analyzer 메서드 → HTTP 구간 (단계는 다른 스레드에서 실행)
+    assert parent('traced') == span_id('test_run')
+    assert parent('count') == span_id('traced')
+    assert parent('test_tracing.<locals>.analyze') == span_id('count')
+    assert parent('GET /article') == span_id('test_tracing.<locals>.analyze')
+    assert by_name['GET /article']['args']['bytes'] == 42
+    assert by_name['count']['tid'] != by_name['test_run']['tid']
+    print(f"✅ 실행 추적: {len(events)}개 구간 기록 (trace {trace.trace_id})")
+
+def test_scheduler(tmp_path=None):
+    """스케줄러: KRX 거래일, 놓친 실행 묶음 보충, 실행 잠금 테스트"""
+    import os
+    import tempfile
+    from datetime import date, datetime, timedelta
+    from scheduler import Job, KRXCalendar, SchedulerDaemon, run_lock
+
+    print("\n📅 스케줄러 테스트...")
+
+    work_dir = str(tmp_path) if tmp_path else tempfile.mkdtemp()
+    calendar = KRXCalendar(path=os.path.join(work_dir, 'holidays.txt'))
+    assert not calendar.is_trading_day(date(2026, 2, 17))  # 설 연휴
+    assert calendar.next_trading_day(date(2026, 2, 13)) == date(2026, 2, 19)
+
+    runs = []
+    job = Job('ranking', lambda: runs.append(1), days='trading')
+    # 금요일 23:30 다음 실행은 주말을 건너뛴 월요일 21:00
+    assert job.next_fire(datetime(2026, 3, 6, 23, 30), calendar) == datetime(2026, 3, 9, 21, 0)
+    # 기본은 매일 실행 (거래일 전용은 days='trading'으로 선택)
+    assert Job('daily', lambda: None).next_fire(datetime(2026, 3, 6, 23, 30), calendar) == datetime(2026, 3, 7, 21, 0)
+
+    now = [datetime(2026, 3, 9, 20, 0)]
+    paths = dict(state_path=os.path.join(work_dir, 'state.json'), lock_path=os.path.join(work_dir, 'run.lock'))
+    daemon = SchedulerDaemon([job], calendar, clock=lambda: now[0], **paths)
+    assert daemon.run_pending() == 0
+
+    # 21:00 ~ 23:30 동안 절전 → 재시작 후 한 번만 보충 실행
+    now[0] = datetime(2026, 3, 9, 23, 40)
+    daemon = SchedulerDaemon([job], calendar, clock=lambda: now[0], **paths)
+    assert daemon.due(now[0])[0][1:] == (datetime(2026, 3, 9, 23, 30), 4)
+    assert daemon.run_pending() == 1 and runs == [1]
+    assert daemon.run_pending() == 0
+    assert daemon.next_fire(now[0]) == datetime(2026, 3, 10, 21, 0)
+
+    # 보충 허용 구간(3시간)보다 오래된 실행은 건너뜀
+    now[0] = datetime(2026, 3, 11, 9, 0)
+    assert daemon.run_pending() == 0 and runs == [1]
+
+    # 다른 실행이 잠금을 잡고 있으면 건너뜀
+    now[0] = datetime(2026, 3, 11, 21, 1)
+    with run_lock(paths['lock_path']) as acquired:
+        assert acquired
+        with run_lock(paths['lock_path']) as second:
+            assert not second
+        job_due = daemon.due(now[0])[0]
+        assert daemon.run_job(*job_due) == 'skipped'
+    assert runs == [1]
+    print(f"✅ 스케줄러: 보충 실행 1회, 잠금 중복 방지 확인")
+
+def test_intraday_state(tmp_path=None):
+    """당일 재실행: 저장된 중간 집계 + 새 기사 = 전체 분석, TOP 10 변화 비교 테스트"""
+    import os
+    import tempfile
+    from news_collector import NewsCollector
+    from global_news_collector_fixed import GlobalNewsCollector
+    from stock_analyzer import StockAnalyzer
+    from intraday_state import IntradayState, ranking_diff
+
+    print("\n🔄 당일 재실행 상태 테스트...")
+
+    analyzer = StockAnalyzer()
+    domestic = NewsCollector()._create_sample_news()
+    global_news = GlobalNewsCollector()._create_global_sample_news()
+    path = os.path.join(str(tmp_path) if tmp_path else tempfile.mkdtemp(), 'intraday.json')
+
+    # 21:00 실행: 일부 기사만 수집 → 집계 저장
+    state = IntradayState.load('2026-03-09', analyzer, path)
+    first = state.add_articles(domestic[:3], global_news[:5])
+    analyzer.aggregate_news(first, state.aggregate)
+    state.save()
+
+    # 22:00 실행: 이미 본 기사는 건너뛰고 새 기사만 더함
+    state = IntradayState.load('2026-03-09', analyzer, path)
+    assert state.links() >= {news['link'] for news in domestic[:3]}
+    new_news = state.add_articles(domestic, global_news)
+    assert len(new_news) == len(domestic) + len(global_news) - 8
+    aggregate = analyzer.aggregate_news(new_news, state.aggregate)
+
+    all_news = domestic + global_news
+    mentions = analyzer.extract_stock_mentions(all_news)
+    assert aggregate.stock_mentions() == mentions
+    assert analyzer.rank_stocks(analyzer.scores_from_aggregate(aggregate)) == \
+        analyzer.rank_stocks(analyzer.calculate_stock_scores(all_news, mentions))
+    assert analyzer.declining_from_aggregate(aggregate) == analyzer.predict_declining_stocks(all_news, mentions)
+    assert analyzer.market_trends_from_aggregate(aggregate)['hot_sectors'] == \
+        analyzer.analyze_market_trends(all_news)['hot_sectors']
+
+    diff = ranking_diff([{'rank': 1, 'stock_name': 'A'}, {'rank': 2, 'stock_name': 'B'}, {'rank': 3, 'stock_name': 'C'}],
+                        [{'rank': 1, 'stock_name': 'B'}, {'rank': 2, 'stock_name': 'A'}, {'rank': 3, 'stock_name': 'D'}])
+    assert [stock['stock_name'] for stock in diff['entered']] == ['D']
+    assert [stock['stock_name'] for stock in diff['exited']] == ['C']
+    assert {stock['stock_name']: stock['change'] for stock in diff['moved']} == {'B': 1, 'A': -1}
+    print(f"✅ 당일 재실행: 새 기사 {len(new_news)}개만 분석, 전체 분석과 같은 순위")
+
+def test_import_budget():
+    """CLI 시작 비용: 그래프/크롤링/yfinance 모듈 지연 로드와 `-X importtime` 기준 시간 예산 테스트"""
+    import os
+    import sys
+    import subprocess
+
+    print("\n⏱️ 시작 시간 예산 테스트...")
+
+    # 단일 실행(JSON 출력) 경로에서 import 시점에 로드하지 않아야 하는 모듈
+    deferred = {'matplotlib', 'seaborn', 'yfinance', 'bs4', 'dotenv'}
+    budget = float(os.getenv("TUJA_IMPORT_BUDGET", "1.0"))  # 초 (기존 약 1.5초)
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+
+    def import_times(module):
+        output = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=src_dir,
+                                capture_output=True, text=True, check=True).stderr
+        times = {}
+        for line in output.splitlines():
+            if line.startswith('import time:') and '|' in line and 'cumulative' not in line:
+                _, cumulative, name = line.split('|')
+                times[name.strip()] = int(cumulative) / 1e6
+        return times
+
+    for module in ('enhanced_main', 'stock_ranker_main'):
+        runs = [import_times(module) for _ in range(3)]
+        loaded = {name.split('.')[0] for name in runs[0]} & deferred
+        assert not loaded, f"{module} import 시 로드됨: {sorted(loaded)}"
+        seconds = min(times[module] for times in runs)
+        assert seconds < budget, f"{module} import {seconds:.2f}초 > 예산 {budget:.2f}초"
+        print(f"✅ {module}: import {seconds:.2f}초 (예산 {budget:.1f}초)")
+
+def test_ranking_server(tmp_path=None):
+    """랭킹 조회 서비스: /latest · /history · /stock, ETag 304, 새 실행 반영 테스트"""
+    import os
+    import json
+    import tempfile
+    from urllib.error import HTTPError
+    from urllib.parse import quote
+    from urllib.request import Request, urlopen
+    from ranking_store import RankingStore
+    from ranking_server import RankingServer, notify_refresh
+
+    print("\n🌐 랭킹 조회 서비스 테스트...")
+
+    db_path = os.path.join(str(tmp_path) if tmp_path else tempfile.mkdtemp(), 'rankings.db')
+    store = RankingStore(db_path)
+    for date, top in (('2026-03-09', ['삼성전자', 'SK하이닉스']), ('2026-03-10', ['SK하이닉스', 'NVIDIA'])):
+        store.save({'date': date, 'market_sentiment': 'bullish',
+                    'top_10_stocks': [{'rank': i, 'stock_name': name, 'score': 50 - i} for i, name in enumerate(top, 1)],
+                    'declining_stocks': [{'rank': 1, 'stock_name': 'KB금융', 'risk_score': 25}]}, 'enhanced')
+
+    def get(server, path, etag=None):
+        request = Request(server.base_url + path, headers={'If-None-Match': etag} if etag else {})
+        try:
+            with urlopen(request, timeout=5) as response:
+                body = response.read()
+                return response.status, response.headers.get('ETag'), json.loads(body) if body else None
+        except HTTPError as e:
+            return e.code, e.headers.get('ETag'), None
+
+    with RankingServer(db_path, port=0, poll_interval=0) as server:
+        status, etag, latest = get(server, '/latest')
+        assert status == 200 and latest['date'] == '2026-03-10' and etag
+        assert get(server, '/latest', etag)[0] == 304
+
+        _, _, history = get(server, '/history?from=2026-03-10')
+        assert [day['date'] for day in history['history']] == ['2026-03-10']
+        _, _, stock = get(server, '/stock/' + quote('SK하이닉스'))
+        assert [(entry['date'], entry['rank']) for entry in stock['history']] == [('2026-03-09', 2), ('2026-03-10', 1)]
+        assert get(server, '/stock/' + quote('없는종목'))[0] == 404
+
+        # 새 실행 저장 → 갱신 요청 후 ETag가 바뀜
+        store.save({'date': '2026-03-11', 'top_10_stocks': [{'rank': 1, 'stock_name': 'NVIDIA', 'score': 60}]}, 'enhanced')
+        assert get(server, '/latest', etag)[0] == 304  # 갱신 전에는 메모리 스냅샷 그대로
+        assert notify_refresh(server.base_url)
+        status, new_etag, latest = get(server, '/latest', etag)
+        assert status == 200 and new_etag != etag and latest['date'] == '2026-03-11'
+    store.close()
+    print(f"✅ 랭킹 조회 서비스: ETag 304, 새 실행 반영 확인")
+
+def test_universes(tmp_path=None):
+    """멀티 유니버스: 공유 집계를 좁힌 결과 = 유니버스 사전으로 처음부터 분석한 결과, 저장소 분리 테스트"""
+    import os
+    import tempfile
+    from news_collector import NewsCollector
+    from global_news_collector_fixed import GlobalNewsCollector
+    from stock_analyzer import StockAnalyzer
+    from ranking_store import RankingStore
+    from universes import DEFAULT_UNIVERSES, select_universes, universe_analyzer
+
+    print("\n🗂️ 멀티 유니버스 테스트...")
+
+    analyzer = StockAnalyzer()
+    all_news = NewsCollector()._create_sample_news() + GlobalNewsCollector()._create_global_sample_news()
+    shared = analyzer.aggregate_news(all_news)
+
+    for name, spec in DEFAULT_UNIVERSES.items():
+        scoped = universe_analyzer(analyzer, spec)
+        restricted = shared.restrict(scoped.stock_keywords)
+        direct = scoped.aggregate_news(all_news)
+        assert restricted.stock_mentions() == direct.stock_mentions(), name
+        assert restricted.sectors == direct.sectors, name
+        assert scoped.rank_stocks(scoped.scores_from_aggregate(restricted)) == \
+            scoped.rank_stocks(scoped.scores_from_aggregate(direct)), name
+    assert all(analyzer.classify_stock_region(stock) == '미국'
+               for stocks in universe_analyzer(analyzer, DEFAULT_UNIVERSES['us']).stock_keywords.values() for stock in stocks)
+    # 유니버스 섹터 가중치는 유니버스 분석기에만 적용
+    assert universe_analyzer(analyzer, DEFAULT_UNIVERSES['kosdaq_small']).scoring_params['sector_weights']['반도체'] == 1.5
+    assert analyzer.scoring_params['sector_weights']['반도체'] == 1.4
+    assert list(select_universes(DEFAULT_UNIVERSES, ['us'])) == ['us']
+
+    # 유니버스 결과는 system을 지정해야만 조회 (기본 조회 / 롤업은 전체 랭킹 기준)
+    store = RankingStore(os.path.join(str(tmp_path) if tmp_path else tempfile.mkdtemp(), 'rankings.db'))
+    store.save({'date': '2026-03-09', 'top_10_stocks': [{'rank': 1, 'stock_name': 'TSMC', 'score': 50.0}]}, 'enhanced:us')
+    assert store.range() == {}
+    store.save({'date': '2026-03-09', 'top_10_stocks': [{'rank': 1, 'stock_name': '삼성전자', 'score': 40.0}]}, 'enhanced')
+    assert store.range()['2026-03-09']['top_10_stocks'][0]['stock_name'] == '삼성전자'
+    assert store.range(system='enhanced:us')['2026-03-09']['top_10_stocks'][0]['stock_name'] == 'TSMC'
+    store.close()
+    print(f"✅ 멀티 유니버스: {len(DEFAULT_UNIVERSES)}개 유니버스를 한 번의 집계로 랭킹")
+
+def test_run_checkpoint(tmp_path=None):
+    """실행 체크포인트: 실패 후 이어서 실행하면 끝난 단계는 건너뛰고 상태 변경 단계만 다시 실행하는지 테스트"""
+    import tempfile
+    from pipeline_dag import StageGraph
+    from run_checkpoint import RunCheckpoint, list_runs
+
+    print("\n🧩 실행 체크포인트 테스트...")
+
+    runs_dir = str(tmp_path) if tmp_path else tempfile.mkdtemp()
+    calls = {'crawl': 0, 'select': 0}
+    state = []
+    fail = {'score': True}
+
+    def crawl():
+        calls['crawl'] += 1
+        return [{'title': '삼성전자 상승'}, {'title': 'TSMC record'}]
+
+    def select(news):
+        calls['select'] += 1
+        state.extend(news)  # 외부 상태 변경 → 체크포인트 대신 다시 실행
+        return len(state)
+
+    def score(news, selected):
+        if fail['score']:
+            raise RuntimeError("외부 API 장애")
+        return {item['title']: selected for item in news}
+
+    def build():
+        graph = StageGraph('checkpoint_test')
+        graph.add('news', crawl)
+        graph.add('selected', select, ['news'], checkpoint=False)
+        graph.add('scores', score, ['news', 'selected'])
+        return graph
+
+    checkpoint = RunCheckpoint.create({'date': '2026-03-09'}, runs_dir=runs_dir)
+    try:
+        build().run(checkpoint=checkpoint)
+        assert False, "실패해야 함"
+    except RuntimeError:
+        pass
+    assert checkpoint.completed() == ['news']
+
+    # 이어서 실행: 크롤링은 건너뛰고, 상태 변경 단계는 다시 실행해 상태를 복원
+    state.clear()
+    fail['score'] = False
+    resumed = RunCheckpoint.open(checkpoint.run_id, runs_dir=runs_dir)
+    assert resumed.meta['date'] == '2026-03-09'
+    graph = build()
+    results = graph.run(checkpoint=resumed)
+    assert graph.restored == ['news']
+    assert calls == {'crawl': 1, 'select': 2}
+    assert results['scores'] == {'삼성전자 상승': 2, 'TSMC record': 2}
+    assert sorted(resumed.completed()) == ['news', 'scores']
+    assert [run.run_id for run in list_runs(runs_dir)] == [checkpoint.run_id]
+    resumed.remove()
+    assert list_runs(runs_dir) == []
+    print("✅ 실행 체크포인트: 실패 후 크롤링 없이 이어서 실행")
+
+def test_result_dataset(tmp_path=None):
+    """컬럼형 결과 저장: 결과 ↔ 행 변환 왕복, 저장 형식 선택, (pyarrow가 있으면) 데이터셋 추가/조회/JSON 내보내기 테스트"""
+    import json
+    import tempfile
+    from result_dataset import (export_json, pyarrow_available, read_stocks, resolve_format, result_from_rows,
+                                result_rows, append_result)
+
+    print("\n🧱 컬럼형 결과 저장 테스트...")
+
+    enhanced = {
+        'date': '2026-03-09', 'time': '21:00:05', 'market_sentiment': 'bullish', 'global_market_sentiment': 'NEUTRAL',
+        'hot_sectors': ['반도체', 'AI'], 'domestic_news_count': 10, 'global_news_count': 12, 'total_news_analyzed': 22,
+        'new_news_count': 22, 'total_stocks_mentioned': 2,
+        'top_10_stocks': [{'rank': 1, 'stock_name': '삼성전자', 'score': 161.5, 'reason': '반도체 섹터 소속',
+                           'mention_count': 6, 'region': '한국'},
+                          {'rank': 2, 'stock_name': 'TSMC', 'score': 80.0, 'reason': '반도체 섹터 소속',
+                           'mention_count': 3, 'region': '미국'}],
+        'declining_stocks': [{'rank': 1, 'stock_name': 'NVIDIA', 'risk_score': 33.0, 'reason': '반도체 섹터',
+                              'mention_count': 2, 'region': '미국'}],
+        'emerging_trends': {'trend_signals': [{'signal': 'AI 전력'}]},
+        'ranking_diff': {'entered': [], 'exited': [], 'moved': []},
+    }
+    basic = {'date': '2026-03-09', 'time': '21:00:01', 'market_sentiment': 'neutral', 'total_news_analyzed': 10,
+             'total_stocks_mentioned': 1, 'top_10_stocks': [{'rank': 1, 'stock_name': '삼성전자', 'score': 20.0,
+                                                            'reason': '상승 기대', 'mention_count': 2}]}
+
+    for result, system in ((enhanced, 'enhanced'), (basic, 'basic')):
+        run, stocks = result_rows(result, system)
+        assert run['system'] == system and run['schema_version'] == 1
+        assert len(stocks) == len(result['top_10_stocks']) + len(result.get('declining_stocks', []))
+        assert result_from_rows(run, stocks) == result
+
+    assert resolve_format('files') == 'files'
+    assert resolve_format('auto') == ('parquet' if pyarrow_available() else 'files')
+    try:
+        resolve_format('xml')
+        assert False, "알 수 없는 형식은 오류"
+    except ValueError:
+        pass
+
+    if not pyarrow_available():
+        print("✅ 컬럼형 결과 저장: 행 변환 왕복 확인 (pyarrow 없음 — JSON + CSV 파일로 저장)")
+        return
+
+    root = str(tmp_path) if tmp_path else tempfile.mkdtemp()
+    append_result(basic, 'basic', root=root)
+    append_result(enhanced, 'enhanced', root=root)
+    append_result(dict(enhanced, date='2026-03-10'), 'enhanced', root=root)
+    df = read_stocks(['date', 'stock_name', 'rank'], start='2026-03-09', end='2026-03-09', system='enhanced', root=root)
+    assert list(df.columns) == ['date', 'stock_name', 'rank'] and len(df) == 3
+    path = export_json('2026-03-09', 'enhanced', directory=root, root=root)
+    with open(path, 'r', encoding='utf-8') as f:
+        assert json.load(f) == enhanced
+    print("✅ 컬럼형 결과 저장: Parquet 추가 / 컬럼 조회 / JSON 내보내기 왕복")
+
+def test_ic_tracker(tmp_path=None):
+    """롤링 순위 IC 증분 갱신이 창 전체 재계산과 같은지 테스트"""
+    import os
+    import tempfile
+    import numpy as np
+    import pandas as pd
+    from ic_tracker import RollingICTracker
+    from performance_analytics import daily_rank_ic
+
+    print("\n📉 롤링 IC 추적기 테스트...")
+
+    work_dir = str(tmp_path) if tmp_path else tempfile.mkdtemp()
+    paths = dict(state_path=os.path.join(work_dir, 'ic_state.json'), series_path=os.path.join(work_dir, 'ic_series.jsonl'))
+
+    rng = np.random.default_rng(3)
+    dates = [d.strftime('%Y-%m-%d') for d in pd.bdate_range('2026-01-01', periods=12)]
+    frame = pd.DataFrame([
+        {'date': date, 'stock': f'S{i}', 'score': float(10 - i), 'return': float(rng.normal())}
+        for date in dates for i in range(8)
+    ])
+    frame.loc[frame['date'] == dates[-1], 'return'] = np.nan  # 다음 거래일 수익률 미도래
+
+    tracker = RollingICTracker(windows=(3, 5), **paths)
+    assert len(tracker.update_from_frame(frame[frame['date'] <= dates[6]])) == 7
+    tracker.save()
+
+    # 상태를 다시 읽어 이어서 갱신해도 결과가 같아야 함
+    tracker = RollingICTracker(windows=(3, 5), **paths)
+    rows = tracker.update_from_frame(frame)
+    assert [row['date'] for row in rows] == dates[7:11]
+    assert tracker.update_from_frame(frame) == []
+
+    daily = daily_rank_ic(frame.dropna(subset=['return']))
+    expected = daily.iloc[-5:].mean()
+    assert abs(tracker.snapshot()['ic_5'] - expected) < 1e-6
+    assert abs(rows[-1]['ic_3'] - daily.iloc[-3:].mean()) < 1e-6
+    assert len(tracker.history()) == 11
+    print(f"✅ 롤링 IC: 5일 {tracker.snapshot()['ic_5']:+.3f}, 3일 {rows[-1]['ic_3']:+.3f}")
+
+def test_ranking_store(tmp_path=None):
+    """랭킹 이력 저장소 테스트 (기존 파일 가져오기 + 기간/종목 조회)"""
+    import os
+    import json
+    import tempfile
+    from ranking_store import RankingStore
+
+    print("\n🗄️ 랭킹 저장소 테스트...")
+
+    work_dir = str(tmp_path) if tmp_path else tempfile.mkdtemp()
+    with open(os.path.join(work_dir, 'stock_ranking_2026-01-26.json'), 'w', encoding='utf-8') as f:
+        json.dump({'date': '2026-01-26', 'market_sentiment': 'neutral',
+                   'top_10_stocks': [{'rank': 1, 'stock_name': 'SK하이닉스', 'score': 30.0}]}, f, ensure_ascii=False)
+    with open(os.path.join(work_dir, 'enhanced_stock_ranking_2026-01-27.csv'), 'w', encoding='utf-8-sig') as f:
+        f.write("rank,stock_name,score,reason,mention_count,date,market_sentiment,global_sentiment\n"
+                "1,삼성전자,45.5,반도체,3,2026-01-27,bullish,positive\n2,SK하이닉스,28.75,반도체,2,2026-01-27,bullish,positive\n")
+
+    store = RankingStore(os.path.join(work_dir, 'rankings.db'))
+    assert store.import_files(work_dir) == 2
+    assert store.import_files(work_dir) == 0  # 이미 가져온 날짜는 건너뜀
+
+    store.save({'date': '2026-01-27', 'market_sentiment': 'bearish',
+                'top_10_stocks': [{'rank': 1, 'stock_name': 'SK하이닉스', 'score': 50.0}]}, 'basic')
+    results = store.range('2026-01-26', '2026-01-27')
+    assert list(results) == ['2026-01-26', '2026-01-27']
+    assert results['2026-01-27']['market_sentiment'] == 'bullish'  # 향상된 결과 우선
+    assert results['2026-01-27']['top_10_stocks'][0]['score'] == 45.5
+
+    history = store.by_stock('SK하이닉스')
+    assert list(history['date']) == ['2026-01-26', '2026-01-27', '2026-01-27']
+    assert store.range(system='basic')['2026-01-27']['market_sentiment'] == 'bearish'
+    store.close()
+    print(f"✅ 랭킹 저장소: {len(results)}일, SK하이닉스 {len(history)}건")
+
+def test_rollups(tmp_path=None):
+    """일/주/월 롤업 증분 갱신 테스트"""
+    import os
+    import tempfile
+    import pandas as pd
+    from ranking_store import RankingStore
+    from rollups import cover_periods
+
+    print("\n🧮 롤업 테스트...")
+
+    assert cover_periods('2026-01-30', '2026-03-03') == [
+        ('daily', '2026-01-30'), ('daily', '2026-01-31'), ('monthly', '2026-02'),
+        ('daily', '2026-03-01'), ('daily', '2026-03-02'), ('daily', '2026-03-03')]
+    assert cover_periods('2026-01-05', '2026-01-12')[0] == ('weekly', '2026-W02')
+
+    work_dir = str(tmp_path) if tmp_path else tempfile.mkdtemp()
+    store = RankingStore(os.path.join(work_dir, 'rankings.db'), sectors={'삼성전자': '반도체', 'SK하이닉스': '반도체'})
+    for date, names in [('2026-01-30', ['삼성전자', '네이버']), ('2026-02-02', ['삼성전자', 'SK하이닉스']),
+                        ('2026-02-03', ['SK하이닉스'])]:
+        store.save({'date': date, 'top_10_stocks': [
+            {'rank': i, 'stock_name': name, 'score': 10.0 * i, 'mention_count': 2} for i, name in enumerate(names, 1)]})
+    store.rollups.record_returns(pd.DataFrame({
+        'date': ['2026-02-02', '2026-02-02', '2026-02-03'], 'stock': ['삼성전자', 'SK하이닉스', 'SK하이닉스'],
+        'return': [1.5, -0.5, 2.5]}))
+    # 같은 날짜 재저장은 교체되고 실현 수익률은 유지
+    store.save({'date': '2026-02-03', 'top_10_stocks': [{'rank': 1, 'stock_name': 'SK하이닉스', 'score': 30.0}]})
+
+    monthly = store.rollups.periods('monthly', 'stock').set_index(['period', 'key'])
+    assert monthly.loc[('2026-02', '삼성전자'), 'appearances'] == 1
+    hynix = monthly.loc[('2026-02', 'SK하이닉스')]
+    assert hynix['appearances'] == 2 and hynix['hits'] == 1 and abs(hynix['mean_return'] - 1.0) < 1e-9
+    assert abs(hynix['avg_score'] - 25.0) < 1e-9
+
+    sectors = store.rollups.summary('2026-01-30', '2026-02-28', 'sector').set_index('key')
+    assert sectors.loc['반도체', 'appearances'] == 4 and sectors.loc['기타', 'appearances'] == 1
+    assert abs(sectors.loc['반도체', 'mean_return'] - 3.5 / 3) < 1e-9
+    store.close()
+    print(f"✅ 롤업: 2월 SK하이닉스 {hynix['appearances']}회, 반도체 적중 {sectors.loc['반도체', 'hits']}건")
+
+def test_stock_master(tmp_path=None):
+    """종목 마스터 인덱스 테스트 (로컬 파일만 사용)"""
+    import os
+    import tempfile
+    from stock_master import load_stock_master
+
+    print("\n🗂️ 종목 마스터 테스트...")
+
+    master_dir = str(tmp_path) if tmp_path else tempfile.mkdtemp()
+
+    # KIS 마스터 형식: 단축코드(9) + 표준코드(12) + 종목명 + 고정폭 필드
+    with open(os.path.join(master_dir, 'kosdaq_code.mst'), 'w', encoding='cp949') as f:
+        for code, name in [('303030', '지니틱스'), ('042700', '한미반도체')]:
+            f.write(f"{code:<9}{'KR7' + code + '000':<12}{name}" + "0" * 222 + "\n")
+    with open(os.path.join(master_dir, 'extra.csv'), 'w', encoding='utf-8') as f:
+        f.write("code,name,market,aliases\n10140,삼성중공업,KOSPI,삼중\n35420,NAVER,KOSPI,\n")
+
+    index = load_stock_master(master_dir)
+    assert len(index) == 4
+    assert index.lookup('지니틱스') == '303030'
+    assert index.lookup('삼성 중공업') == '010140'
+    assert index.lookup('삼중') == '010140'
+    assert index.lookup('네이버') == '035420'
+    assert index.search_prefix('한미')[0] == ('042700', '한미반도체')
+
+    # 두 번째 로드는 바이너리 캐시 사용
+    assert os.path.exists(os.path.join(master_dir, 'stock_master.pkl'))
+    assert load_stock_master(master_dir).lookup('한미반도체') == '042700'
+
+    # 잘린 캐시 / 없는 모듈을 가리키는 예전 캐시는 예외 없이 다시 생성
+    cache_path = os.path.join(master_dir, 'stock_master.pkl')
+    for stale in (open(cache_path, 'rb').read()[:40], b"cno_such_module\nStockMasterIndex\n."):
+        with open(cache_path, 'wb') as f:
+            f.write(stale)
+        assert load_stock_master(master_dir).lookup('한미반도체') == '042700'
+    print(f"✅ 종목 마스터: {len(index)}종목")
+
+def test_kis_emulator():
+    """로컬 KIS 에뮬레이터로 API 클라이언트 테스트 (네트워크/계정 불필요)"""
+    from datetime import timedelta
+    from kis_api import KoreaInvestmentAPI
+    from kis_emulator import KISEmulator, run_benchmark
+
+    print("\n🛰️ KIS 에뮬레이터 테스트...")
+
+    with KISEmulator(quota_per_sec=3) as emulator:
+        api = KoreaInvestmentAPI(base_url=emulator.base_url)
+        end = datetime.now().strftime('%Y%m%d')
+        start = (datetime.now() - timedelta(days=40)).strftime('%Y%m%d')
+        first = api.fetch_daily_prices('005930', start, end)
+        second = api.fetch_daily_prices('005930', start, end)
+        assert 0 < len(first) <= 30
+        assert first.equals(second)  # 같은 종목은 항상 같은 합성 시세
+        expires = datetime.strptime(emulator.issue_token({})['access_token_token_expired'], '%Y-%m-%d %H:%M:%S')
+        assert expires > datetime.now() + timedelta(hours=23)  # 발급 토큰은 24시간 유효
+
+        # 100건 제한을 넘는 기간은 구간을 나눠 조회 (오래된 예측일 수익률 계산용)
+        history = api.get_historical_prices('005930', 250)
+        assert len(history) > 100 and history['date'].is_unique and history['date'].is_monotonic_increasing
+
+        # inquire-daily-price는 실제 API처럼 기간을 무시하고 최근 30거래일만, 기간 조회는 itemchartprice
+        daily = emulator.daily_prices({'fid_input_iscd': '005930', 'fid_input_dt_2': '20200131'})['output']
+        assert len(daily) == 30 and daily[0]['stck_bsop_date'] > '20200131'
+        chart = emulator.itemchart_prices({'FID_INPUT_ISCD': '005930', 'FID_INPUT_DATE_1': '20200101',
+                                           'FID_INPUT_DATE_2': '20200131'})['output2']
+        assert 0 < len(chart) <= 23 and all('20200101' <= row['stck_bsop_date'] <= '20200131' for row in chart)
+
+        # 클라이언트 제한을 풀면 에뮬레이터가 초당 한도 초과 오류(EGW00201) 반환
+        result = run_benchmark(emulator.base_url, ['005930'], total_requests=12,
+                               concurrency=4, max_calls_per_sec=1000)
+        assert result['throttled'] > 0
+        assert result['ok'] + result['throttled'] == 12
+    print(f"✅ 에뮬레이터: 성공 {result['ok']}건, 한도초과 {result['throttled']}건")
+
+def test_backfill_prices(tmp_path=None):
+    """에뮬레이터 대상 일봉 백필 / 구간 분할 / 재시도 대상 구간 / 이어서 실행 테스트"""
+    import os
+    import tempfile
+    import pandas as pd
+    from datetime import timedelta
+    from kis_api import KoreaInvestmentAPI
+    from kis_emulator import KISEmulator
+    from price_store import PriceBarStore, MAX_EMPTY_ATTEMPTS
+    from backfill_prices import BackfillJob, plan_chunks
+
+    print("\n📦 일봉 백필 테스트...")
+
+    assert plan_chunks('20260101', '20260131', 10) == [
+        ('20260101', '20260110'), ('20260111', '20260120'), ('20260121', '20260130'), ('20260131', '20260131')]
+
+    today = datetime.now()
+    start, end = (today - timedelta(days=299)).strftime('%Y%m%d'), today.strftime('%Y%m%d')
+    chunks = plan_chunks(start, end)
+    assert len(chunks) == 3 and chunks[-1][1] == end  # 140 + 140 + 20일
+
+    store = PriceBarStore(os.path.join(str(tmp_path) if tmp_path else tempfile.mkdtemp(), 'price_bars.db'))
+    with KISEmulator() as emulator:
+        job = BackfillJob(KoreaInvestmentAPI(base_url=emulator.base_url), store, workers=2)
+        stats = job.run(['005930', '000660'], start, end)
+
+        # 오늘이 포함된 마지막 구간은 행이 있어도 재시도 대상
+        assert stats['chunks'] == 4 and stats['retry'] == 2 and stats['failed'] == 0
+        assert len(emulator._tokens) == 1  # 워커 여러 개여도 토큰은 한 번만 발급
+        bars = store.load_bars(['005930'])
+        assert len(bars) == len(pd.bdate_range(start, end)) and bars['date'].is_monotonic_increasing
+        progress = dict(((code, chunk_start), (rows, status)) for code, chunk_start, rows, status in store.conn.execute(
+            "SELECT code, chunk_start, rows, status FROM backfill_progress"))
+        assert len(progress) == 6
+        assert all(0 < rows <= 100 for rows, _ in progress.values())
+        assert progress[('005930', chunks[-1][0])][1] == 'retry'
+        assert store.completed_chunks() == {(code, chunk[0], chunk[1]) for code in ('005930', '000660') for chunk in chunks[:2]}
+
+        # 두 번째 실행은 완료 구간을 건너뛰고 재시도 대상만 다시 조회
+        stats = job.run(['005930', '000660'], start, end)
+        assert stats['chunks'] == 0 and stats['retry'] == 2
+
+        # 평일인데 0행인 구간: 저장된 일봉보다 앞(상장 이전)이면 완료
+        stats = job.run(['005930'], '20091201', '20091210')
+        assert stats['rows'] == 0 and stats['chunks'] == 1
+
+        # 저장된 일봉이 없는 종목은 재시도 대상으로 남기되 MAX_EMPTY_ATTEMPTS번째 조회에서 완료
+        for attempt in range(1, MAX_EMPTY_ATTEMPTS + 1):
+            stats = job.run(['123456'], '20091201', '20091210')
+            assert stats['chunks'] == (attempt == MAX_EMPTY_ATTEMPTS)
+        assert ('123456', '20091201', '20091210') in store.completed_chunks()
+        assert job.run(['123456'], '20091201', '20091210')['chunks'] == 0
+    store.close()
+    print(f"✅ 백필: {len(bars)}행, 재시도 대상 구간 {len(progress) - 4}개")
+
+def test_realtime_ticks():
+    """실시간 체결 메시지 디코딩 / 틱 링 버퍼 테스트"""
+    import numpy as np
+    from realtime_ticks import RealtimeQuoteStream, build_execution_message
+
+    print("\n📡 실시간 틱 버퍼 테스트...")
+
+    stream = RealtimeQuoteStream(url="ws://127.0.0.1:1", capacity=4, approval_key="test")
+    received = []
+    stream.subscribe(['005930'], callback=lambda code, ring: received.append(code))
+
+    # 구독하지 않은 종목(000660)은 버퍼에 기록하지 않음
+    for i in range(6):
+        stream.handle_message(build_execution_message([
+            ('005930', '090000', 70000 + i, 10 + i),
+            ('000660', '090000', 150000, 1),
+        ]))
+
+    ticks = stream.latest('005930')
+    assert list(ticks['price']) == [70002, 70003, 70004, 70005]  # 용량 4 → 최근 4틱
+    assert list(stream.latest('005930', 2)['volume']) == [14, 15]
+    assert np.shares_memory(ticks, stream.book.rings['005930'].data)  # 복사 없는 뷰
+    assert len(stream.latest('005930', 0)) == 0
+    assert len(stream.latest('000660')) == 0
+    assert len(received) == 6
+    assert stream.stats['ticks'] == 6  # 버린 체결은 세지 않음
+
+    # 한 메시지에 용량보다 많은 체결이 묶여 와도 최근 4틱만 순서대로 남음
+    stream.handle_message(build_execution_message([('005930', '090001', 71000 + i, i) for i in range(6)]))
+    assert list(stream.latest('005930')['price']) == [71002, 71003, 71004, 71005]
+    assert stream.latest('005930')['ts'][-1] - stream.latest('005930')['ts'][0] == 0
+
+    ping = '{"header": {"tr_id": "PINGPONG", "datetime": "20260126090000"}}'
+    assert stream.handle_message(ping) == ping
+    print(f"✅ 실시간 틱: {stream.stats['ticks']}틱 디코딩")
+
+def test_realtime_stream():
+    """로컬 WebSocket 서버로 접속 / 구독 / PINGPONG / 틱 수신 테스트"""
+    import time
+    from realtime_ticks import LocalQuoteServer, RealtimeQuoteStream
+
+    print("\n📡 실시간 WebSocket 수신 테스트...")
+
+    with LocalQuoteServer(interval=0.01, ping_interval=0.1) as server:
+        stream = RealtimeQuoteStream(url=server.url, capacity=64, approval_key="test")
+        stream.subscribe(['005930', '000660'])
+        stream.start()
+        try:
+            assert stream.connected.wait(timeout=5)
+            deadline = time.monotonic() + 5
+            while time.monotonic() < deadline and not (
+                    len(stream.latest('005930')) and len(stream.latest('000660')) and server.pongs):
+                time.sleep(0.05)
+
+            assert len(stream.latest('005930')) > 0 and len(stream.latest('000660')) > 0
+            assert stream.stats['pings'] > 0 and server.pongs > 0  # PINGPONG을 그대로 돌려보냄
+
+            # 구독 해지 후에는 해당 종목 틱이 더 늘지 않음 (버퍼는 유지)
+            stream.unsubscribe(['000660'])
+            time.sleep(0.2)
+            count = stream.book.rings['000660'].count
+            time.sleep(0.2)
+            assert stream.book.rings['000660'].count == count
+        finally:
+            stream.stop()
+    print(f"✅ 실시간 수신: {stream.stats['ticks']}틱, PINGPONG {stream.stats['pings']}회")
+
+def test_realtime_sharding():
+    """세션당 구독 한도(41종목)를 넘는 종목을 여러 세션으로 나눠 수신하는지 테스트"""
+    import time
+    from realtime_ticks import LocalQuoteServer, RealtimeQuoteStream, MAX_SUBSCRIPTIONS_PER_SESSION
+
+    print("\n📡 실시간 다중 세션 테스트...")
+
+    codes = [f"{100000 + i:06d}" for i in range(100)]
+    with LocalQuoteServer(interval=0.05, ping_interval=10) as server:
+        stream = RealtimeQuoteStream(url=server.url, capacity=16, approval_key="test")
+        stream.subscribe(codes[:60])
+        stream.start()
+        try:
+            assert stream.connected.wait(timeout=5)
+            stream.subscribe(codes[60:])  # 수신 중 추가 구독 → 새 세션 접속
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline and not all(len(stream.latest(code)) for code in codes):
+                time.sleep(0.05)
+
+            assert len(stream.sessions) == 3
+            assert all(len(session.codes) <= MAX_SUBSCRIPTIONS_PER_SESSION for session in stream.sessions)
+            assert all(len(stream.latest(code)) for code in codes)
+            assert server.rejected == 0
+        finally:
+            stream.stop()
+    print(f"✅ 다중 세션: {len(codes)}종목 / 세션 {len(stream.sessions)}개, {stream.stats['ticks']}틱")
+
 if __name__ == "__main__":
     print("="*80)
     print("🧪 주식 랭킹 시스템 통합 테스트")
@@ -150,6 +1228,37 @@ if __name__ == "__main__":
     # 전체 시스템 테스트
     test_ranking_system()
     
+    print("\n" + "="*80)
+    
+    # 분석 모듈 테스트
+    test_returns_engine()
+    test_backtest()
+    test_intraday_sim()
+    test_scoring_sweep()
+    test_ranking_store()
+    test_rollups()
+    test_performance_analytics()
+    test_bootstrap_confidence()
+    test_ic_tracker()
+    test_portfolio_sim()
+    test_walk_forward()
+    test_stage_graph()
+    test_metrics()
+    test_tracing()
+    test_scheduler()
+    test_intraday_state()
+    test_import_budget()
+    test_ranking_server()
+    test_universes()
+    test_run_checkpoint()
+    test_result_dataset()
+    test_stock_master()
+    test_kis_emulator()
+    test_backfill_prices()
+    test_realtime_ticks()
+    test_realtime_stream()
+    test_realtime_sharding()
+    
     print("\n" + "="*80)
     print("🎉 테스트 완료!")
     print("="*80)
\ No newline at end of file
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+실행 추적 (span)
+실행마다 trace ID를 발급하고 단계 → 수집기/분석기 메서드 → HTTP 호출 순으로 중첩된 구간을 기록
+
+구간은 Chrome trace 'X'(complete) 이벤트 형식으로 data/traces/YYYY-MM-DD.jsonl에 한 줄씩 추가되며,
+`python3 tracing.py --chrome` 으로 Perfetto / chrome://tracing에서 여는 JSON 파일을 만든다.
+추적 중이 아닐 때 계측 지점의 비용은 contextvar 조회 한 번이다.
+"""
+
+import os
+import json
+import time
+import uuid
+import argparse
+import itertools
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+from data_paths import data_path
+
+TRACE_ENABLED = os.getenv("TUJA_TRACE", "1") != "0"
+
+_trace: contextvars.ContextVar = contextvars.ContextVar('tuja_trace', default=None)
+_span: contextvars.ContextVar = contextvars.ContextVar('tuja_span', default=None)
+_span_ids = itertools.count(1)
+
+
+class Trace:
+    """한 번의 실행에서 기록된 구간 모음"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.events: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def add(self, event: Dict) -> None:
+        with self._lock:
+            self.events.append(event)
+
+
+def current_trace_id() -> Optional[str]:
+    """진행 중인 trace ID (추적 중이 아니면 None)"""
+    trace = _trace.get()
+    return trace.trace_id if trace else None
+
+
+@contextmanager
+def span(name: str, cat: str = 'function', **args) -> Iterator[Dict]:
+    """
+    구간 기록 (추적 중이 아니면 아무것도 하지 않음)
+
+    Args:
+        name: 구간 이름
+        cat: 분류 (stage / collector / analyzer / http 대상 등)
+        **args: 구간 속성 (Chrome trace args)
+
+    Yields:
+        속성 딕셔너리 — 블록 안에서 status, bytes 등을 추가할 수 있음
+    """
+    trace = _trace.get()
+    if trace is None:
+        yield {}
+        return
+
+    parent = _span.get()
+    attributes = dict(args)
+    span_id = next(_span_ids)
+    token = _span.set(span_id)
+    start_us = time.time_ns() // 1000
+    started = time.perf_counter()
+    try:
+        yield attributes
+    except BaseException as e:
+        attributes['error'] = f"{type(e).__name__}: {e}"[:200]
+        raise
+    finally:
+        _span.reset(token)
+        attributes.update({'trace_id': trace.trace_id, 'span_id': span_id, 'parent_id': parent})
+        trace.add({
+            'name': name, 'cat': cat, 'ph': 'X', 'ts': start_us,
+            'dur': round((time.perf_counter() - started) * 1e6, 1),
+            'pid': os.getpid(), 'tid': threading.get_ident(), 'args': attributes,
+        })
+
+
+def traced(cat: str = 'function', name: Optional[str] = None) -> Callable:
+    """함수 호출 전체를 구간으로 기록하는 데코레이터 (이름 기본값: 클래스.메서드)"""
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _trace.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name, cat):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def bind(func: Callable) -> Callable:
+    """현재 추적 문맥을 다른 스레드에서 이어 쓰도록 묶음 (스레드 풀 제출용, 제출마다 새로 호출)"""
+    return functools.partial(contextvars.copy_context().run, func)
+
+
+def traces_file(date: Optional[str] = None) -> str:
+    return data_path("traces", f"{date or datetime.now().strftime('%Y-%m-%d')}.jsonl")
+
+
+@contextmanager
+def trace(name: str, path: Optional[str] = None) -> Iterator[Optional[Trace]]:
+    """
+    실행 하나를 추적하고 끝나면 구간을 JSON lines로 추가 저장 (TUJA_TRACE=0이면 비활성)
+
+    Args:
+        name: 최상위 구간 이름
+        path: 저장 경로 (기본: data/traces/YYYY-MM-DD.jsonl)
+    """
+    if not TRACE_ENABLED or _trace.get() is not None:
+        yield _trace.get()
+        return
+
+    current = Trace(name)
+    token = _trace.set(current)
+    try:
+        with span(name, 'run'):
+            yield current
+    finally:
+        _trace.reset(token)
+        try:
+            with open(path or traces_file(), 'a', encoding='utf-8') as f:
+                for event in sorted(current.events, key=lambda event: event['ts']):
+                    f.write(json.dumps(event, ensure_ascii=False) + "\n")
+        except OSError:
+            pass
+
+
+def load_events(path: str, trace_id: Optional[str] = None) -> List[Dict]:
+    """JSON lines에서 구간 로드 (trace_id가 'last'면 마지막 실행)"""
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    if trace_id == 'last' and events:
+        trace_id = events[-1]['args']['trace_id']
+    return [event for event in events if not trace_id or event['args'].get('trace_id') == trace_id]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='실행 추적 조회 / Chrome trace 변환')
+    parser.add_argument('--date', help='추적 파일 날짜 (기본: 오늘)')
+    parser.add_argument('--trace', default='last', help="trace ID ('last': 마지막 실행, 'all': 전체)")
+    parser.add_argument('--chrome', metavar='OUT', help='Perfetto / chrome://tracing용 JSON 파일로 저장')
+    parser.add_argument('--slowest', type=int, default=10, help='가장 오래 걸린 구간 N개 표시')
+    parser.add_argument('--cat', help='구간 분류 필터 (예: crawl, kis, analyzer)')
+    args = parser.parse_args()
+
+    path = traces_file(args.date)
+    events = load_events(path, None if args.trace == 'all' else args.trace)
+    if not events:
+        print(f"❌ 기록된 추적이 없습니다: {path}")
+        return
+
+    if args.chrome:
+        with open(args.chrome, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+        print(f"💾 {len(events)}개 구간 저장: {args.chrome} (Perfetto / chrome://tracing에서 열기)")
+
+    runs = [event for event in events if event['cat'] == 'run']
+    for run in runs:
+        print(f"🧵 {run['args']['trace_id']} {run['name']}: {run['dur'] / 1e6:.2f}초, "
+              f"{sum(e['args']['trace_id'] == run['args']['trace_id'] for e in events)}개 구간")
+
+    spans = [event for event in events if event['cat'] != 'run' and (not args.cat or event['cat'] == args.cat)]
+    print(f"\n🐢 가장 오래 걸린 구간 {min(args.slowest, len(spans))}개:")
+    for event in sorted(spans, key=lambda event: event['dur'], reverse=True)[:args.slowest]:
+        extra = {key: value for key, value in event['args'].items() if key not in ('trace_id', 'span_id', 'parent_id')}
+        print(f"   {event['dur'] / 1e3:9.1f}ms  [{event['cat']}] {event['name']} {json.dumps(extra, ensure_ascii=False) if extra else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+멀티 유니버스 랭킹
+KOSPI 대형주 / KOSDAQ 중소형주 / 미국 종목처럼 종목 사전의 일부와 섹터 가중치를 따로 둔 유니버스를
+뉴스 수집·분석 한 번으로 함께 랭킹한다 (enhanced_main.py --universes).
+
+- 수집과 기사별 분석(stock_analyzer.NewsAggregate)은 한 번만 하고
+- 유니버스마다 집계를 사전 일부로 좁혀(NewsAggregate.restrict) 점수 / 순위 / 핫 섹터 / 하락 예측을 계산
+- 결과는 유니버스별 파일(enhanced_stock_ranking_YYYY-MM-DD_<이름>.json/csv, Parquet 저장 시 데이터셋 행)과
+  랭킹 저장소 system='enhanced:<이름>'으로 저장
+
+유니버스 설정 JSON (TUJA_UNIVERSES 환경변수 또는 --universes-file, 없으면 DEFAULT_UNIVERSES):
+    {"이름": {"description": "...", "region": "한국|미국", "sectors": [...], "stocks": [...],
+              "exclude": [...], "sector_weights": {"섹터": 가중치}}}
+모든 키는 선택이며, 조건은 모두 만족해야 종목이 남는다.
+"""
+
+import os
+import re
+import copy
+import json
+import argparse
+from typing import Dict, List, Optional
+from stock_analyzer import StockAnalyzer
+
+# 기본 유니버스 (stock_keywords에 있는 종목 기준)
+DEFAULT_UNIVERSES = {
+    'kospi_large': {
+        'description': 'KOSPI 대형주',
+        'region': '한국',
+        'stocks': ['삼성전자', 'SK하이닉스', 'LG에너지솔루션', '삼성바이오로직스', '현대차', '기아', '셀트리온',
+                   'KB금융', '신한지주', '하나금융지주', '미래에셋증권', '네이버', '카카오', '삼성SDI', 'LG화학',
+                   '포스코퓨처엠', '한화에어로스페이스', '한국전력', '삼성중공업', '한국조선해양', '현대중공업',
+                   'LG', 'KT', 'LG이노텍', '현대로템', 'LIG넥스원', '한국항공우주', 'KAI', '두산로보틱스',
+                   'SK바이오팜', '삼성엔지니어링', '한미반도체', 'DB하이텍'],
+    },
+    'kosdaq_small': {
+        'description': 'KOSDAQ 중소형주',
+        'region': '한국',
+        'stocks': ['지니틱스', '라닉스', '와이씨켐', '샘씨엔에스', '저스템', '케이엔제이', '아이씨케이', '에코프로',
+                   '로보스타', '유비온', '티로보틱스', '알체라', '네오텍', '스타일럽', '비젠트로', '모바일리언'],
+        # 소형주는 테마(로봇/반도체 소부장) 민감도가 커서 섹터 가중치를 더 벌림
+        'sector_weights': {'반도체': 1.5, '로봇': 1.45, 'AI': 1.3, '2차전지': 1.1},
+    },
+    'us': {
+        'description': '미국',
+        'region': '미국',
+        'exclude': ['Fed', 'Federal Reserve', 'IMF', 'NASA', 'ChatGPT'],
+        'sector_weights': {'글로벌테크': 1.4, '금융': 1.0},
+    },
+}
+
+UNIVERSE_NAME = re.compile(r'^[A-Za-z0-9_-]+$')  # 파일 이름 / system 라벨에 그대로 쓰임
+
+
+def load_universes(path: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    유니버스 설정 로드 (파일이 있으면 기본 유니버스 대신 파일의 유니버스만 사용)
+
+    Args:
+        path: 설정 JSON 경로 (기본: TUJA_UNIVERSES 환경변수, 없으면 DEFAULT_UNIVERSES)
+
+    Raises:
+        ValueError: 이름에 영문/숫자/_/- 외의 문자가 있는 경우
+    """
+    path = path or os.getenv("TUJA_UNIVERSES")
+    if not path:
+        return copy.deepcopy(DEFAULT_UNIVERSES)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        universes = json.load(f)
+    for name in universes:
+        if not UNIVERSE_NAME.match(name):
+            raise ValueError(f"유니버스 이름은 영문/숫자/_/-만 쓸 수 있습니다: {name}")
+    return universes
+
+
+def universe_keywords(analyzer: StockAnalyzer, spec: Dict) -> Dict[str, List[str]]:
+    """
+    유니버스 종목 사전 ({섹터: [종목]}, 종목이 남지 않은 섹터는 제외)
+
+    Args:
+        analyzer: 전체 사전을 가진 분석기
+        spec: 유니버스 설정 (region / sectors / stocks / exclude)
+    """
+    region = spec.get('region')
+    sectors = set(spec.get('sectors') or ())
+    stocks = set(spec.get('stocks') or ())
+    exclude = set(spec.get('exclude') or ())
+
+    keywords = {}
+    for sector, sector_stocks in analyzer.stock_keywords.items():
+        if sectors and sector not in sectors:
+            continue
+        kept = [stock for stock in sector_stocks
+                if (not region or analyzer.classify_stock_region(stock) == region)
+                and (not stocks or stock in stocks) and stock not in exclude]
+        if kept:
+            keywords[sector] = kept
+    return keywords
+
+
+def universe_analyzer(analyzer: StockAnalyzer, spec: Dict) -> StockAnalyzer:
+    """
+    유니버스 전용 분석기 (종목 사전 일부 + 섹터 가중치 덮어쓰기, 나머지 사전은 공유)
+
+    Args:
+        analyzer: 전체 사전을 가진 분석기
+        spec: 유니버스 설정
+    """
+    scoped = copy.copy(analyzer)
+    scoped.stock_keywords = universe_keywords(analyzer, spec)
+    scoped.scoring_params = copy.deepcopy(analyzer.scoring_params)
+    scoped.scoring_params['sector_weights'].update(spec.get('sector_weights') or {})
+    return scoped
+
+
+def select_universes(universes: Dict[str, Dict], names: Optional[List[str]] = None) -> Dict[str, Dict]:
+    """
+    이름으로 유니버스 선택 (names가 비어 있으면 전체)
+
+    Raises:
+        KeyError: 설정에 없는 이름
+    """
+    if not names:
+        return universes
+    unknown = [name for name in names if name not in universes]
+    if unknown:
+        raise KeyError(f"설정에 없는 유니버스: {', '.join(unknown)} (가능: {', '.join(universes)})")
+    return {name: universes[name] for name in names}
+
+
+def print_universe_results(universe_results: Dict[str, Dict]) -> None:
+    """유니버스별 TOP 5 요약 출력"""
+    for name, result in universe_results.items():
+        print(f"\n🗂️ [{name}] {result.get('universe_description', '')} — 언급 종목 {result['total_stocks_mentioned']}개, "
+              f"핫 섹터: {', '.join(result['hot_sectors']) or '-'}")
+        if not result['top_10_stocks']:
+            print("   언급된 종목이 없습니다.")
+        for stock in result['top_10_stocks'][:5]:
+            print(f"   {stock['rank']:2d}. {stock['stock_name']} ({stock['score']:.2f}점, 언급 {stock['mention_count']}회)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='유니버스 설정 조회')
+    parser.add_argument('--file', help='유니버스 설정 JSON (기본: TUJA_UNIVERSES 또는 기본 유니버스)')
+    args = parser.parse_args()
+
+    analyzer = StockAnalyzer()
+    for name, spec in load_universes(args.file).items():
+        keywords = universe_keywords(analyzer, spec)
+        stocks = list(dict.fromkeys(stock for sector_stocks in keywords.values() for stock in sector_stocks))
+        print(f"🗂️ {name} ({spec.get('description', '')}): 섹터 {len(keywords)}개, 종목 {len(stocks)}개")
+        print(f"   {', '.join(stocks)}")
+        if spec.get('sector_weights'):
+            print(f"   섹터 가중치: {spec['sector_weights']}")
+
+
+if __name__ == "__main__":
+    main()
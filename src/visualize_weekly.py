@@ -5,37 +5,15 @@
 주간 주식 예측 성과 시각화 스크립트
 """
 
-import json
 from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from collections import defaultdict
-import os
+from ranking_store import load_ranking_history
 
 def load_past_results(days_back: int = 7):
-    """과거 결과 로드"""
-    past_results = {}
-    current_date = datetime.now()
-    
-    for i in range(days_back):
-        date = (current_date - timedelta(days=i)).strftime('%Y-%m-%d')
-        
-        # 다양한 파일명 패턴 시도
-        patterns = [
-            f"enhanced_stock_ranking_{date}.json",
-            f"stock_ranking_{date}.json"
-        ]
-        
-        for filename in patterns:
-            if os.path.exists(filename):
-                try:
-                    with open(filename, 'r', encoding='utf-8') as f:
-                        past_results[date] = json.load(f)
-                        break
-                except (FileNotFoundError, json.JSONDecodeError):
-                    continue
-    
-    return past_results
+    """과거 결과 로드 (랭킹 저장소에서 최근 days_back일 조회, 날짜별 향상된 결과 우선)"""
+    return load_ranking_history(days_back)
 
 def analyze_weekly_data(past_results):
     """주간 데이터 분석"""
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+점수 파라미터 걷기 전진(walk-forward) 검증
+직전 N일 구간에서 성과가 가장 좋은 파라미터 조합을 고르고 다음 날 하나만 채점하는 과정을 끝까지 반복
+
+보관 뉴스 특징은 scoring_sweep.FeatureCache로 날짜별 한 번만 추출하고(사전 버전별 캐시),
+조합별 날짜 성과는 프로세스 풀에서 한 번 계산한 뒤 모든 구간(fold)의 학습 지표를
+누적합 차이로 동시에 구한다. 구간끼리 독립이라 fold 수가 늘어도 채점은 다시 하지 않는다.
+
+d일의 다음 거래일 수익률은 d+1일 종가에 확정되므로 d+1일 랭킹을 만들 때는 이미 알려진 값이다.
+"""
+
+import os
+import copy
+import json
+import argparse
+import itertools
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+from data_paths import data_path
+from stock_analyzer import DEFAULT_SCORING_PARAMS
+from scoring_sweep import DEFAULT_GRID, SweepDataset, expand_grid, flatten_params, load_dataset
+
+WALK_FORWARD_METRICS = ('mean_return', 'hit_rate', 'sharpe', 'cumulative_return')
+
+_WORKER_DATASET: Optional[SweepDataset] = None
+
+
+def _init_worker(dataset: SweepDataset) -> None:
+    global _WORKER_DATASET
+    _WORKER_DATASET = dataset
+
+
+def _daily_chunk(param_sets: List[Dict], k: int) -> List[np.ndarray]:
+    return [_WORKER_DATASET.daily_stats(params, k) for params in param_sets]
+
+
+def daily_stats_matrix(dataset: SweepDataset, param_sets: List[Dict], workers: int = 0, k: int = 10) -> np.ndarray:
+    """
+    조합 × 날짜 성과 합계 (프로세스 풀, 데이터셋은 워커마다 한 번만 전달)
+
+    Returns:
+        (조합 수 × 3 × 날짜 수) 배열: 수익률 합(%), 평가 종목 수, 상승 종목 수
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(param_sets) < 2:
+        return np.stack([dataset.daily_stats(params, k) for params in param_sets])
+
+    chunk_size = max(1, -(-len(param_sets) // (workers * 4)))
+    chunks = [param_sets[i:i + chunk_size] for i in range(0, len(param_sets), chunk_size)]
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(dataset,)) as executor:
+        for chunk_result in executor.map(_daily_chunk, chunks, itertools.repeat(k)):
+            results.extend(chunk_result)
+    return np.stack(results)
+
+
+def _window_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """마지막 축 기준 직전 window일 합계 (t번째 값 = t-window ~ t-1일 합, t일 제외)"""
+    cumulative = np.concatenate([np.zeros(values.shape[:-1] + (1,)), np.cumsum(values, axis=-1)], axis=-1)
+    upper = cumulative[..., :-1]
+    lower = cumulative[..., np.maximum(np.arange(values.shape[-1]) - window, 0)]
+    return upper - lower
+
+
+def training_scores(stats: np.ndarray, train_days: int, metric: str = 'mean_return',
+                    min_trades: int = 10) -> np.ndarray:
+    """
+    모든 날짜에 대해 직전 train_days일 구간의 학습 지표 (조합 × 날짜)
+
+    Args:
+        stats: daily_stats_matrix 결과
+        train_days: 학습 구간 길이 (보관 날짜 수)
+        metric: 'mean_return' / 'hit_rate' / 'sharpe' / 'cumulative_return'
+        min_trades: 학습 구간 최소 평가 종목 수 (미만이면 -inf)
+
+    Returns:
+        (조합 수 × 날짜 수) 배열
+    """
+    sums, counts, hits = stats[:, 0], stats[:, 1], stats[:, 2]
+    active = counts > 0
+    daily = np.divide(sums, counts, out=np.zeros_like(sums), where=active)
+
+    trades = _window_sum(counts, train_days)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if metric == 'hit_rate':
+            score = _window_sum(hits, train_days) / trades * 100
+        elif metric == 'sharpe':
+            days = _window_sum(active.astype(np.float64), train_days)
+            total = _window_sum(daily, train_days)
+            mean = total / days
+            var = (_window_sum(daily ** 2, train_days) - days * mean ** 2) / (days - 1)
+            score = np.where(var > 0, mean / np.sqrt(var) * np.sqrt(252), np.nan)
+        elif metric == 'cumulative_return':
+            score = (np.exp(_window_sum(np.log1p(daily / 100), train_days)) - 1) * 100
+        else:
+            score = _window_sum(sums, train_days) / trades
+    return np.where((trades >= min_trades) & np.isfinite(score), score, -np.inf)
+
+
+def walk_forward(stats: np.ndarray, dates: List[str], train_days: int = 20, metric: str = 'mean_return',
+                 min_trades: int = 10) -> pd.DataFrame:
+    """
+    걷기 전진 검증 (0번 조합을 기준 파라미터로 함께 비교)
+
+    Args:
+        stats: daily_stats_matrix 결과 (0번 조합 = 기준 파라미터)
+        dates: 날짜 목록 (stats 마지막 축 순서)
+        train_days: 학습 구간 길이
+        metric: 학습 구간 선택 지표
+        min_trades: 학습 구간 최소 평가 종목 수
+
+    Returns:
+        평가일별 DataFrame (test_date, param_set, train_score, trades, test_return, test_hits,
+        baseline_trades, baseline_return)
+    """
+    scores = training_scores(stats, train_days, metric, min_trades)
+    best = scores.argmax(axis=0)  # 동점이면 앞 조합(기준 파라미터) 우선
+    day = np.arange(len(dates))
+    eligible = (day >= train_days) & np.isfinite(scores[best, day]) & (stats[best, 1, day] > 0)
+
+    day = day[eligible]
+    chosen = best[eligible]
+    trades = stats[chosen, 1, day]
+    baseline_trades = stats[0, 1, day]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        baseline_return = np.where(baseline_trades > 0, stats[0, 0, day] / baseline_trades, np.nan)
+    return pd.DataFrame({
+        'test_date': [dates[i] for i in day],
+        'param_set': chosen,
+        'train_score': scores[chosen, day],
+        'trades': trades.astype(int),
+        'test_return': stats[chosen, 0, day] / trades,
+        'test_hits': stats[chosen, 2, day].astype(int),
+        'baseline_trades': baseline_trades.astype(int),
+        'baseline_return': baseline_return,
+    })
+
+
+def summarize_folds(folds: pd.DataFrame) -> Dict[str, float]:
+    """평가일별 결과 → 표본 외 요약 (선택 조합 vs 기준 파라미터)"""
+    if folds.empty:
+        return {'folds': 0}
+
+    def curve(daily: pd.Series) -> Dict[str, float]:
+        daily = daily.dropna()
+        equity = np.cumprod(1 + daily.to_numpy() / 100)
+        std = daily.std(ddof=1) if len(daily) > 1 else 0.0
+        return {
+            'mean_daily_return': float(daily.mean()) if len(daily) else 0.0,
+            'cumulative_return': float((equity[-1] - 1) * 100) if len(equity) else 0.0,
+            'sharpe': float(daily.mean() / std * np.sqrt(252)) if std > 0 else 0.0,
+        }
+
+    selected, baseline = curve(folds['test_return']), curve(folds['baseline_return'])
+    return {
+        'folds': len(folds),
+        'hit_rate': float(folds['test_hits'].sum() / folds['trades'].sum() * 100),
+        **selected,
+        **{f'baseline_{key}': value for key, value in baseline.items()},
+        'distinct_params': int(folds['param_set'].nunique()),
+        'param_changes': int((folds['param_set'].diff().fillna(0) != 0).sum()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='점수 파라미터 걷기 전진 검증 (직전 구간 최적 조합 → 다음 날 채점)')
+    parser.add_argument('--grid', help='후보 그리드 JSON (scoring_sweep.py와 같은 형식)')
+    parser.add_argument('--samples', type=int, help='전체 조합 중 무작위 표본 수')
+    parser.add_argument('--start', help='시작일 (YYYY-MM-DD)')
+    parser.add_argument('--end', help='종료일 (YYYY-MM-DD)')
+    parser.add_argument('--train-days', type=int, default=20, help='학습 구간 길이 (보관 날짜 수)')
+    parser.add_argument('--metric', choices=WALK_FORWARD_METRICS, default='mean_return', help='학습 구간 선택 지표')
+    parser.add_argument('--min-trades', type=int, default=10, help='학습 구간 최소 평가 종목 수')
+    parser.add_argument('--k', type=int, default=10, help='날짜별 선정 종목 수')
+    parser.add_argument('--workers', type=int, default=0, help='프로세스 수 (기본: CPU 수)')
+    parser.add_argument('--db', help='일봉 저장소 경로 (기본: data/price_bars.db)')
+    args = parser.parse_args()
+
+    grid = DEFAULT_GRID
+    if args.grid:
+        with open(args.grid, 'r', encoding='utf-8') as f:
+            grid = json.load(f)
+
+    dataset = load_dataset(args.start, args.end, db_path=args.db)
+    if len(dataset.dates) <= args.train_days or np.isnan(dataset.returns).all():
+        print(f"❌ 검증할 데이터가 부족합니다. 학습 구간({args.train_days}일)보다 긴 보관 뉴스와 일봉이 필요합니다.")
+        return
+
+    param_sets = [copy.deepcopy(DEFAULT_SCORING_PARAMS)] + expand_grid(grid, args.samples)
+    print(f"🚶 {len(param_sets):,}개 조합 × {len(dataset.dates) - args.train_days}개 평가일 걷기 전진 검증 중...")
+    started = datetime.now()
+    stats = daily_stats_matrix(dataset, param_sets, args.workers, args.k)
+    folds = walk_forward(stats, dataset.dates, args.train_days, args.metric, args.min_trades)
+    elapsed = (datetime.now() - started).total_seconds()
+
+    summary = summarize_folds(folds)
+    if not summary['folds']:
+        print("❌ 학습 구간 조건(--min-trades)을 만족하는 평가일이 없습니다.")
+        return
+
+    for key in grid:
+        folds[key] = [flatten_params(param_sets[i])[key] for i in folds['param_set']]
+    csv_path = data_path("sweeps", f"walk_forward_{started.strftime('%Y%m%d_%H%M%S')}.csv")
+    folds.to_csv(csv_path, index=False, encoding='utf-8-sig')
+
+    print(f"✅ {summary['folds']}개 평가일 {elapsed:.1f}초 → {csv_path}")
+    print(f"\n📊 표본 외 성과 (선택 조합 / 기준 파라미터):")
+    print(f"   일평균 수익률: {summary['mean_daily_return']:+.3f}% / {summary['baseline_mean_daily_return']:+.3f}%")
+    print(f"   누적 수익률: {summary['cumulative_return']:+.2f}% / {summary['baseline_cumulative_return']:+.2f}%")
+    print(f"   샤프 비율: {summary['sharpe']:.2f} / {summary['baseline_sharpe']:.2f}")
+    print(f"   적중률: {summary['hit_rate']:.1f}% | 선택된 조합 {summary['distinct_params']}개, 교체 {summary['param_changes']}회")
+
+
+if __name__ == "__main__":
+    main()